@@ -60,13 +60,19 @@ from .exceptions import (
 from .sandbox.commands.command_handle import (
     CommandExitException,
     CommandResult,
+    OutputFormat,
+    OutputRetention,
     PtyOutput,
     PtySize,
     Stderr,
     Stdout,
 )
-from .sandbox.commands.main import ProcessInfo
+from .io_utils import MappedFile, ProgressHandler, TransferStats
+from .sandbox.commands.batch import BatchCommandResult
+from .sandbox.commands.main import ProcessInfo, ShellMode
+from .sandbox.commands.session import SessionShell
 from .sandbox.filesystem.filesystem import EntryInfo, FileType, WriteInfo
+from .sandbox.filesystem.sync_dir import SyncDirResult
 from .sandbox.filesystem.watch_handle import (
     FilesystemEvent,
     FilesystemEventType,
@@ -106,6 +112,7 @@ from .sandbox.sandbox_api import (
     SnapshotInfo,
 )
 from .sandbox_async.commands.command_handle import AsyncCommandHandle
+from .sandbox_async.commands.session import AsyncCommandSession
 from .sandbox_async.filesystem.watch_handle import AsyncWatchHandle
 from .sandbox_async.main import AsyncSandbox
 from .sandbox_async.paginator import AsyncSandboxPaginator, AsyncSnapshotPaginator
@@ -118,6 +125,7 @@ from .secret import (
     SecretPaginator,
 )
 from .sandbox_sync.commands.command_handle import CommandHandle
+from .sandbox_sync.commands.session import CommandSession
 from .sandbox_sync.filesystem.watch_handle import WatchHandle
 from .sandbox_sync.main import Sandbox
 from .sandbox_sync.paginator import SandboxPaginator, SnapshotPaginator
@@ -196,6 +204,9 @@ __all__ = [
     "SandboxInfoLifecycle",
     "SandboxMetrics",
     "ProcessInfo",
+    "ShellMode",
+    "BatchCommandResult",
+    "SessionShell",
     "SandboxListOrder",
     "SandboxQuery",
     "SandboxState",
@@ -209,6 +220,8 @@ __all__ = [
     "Stderr",
     "Stdout",
     "CommandExitException",
+    "OutputFormat",
+    "OutputRetention",
     "PtyOutput",
     "PtySize",
     # Filesystem
@@ -216,7 +229,11 @@ __all__ = [
     "FilesystemEventType",
     "EntryInfo",
     "WriteInfo",
+    "SyncDirResult",
     "FileType",
+    "MappedFile",
+    "ProgressHandler",
+    "TransferStats",
     # Network
     "SandboxEgressProxyOpts",
     "SandboxEgressProxyInfo",
@@ -256,12 +273,14 @@ __all__ = [
     "SandboxPaginator",
     "WatchHandle",
     "CommandHandle",
+    "CommandSession",
     # Async sandbox
     "OutputHandler",
     "AsyncSandboxPaginator",
     "AsyncSandbox",
     "AsyncWatchHandle",
     "AsyncCommandHandle",
+    "AsyncCommandSession",
     # Template
     "Template",
     "AsyncTemplate",
@@ -77,6 +77,11 @@ class ApiParams(TypedDict, total=False):
     sandbox_url: Optional[str]
     """URL to connect to sandbox, defaults to `E2B_SANDBOX_URL` environment variable."""
 
+    envd_binary_rpc: Optional[bool]
+    """Whether to talk to the sandbox's RPC endpoints over binary protobuf instead of JSON.
+    Binary messages decode much faster, e.g. for commands with a lot of output.
+    Defaults to `E2B_ENVD_BINARY_RPC` environment variable or `False`."""
+
 
 class ApiParamsWithLogger(ApiParams, total=False):
     """:class:`ApiParams` plus the construction-time ``logger``.
@@ -189,6 +194,10 @@ class ConnectionConfig:
     def _sandbox_url():
         return os.getenv("E2B_SANDBOX_URL")
 
+    @staticmethod
+    def _envd_binary_rpc():
+        return os.getenv("E2B_ENVD_BINARY_RPC", "false").lower() == "true"
+
     @staticmethod
     def _build_user_agent() -> str:
         user_agent_parts = [f"e2b-python-sdk/{package_version}"]
@@ -232,6 +241,7 @@ class ConnectionConfig:
         extra_sandbox_headers: Optional[Dict[str, str]] = None,
         proxy: Optional[ProxyTypes] = None,
         logger: Optional[logging.Logger] = None,
+        envd_binary_rpc: Optional[bool] = None,
     ):
         self.logger = logger
         self.domain = domain or ConnectionConfig._domain()
@@ -266,6 +276,12 @@ class ConnectionConfig:
             sandbox_url or ConnectionConfig._sandbox_url()
         )
 
+        self.envd_binary_rpc = (
+            envd_binary_rpc
+            if envd_binary_rpc is not None
+            else ConnectionConfig._envd_binary_rpc()
+        )
+
     @staticmethod
     def _get_request_timeout(
         default_timeout: Optional[float],
@@ -343,6 +359,7 @@ class ConnectionConfig:
         debug = opts.get("debug")
         proxy = opts.get("proxy")
         sandbox_url = opts.get("sandbox_url")
+        envd_binary_rpc = opts.get("envd_binary_rpc")
 
         req_headers = self.headers.copy()
         if headers is not None:
@@ -381,6 +398,11 @@ class ConnectionConfig:
                     if sandbox_url is not None
                     else cast(Optional[str], self._sandbox_url)
                 ),
+                envd_binary_rpc=(
+                    envd_binary_rpc
+                    if envd_binary_rpc is not None
+                    else self.envd_binary_rpc
+                ),
                 logger=self.logger,
             )
         )
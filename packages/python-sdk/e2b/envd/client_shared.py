@@ -17,7 +17,7 @@ protobuf codegen (`make generate-envd`).
 """
 
 import json
-from typing import Optional, TypedDict, TypeVar
+from typing import Optional, TypedDict, TypeVar, Union
 
 from connectrpc.code import Code
 from connectrpc.errors import ConnectError
@@ -27,13 +27,12 @@ _MESSAGE = TypeVar("_MESSAGE", bound=Message)
 
 
 class _ProtoJSONCodec:
-    """JSON codec matching the JS SDK's `useBinaryFormat: false`.
+    """JSON codec matching the JS SDK's `useBinaryFormat: false`, the default
+    wire format (see ``envd_rpc_codec``).
 
-    connectrpc's default codec is binary protobuf, which would silently
-    change the wire format the SDK has always used; its built-in JSON codec
-    fails hard on unknown fields, which would break an older SDK against a
-    newer envd that added response fields. This codec is the built-in JSON
-    codec plus `ignore_unknown_fields`.
+    connectrpc's built-in JSON codec fails hard on unknown fields, which
+    would break an older SDK against a newer envd that added response fields.
+    This codec is the built-in JSON codec plus `ignore_unknown_fields`.
     """
 
     def name(self) -> str:
@@ -46,18 +45,58 @@ class _ProtoJSONCodec:
         try:
             return message_class.from_json(data, ignore_unknown_fields=True)
         except Exception as e:
-            # A raw error would hit connectrpc's catch-all and become
-            # ConnectError(UNAVAILABLE) — a misleading sandbox-timeout in
-            # rpc.py. Codec-raised ConnectErrors pass through unchanged;
-            # INTERNAL maps to a plain SandboxException.
-            raise ConnectError(
-                Code.INTERNAL,
-                f"envd sent a response that could not be decoded as "
-                f"{message_class.__name__}: {e}",
-            ) from e
+            raise _decode_error(message_class, e) from e
+
+
+class _ProtoBinaryCodec:
+    """Binary protobuf codec (``application/proto``).
+
+    Every process event carries its output in a bytes field, which the JSON
+    codec base64-encodes and parses as a JSON document per stream message;
+    the binary format decodes the same event in a fraction of the time.
+    Fields added by a newer envd are kept as unknown fields, so, like the
+    JSON codec, an older SDK keeps working against it.
+    """
+
+    def name(self) -> str:
+        return "proto"
+
+    def encode(self, message: Message) -> bytes:
+        return message.to_binary()
+
+    def decode(self, data, message_class: type[_MESSAGE]) -> _MESSAGE:
+        try:
+            return message_class.from_binary(data)
+        except Exception as e:
+            raise _decode_error(message_class, e) from e
+
+
+def _decode_error(message_class: type[Message], e: Exception) -> ConnectError:
+    # A raw error would hit connectrpc's catch-all and become
+    # ConnectError(UNAVAILABLE) — a misleading sandbox-timeout in rpc.py.
+    # Codec-raised ConnectErrors pass through unchanged; INTERNAL maps to a
+    # plain SandboxException.
+    return ConnectError(
+        Code.INTERNAL,
+        f"envd sent a response that could not be decoded as "
+        f"{message_class.__name__}: {e}",
+    )
 
 
 ENVD_JSON_CODEC = _ProtoJSONCodec()
+ENVD_BINARY_CODEC = _ProtoBinaryCodec()
+
+
+def envd_rpc_codec(binary: bool) -> Union[_ProtoJSONCodec, _ProtoBinaryCodec]:
+    """The codec the envd RPC clients talk to a sandbox with: JSON, the wire
+    format the SDK has always used and the one the JS SDK uses, unless binary
+    protobuf was opted into with ``envd_binary_rpc`` (or
+    ``E2B_ENVD_BINARY_RPC=true``). envd serves Connect through connect-go,
+    which accepts both. The choice is per client, so the request and every
+    message of its streams use the same format.
+    """
+    return ENVD_BINARY_CODEC if binary else ENVD_JSON_CODEC
+
 
 # How the vendored client mapped plain (non-Connect-encoded) HTTP error
 # responses — e.g. an edge proxy answering for envd — to codes (#806).
@@ -13,8 +13,8 @@ from e2b.api import proxy_to_config
 from e2b.api.client_sync import get_pyqwest_transport
 from e2b.connection_config import ConnectionConfig
 from e2b.envd.client_shared import (
-    ENVD_JSON_CODEC,
     ENVD_RPC_COMPRESSION,
+    envd_rpc_codec,
     plain_http_error,
 )
 from e2b.envd.interceptors import build_interceptors
@@ -60,9 +60,9 @@ def create_rpc_client(
 ) -> TClient:
     """Build a generated sync connectrpc client (e.g. ``ProcessClientSync``)
     wired with the shared pyqwest transport (which retries failed connects,
-    see :class:`e2b.api.client_sync.ConnectionRetryTransport`), the envd JSON
-    codec, and the SDK's default-header and logging interceptors. Compression
-    is disabled (see ``ENVD_RPC_COMPRESSION``). The client is stateless per
+    see :class:`e2b.api.client_sync.ConnectionRetryTransport`), the envd codec
+    selected by ``config.envd_binary_rpc`` (see ``envd_rpc_codec``), and the
+    SDK's default-header and logging interceptors. Compression is disabled (see ``ENVD_RPC_COMPRESSION``). The client is stateless per
     call and its connection pool is process-global, so one instance serves all
     threads.
 
@@ -79,7 +79,7 @@ def create_rpc_client(
     )
     return client_cls(
         base_url,
-        codec=ENVD_JSON_CODEC,
+        codec=envd_rpc_codec(config.envd_binary_rpc),
         interceptors=build_interceptors(config, base_url),
         http_client=http_client,
         **ENVD_RPC_COMPRESSION,
@@ -9,3 +9,4 @@ ENVD_OCTET_STREAM_UPLOAD = Version("0.5.7")
 ENVD_FILE_METADATA = Version("0.6.2")
 ENVD_VERSION_FS_EVENT_ENTRY_INFO = Version("0.6.3")
 ENVD_VERSION_WATCH_NETWORK_MOUNTS = Version("0.6.4")
+ENVD_FILE_COMPOSE = Version("0.6.7")
@@ -1,30 +1,428 @@
 import asyncio
+import io
+import math
+import mmap
+import os
+import threading
+import time
 import zlib
-from typing import IO, AsyncIterable, AsyncIterator, Iterable, Iterator
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    IO,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Union,
+)
 
 IO_CHUNK_SIZE = 65_536
 
+# Bounds of `AdaptiveChunkSize`, and how long it aims for each chunk to take
+# to read and write out.
+MIN_IO_CHUNK_SIZE = 16 * 1024
+MAX_IO_CHUNK_SIZE = 1024 * 1024
+ADAPTIVE_CHUNK_TARGET_SECONDS = 0.05
 
-def iter_io_chunks(data: IO) -> Iterator[bytes]:
-    """Read a file-like object in chunks, encoding text chunks to UTF-8."""
+# Weight of the latest chunk in the smoothed throughput of `AdaptiveChunkSize`.
+_THROUGHPUT_SMOOTHING = 0.5
+
+# Time constant of the rate reported to progress handlers, in seconds: how
+# quickly it follows a change of pace, and how soon a stall shows in it.
+PROGRESS_RATE_WINDOW_SECONDS = 1.0
+
+# Default size of the slices `MappedFile` is uploaded in. Slicing a map costs
+# no system call, so the chunks can be much larger than `IO_CHUNK_SIZE`.
+MMAP_CHUNK_SIZE = 1024 * 1024
+
+# Uncompressed size of each independently compressed block of
+# `parallel_gzip_iter`. Large enough that restarting the deflate dictionary
+# per block costs a negligible amount of compression ratio.
+GZIP_BLOCK_SIZE = 1024 * 1024
+
+
+class AdaptiveChunkSize:
+    """Chunk size of a streamed transfer that follows its measured pace.
+
+    Each chunk is timed from when it's requested until the consumer asks for
+    the next one, which covers reading it and writing it out. The size then
+    moves towards what the smoothed throughput transfers in `target_seconds`,
+    at most doubling or halving per chunk and staying within `minimum` and
+    `maximum`. A fast link gets large chunks, with fewer system calls and
+    scheduling rounds per byte; a slow one gets small chunks, so progress is
+    reported at a fine grain.
+
+    One instance tracks a single stream. Pass it as the `chunk_size` of
+    `iter_io_chunks`, `aiter_io_chunks`, `gzip_iter` or `agzip_iter`.
+    """
+
+    def __init__(
+        self,
+        initial: int = IO_CHUNK_SIZE,
+        minimum: int = MIN_IO_CHUNK_SIZE,
+        maximum: int = MAX_IO_CHUNK_SIZE,
+        target_seconds: float = ADAPTIVE_CHUNK_TARGET_SECONDS,
+    ):
+        if not 0 < minimum <= initial <= maximum:
+            raise ValueError(
+                "chunk sizes must satisfy 0 < minimum <= initial <= maximum"
+            )
+        if target_seconds <= 0:
+            raise ValueError("target_seconds must be positive")
+        self.size = initial
+        """Size of the next chunk in bytes."""
+        self.throughput: Optional[float] = None
+        """Smoothed throughput in bytes per second, None before the first full chunk."""
+        self._minimum = minimum
+        self._maximum = maximum
+        self._target_seconds = target_seconds
+
+    def record(self, size: int, seconds: float) -> None:
+        """Adjust the size after a chunk of `size` bytes took `seconds`."""
+        if size < self.size:
+            # A short read at the end of the stream says nothing about the pace.
+            return
+        rate = size / max(seconds, 1e-9)
+        if self.throughput is None:
+            self.throughput = rate
+        else:
+            self.throughput += _THROUGHPUT_SMOOTHING * (rate - self.throughput)
+
+        ideal = int(self.throughput * self._target_seconds)
+        step = min(self.size * 2, max(self.size // 2, ideal))
+        self.size = min(self._maximum, max(self._minimum, step))
+
+
+ChunkSize = Union[int, AdaptiveChunkSize]
+
+Readable = Union[IO, io.RawIOBase, io.BufferedIOBase, io.TextIOBase]
+"""
+File-like object data is read from: a binary or text file object, or a raw
+binary stream like `MappedFile`.
+"""
+
+
+class MappedFile(io.RawIOBase):
+    """Read-only memory map of a local file, to upload it without reading it.
+
+    Pass it as upload data, e.g. to `files.write(path, MappedFile("big.bin"))`.
+    Uploads take their chunks as slices of the map instead of `read` calls,
+    so no chunk costs a system call or, in async code, a hop to a worker
+    thread. It is also a regular binary file object for anything that calls
+    `read`.
+
+    `file` is a path or a binary file object with a `fileno()`; a file
+    object is read from its current position and stays owned by the caller.
+    """
+
+    def __init__(
+        self,
+        file: Union[str, "os.PathLike[str]", IO[bytes]],
+        chunk_size: int = MMAP_CHUNK_SIZE,
+    ):
+        super().__init__()
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self._chunk_size = chunk_size
+        self._map: Optional[mmap.mmap] = None
+
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "rb") as f:
+                self._open(f.fileno())
+            self._position = 0
+        else:
+            self._open(file.fileno())
+            self._position = min(file.tell(), self.size)
+
+    def _open(self, fd: int) -> None:
+        self.size = os.fstat(fd).st_size
+        if self.size == 0:
+            # An empty file can't be mapped.
+            self._view = memoryview(b"")
+            return
+        # The map keeps its own handle, so the file can be closed right away.
+        self._map = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        if hasattr(self._map, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            # Read ahead aggressively, the file is consumed front to back.
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+        self._view = memoryview(self._map)
+
+    def chunks(self) -> Iterator[memoryview]:
+        """Yield the rest of the file as `memoryview` slices of the map, without copying."""
+        while self._position < self.size:
+            end = min(self._position + self._chunk_size, self.size)
+            chunk = self._view[self._position : end]
+            self._position = end
+            yield chunk
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer) -> int:
+        n = max(0, min(len(buffer), self.size - self._position))
+        buffer[:n] = self._view[self._position : self._position + n]
+        self._position += n
+        return n
+
+    def close(self) -> None:
+        mapped = getattr(self, "_map", None)
+        if not self.closed and mapped is not None:
+            self._view.release()
+            try:
+                mapped.close()
+            except BufferError:
+                # Slices handed out by `chunks` are still referenced; the map
+                # is unmapped when the last of them is garbage collected.
+                pass
+            self._map = None
+        super().close()
+
+
+def iter_io_chunks(
+    data: Readable, chunk_size: ChunkSize = IO_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Read a file-like object in chunks, encoding text chunks to UTF-8.
+
+    `chunk_size` is a fixed size, or an `AdaptiveChunkSize` timing each chunk.
+    """
+    if isinstance(data, MappedFile):
+        # The HTTP transport only accepts `bytes` chunks, so each slice is
+        # copied once, without a `read` system call.
+        for chunk in data.chunks():
+            yield bytes(chunk)
+        return
+    adaptive = chunk_size if isinstance(chunk_size, AdaptiveChunkSize) else None
+    size = chunk_size.size if isinstance(chunk_size, AdaptiveChunkSize) else chunk_size
     while True:
-        chunk = data.read(IO_CHUNK_SIZE)
+        if adaptive:
+            size = adaptive.size
+        started = time.perf_counter()
+        chunk = data.read(size)
         if not chunk:
             break
         yield chunk if isinstance(chunk, bytes) else chunk.encode("utf-8")
+        if adaptive:
+            adaptive.record(len(chunk), time.perf_counter() - started)
 
 
-async def aiter_io_chunks(data: IO) -> AsyncIterator[bytes]:
+async def aiter_io_chunks(
+    data: Readable, chunk_size: ChunkSize = IO_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
     """Read a file-like object in chunks, encoding text chunks to UTF-8.
 
     `data.read` is a synchronous (potentially disk-blocking) call, so it runs in
-    a worker thread to avoid stalling the event loop during large uploads.
+    a worker thread to avoid stalling the event loop during large uploads. A
+    `MappedFile` is sliced on the loop instead: copying from the map doesn't
+    block beyond page faults, which its sequential read-ahead keeps rare.
+
+    `chunk_size` is a fixed size, or an `AdaptiveChunkSize` timing each chunk.
     """
+    if isinstance(data, MappedFile):
+        for chunk in data.chunks():
+            yield bytes(chunk)
+        return
+    adaptive = chunk_size if isinstance(chunk_size, AdaptiveChunkSize) else None
+    size = chunk_size.size if isinstance(chunk_size, AdaptiveChunkSize) else chunk_size
     while True:
-        chunk = await asyncio.to_thread(data.read, IO_CHUNK_SIZE)
+        if adaptive:
+            size = adaptive.size
+        started = time.perf_counter()
+        chunk = await asyncio.to_thread(data.read, size)
         if not chunk:
             break
         yield chunk if isinstance(chunk, bytes) else chunk.encode("utf-8")
+        if adaptive:
+            adaptive.record(len(chunk), time.perf_counter() - started)
+
+
+ProgressHandler = Callable[[int, Optional[int], float], None]
+"""
+Called as `on_progress(bytes_done, total, rate)` while a transfer runs, with
+the bytes of file content transferred so far, the total size when it's known
+(`None` otherwise), and the current rate in bytes per second.
+"""
+
+
+class TransferStats:
+    """
+    Running totals of the transfers made through a client, e.g. to export
+    transfer throughput metrics.
+
+    Bytes are counted as they're transferred. A transfer is counted, with its
+    duration, when it ends, whether it succeeded or not.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.bytes_uploaded = 0
+        self.bytes_downloaded = 0
+        self.uploads = 0
+        self.downloads = 0
+        self.upload_seconds = 0.0
+        """Sum of the durations of the finished uploads."""
+        self.download_seconds = 0.0
+        """Sum of the durations of the finished downloads."""
+
+    @property
+    def upload_rate(self) -> float:
+        """Average rate of the finished uploads in bytes per second."""
+        return self.bytes_uploaded / self.upload_seconds if self.upload_seconds else 0.0
+
+    @property
+    def download_rate(self) -> float:
+        """Average rate of the finished downloads in bytes per second."""
+        return (
+            self.bytes_downloaded / self.download_seconds
+            if self.download_seconds
+            else 0.0
+        )
+
+    def _add_bytes(self, upload: bool, size: int) -> None:
+        with self._lock:
+            if upload:
+                self.bytes_uploaded += size
+            else:
+                self.bytes_downloaded += size
+
+    def _add_transfer(self, upload: bool, seconds: float) -> None:
+        with self._lock:
+            if upload:
+                self.uploads += 1
+                self.upload_seconds += seconds
+            else:
+                self.downloads += 1
+                self.download_seconds += seconds
+
+
+class TransferProgress:
+    """
+    Progress of a single transfer, fed as chunks go through. Calls the
+    progress handler and adds to the transfer stats once per chunk.
+
+    Thread-safe, so the parallel ranges of a download can share one.
+    """
+
+    def __init__(
+        self,
+        upload: bool,
+        total: Optional[int] = None,
+        on_progress: Optional[ProgressHandler] = None,
+        stats: Optional[TransferStats] = None,
+    ):
+        self.upload = upload
+        self.total = total
+        self.bytes_done = 0
+        self.rate = 0.0
+        """Bytes per second, smoothed over `PROGRESS_RATE_WINDOW_SECONDS`."""
+        self._on_progress = on_progress
+        self._stats = stats
+        self._lock = threading.Lock()
+        self._started = self._last = time.perf_counter()
+        self._finished = False
+
+    def update(self, size: int) -> None:
+        """Record `size` more bytes transferred."""
+        with self._lock:
+            now = time.perf_counter()
+            self.bytes_done += size
+            if now - self._started < PROGRESS_RATE_WINDOW_SECONDS:
+                # Too early for a smoothed rate, use the average so far.
+                self.rate = self.bytes_done / max(now - self._started, 1e-9)
+            elif now > self._last:
+                elapsed = now - self._last
+                weight = 1 - math.exp(-elapsed / PROGRESS_RATE_WINDOW_SECONDS)
+                self.rate += weight * (size / elapsed - self.rate)
+            self._last = now
+
+            if self._stats is not None:
+                self._stats._add_bytes(self.upload, size)
+            # Called under the lock, so concurrent updates report in order.
+            if self._on_progress is not None:
+                self._on_progress(self.bytes_done, self.total, self.rate)
+
+    def finish(self) -> None:
+        """Count the transfer in the stats. Only the first call counts."""
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+        if self._stats is not None:
+            self._stats._add_transfer(self.upload, time.perf_counter() - self._started)
+
+
+def iter_progress(
+    chunks: Iterable[bytes], progress: TransferProgress
+) -> Iterator[bytes]:
+    """Pass chunks through, recording each in `progress`."""
+    for chunk in chunks:
+        progress.update(len(chunk))
+        yield chunk
+
+
+async def aiter_progress(
+    chunks: AsyncIterable[bytes], progress: TransferProgress
+) -> AsyncIterator[bytes]:
+    """Pass chunks through, recording each in `progress`."""
+    async for chunk in chunks:
+        progress.update(len(chunk))
+        yield chunk
+
+
+def upload_size(data) -> Optional[int]:
+    """
+    Number of bytes an upload of `data` carries, or None when it can't be
+    known up front, e.g. for text or non-file streams.
+    """
+    if isinstance(data, bytes):
+        return len(data)
+    if isinstance(data, str):
+        return len(data) if data.isascii() else len(data.encode("utf-8"))
+    if isinstance(data, MappedFile):
+        return max(0, data.size - data.tell())
+    if isinstance(data, io.TextIOBase):
+        return None
+    if isinstance(data, io.BytesIO):
+        with data.getbuffer() as view:
+            return max(0, view.nbytes - data.tell())
+    try:
+        return max(0, os.fstat(data.fileno()).st_size - data.tell())
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def content_length(headers: Mapping[str, str]) -> Optional[int]:
+    """
+    Size of the content of a response, when its `Content-Length` gives it:
+    not for a compressed response, which is decoded while it's read.
+    """
+    length = headers.get("Content-Length")
+    if length is None or headers.get("Content-Encoding"):
+        return None
+    try:
+        return int(length)
+    except ValueError:
+        return None
 
 
 def _gzip_compressor():
@@ -32,26 +430,116 @@ def _gzip_compressor():
     return zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
 
 
-def gzip_iter(chunks: Iterable[bytes]) -> Iterator[bytes]:
-    """Gzip-compress a byte stream chunk by chunk."""
+def gzip_iter(
+    chunks: Iterable[bytes], chunk_size: Optional[AdaptiveChunkSize] = None
+) -> Iterator[bytes]:
+    """Gzip-compress a byte stream chunk by chunk.
+
+    With `chunk_size`, the compressed output is regrouped into chunks of its
+    adaptive size instead of being yielded as zlib produces it.
+    """
     compressor = _gzip_compressor()
+    if chunk_size is None:
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+        return
+
+    buffer = bytearray()
+    started = time.perf_counter()
     for chunk in chunks:
-        compressed = compressor.compress(chunk)
-        if compressed:
-            yield compressed
-    yield compressor.flush()
+        buffer += compressor.compress(chunk)
+        if len(buffer) >= chunk_size.size:
+            size = len(buffer)
+            yield bytes(buffer)
+            buffer.clear()
+            chunk_size.record(size, time.perf_counter() - started)
+            started = time.perf_counter()
+    buffer += compressor.flush()
+    yield bytes(buffer)
 
 
-async def agzip_iter(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+async def agzip_iter(
+    chunks: AsyncIterable[bytes], chunk_size: Optional[AdaptiveChunkSize] = None
+) -> AsyncIterator[bytes]:
     """Gzip-compress a byte stream chunk by chunk.
 
     Compression is CPU-bound, so it runs in a worker thread to avoid stalling
     the event loop during large uploads (zlib releases the GIL while
-    compressing, so the offload genuinely overlaps with the loop).
+    compressing, so the offload genuinely overlaps with the loop). With
+    `chunk_size`, the output is regrouped like in `gzip_iter`.
     """
     compressor = _gzip_compressor()
+    if chunk_size is None:
+        async for chunk in chunks:
+            compressed = await asyncio.to_thread(compressor.compress, chunk)
+            if compressed:
+                yield compressed
+        yield await asyncio.to_thread(compressor.flush)
+        return
+
+    buffer = bytearray()
+    started = time.perf_counter()
     async for chunk in chunks:
-        compressed = await asyncio.to_thread(compressor.compress, chunk)
-        if compressed:
-            yield compressed
-    yield await asyncio.to_thread(compressor.flush)
+        buffer += await asyncio.to_thread(compressor.compress, chunk)
+        if len(buffer) >= chunk_size.size:
+            size = len(buffer)
+            yield bytes(buffer)
+            buffer.clear()
+            chunk_size.record(size, time.perf_counter() - started)
+            started = time.perf_counter()
+    buffer += await asyncio.to_thread(compressor.flush)
+    yield bytes(buffer)
+
+
+def _iter_blocks(chunks: Iterable[bytes], block_size: int) -> Iterator[bytes]:
+    """Regroup a byte stream into blocks of `block_size` (the last may be shorter)."""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= block_size:
+            yield bytes(buffer[:block_size])
+            del buffer[:block_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+def _gzip_member(block: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, wbits=zlib.MAX_WBITS | 16)
+    return compressor.compress(block) + compressor.flush()
+
+
+def parallel_gzip_iter(
+    chunks: Iterable[bytes],
+    level: int = zlib.Z_DEFAULT_COMPRESSION,
+    block_size: int = GZIP_BLOCK_SIZE,
+    max_workers: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Gzip-compress a byte stream on a thread pool.
+
+    The stream is cut into `block_size` blocks that are compressed as separate
+    gzip members on worker threads (zlib releases the GIL while compressing,
+    so the blocks compress on all cores) and yielded in order. Concatenated
+    gzip members are a valid gzip stream that any gzip reader decompresses
+    to the original bytes. At most two blocks per worker are in flight, so
+    memory use stays bounded regardless of the stream size.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    pending: Deque[Future] = deque()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        empty = True
+        for block in _iter_blocks(chunks, block_size):
+            empty = False
+            pending.append(executor.submit(_gzip_member, block, level))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+
+        if empty:
+            # An empty stream still has to be a valid gzip file
+            pending.append(executor.submit(_gzip_member, b"", level))
+
+        while pending:
+            yield pending.popleft().result()
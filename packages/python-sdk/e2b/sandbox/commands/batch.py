@@ -0,0 +1,146 @@
+import base64
+import shlex
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+from e2b.exceptions import InvalidArgumentException, SandboxException
+from e2b.sandbox.commands.command_handle import CommandResult
+from e2b.sandbox.commands.main import ShellMode
+
+"""
+Default number of commands of a `run_many` batch running at the same time.
+"""
+BATCH_MAX_CONCURRENCY = 10
+
+"""
+Prefix of the result lines printed by the `run_many` supervisor script.
+"""
+SUPERVISOR_MARKER = "__e2b_batch_result__"
+
+
+@dataclass
+class BatchCommandResult(CommandResult):
+    """
+    Result of a command of a `run_many` batch.
+
+    Unlike `run`, a non-zero exit code doesn't raise, check `exit_code`.
+    """
+
+    duration: float
+    """
+    Time the command took in **seconds**.
+    """
+
+
+def validate_batch(
+    cmds: Sequence[Union[str, List[str]]],
+    max_concurrency: int,
+    shell: Optional[ShellMode],
+    supervisor: bool,
+) -> None:
+    """
+    Check the arguments of a `run_many` batch.
+    """
+    if isinstance(cmds, str):
+        raise InvalidArgumentException("cmds must be a list of commands")
+    if max_concurrency < 1:
+        raise InvalidArgumentException("max_concurrency must be at least 1")
+    if supervisor and shell == "none":
+        raise InvalidArgumentException(
+            "The batch supervisor is a shell script, use shell='login' or 'non-login'"
+        )
+
+
+def supervisor_script(
+    cmds: Sequence[Union[str, List[str]]], max_concurrency: int
+) -> str:
+    """
+    Bash script running a batch of commands in one process, at most
+    `max_concurrency` at a time.
+
+    Each command runs in a subshell of its own, in a background job with stdin
+    from `/dev/null` and its output going to files. The job records the exit
+    code and the start and end time of the command once its subshell has
+    exited, so a command using `exec` or setting the script's variables still
+    gets its result. Those are the only processes forked per command; once all
+    of them have finished, the outputs are printed base64-encoded in one piece.
+    """
+    lines = " ".join(
+        shlex.quote(cmd if isinstance(cmd, str) else shlex.join(cmd)) for cmd in cmds
+    )
+    return f"""dir=$(mktemp -d) || exit 1
+trap 'rm -rf "$dir"' EXIT
+run() {{
+  local started=$EPOCHREALTIME
+  (eval "$1")
+  echo "$? $started $EPOCHREALTIME" > "$dir/$2.status"
+}}
+cmds=({lines})
+running=0
+for i in "${{!cmds[@]}}"; do
+  if (( running >= {max_concurrency} )); then wait -n; running=$((running - 1)); fi
+  run "${{cmds[$i]}}" "$i" < /dev/null > "$dir/$i.out" 2> "$dir/$i.err" &
+  running=$((running + 1))
+done
+wait
+files=()
+for i in "${{!cmds[@]}}"; do
+  code= started= ended=
+  read -r code started ended 2> /dev/null < "$dir/$i.status"
+  echo "{SUPERVISOR_MARKER} status $i $code $started $ended"
+  files+=("$dir/$i.out" "$dir/$i.err")
+done
+echo "{SUPERVISOR_MARKER} sizes" $(stat -c %s "${{files[@]}}")
+echo "{SUPERVISOR_MARKER} output $(cat "${{files[@]}}" | base64 -w0)"
+"""
+
+
+def parse_supervisor_output(stdout: str, count: int) -> List[BatchCommandResult]:
+    """
+    Results of the commands from the output of `supervisor_script`.
+
+    Other output, e.g. of the profile scripts of a login shell, is skipped.
+    """
+    statuses: Dict[int, List[str]] = {}
+    sizes: List[int] = []
+    output = b""
+    for line in stdout.splitlines():
+        fields = line.split(" ")
+        if fields[0] != SUPERVISOR_MARKER or len(fields) < 2:
+            continue
+        if fields[1] == "status" and len(fields) == 6 and all(fields[3:]):
+            statuses[int(fields[2])] = fields[3:]
+        elif fields[1] == "sizes":
+            sizes = [int(size) for size in fields[2:]]
+        elif fields[1] == "output":
+            output = base64.b64decode(fields[2] if len(fields) > 2 else "")
+
+    missing = [i for i in range(count) if i not in statuses]
+    if missing or len(sizes) != 2 * count or sum(sizes) != len(output):
+        raise SandboxException(
+            f"The batch supervisor returned no result for commands {missing or 'all'}"
+        )
+
+    results: List[BatchCommandResult] = []
+    offset = 0
+    for i in range(count):
+        exit_code, started, ended = statuses[i]
+        stdout_size, stderr_size = sizes[2 * i], sizes[2 * i + 1]
+        out = output[offset : offset + stdout_size]
+        err = output[offset + stdout_size : offset + stdout_size + stderr_size]
+        offset += stdout_size + stderr_size
+        results.append(
+            BatchCommandResult(
+                stdout=out.decode("utf-8", errors="replace"),
+                stderr=err.decode("utf-8", errors="replace"),
+                exit_code=int(exit_code),
+                error=None,
+                duration=_seconds(ended) - _seconds(started),
+            )
+        )
+    return results
+
+
+def _seconds(epoch: str) -> float:
+    # `$EPOCHREALTIME` uses the decimal separator of the locale
+    return float(epoch.replace(",", "."))
@@ -1,7 +1,13 @@
+import codecs
+from abc import ABC, abstractmethod
+import tempfile
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional
+from typing import IO, Deque, Generic, Iterable, Literal, Optional
 
-from e2b.exceptions import SandboxException
+from typing_extensions import TypeVar
+
+from e2b.exceptions import InvalidArgumentException, SandboxException
 
 Stdout = str
 """
@@ -15,6 +21,17 @@ PtyOutput = bytes
 """
 Pty output.
 """
+OutputFormat = Literal["text", "bytes"]
+"""
+Format of a command's stdout and stderr:
+
+- `text`: decoded as UTF-8 to `str`, invalid sequences replaced
+- `bytes`: raw `bytes`, as the command wrote them
+"""
+Output = TypeVar("Output", str, bytes, default=str)
+"""
+Type of a command's stdout and stderr, `str` or `bytes` depending on the `OutputFormat`.
+"""
 
 
 @dataclass
@@ -33,19 +50,29 @@ class PtySize:
     """
 
 
+def validate_output_format(output_format: OutputFormat) -> None:
+    """
+    Check that `output_format` is a supported `OutputFormat`.
+    """
+    if output_format not in ("text", "bytes"):
+        raise InvalidArgumentException(
+            f"Unsupported output format '{output_format}', use 'text' or 'bytes'"
+        )
+
+
 @dataclass
-class CommandResult:
+class CommandResult(Generic[Output]):
     """
     Command execution result.
     """
 
-    stderr: str
+    stderr: Output
     """
-    Command stderr output.
+    Command stderr output, `bytes` if the command was run with `output_format="bytes"`.
     """
-    stdout: str
+    stdout: Output
     """
-    Command stdout output.
+    Command stdout output, `bytes` if the command was run with `output_format="bytes"`.
     """
     exit_code: int
     """
@@ -60,10 +87,215 @@ class CommandResult:
 
 
 @dataclass
-class CommandExitException(SandboxException, CommandResult):
+class CommandExitException(SandboxException, CommandResult[Output]):
     """
     Exception raised when a command exits with a non-zero exit code.
     """
 
     def __str__(self):
-        return f"Command exited with code {self.exit_code} and error:\n{self.stderr}"
+        stderr = self.stderr
+        if isinstance(stderr, bytes):
+            stderr = stderr.decode("utf-8", errors="replace")
+        return f"Command exited with code {self.exit_code} and error:\n{stderr}"
+
+
+@dataclass
+class OutputRetention:
+    """
+    How much of a command's stdout and stderr its handle keeps.
+
+    Output callbacks and iterating over the handle still see all output; the
+    policy bounds what is kept for `stdout`, `stderr` and the `CommandResult`.
+    """
+
+    mode: Literal["all", "tail", "discard", "spill"] = "all"
+    """
+    - `all` keeps all output in memory.
+    - `tail` keeps only the last `max_chars` characters of each stream.
+    - `discard` keeps nothing, `stdout` and `stderr` are empty.
+    - `spill` keeps up to `max_chars` characters of each stream in memory and moves the stream to a temporary file once it grows past that. This bounds the memory used while the command runs; the spilled output is read back into memory in one piece for the `CommandResult` of `wait()`, or when `stdout` or `stderr` is read.
+    """
+    max_chars: int = 1024 * 1024
+    """
+    Characters of each stream kept by the `tail` mode, or kept in memory before spilling by the `spill` mode. Bytes for output in the `bytes` format.
+    """
+
+    def __post_init__(self):
+        if self.mode not in ("all", "tail", "discard", "spill"):
+            raise InvalidArgumentException(
+                f"Unsupported output retention mode: {self.mode}"
+            )
+        if self.max_chars < 1:
+            raise InvalidArgumentException("max_chars must be at least 1")
+
+
+class OutputBuffer(ABC, Generic[Output]):
+    """
+    Output of one command stream, kept according to an `OutputRetention` policy.
+
+    `TextOutputBuffer` decodes the stream to `str`, `BytesOutputBuffer` keeps
+    the raw `bytes`, for which the policy counts bytes instead of characters.
+    """
+
+    def __init__(self, retention: Optional[OutputRetention] = None):
+        self._retention = retention or OutputRetention()
+        self._chunks: Deque[Output] = deque()
+        self._size = 0
+        self._file: Optional[IO[Output]] = None
+
+    def feed(self, chunk: bytes) -> Output:
+        """
+        Decode a raw chunk of the stream and keep it.
+
+        :param chunk: Raw output chunk
+        :return: Decoded output chunk, empty if the chunk holds only part of a character
+        """
+        output = self._decode(chunk, final=False)
+        if output:
+            self.append(output)
+        return output
+
+    def flush(self) -> Output:
+        """
+        Decode and keep the bytes still buffered at the end of the stream.
+
+        Incomplete trailing UTF-8 sequences are emitted as replacement
+        characters, matching the per-chunk decoding behavior.
+
+        :return: Decoded output, empty if nothing was buffered
+        """
+        output = self._decode(b"", final=True)
+        if output:
+            self.append(output)
+        return output
+
+    def append(self, chunk: Output) -> None:
+        """
+        Keep a chunk of output.
+
+        :param chunk: Decoded output chunk
+        """
+        mode = self._retention.mode
+        max_chars = self._retention.max_chars
+
+        if mode == "discard":
+            return
+
+        if self._file is not None:
+            self._file.write(chunk)
+            return
+
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+
+        if mode == "tail":
+            # Drop whole chunks from the front, then trim the first one
+            while self._size - len(self._chunks[0]) >= max_chars:
+                self._size -= len(self._chunks.popleft())
+            if self._size > max_chars:
+                self._chunks[0] = self._skip(self._chunks[0], self._size - max_chars)
+                self._size = max_chars
+        elif mode == "spill" and self._size > max_chars:
+            self._file = self._temporary_file()
+            self._file.writelines(self._chunks)
+            self._chunks.clear()
+            self._size = 0
+
+    def getvalue(self) -> Output:
+        """
+        Get the kept output.
+
+        :return: Kept output, read back from the temporary file into memory if it was spilled
+        """
+        if self._file is None:
+            # Joining the chunks once is cheaper than growing a buffer with each
+            joined = self._join(self._chunks)
+            if len(self._chunks) > 1 and self._retention.mode != "tail":
+                # Keep the joined output, so repeated reads don't join again.
+                # The tail stays in chunks, trimming it must not copy it all.
+                self._chunks.clear()
+                self._chunks.append(joined)
+            return joined
+
+        self._file.flush()
+        self._file.seek(0)
+        try:
+            return self._file.read()
+        finally:
+            self._file.seek(0, 2)
+
+    def close(self) -> None:
+        """
+        Release the kept output, closing the temporary file if it was spilled.
+        """
+        self._chunks.clear()
+        self._size = 0
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @abstractmethod
+    def _decode(self, chunk: bytes, final: bool) -> Output:
+        """
+        Decode a raw chunk, keeping an incomplete trailing character for the next one unless `final`.
+        """
+
+    @abstractmethod
+    def _join(self, chunks: Iterable[Output]) -> Output:
+        """
+        Join kept chunks into one.
+        """
+
+    @abstractmethod
+    def _skip(self, chunk: Output, size: int) -> Output:
+        """
+        Drop the first `size` characters, or bytes, of a chunk.
+        """
+
+    @abstractmethod
+    def _temporary_file(self) -> IO[Output]:
+        """
+        Open the temporary file the output is spilled to.
+        """
+
+
+class TextOutputBuffer(OutputBuffer[str]):
+    """
+    Output of one command stream in the `text` format, decoded as UTF-8 to
+    `str` with invalid sequences replaced.
+    """
+
+    def __init__(self, retention: Optional[OutputRetention] = None):
+        super().__init__(retention)
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def _decode(self, chunk: bytes, final: bool) -> str:
+        return self._decoder.decode(chunk, final=final)
+
+    def _join(self, chunks: Iterable[str]) -> str:
+        return "".join(chunks)
+
+    def _skip(self, chunk: str, size: int) -> str:
+        return chunk[size:]
+
+    def _temporary_file(self) -> IO[str]:
+        return tempfile.TemporaryFile(mode="w+", encoding="utf-8", newline="")
+
+
+class BytesOutputBuffer(OutputBuffer[bytes]):
+    """
+    Output of one command stream in the `bytes` format, the raw `bytes` as the
+    command wrote them.
+    """
+
+    def _decode(self, chunk: bytes, final: bool) -> bytes:
+        return chunk
+
+    def _join(self, chunks: Iterable[bytes]) -> bytes:
+        return b"".join(chunks)
+
+    def _skip(self, chunk: bytes, size: int) -> bytes:
+        return chunk[size:]
+
+    def _temporary_file(self) -> IO[bytes]:
+        return tempfile.TemporaryFile()
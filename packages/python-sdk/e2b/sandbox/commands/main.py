@@ -1,5 +1,17 @@
+import shlex
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional, Tuple, Union
+
+from e2b.exceptions import InvalidArgumentException
+
+ShellMode = Literal["login", "non-login", "none"]
+"""
+How a command is started:
+
+- `login`: in a Bash login shell (`bash -l -c`), which sources the profile scripts first
+- `non-login`: in a plain Bash shell (`bash -c`), skipping the profile scripts
+- `none`: executed directly, without a shell
+"""
 
 
 @dataclass
@@ -37,3 +49,32 @@ class ProcessInfo:
     """
     Executed command working directory.
     """
+
+
+def process_argv(
+    cmd: Union[str, List[str]], shell: Optional[ShellMode] = None
+) -> Tuple[str, List[str]]:
+    """
+    Program and arguments of the process running `cmd` in the `shell` mode.
+
+    By default a string is run in a login shell and a list is executed
+    directly. A list run in a shell is quoted into a command line; a string
+    executed directly is split like a shell would split it.
+    """
+    if shell is None:
+        shell = "login" if isinstance(cmd, str) else "none"
+
+    if shell == "none":
+        argv = shlex.split(cmd) if isinstance(cmd, str) else list(cmd)
+        if not argv:
+            raise InvalidArgumentException("The command must not be empty")
+        return argv[0], argv[1:]
+
+    script = cmd if isinstance(cmd, str) else shlex.join(cmd)
+    if shell == "login":
+        return "/bin/bash", ["-l", "-c", script]
+    if shell == "non-login":
+        return "/bin/bash", ["-c", script]
+    raise InvalidArgumentException(
+        f"Unsupported shell mode '{shell}', use 'login', 'non-login' or 'none'"
+    )
@@ -0,0 +1,165 @@
+import shlex
+import uuid
+from typing import List, Literal, Optional, Tuple
+
+from e2b.exceptions import InvalidArgumentException, SandboxException
+from e2b.sandbox.commands.command_handle import CommandExitException, CommandResult
+
+SessionShell = Literal["login", "non-login"]
+"""
+Shell a command session runs in, see `ShellMode`.
+"""
+
+
+def session_argv(shell: SessionShell) -> List[str]:
+    """
+    Argv of the shell process of a command session, reading the commands
+    from its stdin.
+    """
+    if shell == "login":
+        return ["/bin/bash", "-l"]
+    if shell == "non-login":
+        return ["/bin/bash"]
+    raise InvalidArgumentException(
+        f"Unsupported session shell '{shell}', use 'login' or 'non-login'"
+    )
+
+
+class SentinelStream:
+    """
+    Output of one stream of a session's shell, split into the output of each
+    command at the sentinel line printed after it.
+
+    The sentinel is printed on a line of its own after a newline, which is
+    removed with it, so output not ending with a newline is kept as it is.
+    """
+
+    def __init__(self, sentinel: str):
+        self._marker = "\n" + sentinel
+        self._buffer = ""
+        self._found = False
+
+    def feed(self, chunk: str) -> Tuple[str, Optional[str]]:
+        """
+        Add a chunk of the stream.
+
+        :return: The command output that can be passed on, and, once the rest of the sentinel line is complete, what it holds after the sentinel (`None` before that)
+        """
+        self._buffer += chunk
+        if not self._found:
+            index = self._buffer.find(self._marker)
+            if index < 0:
+                # Hold back a trailing part that may be the start of the marker
+                keep = self._partial_marker()
+                output = self._buffer[: len(self._buffer) - keep]
+                self._buffer = self._buffer[len(output) :]
+                return output, None
+
+            output = self._buffer[:index]
+            self._buffer = self._buffer[index + len(self._marker) :]
+            self._found = True
+        else:
+            output = ""
+
+        line, newline, rest = self._buffer.partition("\n")
+        if not newline:
+            return output, None
+
+        self._buffer, self._found = rest, False
+        return output, line
+
+    def _partial_marker(self) -> int:
+        for size in range(min(len(self._marker) - 1, len(self._buffer)), 0, -1):
+            if self._buffer.endswith(self._marker[:size]):
+                return size
+        return 0
+
+
+class SessionState:
+    """
+    Sentinel and output parsing of the command running in a session.
+    """
+
+    def __init__(self):
+        self.sentinel = f"__e2b_session_{uuid.uuid4().hex}__"
+        self._stdout = SentinelStream(self.sentinel)
+        self._stderr = SentinelStream(self.sentinel)
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Prepare for the next command.
+        """
+        self.stdout: List[str] = []
+        self.stderr: List[str] = []
+        self.exit_code: Optional[int] = None
+        self._stderr_done = False
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether both streams of the command have ended.
+        """
+        return self.exit_code is not None and self._stderr_done
+
+    def result(self) -> CommandResult:
+        """
+        Result of the finished command.
+
+        :raises CommandExitException: If the command exited with a non-zero exit code
+        """
+        if self.exit_code is None:
+            raise SandboxException("The command hasn't finished yet.")
+
+        stdout, stderr = "".join(self.stdout), "".join(self.stderr)
+        if self.exit_code != 0:
+            raise CommandExitException(
+                stdout=stdout, stderr=stderr, exit_code=self.exit_code, error=None
+            )
+        return CommandResult(
+            stdout=stdout, stderr=stderr, exit_code=self.exit_code, error=None
+        )
+
+    def script(self, cmd: str) -> str:
+        """
+        Shell input running `cmd` in the session and printing the sentinel to
+        both streams afterwards.
+
+        The command runs through `eval`, so a syntax error fails the command,
+        not the shell, and with stdin from `/dev/null`, so it can't read the
+        following commands.
+        """
+        return (
+            f"eval {shlex.quote(cmd)} < /dev/null\n"
+            f"printf '\\n%s %d\\n' {self.sentinel} $?\n"
+            f"printf '\\n%s\\n' {self.sentinel} >&2\n"
+        )
+
+    def feed_stdout(self, chunk: str) -> str:
+        """
+        Add a stdout chunk of the shell.
+
+        :return: Output of the command in it
+        """
+        output, line = self._stdout.feed(chunk)
+        if output:
+            self.stdout.append(output)
+        if line is not None:
+            try:
+                self.exit_code = int(line)
+            except ValueError:
+                raise SandboxException(f"Unexpected session exit status '{line}'")
+        return output
+
+    def feed_stderr(self, chunk: str) -> str:
+        """
+        Add a stderr chunk of the shell.
+
+        :return: Output of the command in it
+        """
+        output, line = self._stderr.feed(chunk)
+        if output:
+            self.stderr.append(output)
+        if line is not None:
+            self._stderr_done = True
+        return output
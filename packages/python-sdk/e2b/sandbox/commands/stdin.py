@@ -0,0 +1,89 @@
+import io
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Union
+
+from protobuf import Oneof
+
+from e2b.envd.process import process_pb
+from e2b.io_utils import IO_CHUNK_SIZE, Readable, aiter_io_chunks, iter_io_chunks
+
+"""
+Largest stdin payload of a single `StreamInput` message. Bigger chunks are
+split, keeping each message well under the RPC message size limit.
+"""
+STDIN_STREAM_MESSAGE_SIZE = 1024 * 1024
+
+StdinData = Union[Iterable[Union[str, bytes]], Readable]
+"""
+Data streamed to a command's stdin: `str` or `bytes` chunks, or a file-like object read in chunks.
+"""
+
+AsyncStdinData = Union[
+    Iterable[Union[str, bytes]], AsyncIterable[Union[str, bytes]], Readable
+]
+"""
+Like `StdinData`, also accepting an async iterable of chunks.
+"""
+
+
+def _start_request(pid: int) -> process_pb.StreamInputRequest:
+    return process_pb.StreamInputRequest(
+        event=Oneof(
+            "start",
+            process_pb.StreamInputRequest.StartEvent(
+                process=process_pb.ProcessSelector(selector=Oneof("pid", pid)),
+            ),
+        )
+    )
+
+
+def _data_requests(
+    chunk: Union[str, bytes],
+) -> Iterator[process_pb.StreamInputRequest]:
+    data = chunk.encode() if isinstance(chunk, str) else chunk
+    for start in range(0, len(data), STDIN_STREAM_MESSAGE_SIZE):
+        yield process_pb.StreamInputRequest(
+            event=Oneof(
+                "data",
+                process_pb.StreamInputRequest.DataEvent(
+                    input=process_pb.ProcessInput(
+                        input=Oneof(
+                            "stdin", data[start : start + STDIN_STREAM_MESSAGE_SIZE]
+                        ),
+                    ),
+                ),
+            )
+        )
+
+
+def stdin_stream_requests(
+    pid: int, data: StdinData
+) -> Iterator[process_pb.StreamInputRequest]:
+    """
+    Messages of a `StreamInput` request sending `data` to the stdin of the
+    process `pid`. Chunks are pulled from `data` only as the request is sent.
+    """
+    yield _start_request(pid)
+    # File objects are iterable too, but by line
+    if isinstance(data, (io.RawIOBase, io.BufferedIOBase, io.TextIOBase)):
+        data = iter_io_chunks(data, IO_CHUNK_SIZE)
+    for chunk in data:
+        yield from _data_requests(chunk)
+
+
+async def astdin_stream_requests(
+    pid: int, data: AsyncStdinData
+) -> AsyncIterator[process_pb.StreamInputRequest]:
+    """
+    Like `stdin_stream_requests`, for the async client.
+    """
+    yield _start_request(pid)
+    if isinstance(data, (io.RawIOBase, io.BufferedIOBase, io.TextIOBase)):
+        data = aiter_io_chunks(data, IO_CHUNK_SIZE)
+    if isinstance(data, AsyncIterable):
+        async for chunk in data:
+            for request in _data_requests(chunk):
+                yield request
+    else:
+        for chunk in data:
+            for request in _data_requests(chunk):
+                yield request
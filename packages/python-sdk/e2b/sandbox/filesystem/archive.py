@@ -0,0 +1,203 @@
+import io
+import os
+import posixpath
+import shlex
+import tarfile
+import uuid
+from typing import Generator, Iterator, List, Sequence
+
+from e2b.exceptions import InvalidArgumentException, SandboxException
+from e2b.io_utils import IO_CHUNK_SIZE, Readable
+
+"""
+Directory in the sandbox the archives of `write_archive` and `read_archive`
+are staged in.
+"""
+ARCHIVE_STAGING_DIR = "/tmp"
+
+
+class IterStream(io.RawIOBase):
+    """
+    Read-only file object over an iterator of byte chunks, letting `tarfile`
+    extract a download as it streams in.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]):
+        super().__init__()
+        self._chunks = chunks
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
+
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self) -> None:
+        # Stops a generator early, closing the file it may have open.
+        chunks = getattr(self, "_chunks", None)
+        if not self.closed and hasattr(chunks, "close"):
+            chunks.close()
+        super().close()
+
+
+class TarArchiveStream(IterStream):
+    """
+    Uncompressed tar archive of local files and directories, produced while
+    it is read, so archiving overlaps with the upload and nothing is spooled
+    to disk.
+
+    Each path is stored under its base name, directories recursively.
+    Symlinks are stored as links, not followed.
+    """
+
+    def __init__(self, local_paths: Sequence[str], chunk_size: int = IO_CHUNK_SIZE):
+        if not local_paths:
+            raise InvalidArgumentException("local_paths must not be empty")
+
+        # Used only to build the member headers: it tracks hard links and
+        # carries the format and encoding settings, nothing is written to it
+        self._tar = tarfile.open(fileobj=io.BytesIO(), mode="w")
+        self._paths = [os.path.abspath(p) for p in local_paths]
+        for path in self._paths:
+            if not os.path.lexists(path):
+                raise FileNotFoundError(f"'{path}' does not exist")
+        self._chunk_size = chunk_size
+        super().__init__(self._iter_chunks())
+
+    def _iter_files(self) -> Generator[tuple, None, None]:
+        for path in self._paths:
+            base = os.path.dirname(path)
+            yield path, os.path.relpath(path, base)
+            if os.path.isdir(path) and not os.path.islink(path):
+                for root, dir_names, file_names in os.walk(path):
+                    dir_names.sort()
+                    for name in [*dir_names, *sorted(file_names)]:
+                        file = os.path.join(root, name)
+                        yield file, os.path.relpath(file, base)
+
+    def _iter_chunks(self) -> Generator[bytes, None, None]:
+        offset = 0
+        for file, arcname in self._iter_files():
+            tarinfo = self._tar.gettarinfo(file, arcname=arcname.replace(os.sep, "/"))
+            if tarinfo is None:
+                # Unsupported file type (e.g. a socket), skipped like `tar.add`
+                continue
+
+            header = tarinfo.tobuf(
+                self._tar.format, self._tar.encoding, self._tar.errors
+            )
+            offset += len(header)
+            yield header
+
+            if not tarinfo.isreg():
+                continue
+
+            with open(file, "rb") as f:
+                remaining = tarinfo.size
+                while remaining > 0:
+                    chunk = f.read(min(self._chunk_size, remaining))
+                    if not chunk:
+                        raise SandboxException(
+                            f"File '{file}' changed while it was being archived"
+                        )
+                    remaining -= len(chunk)
+                    yield chunk
+
+            padding = -tarinfo.size % tarfile.BLOCKSIZE
+            offset += tarinfo.size + padding
+            if padding:
+                yield tarfile.NUL * padding
+
+        # End-of-archive marker, padded to a whole record like `TarFile.close`
+        end = offset + 2 * tarfile.BLOCKSIZE
+        yield tarfile.NUL * (2 * tarfile.BLOCKSIZE + -end % tarfile.RECORDSIZE)
+
+
+def staged_archive_path() -> str:
+    """
+    Unique path to stage an archive at in the sandbox.
+    """
+    return posixpath.join(ARCHIVE_STAGING_DIR, f".e2b-archive-{uuid.uuid4().hex}.tar")
+
+
+def extract_archive_command(archive: str, remote_dir: str) -> str:
+    """
+    Shell command extracting a staged archive into a directory, removing the
+    archive whether or not extraction succeeds.
+    """
+    archive, remote_dir = shlex.quote(archive), shlex.quote(remote_dir)
+    return (
+        f"mkdir -p {remote_dir} && tar -xf {archive} --no-same-owner -C {remote_dir}; "
+        f"status=$?; rm -f {archive}; exit $status"
+    )
+
+
+def create_archive_command(archive: str, remote_dir: str) -> str:
+    """
+    Shell command archiving the contents of a directory to a staged archive.
+    """
+    archive, remote_dir = shlex.quote(archive), shlex.quote(remote_dir)
+    return f"tar -cf {archive} -C {remote_dir} ."
+
+
+def extract_archive(archive: Readable, local_dir: str) -> List[str]:
+    """
+    Extract a tar archive into a local directory.
+
+    Members that would be written outside of `local_dir` (absolute paths,
+    `..` components, or links pointing outside of it) are rejected, and
+    device files are skipped.
+
+    :return: Local paths of the extracted files and directories
+    """
+    local_dir = os.path.abspath(local_dir)
+    os.makedirs(local_dir, exist_ok=True)
+    # Compare resolved paths, `local_dir` itself may be behind a symlink.
+    root = os.path.realpath(local_dir)
+    extracted: List[str] = []
+
+    with tarfile.open(fileobj=archive, mode="r|") as tar:
+        for member in tar:
+            name = member.name
+            if name in (".", "./"):
+                continue
+            if member.ischr() or member.isblk() or member.isfifo():
+                continue
+
+            target = os.path.realpath(os.path.join(root, name))
+            if not _is_within(target, root):
+                raise SandboxException(
+                    f"Archive member '{name}' would be extracted outside of '{local_dir}'"
+                )
+            if member.issym() or member.islnk():
+                link_base = os.path.dirname(target) if member.issym() else root
+                link_target = os.path.realpath(os.path.join(link_base, member.linkname))
+                if not _is_within(link_target, root):
+                    raise SandboxException(
+                        f"Archive member '{name}' links outside of '{local_dir}'"
+                    )
+
+            # Special mode bits aren't carried over. Where available, the
+            # `data` filter repeats the checks above and also drops ownership.
+            member.mode &= 0o777
+            if hasattr(tarfile, "data_filter"):
+                tar.extract(member, local_dir, filter="data")
+            else:
+                tar.extract(member, local_dir, set_attrs=not member.issym())
+            extracted.append(os.path.normpath(os.path.join(local_dir, name)))
+
+    return extracted
+
+
+def _is_within(path: str, directory: str) -> bool:
+    return path == directory or path.startswith(directory.rstrip(os.sep) + os.sep)
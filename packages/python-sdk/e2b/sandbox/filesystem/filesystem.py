@@ -1,19 +1,44 @@
 import asyncio
 import gzip
+import io
+import os
+import posixpath
 import re
+import threading
+import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from io import IOBase, TextIOBase
-from typing import IO, AsyncIterator, Dict, Iterator, List, Optional, Union, TypedDict
+from typing import (
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+)
 
 import httpx
 
 from protobuf.wkt import Timestamp
 
 from e2b.envd.filesystem import filesystem_pb
-from e2b.exceptions import InvalidArgumentException
-from e2b.io_utils import agzip_iter, aiter_io_chunks, gzip_iter, iter_io_chunks
+from e2b.exceptions import InvalidArgumentException, SandboxException
+from e2b.io_utils import (
+    AdaptiveChunkSize,
+    Readable,
+    TransferProgress,
+    agzip_iter,
+    aiter_io_chunks,
+    aiter_progress,
+    gzip_iter,
+    iter_io_chunks,
+    iter_progress,
+    upload_size,
+)
 
 
 class FileType(Enum):
@@ -152,7 +177,7 @@ class WriteEntry(TypedDict):
     """
 
     path: str
-    data: Union[str, bytes, IO]
+    data: Union[str, bytes, Readable]
 
 
 class FileStreamReader(Iterator[bytes]):
@@ -171,9 +196,12 @@ class FileStreamReader(Iterator[bytes]):
                 ...
     """
 
-    def __init__(self, response: httpx.Response):
+    def __init__(
+        self, response: httpx.Response, progress: Optional[TransferProgress] = None
+    ):
         self._response = response
         self._iterator = response.iter_bytes()
+        self._progress = progress
         self._closed = False
 
     def __iter__(self) -> Iterator[bytes]:
@@ -181,7 +209,10 @@ class FileStreamReader(Iterator[bytes]):
 
     def __next__(self) -> bytes:
         try:
-            return next(self._iterator)
+            chunk = next(self._iterator)
+            if self._progress is not None:
+                self._progress.update(len(chunk))
+            return chunk
         except BaseException:
             # Covers normal end (StopIteration) and read errors alike.
             self.close()
@@ -192,6 +223,8 @@ class FileStreamReader(Iterator[bytes]):
         if self._closed:
             return
         self._closed = True
+        if self._progress is not None:
+            self._progress.finish()
         self._response.close()
 
     def __enter__(self) -> "FileStreamReader":
@@ -220,13 +253,19 @@ class AsyncFileStreamReader(AsyncIterator[bytes]):
                 ...
     """
 
-    def __init__(self, response: httpx.Response, idle_timeout: Optional[float] = None):
+    def __init__(
+        self,
+        response: httpx.Response,
+        idle_timeout: Optional[float] = None,
+        progress: Optional[TransferProgress] = None,
+    ):
         self._response = response
         self._iterator = response.aiter_bytes()
         # An explicit per-call idle bound, applied around each read with
         # `wait_for` (the transport-wide idle read timeout covers the
         # default case; see the flavor `read` implementations).
         self._idle_timeout = idle_timeout
+        self._progress = progress
         self._closed = False
 
     def __aiter__(self) -> AsyncIterator[bytes]:
@@ -236,8 +275,12 @@ class AsyncFileStreamReader(AsyncIterator[bytes]):
         try:
             read = self._iterator.__anext__()
             if self._idle_timeout:
-                return await asyncio.wait_for(read, self._idle_timeout)
-            return await read
+                chunk = await asyncio.wait_for(read, self._idle_timeout)
+            else:
+                chunk = await read
+            if self._progress is not None:
+                self._progress.update(len(chunk))
+            return chunk
         except asyncio.TimeoutError as e:
             # `wait_for`'s expiry; keep the documented httpx exception. The
             # transport's own idle read timeout already arrives as one.
@@ -253,6 +296,8 @@ class AsyncFileStreamReader(AsyncIterator[bytes]):
         if self._closed:
             return
         self._closed = True
+        if self._progress is not None:
+            self._progress.finish()
         await self._response.aclose()
 
     async def __aenter__(self) -> "AsyncFileStreamReader":
@@ -262,7 +307,50 @@ class AsyncFileStreamReader(AsyncIterator[bytes]):
         await self.aclose()
 
 
-def _to_httpx_file(file_path: str, file_data: Union[str, bytes, IO]):
+class ReadIntoBuffer:
+    """
+    Caller-provided writable buffer a download is copied into as it streams
+    in, so the file content is never held in memory twice.
+
+    Accepts anything exposing a writable, C-contiguous buffer, e.g. a
+    `bytearray`, an `mmap` or a NumPy array, filled byte by byte from the
+    start regardless of its item type.
+    """
+
+    def __init__(self, buffer, path: str):
+        try:
+            view = memoryview(buffer)
+        except TypeError:
+            raise InvalidArgumentException(
+                "buffer must support the buffer protocol"
+            ) from None
+        if view.readonly:
+            raise InvalidArgumentException("buffer must be writable")
+        if not view.c_contiguous:
+            raise InvalidArgumentException("buffer must be C-contiguous")
+
+        self._view = view.cast("B")
+        self._path = path
+        self.size = 0
+        """Number of bytes written to the buffer so far."""
+
+    def write(self, chunk: bytes) -> None:
+        end = self.size + len(chunk)
+        if end > len(self._view):
+            raise InvalidArgumentException(
+                f"File '{self._path}' doesn't fit into the buffer of {len(self._view)} bytes"
+            )
+        self._view[self.size : end] = chunk
+        self.size = end
+
+    def release(self) -> None:
+        """
+        Release the view of the buffer, so e.g. a `bytearray` can be resized again.
+        """
+        self._view.release()
+
+
+def _to_httpx_file(file_path: str, file_data: Union[str, bytes, Readable]):
     """Build an httpx multipart `("file", (name, data))` tuple for the upload."""
     if isinstance(file_data, (str, bytes)):
         return ("file", (file_path, file_data))
@@ -295,44 +383,46 @@ def multipart_body_is_streamed(files: List[WriteEntry]) -> bool:
 
 
 def to_upload_body(
-    data: Union[str, bytes, IO],
+    data: Union[str, bytes, Readable],
     use_gzip: bool = False,
-) -> Union[bytes, IO, Iterator[bytes]]:
+    progress: Optional[TransferProgress] = None,
+) -> Union[bytes, Iterator[bytes]]:
     """Prepare file data for upload, optionally gzip-compressed.
 
-    File-like objects are streamed in chunks instead of being buffered in
-    memory.
+    File-like objects are streamed in chunks sized to the measured pace of the
+    upload instead of being buffered in memory; text-mode chunks are encoded
+    while streaming. Their chunks are recorded in `progress` as they're sent.
     """
     if isinstance(data, (str, bytes)):
         raw = data.encode("utf-8") if isinstance(data, str) else data
         return gzip.compress(raw) if use_gzip else raw
     elif isinstance(data, (TextIOBase, IOBase)):
-        if use_gzip:
-            return gzip_iter(iter_io_chunks(data))
-        if isinstance(data, TextIOBase):
-            # Text-mode IO yields str chunks—encode them while streaming.
-            return iter_io_chunks(data)
-        # httpx streams binary file-like objects in chunks without buffering.
-        return data
+        chunks = iter_io_chunks(data, AdaptiveChunkSize())
+        if progress is not None:
+            chunks = iter_progress(chunks, progress)
+        return gzip_iter(chunks, AdaptiveChunkSize()) if use_gzip else chunks
     else:
         raise InvalidArgumentException(f"Unsupported data type: {type(data)}")
 
 
 def to_upload_body_async(
-    data: Union[str, bytes, IO],
+    data: Union[str, bytes, Readable],
     use_gzip: bool = False,
+    progress: Optional[TransferProgress] = None,
 ) -> Union[bytes, AsyncIterator[bytes]]:
     """Prepare file data for upload with async httpx, optionally gzip-compressed.
 
-    File-like objects are streamed in chunks instead of being buffered in
-    memory. Async httpx requires an async iterable for streamed request bodies.
+    Like `to_upload_body`. Async httpx requires an async iterable for streamed
+    request bodies.
     """
     if isinstance(data, (str, bytes)):
         raw = data.encode("utf-8") if isinstance(data, str) else data
         return gzip.compress(raw) if use_gzip else raw
     elif isinstance(data, (TextIOBase, IOBase)):
-        chunks = aiter_io_chunks(data)
-        return agzip_iter(chunks) if use_gzip else chunks
+        chunks = aiter_io_chunks(data, AdaptiveChunkSize())
+        if progress is not None:
+            chunks = aiter_progress(chunks, progress)
+        return agzip_iter(chunks, AdaptiveChunkSize()) if use_gzip else chunks
     else:
         raise InvalidArgumentException(f"Unsupported data type: {type(data)}")
 
@@ -376,3 +466,289 @@ def map_metadata(metadata) -> Optional[Dict[str, str]]:
     if not metadata:
         return None
     return dict(metadata)
+
+
+"""
+Default number of files `write_files` uploads at the same time.
+"""
+WRITE_FILES_MAX_CONCURRENCY = 16
+
+"""
+Maximum number of files uploaded to a sandbox at the same time, across all
+`write_files` calls on it.
+"""
+SANDBOX_MAX_CONCURRENT_UPLOADS = 64
+
+"""
+Default number of byte ranges `download` fetches at the same time.
+"""
+DOWNLOAD_PARALLELISM = 4
+
+"""
+Smallest byte range `download` splits a file into. Files smaller than two
+ranges are downloaded as a single stream.
+"""
+DOWNLOAD_MIN_RANGE_SIZE = 4 * 1024 * 1024
+
+"""
+How many times a range that failed mid-transfer is resumed before the download
+fails.
+"""
+DOWNLOAD_RANGE_RETRIES = 3
+
+_CONTENT_RANGE_REGEX = re.compile(r"\Abytes (\d+)-(\d+)/(\d+|\*)\Z")
+
+
+@dataclass
+class DownloadRange:
+    """
+    Byte range of a ranged download. `start` advances as bytes are written, so
+    a failed range resumes from the first byte not yet received.
+    """
+
+    start: int
+    end: int
+    """Exclusive end offset."""
+
+    @property
+    def done(self) -> bool:
+        return self.start >= self.end
+
+    def header(self) -> str:
+        return f"bytes={self.start}-{self.end - 1}"
+
+
+def plan_download_ranges(size: int, parallelism: int) -> List[DownloadRange]:
+    """
+    Split a file into at most `parallelism` contiguous byte ranges of at least
+    `DOWNLOAD_MIN_RANGE_SIZE` bytes.
+    """
+    range_size = max(DOWNLOAD_MIN_RANGE_SIZE, -(-size // max(parallelism, 1)))
+    return [
+        DownloadRange(start, min(start + range_size, size))
+        for start in range(0, size, range_size)
+    ]
+
+
+def parse_content_range(
+    value: Optional[str],
+) -> Optional[Tuple[int, int, Optional[int]]]:
+    """
+    Parse a `Content-Range: bytes <start>-<last>/<size>` header.
+
+    :return: Start offset, exclusive end offset and total size (None when unknown), or None if the header is missing or malformed
+    """
+    match = _CONTENT_RANGE_REGEX.match((value or "").strip())
+    if not match:
+        return None
+    total = match.group(3)
+    return (
+        int(match.group(1)),
+        int(match.group(2)) + 1,
+        None if total == "*" else int(total),
+    )
+
+
+def check_range_response(r: httpx.Response, rng: DownloadRange, size: int) -> None:
+    """
+    Check that a `206 Partial Content` response carries the requested range of
+    a file that still has the size the download was planned for.
+    """
+    content_range = parse_content_range(r.headers.get("content-range"))
+    if content_range is None:
+        raise SandboxException(
+            f"Received an invalid Content-Range header: {r.headers.get('content-range')!r}"
+        )
+
+    start, _, total = content_range
+    if start != rng.start:
+        raise SandboxException(
+            f"Requested bytes from offset {rng.start}, received them from offset {start}"
+        )
+    if total is not None and total != size:
+        raise SandboxException(
+            f"File size changed during download (was {size} bytes, now {total} bytes)"
+        )
+
+
+class DownloadFile:
+    """
+    Local destination of a download, preallocated to the expected size so byte
+    ranges can be written at their offsets in any order.
+
+    The file is removed when the download fails, so a partially written file
+    is never left behind looking complete.
+    """
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self._fd = os.open(
+            path,
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0),
+            0o666,
+        )
+        # `os.pwrite` is POSIX only; elsewhere seek and write under a lock.
+        self._lock = None if hasattr(os, "pwrite") else threading.Lock()
+        try:
+            os.ftruncate(self._fd, size)
+        except BaseException:
+            self.close(success=False)
+            raise
+
+    def write_at(self, data: bytes, offset: int) -> None:
+        """
+        Write all of `data` at `offset`.
+        """
+        view = memoryview(data)
+        while view:
+            if self._lock is None:
+                written = os.pwrite(self._fd, view, offset)
+            else:
+                with self._lock:
+                    os.lseek(self._fd, offset, os.SEEK_SET)
+                    written = os.write(self._fd, view)
+            view = view[written:]
+            offset += written
+
+    def truncate(self, size: int) -> None:
+        os.ftruncate(self._fd, size)
+
+    def close(self, success: bool) -> None:
+        """
+        Close the file, removing it if the download didn't succeed.
+        """
+        os.close(self._fd)
+        if not success:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+"""
+Default size of the chunks a resumable upload is split into. Each chunk is a
+separate request bounded by the request timeout, so it must be small enough to
+upload within it.
+"""
+RESUMABLE_UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
+"""
+How many times a chunk of a resumable upload is retried after a network error
+before the upload fails.
+"""
+UPLOAD_CHUNK_RETRIES = 5
+
+"""
+Delay before the first retry of a chunk, in seconds. It doubles with every
+further retry.
+"""
+UPLOAD_CHUNK_RETRY_DELAY = 1.0
+
+
+class ResumableUpload:
+    """
+    Checkpointed state of a resumable upload.
+
+    The source is read one chunk at a time and every chunk is uploaded as a
+    separate part file next to the destination. Only confirmed parts advance
+    the checkpoint, so a failed chunk is re-sent from the last confirmed
+    offset. Once all parts are uploaded they are composed into a temporary
+    file, which is then renamed to the destination.
+
+    The staging paths of a source of known size are named after the
+    destination, the size and the chunk size, so the parts a failed upload
+    left behind are found and resumed by the next upload of the same data.
+    """
+
+    def __init__(self, path: str, data: Union[str, bytes, Readable], chunk_size: int):
+        if chunk_size < 1:
+            raise InvalidArgumentException("chunk_size must be at least 1")
+
+        if isinstance(data, (str, bytes)):
+            data = io.BytesIO(data.encode("utf-8") if isinstance(data, str) else data)
+        elif not isinstance(data, (TextIOBase, IOBase)):
+            raise InvalidArgumentException(f"Unsupported data type: {type(data)}")
+
+        directory, name = posixpath.split(path)
+        self._source: Readable = data
+        self._chunk_size = chunk_size
+        self.size = upload_size(data)
+        """Number of source bytes, None when it can't be known up front."""
+        key = (
+            uuid.uuid4().hex[:12] if self.size is None else f"{self.size}-{chunk_size}"
+        )
+        self.temp_path = posixpath.join(directory, f".{name}.{key}.upload")
+        self.parts_dir = f"{self.temp_path}.parts"
+        self.parts: List[str] = []
+        self.offset = 0
+        """Number of source bytes in the confirmed parts."""
+
+    def read_chunk(self) -> Optional[bytes]:
+        """
+        Read the next chunk of the source.
+
+        :return: The chunk, or None when the source is exhausted. An empty source still yields one empty chunk.
+        """
+        buffer = bytearray()
+        while len(buffer) < self._chunk_size:
+            chunk = self._source.read(self._chunk_size - len(buffer))
+            if not chunk:
+                break
+            buffer += chunk if isinstance(chunk, bytes) else chunk.encode("utf-8")
+
+        if not buffer and self.parts:
+            return None
+        return bytes(buffer)
+
+    def next_part(self) -> str:
+        """
+        Path of the part file for the next chunk.
+        """
+        return posixpath.join(self.parts_dir, f"{len(self.parts):08d}")
+
+    def confirm(self, part: str, size: int) -> None:
+        """
+        Checkpoint a part the sandbox confirmed writing.
+        """
+        self.parts.append(part)
+        self.offset += size
+
+    @property
+    def resumable(self) -> bool:
+        """
+        Whether a later upload of the same data can resume from the parts of this one.
+        """
+        return self.size is not None
+
+    def resume(self, parts: List[EntryInfo]) -> None:
+        """
+        Checkpoint the parts an earlier, failed upload of the same data left
+        behind and skip their bytes in the source.
+
+        Parts are taken in order up to the first missing or incomplete one,
+        which is uploaded again along with the ones after it.
+
+        :param parts: Entries of `parts_dir` in the sandbox
+        """
+        if self.size is None:
+            return
+
+        sizes = {part.name: part.size for part in parts}
+        while self.offset < self.size:
+            part = self.next_part()
+            size = min(self._chunk_size, self.size - self.offset)
+            if sizes.get(posixpath.basename(part)) != size:
+                break
+            self.confirm(part, size)
+
+        if not self.offset:
+            return
+        if self._source.seekable():
+            self._source.seek(self.offset, io.SEEK_CUR)
+            return
+        remaining = self.offset
+        while remaining:
+            chunk = self._source.read(min(remaining, self._chunk_size))
+            if not chunk:
+                break
+            remaining -= len(chunk)
@@ -0,0 +1,81 @@
+import hashlib
+import shlex
+from typing import Dict, Literal, Optional, Union
+
+from e2b.exceptions import InvalidArgumentException, SandboxException
+from e2b.io_utils import Readable, iter_io_chunks
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+HashAlgorithm = Literal["md5", "sha1", "sha256", "sha512"]
+
+"""
+Commands computing each supported digest in the sandbox, from GNU coreutils.
+"""
+HASH_COMMANDS: Dict[str, str] = {
+    "md5": "md5sum",
+    "sha1": "sha1sum",
+    "sha256": "sha256sum",
+    "sha512": "sha512sum",
+}
+
+
+def validate_hash_algorithm(algo: str) -> None:
+    if algo not in HASH_COMMANDS:
+        raise InvalidArgumentException(
+            f"Unsupported hash algorithm '{algo}', use one of: {', '.join(HASH_COMMANDS)}"
+        )
+
+
+def hash_local_file(path: str, algo: HashAlgorithm = "sha256") -> str:
+    """
+    Hex digest of a local file, read in chunks.
+    """
+    digest = hashlib.new(algo)
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_upload_data(
+    data: Union[str, bytes, Readable], algo: HashAlgorithm = "sha256"
+) -> Optional[str]:
+    """
+    Hex digest of the bytes an upload of `data` would carry.
+
+    A file-like object is read from its current position and rewound to it,
+    so it can still be uploaded. Returns None for one that can't be rewound.
+    """
+    if isinstance(data, (str, bytes)):
+        raw = data.encode("utf-8") if isinstance(data, str) else data
+        return hashlib.new(algo, raw).hexdigest()
+
+    if not data.seekable():
+        return None
+    start = data.tell()
+    digest = hashlib.new(algo)
+    try:
+        for chunk in iter_io_chunks(data, _HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    finally:
+        data.seek(start)
+    return digest.hexdigest()
+
+
+def remote_hash_command(path: str, algo: HashAlgorithm) -> str:
+    """
+    Shell command printing the digest of a file in the sandbox. The file is
+    read from stdin, so the output doesn't depend on how its name is escaped.
+    """
+    return f"{HASH_COMMANDS[algo]} < {shlex.quote(path)}"
+
+
+def parse_hash_output(stdout: str, path: str) -> str:
+    """
+    Digest from the `<digest>  -` output of a `remote_hash_command`.
+    """
+    parts = stdout.split()
+    if not parts:
+        raise SandboxException(f"Failed to hash '{path}': the command printed nothing")
+    return parts[0].lower()
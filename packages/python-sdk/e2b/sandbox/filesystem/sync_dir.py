@@ -0,0 +1,254 @@
+import os
+import posixpath
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from e2b.sandbox.filesystem.filesystem import EntryInfo, FileType
+from e2b.sandbox.filesystem.hashing import hash_local_file
+
+
+@dataclass
+class SyncDirResult:
+    """
+    Outcome of a directory sync.
+    """
+
+    uploaded: List[str] = field(default_factory=list)
+    """
+    Remote paths of the files that were new or changed and got uploaded.
+    """
+    deleted: List[str] = field(default_factory=list)
+    """
+    Remote paths that were removed, either because they don't exist locally or because their type differs from the local entry.
+    """
+    created_dirs: List[str] = field(default_factory=list)
+    """
+    Remote paths of the empty directories that were created.
+    """
+    unchanged: List[str] = field(default_factory=list)
+    """
+    Remote paths of the files that were already up to date.
+    """
+
+
+@dataclass
+class LocalTree:
+    """
+    Regular files and directories under a local directory, keyed by their
+    relative POSIX path.
+    """
+
+    files: Dict[str, os.stat_result]
+    dirs: Set[str]
+    depth: int
+    """Depth of the deepest entry, 0 for an empty directory."""
+
+
+def scan_local_dir(local_dir: str) -> LocalTree:
+    """
+    Walk a local directory. Symlinks to directories aren't followed and
+    entries that aren't regular files or directories are skipped.
+    """
+    if not os.path.isdir(local_dir):
+        raise NotADirectoryError(f"'{local_dir}' is not a directory")
+
+    files: Dict[str, os.stat_result] = {}
+    dirs: Set[str] = set()
+    depth = 0
+    for root, dir_names, file_names in os.walk(local_dir):
+        rel_root = os.path.relpath(root, local_dir)
+        rel_root = "" if rel_root == os.curdir else rel_root.replace(os.sep, "/")
+        for name in dir_names:
+            rel = posixpath.join(rel_root, name)
+            if os.path.islink(os.path.join(root, name)):
+                continue
+            dirs.add(rel)
+            depth = max(depth, rel.count("/") + 1)
+        for name in file_names:
+            path = os.path.join(root, name)
+            try:
+                stats = os.stat(path)
+            except OSError:
+                # Broken symlink, or the file was removed during the walk.
+                continue
+            if not os.path.isfile(path):
+                continue
+            rel = posixpath.join(rel_root, name)
+            files[rel] = stats
+            depth = max(depth, rel.count("/") + 1)
+
+    return LocalTree(files, dirs, depth)
+
+
+@dataclass
+class SyncRecord:
+    """
+    Local file a sync uploaded to a remote path.
+    """
+
+    size: int
+    mtime_ns: int
+    """Local modification time of the file when it was uploaded."""
+    digest: Optional[str] = None
+    """Content digest, only computed by a sync with `checksum`."""
+
+
+class SyncManifest:
+    """
+    Local size and modification time, and with `checksum` the content digest,
+    of every file uploaded by a sync, keyed by remote path.
+
+    Local files are only compared with what was recorded for them here, never
+    with the modification times of the sandbox, whose clock can differ from
+    the local one.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, SyncRecord] = {}
+
+    def unchanged(self, remote_path: str, stats: os.stat_result) -> bool:
+        """
+        Whether the local file is still the one last uploaded to the path.
+        """
+        record = self._entries.get(remote_path)
+        return (
+            record is not None
+            and record.size == stats.st_size
+            and record.mtime_ns == stats.st_mtime_ns
+        )
+
+    def matches(self, remote_path: str, size: int, digest: str) -> bool:
+        """
+        Whether content with the digest was last uploaded to the path.
+        """
+        record = self._entries.get(remote_path)
+        return record is not None and (record.size, record.digest) == (size, digest)
+
+    def record(
+        self, remote_path: str, stats: os.stat_result, digest: Optional[str] = None
+    ) -> None:
+        self._entries[remote_path] = SyncRecord(
+            stats.st_size, stats.st_mtime_ns, digest
+        )
+
+    def forget(self, remote_path: str) -> None:
+        prefix = remote_path.rstrip("/") + "/"
+        for path in [
+            p for p in self._entries if p == remote_path or p.startswith(prefix)
+        ]:
+            del self._entries[path]
+
+
+@dataclass
+class DirSyncPlan:
+    """
+    Changes that bring a remote directory in line with a local one. Paths are
+    relative POSIX paths, except `delete`, which holds remote paths.
+    """
+
+    upload: List[str] = field(default_factory=list)
+    delete: List[str] = field(default_factory=list)
+    make_dirs: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    verify: List[str] = field(default_factory=list)
+    """
+    Files of the same size as the remote copy whose content has to be
+    compared with it by hashing the remote copy, only with `checksum`.
+    """
+    digests: Dict[str, str] = field(default_factory=dict)
+    """Local content digests computed while planning, by relative path."""
+
+    def settle(self, same_content: List[bool]) -> None:
+        """
+        Move the files of `verify` to `unchanged` or `upload`, by whether their
+        content matches the remote copy.
+        """
+        for rel, same in zip(self.verify, same_content):
+            (self.unchanged if same else self.upload).append(rel)
+        self.verify = []
+        self.upload.sort()
+        self.unchanged.sort()
+
+
+def plan_dir_sync(
+    local_dir: str,
+    local: LocalTree,
+    remote_root: Optional[str],
+    remote_entries: List[EntryInfo],
+    manifest: SyncManifest,
+    checksum: bool,
+    delete: bool,
+) -> DirSyncPlan:
+    """
+    Compare a local tree with a remote listing.
+
+    A file is uploaded when it's missing remotely, its size differs, or it
+    isn't the local file the manifest recorded for it. With `checksum`, such a
+    file of the same size is hashed instead: it's unchanged when its digest
+    matches the manifest, and otherwise goes to `verify`, to be compared with
+    the remote copy.
+
+    Remote entries whose type conflicts with the local entry are always
+    deleted; with `delete`, so are remote entries missing locally. Only the
+    top-most of them is deleted, removing its subtree with it.
+    """
+    plan = DirSyncPlan()
+    remote: Dict[str, EntryInfo] = {}
+    if remote_root is not None:
+        for entry in remote_entries:
+            rel = posixpath.relpath(entry.path, remote_root)
+            if not rel.startswith("../"):
+                remote[rel] = entry
+
+    def is_top_most(rel: str) -> bool:
+        parent = posixpath.dirname(rel)
+        return parent == "" or parent in local.dirs
+
+    for rel, entry in sorted(remote.items()):
+        if rel in local.files:
+            conflict = entry.type != FileType.FILE
+        elif rel in local.dirs:
+            conflict = entry.type != FileType.DIR
+        else:
+            conflict = False
+            if delete and is_top_most(rel):
+                plan.delete.append(entry.path)
+                continue
+        if conflict:
+            plan.delete.append(entry.path)
+
+    deleted = {posixpath.relpath(p, remote_root) for p in plan.delete}
+
+    for rel, stats in sorted(local.files.items()):
+        entry = None if rel in deleted else remote.get(rel)
+        if entry is None or entry.size != stats.st_size:
+            plan.upload.append(rel)
+        elif manifest.unchanged(entry.path, stats):
+            plan.unchanged.append(rel)
+        elif checksum:
+            digest = hash_local_file(os.path.join(local_dir, *rel.split("/")))
+            plan.digests[rel] = digest
+            if manifest.matches(entry.path, stats.st_size, digest):
+                plan.unchanged.append(rel)
+            else:
+                plan.verify.append(rel)
+        else:
+            plan.upload.append(rel)
+
+    # Uploading a file or creating a directory creates its parents, so only
+    # directories with nothing below them have to be created explicitly.
+    parents = set()
+    for rel in [*local.files, *local.dirs]:
+        parent = posixpath.dirname(rel)
+        while parent and parent not in parents:
+            parents.add(parent)
+            parent = posixpath.dirname(parent)
+
+    for rel in sorted(local.dirs):
+        if rel in parents:
+            continue
+        if rel in remote and rel not in deleted:
+            continue
+        plan.make_dirs.append(rel)
+
+    return plan
@@ -1,5 +1,8 @@
 from typing import TypeVar, Any, Generic, cast, Optional, Type
 import functools
+import random
+import threading
+import time
 
 T = TypeVar("T")
 
@@ -32,3 +35,56 @@ class class_method_variant(Generic[T]):
                 return class_method(*args, **kwargs)
 
         return _wrapper
+
+
+"""
+Number of times a call sharing a `RateLimitBackoff` is retried after hitting
+the rate limit before the `RateLimitException` is raised.
+"""
+RATE_LIMIT_MAX_RETRIES = 5
+
+
+class RateLimitBackoff:
+    """
+    Backoff shared by concurrent API calls that hit the rate limit.
+
+    Every rate-limited call doubles the delay, up to `max_delay`, and holds
+    back all calls sharing the backoff until it passes, so they don't keep
+    hitting the limit. Every successful call halves the delay again.
+    """
+
+    def __init__(self, initial_delay: float = 1.0, max_delay: float = 30.0):
+        self._initial_delay = initial_delay
+        self._max_delay = max_delay
+        self._delay = 0.0
+        self._not_before = 0.0
+        self._lock = threading.Lock()
+
+    def wait_time(self) -> float:
+        """
+        Get how long to wait before the next call.
+
+        :return: Time to wait in **seconds**, `0` if a call can start right away
+        """
+        return max(0.0, self._not_before - time.monotonic())
+
+    def on_rate_limit(self) -> None:
+        """
+        Record a rate-limited call.
+        """
+        with self._lock:
+            self._delay = min(
+                max(self._delay * 2, self._initial_delay), self._max_delay
+            )
+            # Jitter spreads out the calls released when the delay passes
+            delay = self._delay * random.uniform(0.5, 1.0)
+            self._not_before = max(self._not_before, time.monotonic() + delay)
+
+    def on_success(self) -> None:
+        """
+        Record a successful call.
+        """
+        with self._lock:
+            self._delay /= 2
+            if self._delay < self._initial_delay:
+                self._delay = 0.0
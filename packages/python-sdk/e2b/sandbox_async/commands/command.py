@@ -1,4 +1,18 @@
-from typing import Dict, List, Literal, Optional, Union, overload
+import asyncio
+import time
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+    overload,
+)
 
 import httpx
 from connectrpc.code import Code
@@ -23,9 +37,31 @@ from e2b.envd.utils import (
 from e2b.envd.client_async import as_stream, create_rpc_client, first_event
 from e2b.envd.versions import ENVD_COMMANDS_STDIN, ENVD_ENVD_CLOSE
 from e2b.exceptions import SandboxException
-from e2b.sandbox.commands.main import ProcessInfo
-from e2b.sandbox.commands.command_handle import CommandResult
-from e2b.sandbox_async.commands.command_handle import AsyncCommandHandle, Stderr, Stdout
+from e2b.sandbox.commands.batch import (
+    BATCH_MAX_CONCURRENCY,
+    BatchCommandResult,
+    parse_supervisor_output,
+    supervisor_script,
+    validate_batch,
+)
+from e2b.sandbox.commands.main import ProcessInfo, ShellMode, process_argv
+from e2b.sandbox.commands.command_handle import (
+    BytesOutputBuffer,
+    CommandExitException,
+    CommandResult,
+    Output,
+    OutputBuffer,
+    OutputFormat,
+    OutputRetention,
+    Stderr,
+    Stdout,
+    TextOutputBuffer,
+    validate_output_format,
+)
+from e2b.sandbox.commands.session import SessionShell, session_argv
+from e2b.sandbox.commands.stdin import AsyncStdinData, astdin_stream_requests
+from e2b.sandbox_async.commands.command_handle import AsyncCommandHandle
+from e2b.sandbox_async.commands.session import AsyncCommandSession, SessionOutput
 from e2b.sandbox_async.utils import OutputHandler
 
 
@@ -149,6 +185,29 @@ class Commands:
         except Exception as e:
             raise await ahandle_rpc_exception_with_health(e, self._check_health)
 
+    async def stream_stdin(
+        self,
+        pid: int,
+        data: AsyncStdinData,
+        request_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Stream data to command stdin over a single request.
+
+        `send_stdin` makes a request per call; here the chunks are messages of one client-streaming request, so the throughput is bound by the bandwidth instead of the round-trip time. Chunks are pulled from `data` only as fast as the connection takes them. The command must have been started with `stdin=True`; stdin stays open afterwards, close it with `close_stdin` to signal EOF.
+
+        :param pid Process ID of the command. You can get the list of processes using `sandbox.commands.list()`.
+        :param data: Data to send to the command: an iterable or async iterable of `str` or `bytes` chunks, or a file-like object, which is read in chunks
+        :param request_timeout: Deadline for the whole stream in **seconds**; by default the stream is not bounded in total
+        """
+        try:
+            await self._rpc.stream_input(
+                astdin_stream_requests(pid, data),
+                timeout_ms=timeout_to_ms(request_timeout),
+            )
+        except Exception as e:
+            raise await ahandle_rpc_exception_with_health(e, self._check_health)
+
     async def close_stdin(
         self,
         pid: int,
@@ -183,7 +242,7 @@ class Commands:
     @overload
     async def run(
         self,
-        cmd: str,
+        cmd: Union[str, List[str]],
         background: Union[Literal[False], None] = None,
         envs: Optional[Dict[str, str]] = None,
         user: Optional[Username] = None,
@@ -193,11 +252,14 @@ class Commands:
         stdin: Optional[bool] = None,
         timeout: Optional[float] = 60,
         request_timeout: Optional[float] = None,
+        output_retention: Optional[OutputRetention] = None,
+        shell: Optional[ShellMode] = None,
+        output_format: Literal["text"] = "text",
     ) -> CommandResult:
         """
         Start a new command and wait until it finishes executing.
 
-        :param cmd: Command to execute
+        :param cmd: Command to execute, a command line or a list of the program and its arguments
         :param background: **`False` if the command should be executed in the foreground**, `True` if the command should be executed in the background
         :param envs: Environment variables used for the command
         :param user: User to run the command as
@@ -207,6 +269,9 @@ class Commands:
         :param stdin: If `True`, the command will have a stdin stream that you can send data to using `sandbox.commands.send_stdin()`
         :param timeout: Timeout for the command connection in **seconds**. Using `0` will not limit the command connection time
         :param request_timeout: Timeout for opening the stream in **seconds** — the wait until envd confirms with a start event. The running stream is bounded by `timeout`
+        :param output_retention: How much of the command's stdout and stderr to keep for the result, all of it by default. See `OutputRetention`
+        :param shell: How to start the command: `login` runs it in a Bash login shell (`bash -l -c`), `non-login` in a Bash shell that skips the profile scripts (`bash -c`), and `none` executes it directly, without a shell, which starts fastest. The profile isn't sourced in the last two, so the environment it sets up (e.g. `PATH` additions) is missing. Defaults to `login` for a command line and `none` for a list. A list run in a shell is quoted into a command line; a command line executed directly is split into arguments like a shell would.
+        :param output_format: Format of the command's stdout and stderr: `text` (the default) decodes them to `str`, `bytes` passes on the raw `bytes` without decoding them, e.g. for binary output
 
         :return: `CommandResult` result of the command execution
         """
@@ -215,7 +280,46 @@ class Commands:
     @overload
     async def run(
         self,
-        cmd: str,
+        cmd: Union[str, List[str]],
+        background: Union[Literal[False], None] = None,
+        envs: Optional[Dict[str, str]] = None,
+        user: Optional[Username] = None,
+        cwd: Optional[str] = None,
+        on_stdout: Optional[OutputHandler[bytes]] = None,
+        on_stderr: Optional[OutputHandler[bytes]] = None,
+        stdin: Optional[bool] = None,
+        timeout: Optional[float] = 60,
+        request_timeout: Optional[float] = None,
+        output_retention: Optional[OutputRetention] = None,
+        shell: Optional[ShellMode] = None,
+        *,
+        output_format: Literal["bytes"],
+    ) -> CommandResult[bytes]:
+        """
+        Start a new command and wait until it finishes executing.
+
+        :param cmd: Command to execute, a command line or a list of the program and its arguments
+        :param background: **`False` if the command should be executed in the foreground**, `True` if the command should be executed in the background
+        :param envs: Environment variables used for the command
+        :param user: User to run the command as
+        :param cwd: Working directory to run the command
+        :param on_stdout: Callback for command stdout output
+        :param on_stderr: Callback for command stderr output
+        :param stdin: If `True`, the command will have a stdin stream that you can send data to using `sandbox.commands.send_stdin()`
+        :param timeout: Timeout for the command connection in **seconds**. Using `0` will not limit the command connection time
+        :param request_timeout: Timeout for opening the stream in **seconds** — the wait until envd confirms with a start event. The running stream is bounded by `timeout`
+        :param output_retention: How much of the command's stdout and stderr to keep for the result, all of it by default. See `OutputRetention`
+        :param shell: How to start the command: `login` runs it in a Bash login shell (`bash -l -c`), `non-login` in a Bash shell that skips the profile scripts (`bash -c`), and `none` executes it directly, without a shell, which starts fastest. The profile isn't sourced in the last two, so the environment it sets up (e.g. `PATH` additions) is missing. Defaults to `login` for a command line and `none` for a list. A list run in a shell is quoted into a command line; a command line executed directly is split into arguments like a shell would.
+        :param output_format: Format of the command's stdout and stderr: `text` (the default) decodes them to `str`, `bytes` passes on the raw `bytes` without decoding them, e.g. for binary output
+
+        :return: `CommandResult` result of the command execution, with `bytes` output
+        """
+        ...
+
+    @overload
+    async def run(
+        self,
+        cmd: Union[str, List[str]],
         background: Literal[True],
         envs: Optional[Dict[str, str]] = None,
         user: Optional[Username] = None,
@@ -225,11 +329,53 @@ class Commands:
         stdin: Optional[bool] = None,
         timeout: Optional[float] = 60,
         request_timeout: Optional[float] = None,
+        output_retention: Optional[OutputRetention] = None,
+        shell: Optional[ShellMode] = None,
+        output_format: Literal["text"] = "text",
     ) -> AsyncCommandHandle:
         """
         Start a new command and return a handle to interact with it.
 
-        :param cmd: Command to execute
+        :param cmd: Command to execute, a command line or a list of the program and its arguments
+        :param background: `False` if the command should be executed in the foreground, **`True` if the command should be executed in the background**
+        :param envs: Environment variables used for the command
+        :param user: User to run the command as
+        :param cwd: Working directory to run the command
+        :param on_stdout: Callback for command stdout output
+        :param on_stderr: Callback for command stderr output
+        :param stdin: If `True`, the command will have a stdin stream that you can send data to using `sandbox.commands.send_stdin()`
+        :param timeout: Timeout for the command connection in **seconds**. Using `0` will not limit the command connection time
+        :param request_timeout: Timeout for opening the stream in **seconds** — the wait until envd confirms with a start event. The running stream is bounded by `timeout`
+        :param output_retention: How much of the command's stdout and stderr to keep for the result, all of it by default. See `OutputRetention`
+        :param shell: How to start the command: `login` runs it in a Bash login shell (`bash -l -c`), `non-login` in a Bash shell that skips the profile scripts (`bash -c`), and `none` executes it directly, without a shell, which starts fastest. The profile isn't sourced in the last two, so the environment it sets up (e.g. `PATH` additions) is missing. Defaults to `login` for a command line and `none` for a list. A list run in a shell is quoted into a command line; a command line executed directly is split into arguments like a shell would.
+        :param output_format: Format of the command's stdout and stderr: `text` (the default) decodes them to `str`, `bytes` passes on the raw `bytes` without decoding them, e.g. for binary output
+
+        :return: `AsyncCommandHandle` handle to interact with the running command
+        """
+        ...
+
+    @overload
+    async def run(
+        self,
+        cmd: Union[str, List[str]],
+        background: Literal[True],
+        envs: Optional[Dict[str, str]] = None,
+        user: Optional[Username] = None,
+        cwd: Optional[str] = None,
+        on_stdout: Optional[OutputHandler[bytes]] = None,
+        on_stderr: Optional[OutputHandler[bytes]] = None,
+        stdin: Optional[bool] = None,
+        timeout: Optional[float] = 60,
+        request_timeout: Optional[float] = None,
+        output_retention: Optional[OutputRetention] = None,
+        shell: Optional[ShellMode] = None,
+        *,
+        output_format: Literal["bytes"],
+    ) -> AsyncCommandHandle[bytes]:
+        """
+        Start a new command and return a handle to interact with it.
+
+        :param cmd: Command to execute, a command line or a list of the program and its arguments
         :param background: `False` if the command should be executed in the foreground, **`True` if the command should be executed in the background**
         :param envs: Environment variables used for the command
         :param user: User to run the command as
@@ -239,6 +385,9 @@ class Commands:
         :param stdin: If `True`, the command will have a stdin stream that you can send data to using `sandbox.commands.send_stdin()`
         :param timeout: Timeout for the command connection in **seconds**. Using `0` will not limit the command connection time
         :param request_timeout: Timeout for opening the stream in **seconds** — the wait until envd confirms with a start event. The running stream is bounded by `timeout`
+        :param output_retention: How much of the command's stdout and stderr to keep for the result, all of it by default. See `OutputRetention`
+        :param shell: How to start the command: `login` runs it in a Bash login shell (`bash -l -c`), `non-login` in a Bash shell that skips the profile scripts (`bash -c`), and `none` executes it directly, without a shell, which starts fastest. The profile isn't sourced in the last two, so the environment it sets up (e.g. `PATH` additions) is missing. Defaults to `login` for a command line and `none` for a list. A list run in a shell is quoted into a command line; a command line executed directly is split into arguments like a shell would.
+        :param output_format: Format of the command's stdout and stderr: `text` (the default) decodes them to `str`, `bytes` passes on the raw `bytes` without decoding them, e.g. for binary output
 
         :return: `AsyncCommandHandle` handle to interact with the running command
         """
@@ -246,16 +395,19 @@ class Commands:
 
     async def run(
         self,
-        cmd: str,
+        cmd: Union[str, List[str]],
         background: Union[bool, None] = None,
         envs: Optional[Dict[str, str]] = None,
         user: Optional[Username] = None,
         cwd: Optional[str] = None,
-        on_stdout: Optional[OutputHandler[Stdout]] = None,
-        on_stderr: Optional[OutputHandler[Stderr]] = None,
+        on_stdout: Optional[OutputHandler[Any]] = None,
+        on_stderr: Optional[OutputHandler[Any]] = None,
         stdin: Optional[bool] = None,
         timeout: Optional[float] = 60,
         request_timeout: Optional[float] = None,
+        output_retention: Optional[OutputRetention] = None,
+        shell: Optional[ShellMode] = None,
+        output_format: OutputFormat = "text",
     ):
         # Check version for stdin support
         if stdin is False and self._envd_version < ENVD_COMMANDS_STDIN:
@@ -277,29 +429,187 @@ class Commands:
             request_timeout,
             on_stdout=on_stdout,
             on_stderr=on_stderr,
+            output_retention=output_retention,
+            shell=shell,
+            output_format=output_format,
         )
 
         return proc if background else await proc.wait()
 
+    async def run_many(
+        self,
+        cmds: Sequence[Union[str, List[str]]],
+        envs: Optional[Dict[str, str]] = None,
+        user: Optional[Username] = None,
+        cwd: Optional[str] = None,
+        timeout: Optional[float] = 60,
+        request_timeout: Optional[float] = None,
+        shell: Optional[ShellMode] = None,
+        max_concurrency: int = BATCH_MAX_CONCURRENCY,
+        supervisor: bool = False,
+    ) -> List[BatchCommandResult]:
+        """
+        Run a batch of independent commands and wait until all of them finish.
+
+        By default each command is started like with `run`, at most `max_concurrency` at a time, over the shared connection to the sandbox.
+        With `supervisor=True` the whole batch is sent as a single shell process that runs the commands itself, which saves the start of a process and a stream per command; the output of the commands then arrives only once all of them have finished.
+
+        Unlike `run`, a command exiting with a non-zero exit code doesn't raise, its result holds the exit code.
+        If a command can't be run, e.g. it times out, the error is raised, the commands not started yet are skipped and the running ones are killed.
+
+        :param cmds: Commands to execute, each a command line or a list of the program and its arguments
+        :param envs: Environment variables used for the commands
+        :param user: User to run the commands as
+        :param cwd: Working directory to run the commands in
+        :param timeout: Timeout for each command's connection, or with `supervisor=True` for the whole batch, in **seconds**. Using `0` will not limit the connection time
+        :param request_timeout: Timeout for the request in **seconds**
+        :param shell: How to start the commands, see `run`. With `supervisor=True` it's the shell the batch runs in, `login` or `non-login`
+        :param max_concurrency: Maximum number of commands running at the same time
+        :param supervisor: Whether to run the batch in a single process in the sandbox
+
+        :return: `BatchCommandResult` of each command, in the order of `cmds`, with the time it took. Without a supervisor that's the time from starting the command to receiving its result, with one it's measured in the sandbox
+        """
+        validate_batch(cmds, max_concurrency, shell, supervisor)
+        if not cmds:
+            return []
+
+        if supervisor:
+            try:
+                result = await self.run(
+                    supervisor_script(cmds, max_concurrency),
+                    envs=envs,
+                    user=user,
+                    cwd=cwd,
+                    timeout=timeout,
+                    request_timeout=request_timeout,
+                    shell=shell or "login",
+                )
+            except CommandExitException as e:
+                raise SandboxException(f"The batch supervisor failed: {e.stderr}")
+            return parse_supervisor_output(result.stdout, len(cmds))
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        # Commands started and not finished yet
+        running: Set[AsyncCommandHandle] = set()
+
+        async def run_one(cmd: Union[str, List[str]]) -> BatchCommandResult:
+            async with semaphore:
+                started = time.perf_counter()
+                handle = await self.run(
+                    cmd,
+                    background=True,
+                    envs=envs,
+                    user=user,
+                    cwd=cwd,
+                    timeout=timeout,
+                    request_timeout=request_timeout,
+                    shell=shell,
+                )
+                running.add(handle)
+                try:
+                    result: CommandResult = await handle.wait()
+                except CommandExitException as e:
+                    result = e
+                running.discard(handle)
+                return BatchCommandResult(
+                    stdout=result.stdout,
+                    stderr=result.stderr,
+                    exit_code=result.exit_code,
+                    error=result.error,
+                    duration=time.perf_counter() - started,
+                )
+
+        async def stop(handle: AsyncCommandHandle) -> None:
+            try:
+                await handle.kill()
+            finally:
+                await handle.disconnect()
+
+        tasks = [asyncio.create_task(run_one(cmd)) for cmd in cmds]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # The commands of the cancelled tasks still run in the sandbox
+            await asyncio.gather(
+                *[stop(handle) for handle in running], return_exceptions=True
+            )
+            raise
+
+    async def session(
+        self,
+        envs: Optional[Dict[str, str]] = None,
+        user: Optional[Username] = None,
+        cwd: Optional[str] = None,
+        shell: SessionShell = "login",
+        timeout: Optional[float] = 0,
+        request_timeout: Optional[float] = None,
+    ) -> AsyncCommandSession:
+        """
+        Start a long-lived shell to run commands in with `AsyncCommandSession.run()`.
+
+        Running a command in a session costs a single request, instead of starting a process and a stream for every `run`, which pays off for many short commands.
+        Close the session with `AsyncCommandSession.close()` or use it as an async context manager.
+
+        :param envs: Environment variables of the shell
+        :param user: User to run the shell as
+        :param cwd: Working directory the shell starts in
+        :param shell: `login` starts a Bash login shell, which sources the profile scripts once, `non-login` a Bash shell that skips them
+        :param timeout: Timeout for the session's connection in **seconds**. Using `0` will not limit the connection time
+        :param request_timeout: Timeout for the request in **seconds**
+
+        :return: `AsyncCommandSession` to run commands in
+        """
+        output: SessionOutput = asyncio.Queue()
+        handle = await self.run(
+            session_argv(shell),
+            background=True,
+            envs=envs,
+            user=user,
+            cwd=cwd,
+            on_stdout=lambda data: output.put_nowait((data, None)),
+            on_stderr=lambda data: output.put_nowait((None, data)),
+            stdin=True,
+            timeout=timeout,
+            request_timeout=request_timeout,
+            output_retention=OutputRetention(mode="discard"),
+            shell="none",
+        )
+        session = AsyncCommandSession(handle, output)
+        # Leaves the output of the profile scripts out of the first command's
+        try:
+            await session.run(":", request_timeout=request_timeout)
+        except BaseException:
+            await session.close()
+            raise
+        return session
+
     async def _start(
         self,
-        cmd: str,
+        cmd: Union[str, List[str]],
         envs: Optional[Dict[str, str]],
         user: Optional[Username],
         cwd: Optional[str],
         stdin: bool,
         timeout: Optional[float],
         request_timeout: Optional[float],
-        on_stdout: Optional[OutputHandler[Stdout]],
-        on_stderr: Optional[OutputHandler[Stderr]],
-    ) -> AsyncCommandHandle:
+        on_stdout: Optional[OutputHandler[Any]],
+        on_stderr: Optional[OutputHandler[Any]],
+        output_retention: Optional[OutputRetention] = None,
+        shell: Optional[ShellMode] = None,
+        output_format: OutputFormat = "text",
+    ) -> Union[AsyncCommandHandle[str], AsyncCommandHandle[bytes]]:
+        validate_output_format(output_format)
+        program, args = process_argv(cmd, shell)
         events = as_stream(
             self._rpc.start(
                 process_pb.StartRequest(
                     process=process_pb.ProcessConfig(
-                        cmd="/bin/bash",
+                        cmd=program,
                         envs=envs,
-                        args=["-l", "-c", cmd],
+                        args=args,
                         cwd=cwd,
                     ),
                     stdin=stdin,
@@ -321,19 +631,17 @@ class Commands:
             )
 
             pid = extract_start_pid(start_event, "start process")
-            return AsyncCommandHandle(
-                pid=pid,
-                handle_kill=lambda: self.kill(pid),
-                events=events,
-                on_stdout=on_stdout,
-                on_stderr=on_stderr,
-                handle_send_stdin=lambda data, request_timeout=None: self.send_stdin(
-                    pid, data, request_timeout
-                ),
-                handle_close_stdin=lambda request_timeout=None: self.close_stdin(
-                    pid, request_timeout
-                ),
-                check_health=self._check_health,
+            if output_format == "bytes":
+                return self._command_handle(
+                    pid,
+                    events,
+                    BytesOutputBuffer,
+                    output_retention,
+                    on_stdout,
+                    on_stderr,
+                )
+            return self._command_handle(
+                pid, events, TextOutputBuffer, output_retention, on_stdout, on_stderr
             )
         except Exception as e:
             try:
@@ -342,6 +650,7 @@ class Commands:
                 pass
             raise await ahandle_rpc_exception_with_health(e, self._check_health)
 
+    @overload
     async def connect(
         self,
         pid: int,
@@ -349,7 +658,33 @@ class Commands:
         request_timeout: Optional[float] = None,
         on_stdout: Optional[OutputHandler[Stdout]] = None,
         on_stderr: Optional[OutputHandler[Stderr]] = None,
-    ) -> AsyncCommandHandle:
+        output_retention: Optional[OutputRetention] = None,
+        output_format: Literal["text"] = "text",
+    ) -> AsyncCommandHandle: ...
+
+    @overload
+    async def connect(
+        self,
+        pid: int,
+        timeout: Optional[float] = 60,
+        request_timeout: Optional[float] = None,
+        on_stdout: Optional[OutputHandler[bytes]] = None,
+        on_stderr: Optional[OutputHandler[bytes]] = None,
+        output_retention: Optional[OutputRetention] = None,
+        *,
+        output_format: Literal["bytes"],
+    ) -> AsyncCommandHandle[bytes]: ...
+
+    async def connect(
+        self,
+        pid: int,
+        timeout: Optional[float] = 60,
+        request_timeout: Optional[float] = None,
+        on_stdout: Optional[OutputHandler[Any]] = None,
+        on_stderr: Optional[OutputHandler[Any]] = None,
+        output_retention: Optional[OutputRetention] = None,
+        output_format: OutputFormat = "text",
+    ) -> AsyncCommandHandle[Any]:
         """
         Connects to a running command.
         You can use `AsyncCommandHandle.wait()` to wait for the command to finish and get execution results.
@@ -359,9 +694,12 @@ class Commands:
         :param timeout: Timeout for the command connection in **seconds**. Using `0` will not limit the command connection time
         :param on_stdout: Callback for command stdout output
         :param on_stderr: Callback for command stderr output
+        :param output_retention: How much of the command's stdout and stderr to keep for the result, all of it by default. See `OutputRetention`
+        :param output_format: Format of the command's stdout and stderr: `text` (the default) decodes them to `str`, `bytes` passes on the raw `bytes` without decoding them
 
         :return: `AsyncCommandHandle` handle to interact with the running command
         """
+        validate_output_format(output_format)
         events = as_stream(
             self._rpc.connect(
                 process_pb.ConnectRequest(
@@ -380,19 +718,17 @@ class Commands:
             )
 
             pid = extract_start_pid(start_event, "connect to process")
-            return AsyncCommandHandle(
-                pid=pid,
-                handle_kill=lambda: self.kill(pid),
-                events=events,
-                on_stdout=on_stdout,
-                on_stderr=on_stderr,
-                handle_send_stdin=lambda data, request_timeout=None: self.send_stdin(
-                    pid, data, request_timeout
-                ),
-                handle_close_stdin=lambda request_timeout=None: self.close_stdin(
-                    pid, request_timeout
-                ),
-                check_health=self._check_health,
+            if output_format == "bytes":
+                return self._command_handle(
+                    pid,
+                    events,
+                    BytesOutputBuffer,
+                    output_retention,
+                    on_stdout,
+                    on_stderr,
+                )
+            return self._command_handle(
+                pid, events, TextOutputBuffer, output_retention, on_stdout, on_stderr
             )
         except Exception as e:
             try:
@@ -400,3 +736,34 @@ class Commands:
             except Exception:
                 pass
             raise await ahandle_rpc_exception_with_health(e, self._check_health)
+
+    def _command_handle(
+        self,
+        pid: int,
+        events: AsyncGenerator[
+            Union[process_pb.StartResponse, process_pb.ConnectResponse], Any
+        ],
+        output_buffer: Callable[[Optional[OutputRetention]], OutputBuffer[Output]],
+        output_retention: Optional[OutputRetention],
+        on_stdout: Optional[OutputHandler[Output]],
+        on_stderr: Optional[OutputHandler[Output]],
+    ) -> AsyncCommandHandle[Output]:
+        return AsyncCommandHandle[Output](
+            pid=pid,
+            handle_kill=lambda: self.kill(pid),
+            events=events,
+            output_buffer=output_buffer,
+            on_stdout=on_stdout,
+            on_stderr=on_stderr,
+            handle_send_stdin=lambda data, request_timeout=None: self.send_stdin(
+                pid, data, request_timeout
+            ),
+            handle_close_stdin=lambda request_timeout=None: self.close_stdin(
+                pid, request_timeout
+            ),
+            handle_stream_stdin=lambda data, request_timeout=None: (
+                self.stream_stdin(pid, data, request_timeout)
+            ),
+            check_health=self._check_health,
+            output_retention=output_retention,
+        )
@@ -1,8 +1,8 @@
 import asyncio
-import codecs
 import inspect
 from typing import (
     Optional,
+    Generic,
     Callable,
     Any,
     AsyncGenerator,
@@ -21,14 +21,16 @@ from e2b.exceptions import SandboxException
 from e2b.sandbox.commands.command_handle import (
     CommandExitException,
     CommandResult,
-    Stderr,
-    Stdout,
+    Output,
+    OutputBuffer,
+    OutputRetention,
     PtyOutput,
 )
+from e2b.sandbox.commands.stdin import AsyncStdinData
 from e2b.sandbox_async.utils import OutputHandler
 
 
-class AsyncCommandHandle:
+class AsyncCommandHandle(Generic[Output]):
     """
     Command execution handle.
 
@@ -45,25 +47,27 @@ class AsyncCommandHandle:
     @property
     def stdout(self):
         """
-        Command stdout output.
+        Command stdout output, as much of it as the output retention policy keeps.
         """
-        return "".join(self._stdout_chunks)
+        if self._result is not None:
+            return self._result.stdout
+        return self._stdout_buffer.getvalue()
 
     @property
     def stderr(self):
         """
-        Command stderr output.
+        Command stderr output, as much of it as the output retention policy keeps.
         """
-        return "".join(self._stderr_chunks)
+        if self._result is not None:
+            return self._result.stderr
+        return self._stderr_buffer.getvalue()
 
     @property
     def error(self):
         """
         Command execution error message.
         """
-        if self._result is None:
-            return None
-        return self._result.error
+        return self._error
 
     @property
     def exit_code(self):
@@ -74,9 +78,7 @@ class AsyncCommandHandle:
 
         It is `None` if the command is still running.
         """
-        if self._result is None:
-            return None
-        return self._result.exit_code
+        return self._exit_code
 
     def __init__(
         self,
@@ -85,8 +87,9 @@ class AsyncCommandHandle:
         events: AsyncGenerator[
             Union[process_pb.StartResponse, process_pb.ConnectResponse], Any
         ],
-        on_stdout: Optional[OutputHandler[Stdout]] = None,
-        on_stderr: Optional[OutputHandler[Stderr]] = None,
+        output_buffer: Callable[[Optional[OutputRetention]], OutputBuffer[Output]],
+        on_stdout: Optional[OutputHandler[Output]] = None,
+        on_stderr: Optional[OutputHandler[Output]] = None,
         on_pty: Optional[OutputHandler[PtyOutput]] = None,
         handle_send_stdin: Optional[
             Callable[[Union[str, bytes], Optional[float]], Coroutine[Any, Any, None]]
@@ -94,47 +97,52 @@ class AsyncCommandHandle:
         handle_close_stdin: Optional[
             Callable[[Optional[float]], Coroutine[Any, Any, None]]
         ] = None,
+        handle_stream_stdin: Optional[
+            Callable[[AsyncStdinData, Optional[float]], Coroutine[Any, Any, None]]
+        ] = None,
         check_health: Optional[Callable[[], Awaitable[Optional[bool]]]] = None,
+        output_retention: Optional[OutputRetention] = None,
     ):
         self._pid = pid
         self._handle_kill = handle_kill
         self._handle_send_stdin = handle_send_stdin
         self._handle_close_stdin = handle_close_stdin
+        self._handle_stream_stdin = handle_stream_stdin
         self._check_health = check_health
         self._events = events
 
-        self._stdout_chunks: List[str] = []
-        self._stderr_chunks: List[str] = []
-
-        self._stdout_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
-        self._stderr_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        # The buffers decode the output to the handle's `Output` type
+        self._stdout_buffer = output_buffer(output_retention)
+        self._stderr_buffer = output_buffer(output_retention)
 
         self._on_stdout = on_stdout
         self._on_stderr = on_stderr
         self._on_pty = on_pty
 
-        self._result: Optional[CommandResult] = None
+        # Set by the end event; the result is only built by `wait`, so output
+        # spilled to a file isn't read back unless it's asked for
+        self._exit_code: Optional[int] = None
+        self._error: Optional[str] = None
+        self._result: Optional[CommandResult[Output]] = None
         self._iteration_exception: Optional[Exception] = None
 
         self._wait = asyncio.create_task(self._handle_events())
 
     def _flush_decoders(
         self,
-    ) -> List[Union[Tuple[Stdout, None, None], Tuple[None, Stderr, None]]]:
+    ) -> List[Union[Tuple[Output, None, None], Tuple[None, Output, None]]]:
         """
         Flush any bytes still buffered in the stream decoders.
 
         Incomplete trailing UTF-8 sequences are emitted as replacement
         characters, matching the per-chunk decoding behavior.
         """
-        events: List[Union[Tuple[Stdout, None, None], Tuple[None, Stderr, None]]] = []
-        out = self._stdout_decoder.decode(b"", final=True)
+        events: List[Union[Tuple[Output, None, None], Tuple[None, Output, None]]] = []
+        out = self._stdout_buffer.flush()
         if out:
-            self._stdout_chunks.append(out)
             events.append((out, None, None))
-        err = self._stderr_decoder.decode(b"", final=True)
+        err = self._stderr_buffer.flush()
         if err:
-            self._stderr_chunks.append(err)
             events.append((None, err, None))
         return events
 
@@ -142,8 +150,8 @@ class AsyncCommandHandle:
         self,
     ) -> AsyncGenerator[
         Union[
-            Tuple[Stdout, None, None],
-            Tuple[None, Stderr, None],
+            Tuple[Output, None, None],
+            Tuple[None, Output, None],
             Tuple[None, None, PtyOutput],
         ],
         None,
@@ -157,31 +165,25 @@ class AsyncCommandHandle:
                     case Oneof(field="data", value=data):
                         match data.output:
                             case Oneof(field="stdout", value=chunk) if chunk:
-                                out = self._stdout_decoder.decode(chunk)
+                                out = self._stdout_buffer.feed(chunk)
                                 if out:
-                                    self._stdout_chunks.append(out)
                                     yield out, None, None
                             case Oneof(field="stderr", value=chunk) if chunk:
-                                out = self._stderr_decoder.decode(chunk)
+                                out = self._stderr_buffer.feed(chunk)
                                 if out:
-                                    self._stderr_chunks.append(out)
                                     yield None, out, None
                             case Oneof(field="pty", value=chunk) if chunk:
                                 yield None, None, chunk
                     case Oneof(field="end", value=end):
                         # Flush trailing decoder bytes into the accumulators and
-                        # record the result before yielding the flushed chunks, so a
-                        # consumer that stops iterating on the first flushed chunk
-                        # still observes the exit code.
+                        # record the exit code before yielding the flushed chunks,
+                        # so a consumer that stops iterating on the first flushed
+                        # chunk still observes it.
                         flushed = list(self._flush_decoders())
-                        self._result = CommandResult(
-                            stdout="".join(self._stdout_chunks),
-                            stderr="".join(self._stderr_chunks),
-                            exit_code=end.exit_code,
-                            # Optional scalar: unset reads as "" — the presence
-                            # check keeps it None, matching the JS SDK
-                            error=end.error if end.has_field("error") else None,
-                        )
+                        self._exit_code = end.exit_code
+                        # Optional scalar: unset reads as "" — the presence
+                        # check keeps it None, matching the JS SDK
+                        self._error = end.error if end.has_field("error") else None
                         for f in flushed:
                             yield f
         except Exception:
@@ -198,7 +200,7 @@ class AsyncCommandHandle:
         # dropped connection), flush any bytes still buffered in the decoders
         # so incomplete trailing sequences surface as replacement characters
         # instead of being silently dropped.
-        if self._result is None:
+        if self._exit_code is None:
             for flushed in self._flush_decoders():
                 yield flushed
 
@@ -238,7 +240,7 @@ class AsyncCommandHandle:
                 e, self._check_health
             )
 
-    async def wait(self) -> CommandResult:
+    async def wait(self) -> CommandResult[Output]:
         """
         Wait for the command to finish and return the result.
         If the command exits with a non-zero exit code, it throws a `CommandExitException`.
@@ -249,18 +251,38 @@ class AsyncCommandHandle:
         if self._iteration_exception:
             raise self._iteration_exception
 
-        if self._result is None:
-            raise Exception("Command ended without an end event")
-
-        if self._result.exit_code != 0:
-            raise CommandExitException(
-                stdout="".join(self._stdout_chunks),
-                stderr="".join(self._stderr_chunks),
-                exit_code=self._result.exit_code,
-                error=self._result.error,
+        result = self._command_result()
+        if result.exit_code != 0:
+            raise CommandExitException[Output](
+                stdout=result.stdout,
+                stderr=result.stderr,
+                exit_code=result.exit_code,
+                error=result.error,
             )
 
-        return self._result
+        return result
+
+    def _command_result(self) -> CommandResult[Output]:
+        """
+        Result of the finished command, built on first use.
+
+        The kept output is read once, then the buffers are released, which
+        closes the temporary files of spilled output.
+        """
+        result = self._result
+        if result is None:
+            if self._exit_code is None:
+                raise Exception("Command ended without an end event")
+
+            result = self._result = CommandResult[Output](
+                stdout=self._stdout_buffer.getvalue(),
+                stderr=self._stderr_buffer.getvalue(),
+                exit_code=self._exit_code,
+                error=self._error,
+            )
+            self._stdout_buffer.close()
+            self._stderr_buffer.close()
+        return result
 
     async def kill(self) -> bool:
         """
@@ -292,6 +314,25 @@ class AsyncCommandHandle:
             )
         await self._handle_send_stdin(data, request_timeout)
 
+    async def stream_stdin(
+        self,
+        data: AsyncStdinData,
+        request_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Stream data to the command stdin over a single request, instead of a request per chunk like `send_stdin`.
+
+        Chunks are pulled from `data` only as fast as the connection takes them. The command must have been started with `stdin=True`. Stdin stays open afterwards, call `close_stdin` to signal EOF.
+
+        :param data: Data to send to the command: an iterable or async iterable of `str` or `bytes` chunks, or a file-like object, which is read in chunks
+        :param request_timeout: Deadline for the whole stream in **seconds**; by default the stream is not bounded in total
+        """
+        if self._handle_stream_stdin is None:
+            raise SandboxException(
+                "Streaming stdin is not supported for this command handle."
+            )
+        await self._handle_stream_stdin(data, request_timeout)
+
     async def close_stdin(self, request_timeout: Optional[float] = None) -> None:
         """
         Close the command stdin.
@@ -22,7 +22,7 @@ from e2b.envd.utils import (
     timeout_to_ms,
 )
 from e2b.envd.client_async import as_stream, create_rpc_client, first_event
-from e2b.sandbox.commands.command_handle import PtySize
+from e2b.sandbox.commands.command_handle import PtySize, TextOutputBuffer
 from e2b.sandbox_async.commands.command_handle import (
     AsyncCommandHandle,
     OutputHandler,
@@ -170,6 +170,7 @@ class Pty:
                 pid=pid,
                 handle_kill=lambda: self.kill(pid),
                 events=events,
+                output_buffer=TextOutputBuffer,
                 on_pty=on_data,
                 check_health=self._check_health,
             )
@@ -219,6 +220,7 @@ class Pty:
                 pid=pid,
                 handle_kill=lambda: self.kill(pid),
                 events=events,
+                output_buffer=TextOutputBuffer,
                 on_pty=on_data,
                 check_health=self._check_health,
             )
@@ -0,0 +1,165 @@
+import asyncio
+import inspect
+from typing import Optional, Tuple
+
+from e2b.exceptions import SandboxException, TimeoutException
+from e2b.sandbox.commands.command_handle import (
+    CommandExitException,
+    CommandResult,
+    Stderr,
+    Stdout,
+)
+from e2b.sandbox.commands.session import SessionState
+from e2b.sandbox_async.commands.command_handle import AsyncCommandHandle
+from e2b.sandbox_async.utils import OutputHandler
+
+SessionOutput = asyncio.Queue[Optional[Tuple[Optional[Stdout], Optional[Stderr]]]]
+"""
+Output chunks of a session's shell, `None` once the shell has exited.
+"""
+
+
+class AsyncCommandSession:
+    """
+    Long-lived shell running commands one after another.
+
+    Each command runs in the same shell process instead of starting a process and a stream of its own, so running one takes a single request.
+    The working directory, shell variables and exported environment variables set by a command carry over to the following ones.
+
+    Use `sandbox.commands.session()` to create one.
+    """
+
+    def __init__(self, handle: AsyncCommandHandle, output: SessionOutput):
+        self._handle = handle
+        self._output = output
+        self._state = SessionState()
+        self._lock = asyncio.Lock()
+        self._closed = False
+        self._killed = False
+        self._shell_error: Optional[Exception] = None
+        self._watch = asyncio.create_task(self._watch_shell())
+
+    @property
+    def pid(self) -> int:
+        """
+        Process ID of the session's shell.
+        """
+        return self._handle.pid
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    async def _watch_shell(self) -> None:
+        try:
+            await self._handle.wait()
+        except CommandExitException:
+            pass
+        except Exception as e:
+            self._shell_error = e
+        # Wakes up the command waiting for output
+        self._output.put_nowait(None)
+
+    async def run(
+        self,
+        cmd: str,
+        on_stdout: Optional[OutputHandler[Stdout]] = None,
+        on_stderr: Optional[OutputHandler[Stderr]] = None,
+        timeout: Optional[float] = 60,
+        request_timeout: Optional[float] = None,
+    ) -> CommandResult:
+        """
+        Run a command in the session's shell and wait until it finishes.
+        If the command exits with a non-zero exit code, it throws a `CommandExitException`.
+
+        The command reads its stdin from `/dev/null`. Commands run one at a time, a call waits for the commands started by other tasks to finish first.
+        A command exiting with a non-zero exit code keeps the session open; one that exits the shell (e.g. `exit`, or a failure after `set -e`) or runs out of time ends the session, and so does an error sending it or reading its output, e.g. a dropped connection.
+
+        :param cmd: Command to execute
+        :param on_stdout: Callback for command stdout output
+        :param on_stderr: Callback for command stderr output
+        :param timeout: Timeout for the command in **seconds**, the session's shell is killed when it runs out. Using `0` will not limit the command time
+        :param request_timeout: Timeout for sending the command to the shell in **seconds**
+
+        :return: `CommandResult` result of the command execution
+        """
+        async with self._lock:
+            if self._closed:
+                raise SandboxException("The command session is closed.")
+
+            state = self._state
+            state.reset()
+            try:
+                await asyncio.wait_for(
+                    self._run(state, cmd, on_stdout, on_stderr, request_timeout),
+                    timeout or None,
+                )
+            except asyncio.TimeoutError:
+                await self._shut_down()
+                raise TimeoutException(
+                    f"The command didn't finish within {timeout} seconds, so the session's shell was killed — the 'timeout' option can be used to increase this timeout"
+                ) from None
+            except BaseException:
+                # The output of the shell can't be told apart anymore
+                await self._shut_down()
+                raise
+
+            return state.result()
+
+    async def _run(
+        self,
+        state: SessionState,
+        cmd: str,
+        on_stdout: Optional[OutputHandler[Stdout]],
+        on_stderr: Optional[OutputHandler[Stderr]],
+        request_timeout: Optional[float],
+    ) -> None:
+        await self._handle.send_stdin(state.script(cmd), request_timeout)
+        while not state.done:
+            event = await self._output.get()
+            if event is None:
+                raise self._shell_error or SandboxException(
+                    "The session's shell exited before the command finished."
+                )
+
+            stdout, stderr = event
+            if stdout is not None:
+                output = state.feed_stdout(stdout)
+                callback = on_stdout
+            else:
+                output = state.feed_stderr(stderr or "")
+                callback = on_stderr
+            if output and callback:
+                cb = callback(output)
+                if inspect.isawaitable(cb):
+                    await cb
+
+    async def close(self) -> None:
+        """
+        Close the session, killing its shell.
+        """
+        self._closed = True
+        if self._killed:
+            return
+        self._killed = True
+        await self._handle.kill()
+        # A command running in another task sees the shell exit instead
+        if not self._lock.locked():
+            await self._handle.disconnect()
+            self._watch.cancel()
+
+    async def _shut_down(self) -> None:
+        # Like `close`, for a failed command, which holds the lock
+        self._closed = True
+        try:
+            if not self._killed:
+                self._killed = True
+                await self._handle.kill()
+        except Exception:
+            # The error of the command is the one to raise
+            pass
+        finally:
+            await self._handle.disconnect()
+            self._watch.cancel()
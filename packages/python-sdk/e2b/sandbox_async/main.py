@@ -4,7 +4,7 @@ import json
 import logging
 import shlex
 import uuid
-from typing import Dict, List, Optional, Union, overload
+from typing import AsyncGenerator, Dict, List, Optional, Set, Union, cast, overload
 
 import httpx
 from packaging.version import Version
@@ -16,6 +16,8 @@ from e2b.connection_config import ApiParams, ConnectionConfig
 from e2b.envd.api import ENVD_API_HEALTH_ROUTE, ahandle_envd_api_exception
 from e2b.envd.versions import ENVD_DEBUG_FALLBACK
 from e2b.exceptions import (
+    InvalidArgumentException,
+    RateLimitException,
     SandboxException,
     TemplateException,
     format_request_timeout_error,
@@ -31,7 +33,11 @@ from e2b.sandbox.sandbox_api import (
     SandboxNetworkUpdate,
     SnapshotInfo,
 )
-from e2b.sandbox.utils import class_method_variant
+from e2b.sandbox.utils import (
+    RATE_LIMIT_MAX_RETRIES,
+    RateLimitBackoff,
+    class_method_variant,
+)
 from e2b.sandbox_async.commands.command import Commands
 from e2b.sandbox_async.commands.pty import Pty
 from e2b.sandbox_async.filesystem.filesystem import Filesystem
@@ -109,17 +115,18 @@ class AsyncSandbox(SandboxApi):
         super().__init__(**opts)
 
         self._envd_api = get_envd_api(self.connection_config, self.envd_api_url)
-        self._filesystem = Filesystem(
+        self._commands = Commands(
             self.envd_api_url,
-            self._envd_version,
             self.connection_config,
+            self._envd_version,
             self._envd_api,
         )
-        self._commands = Commands(
+        self._filesystem = Filesystem(
             self.envd_api_url,
-            self.connection_config,
             self._envd_version,
+            self.connection_config,
             self._envd_api,
+            commands=self._commands,
         )
         self._pty = Pty(
             self.envd_api_url,
@@ -260,6 +267,127 @@ class AsyncSandbox(SandboxApi):
 
         return sandbox
 
+    @classmethod
+    async def create_many(
+        cls,
+        count: int,
+        template: Optional[str] = None,
+        timeout: Optional[int] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        envs: Optional[Dict[str, str]] = None,
+        secure: bool = True,
+        allow_internet_access: bool = True,
+        mcp: Optional[McpServer] = None,
+        network: Optional[SandboxNetworkOpts] = None,
+        iam: Optional[SandboxIamOpts] = None,
+        lifecycle: Optional[SandboxLifecycle] = None,
+        volume_mounts: Optional[SandboxAsyncVolumeMount] = None,
+        logger: Optional[logging.Logger] = None,
+        max_concurrency: int = 10,
+        **opts: Unpack[ApiParams],
+    ) -> AsyncGenerator[Self, None]:
+        """
+        Create many sandboxes with the same configuration.
+
+        At most `max_concurrency` sandboxes are being created at a time. When the API rate limit is hit,
+        all pending creates back off together and the rate-limited ones are retried.
+        Sandboxes are returned in the order they finish being created, so one slow create doesn't hold back the rest.
+
+        If a create fails, the error is raised when it is reached and the remaining creates are stopped.
+        Sandboxes that were created but not returned are killed.
+
+        :param count: Number of sandboxes to create
+        :param max_concurrency: Maximum number of sandboxes being created at the same time
+
+        The other parameters are the same as in `create` and apply to every sandbox.
+
+        :return: Async iterator of the created sandboxes
+
+        Example
+        ```python
+        from e2b import AsyncSandbox
+
+        async for sandbox in AsyncSandbox.create_many(100, max_concurrency=20):
+            print(sandbox.sandbox_id)
+        ```
+        """
+        if count < 0:
+            raise InvalidArgumentException("count must not be negative")
+        if max_concurrency < 1:
+            raise InvalidArgumentException("max_concurrency must be at least 1")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        backoff = RateLimitBackoff()
+        in_flight: Set[asyncio.Task] = set()
+        closing = False
+
+        async def create_one() -> Self:
+            task = cast(asyncio.Task, asyncio.current_task())
+
+            async with semaphore:
+                retries = 0
+                while True:
+                    delay = backoff.wait_time()
+                    while delay > 0:
+                        await asyncio.sleep(delay)
+                        delay = backoff.wait_time()
+                    if closing:
+                        raise asyncio.CancelledError()
+
+                    in_flight.add(task)
+                    try:
+                        sandbox = await cls.create(
+                            template=template,
+                            timeout=timeout,
+                            metadata=metadata,
+                            envs=envs,
+                            secure=secure,
+                            allow_internet_access=allow_internet_access,
+                            mcp=mcp,
+                            network=network,
+                            iam=iam,
+                            lifecycle=lifecycle,
+                            volume_mounts=volume_mounts,
+                            logger=logger,
+                            **opts,
+                        )
+                    except RateLimitException:
+                        if closing or retries >= RATE_LIMIT_MAX_RETRIES:
+                            raise
+                        retries += 1
+                        backoff.on_rate_limit()
+                        continue
+                    finally:
+                        in_flight.discard(task)
+
+                    backoff.on_success()
+                    return sandbox
+
+        tasks = [asyncio.ensure_future(create_one()) for _ in range(count)]
+        returned: Set[int] = set()
+        try:
+            for next_sandbox in asyncio.as_completed(tasks):
+                sandbox = await next_sandbox
+                returned.add(id(sandbox))
+                yield sandbox
+        finally:
+            closing = True
+            # Creates that already reached the API are let finish, so the
+            # sandboxes they create can be killed instead of leaking
+            for task in tasks:
+                if not task.done() and task not in in_flight:
+                    task.cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.gather(
+                *(
+                    result.kill()
+                    for result in results
+                    if not isinstance(result, BaseException)
+                    and id(result) not in returned
+                ),
+                return_exceptions=True,
+            )
+
     @overload
     async def connect(
         self,
@@ -22,7 +22,7 @@ from e2b.envd.utils import (
     timeout_to_ms,
 )
 from e2b.envd.client_sync import as_stream, create_rpc_client
-from e2b.sandbox.commands.command_handle import PtySize
+from e2b.sandbox.commands.command_handle import PtySize, TextOutputBuffer
 from e2b.sandbox_sync.commands.command_handle import CommandHandle
 
 
@@ -162,6 +162,7 @@ class Pty:
                 pid=pid,
                 handle_kill=lambda: self.kill(pid),
                 events=events,
+                output_buffer=TextOutputBuffer,
                 check_health=self._check_health,
             )
         except Exception as e:
@@ -206,6 +207,7 @@ class Pty:
                 pid=pid,
                 handle_kill=lambda: self.kill(pid),
                 events=events,
+                output_buffer=TextOutputBuffer,
                 check_health=self._check_health,
             )
         except Exception as e:
@@ -0,0 +1,138 @@
+import threading
+from typing import Callable, Optional
+
+from e2b.exceptions import SandboxException, TimeoutException
+from e2b.sandbox.commands.command_handle import CommandResult
+from e2b.sandbox.commands.session import SessionState
+from e2b.sandbox_sync.commands.command_handle import CommandHandle
+
+
+class CommandSession:
+    """
+    Long-lived shell running commands one after another.
+
+    Each command runs in the same shell process instead of starting a process and a stream of its own, so running one takes a single request.
+    The working directory, shell variables and exported environment variables set by a command carry over to the following ones.
+
+    Use `sandbox.commands.session()` to create one.
+    """
+
+    def __init__(self, handle: CommandHandle):
+        self._handle = handle
+        self._events = iter(handle)
+        self._state = SessionState()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._killed = False
+
+    @property
+    def pid(self) -> int:
+        """
+        Process ID of the session's shell.
+        """
+        return self._handle.pid
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def run(
+        self,
+        cmd: str,
+        on_stdout: Optional[Callable[[str], None]] = None,
+        on_stderr: Optional[Callable[[str], None]] = None,
+        timeout: Optional[float] = 60,
+        request_timeout: Optional[float] = None,
+    ) -> CommandResult:
+        """
+        Run a command in the session's shell and wait until it finishes.
+        If the command exits with a non-zero exit code, it throws a `CommandExitException`.
+
+        The command reads its stdin from `/dev/null`. Commands run one at a time, a call waits for the commands started from other threads to finish first.
+        A command exiting with a non-zero exit code keeps the session open; one that exits the shell (e.g. `exit`, or a failure after `set -e`) or runs out of time ends the session, and so does an error sending it or reading its output, e.g. a dropped connection.
+
+        :param cmd: Command to execute
+        :param on_stdout: Callback for command stdout output
+        :param on_stderr: Callback for command stderr output
+        :param timeout: Timeout for the command in **seconds**, the session's shell is killed when it runs out. Using `0` will not limit the command time
+        :param request_timeout: Timeout for sending the command to the shell in **seconds**
+
+        :return: `CommandResult` result of the command execution
+        """
+        with self._lock:
+            if self._closed:
+                raise SandboxException("The command session is closed.")
+
+            state = self._state
+            state.reset()
+            timed_out = threading.Event()
+
+            def expire() -> None:
+                timed_out.set()
+                self._handle.kill()
+
+            timer = threading.Timer(timeout, expire) if timeout else None
+            try:
+                if timer:
+                    timer.start()
+                self._handle.send_stdin(state.script(cmd), request_timeout)
+                while not state.done:
+                    event = next(self._events, None)
+                    if event is None:
+                        if timed_out.is_set():
+                            raise TimeoutException(
+                                f"The command didn't finish within {timeout} seconds, so the session's shell was killed — the 'timeout' option can be used to increase this timeout"
+                            )
+                        raise SandboxException(
+                            "The session's shell exited before the command finished."
+                        )
+
+                    stdout, stderr, _ = event
+                    if stdout is not None:
+                        output = state.feed_stdout(stdout)
+                        if output and on_stdout:
+                            on_stdout(output)
+                    elif stderr is not None:
+                        output = state.feed_stderr(stderr)
+                        if output and on_stderr:
+                            on_stderr(output)
+            except BaseException:
+                # The output of the shell can't be told apart anymore
+                self._shut_down()
+                raise
+            finally:
+                if timer:
+                    timer.cancel()
+
+            return state.result()
+
+    def close(self) -> None:
+        """
+        Close the session, killing its shell.
+        """
+        self._closed = True
+        if self._killed:
+            return
+        self._killed = True
+        self._handle.kill()
+        # A command running in another thread sees the shell exit instead
+        if self._lock.acquire(blocking=False):
+            try:
+                self._handle.disconnect()
+            finally:
+                self._lock.release()
+
+    def _shut_down(self) -> None:
+        # Like `close`, for a failed command, which holds the lock
+        self._closed = True
+        try:
+            if not self._killed:
+                self._killed = True
+                self._handle.kill()
+        except Exception:
+            # The error of the command is the one to raise
+            pass
+        finally:
+            self._handle.disconnect()
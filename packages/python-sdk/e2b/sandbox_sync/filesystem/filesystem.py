@@ -1,4 +1,29 @@
-from typing import IO, Dict, List, Literal, Optional, Union, overload
+import os
+import posixpath
+import threading
+import time
+from gzip import compress
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    FIRST_EXCEPTION,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import ExitStack, closing
+from itertools import islice
+from typing import (
+    Dict,
+    Generator,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+    overload,
+)
 
 import httpx
 from connectrpc.code import Code
@@ -15,6 +40,7 @@ from e2b.connection_config import (
 )
 
 from e2b.envd.api import (
+    ENVD_API_FILES_COMPOSE_ROUTE,
     ENVD_API_FILES_ROUTE,
     check_sandbox_health,
     handle_envd_api_exception,
@@ -26,6 +52,7 @@ from e2b.envd.utils import authentication_header, timeout_to_ms
 from e2b.envd.client_sync import create_rpc_client
 from e2b.envd.versions import (
     ENVD_DEFAULT_USER,
+    ENVD_FILE_COMPOSE,
     ENVD_FILE_METADATA,
     ENVD_OCTET_STREAM_UPLOAD,
     ENVD_VERSION_FS_EVENT_ENTRY_INFO,
@@ -39,18 +66,63 @@ from e2b.exceptions import (
     TemplateException,
 )
 from e2b.sandbox.filesystem.filesystem import (
+    DOWNLOAD_PARALLELISM,
+    DOWNLOAD_RANGE_RETRIES,
+    SANDBOX_MAX_CONCURRENT_UPLOADS,
+    WRITE_FILES_MAX_CONCURRENCY,
+    RESUMABLE_UPLOAD_CHUNK_SIZE,
+    UPLOAD_CHUNK_RETRIES,
+    UPLOAD_CHUNK_RETRY_DELAY,
+    DownloadFile,
+    DownloadRange,
+    ReadIntoBuffer,
     EntryInfo,
     FileStreamReader,
+    FileType,
+    ResumableUpload,
     WriteEntry,
     WriteInfo,
     _to_httpx_file,
+    check_range_response,
     multipart_body_is_streamed,
     map_entry_info,
     map_file_type,
     metadata_to_headers,
+    plan_download_ranges,
     to_upload_body,
     validate_metadata,
 )
+from e2b.sandbox.filesystem.archive import (
+    IterStream,
+    TarArchiveStream,
+    create_archive_command,
+    extract_archive,
+    extract_archive_command,
+    staged_archive_path,
+)
+from e2b.sandbox.filesystem.hashing import (
+    HashAlgorithm,
+    hash_local_file,
+    hash_upload_data,
+    parse_hash_output,
+    remote_hash_command,
+    validate_hash_algorithm,
+)
+from e2b.sandbox.filesystem.sync_dir import (
+    SyncDirResult,
+    SyncManifest,
+    plan_dir_sync,
+    scan_local_dir,
+)
+from e2b.io_utils import (
+    ProgressHandler,
+    Readable,
+    TransferProgress,
+    TransferStats,
+    content_length,
+    upload_size,
+)
+from e2b.sandbox_sync.commands.command import Commands
 from e2b.sandbox_sync.filesystem.watch_handle import WatchHandle
 
 
@@ -84,8 +156,11 @@ class Filesystem:
         envd_version: Version,
         connection_config: ConnectionConfig,
         envd_api: httpx.Client,
+        commands: Optional[Commands] = None,
     ) -> None:
         self._envd_api_url = envd_api_url
+        # Runs `tar` in the sandbox for the archive transfers.
+        self._commands = commands
         self._envd_version = envd_version
         self._connection_config = connection_config
         self._rpc = create_rpc_client(
@@ -94,6 +169,14 @@ class Filesystem:
             connection_config,
         )
         self._envd_api = envd_api
+        # Shared by all uploads to the sandbox, so concurrent `write_files`
+        # calls can't flood envd together.
+        self._upload_semaphore = threading.BoundedSemaphore(
+            SANDBOX_MAX_CONCURRENT_UPLOADS
+        )
+        # What `sync_dir` uploaded, for its `checksum` comparison.
+        self._sync_manifest = SyncManifest()
+        self._transfer_stats = TransferStats()
         # Streamed downloads default to a sibling client whose transport
         # carries the idle read timeout (see `get_transport`). Like the
         # RPC client, the pyqwest transports underneath are thread-safe, so
@@ -102,6 +185,13 @@ class Filesystem:
             connection_config, envd_api_url, for_streaming=True
         )
 
+    @property
+    def transfer_stats(self) -> TransferStats:
+        """
+        Running totals of the file transfers to and from the sandbox, e.g. to export its transfer throughput.
+        """
+        return self._transfer_stats
+
     @overload
     def read(
         self,
@@ -146,6 +236,28 @@ class Filesystem:
         """
         ...
 
+    @overload
+    def read(
+        self,
+        path: str,
+        format: Literal["memoryview"],
+        user: Optional[Username] = None,
+        request_timeout: Optional[float] = None,
+        gzip: bool = False,
+    ) -> memoryview:
+        """
+        Read file content as a read-only `memoryview` of the response body, without copying it.
+
+        :param path: Path to the file
+        :param user: Run the operation as this user
+        :param format: Format of the file content—`memoryview`
+        :param request_timeout: Timeout for the request in **seconds**
+        :param gzip: Use gzip compression for the request
+
+        :return: File content as a `memoryview`
+        """
+        ...
+
     @overload
     def read(
         self,
@@ -155,6 +267,7 @@ class Filesystem:
         request_timeout: Optional[float] = None,
         gzip: bool = False,
         stream_idle_timeout: Optional[float] = None,
+        on_progress: Optional[ProgressHandler] = None,
     ) -> FileStreamReader:
         """
         Read file content as a `FileStreamReader` (an `Iterator[bytes]`).
@@ -176,6 +289,7 @@ class Filesystem:
             a transport-wide idle read timeout instead (60 seconds), which
             resets on every chunk. (`AsyncSandbox.files.read` honors this
             parameter.)
+        :param on_progress: Called as `on_progress(bytes_done, total, rate)` for each chunk read from the stream, `total` is `None` when the size isn't known up front (e.g. with `gzip`)
 
         :return: File content as a `FileStreamReader`
         """
@@ -184,11 +298,12 @@ class Filesystem:
     def read(
         self,
         path: str,
-        format: Literal["text", "bytes", "stream"] = "text",
+        format: Literal["text", "bytes", "memoryview", "stream"] = "text",
         user: Optional[Username] = None,
         request_timeout: Optional[float] = None,
         gzip: bool = False,
         stream_idle_timeout: Optional[float] = None,
+        on_progress: Optional[ProgressHandler] = None,
     ):
         username = user
         if username is None and self._envd_version < ENVD_DEFAULT_USER:
@@ -203,6 +318,9 @@ class Filesystem:
             headers["Accept-Encoding"] = "gzip"
 
         timeout = self._connection_config.get_request_timeout(request_timeout)
+        progress = TransferProgress(
+            upload=False, on_progress=on_progress, stats=self._transfer_stats
+        )
 
         if format == "stream":
             # Stream the response body instead of buffering it in memory.
@@ -232,7 +350,8 @@ class Filesystem:
                 r.close()
                 raise err
 
-            return FileStreamReader(r)
+            progress.total = content_length(r.headers)
+            return FileStreamReader(r, progress=progress)
 
         try:
             r = self._envd_api.get(
@@ -248,20 +367,224 @@ class Filesystem:
         if err:
             raise err
 
+        progress.update(len(r.content))
+        progress.finish()
+
         if format == "text":
             return r.text
         elif format == "bytes":
             return bytearray(r.content)
+        elif format == "memoryview":
+            return memoryview(r.content)
+
+    def read_into(
+        self,
+        path: str,
+        buffer,
+        user: Optional[Username] = None,
+        request_timeout: Optional[float] = None,
+        gzip: bool = False,
+        on_progress: Optional[ProgressHandler] = None,
+    ) -> int:
+        """
+        Read file content into a writable buffer, such as a `bytearray`, an `mmap` or a NumPy array.
+
+        The content is copied into the buffer as it streams in, so the file is never held in memory a second time. The buffer is filled from its start and must be large enough for the whole file.
+
+        :param path: Path to the file
+        :param buffer: Writable, C-contiguous buffer to read the content into
+        :param user: Run the operation as this user
+        :param request_timeout: Deadline for the whole transfer in **seconds**
+        :param gzip: Use gzip compression for the request
+        :param on_progress: Called as `on_progress(bytes_done, total, rate)` for each chunk read
+
+        :return: Number of bytes read into the buffer
+        """
+        target = ReadIntoBuffer(buffer, path)
+        try:
+            stream = self.read(
+                path,
+                format="stream",
+                user=user,
+                request_timeout=request_timeout,
+                gzip=gzip,
+                on_progress=on_progress,
+            )
+            with stream:
+                for chunk in stream:
+                    target.write(chunk)
+            return target.size
+        finally:
+            target.release()
+
+    def download(
+        self,
+        path: str,
+        dest: str,
+        parallelism: int = DOWNLOAD_PARALLELISM,
+        user: Optional[Username] = None,
+        request_timeout: Optional[float] = None,
+        on_progress: Optional[ProgressHandler] = None,
+    ) -> int:
+        """
+        Download a file from the sandbox to a local path, fetching byte ranges of it concurrently.
+
+        The local file is preallocated and every range is written at its offset as it arrives. A range that fails mid-transfer is resumed from the first byte not yet received; the other ranges are kept. When the sandbox doesn't support `Range` requests, the file is downloaded as a single stream.
+
+        :param path: Path to the file in the sandbox
+        :param dest: Local path to write the file to, an existing file is overwritten
+        :param parallelism: Maximum number of byte ranges fetched at the same time
+        :param user: Run the operation as this user
+        :param request_timeout: Timeout for each request in **seconds**. Streamed ranges are otherwise bounded by the transport-wide idle read timeout.
+        :param on_progress: Called as `on_progress(bytes_done, total, rate)` for each chunk written to the local file, across all ranges
+
+        :return: Number of bytes downloaded
+        """
+        if parallelism < 1:
+            raise InvalidArgumentException("parallelism must be at least 1")
+
+        info = self.get_info(path, user=user, request_timeout=request_timeout)
+        if info.type == FileType.DIR:
+            raise InvalidArgumentException(f"Path '{path}' is a directory")
+
+        username = user
+        if username is None and self._envd_version < ENVD_DEFAULT_USER:
+            username = default_username
+
+        params = {"path": path}
+        if username:
+            params["username"] = username
+
+        # Same as `read(format="stream")`: a per-request timeout is a
+        # whole-request deadline, so it is only sent when set explicitly.
+        timeout = ConnectionConfig._get_request_timeout(None, request_timeout)
+
+        def send(rng: Optional[DownloadRange]) -> httpx.Response:
+            request = self._envd_api_streaming.build_request(
+                "GET",
+                ENVD_API_FILES_ROUTE,
+                params=params,
+                headers={"Range": rng.header()} if rng else {},
+                timeout=timeout,
+            )
+            r = self._envd_api_streaming.send(request, stream=True)
+            err = _handle_filesystem_envd_api_exception(r)
+            if err:
+                r.close()
+                raise err
+            return r
+
+        size = info.size
+        ranges = plan_download_ranges(size, parallelism)
+        file = DownloadFile(dest, size)
+        progress = TransferProgress(False, size, on_progress, self._transfer_stats)
+        success = False
+        try:
+            try:
+                first = send(ranges[0] if len(ranges) > 1 else None)
+                if first.status_code != 206:
+                    # Single range, or the server ignored `Range`.
+                    size = self._download_stream(first, file, progress)
+                else:
+                    self._download_ranges(send, first, ranges, size, file, progress)
+            except httpx.RemoteProtocolError as e:
+                raise handle_envd_api_transport_exception_with_health(e, self._envd_api)
+            success = True
+        finally:
+            progress.finish()
+            file.close(success)
+
+        return size
+
+    @staticmethod
+    def _download_stream(
+        r: httpx.Response, file: DownloadFile, progress: TransferProgress
+    ) -> int:
+        offset = 0
+        try:
+            for chunk in r.iter_bytes():
+                file.write_at(chunk, offset)
+                offset += len(chunk)
+                progress.update(len(chunk))
+        finally:
+            r.close()
+
+        # The file may have changed size since it was stat'ed.
+        file.truncate(offset)
+        return offset
+
+    @staticmethod
+    def _download_ranges(
+        send,
+        first: httpx.Response,
+        ranges: List[DownloadRange],
+        size: int,
+        file: DownloadFile,
+        progress: TransferProgress,
+    ) -> None:
+        # Set when a range fails for good, so the others stop early.
+        failed = threading.Event()
+
+        def fetch(rng: DownloadRange, r: Optional[httpx.Response]) -> None:
+            retries = 0
+            while True:
+                try:
+                    if r is None:
+                        r = send(rng)
+                    try:
+                        if r.status_code != 206:
+                            raise SandboxException(
+                                "The sandbox stopped honoring Range requests during the download"
+                            )
+                        check_range_response(r, rng, size)
+                        for chunk in r.iter_bytes():
+                            if failed.is_set():
+                                return
+                            chunk = chunk[: rng.end - rng.start]
+                            file.write_at(chunk, rng.start)
+                            rng.start += len(chunk)
+                            progress.update(len(chunk))
+                    finally:
+                        r.close()
+                    if rng.done:
+                        return
+                    error: Exception = httpx.ReadError(
+                        f"Range response ended {rng.end - rng.start} bytes early"
+                    )
+                except httpx.TransportError as e:
+                    error = e
+
+                # Resume only this range, from the first byte not received.
+                r = None
+                retries += 1
+                if retries > DOWNLOAD_RANGE_RETRIES or failed.is_set():
+                    raise error
+
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [executor.submit(fetch, ranges[0], first)] + [
+                executor.submit(fetch, rng, None) for rng in ranges[1:]
+            ]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in done:
+                if future.exception() is not None:
+                    failed.set()
+                    # Waits for the other ranges to stop before re-raising.
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise cast(BaseException, future.exception())
 
     def write(
         self,
         path: str,
-        data: Union[str, bytes, IO],
+        data: Union[str, bytes, Readable],
         user: Optional[Username] = None,
         request_timeout: Optional[float] = None,
         gzip: bool = False,
         use_octet_stream: Optional[bool] = None,
         metadata: Optional[Dict[str, str]] = None,
+        resumable: bool = False,
+        chunk_size: Optional[int] = None,
+        on_progress: Optional[ProgressHandler] = None,
+        skip_if_identical: bool = False,
     ) -> WriteInfo:
         """
         Write content to a file on the path.
@@ -270,15 +593,37 @@ class Filesystem:
         Writing to a file at path that doesn't exist creates the necessary directories.
 
         :param path: Path to the file
-        :param data: Data to write to the file, can be a `str`, `bytes`, or `IO`. File-like objects are streamed in chunks instead of being buffered in memory.
+        :param data: Data to write to the file, can be a `str`, `bytes`, or `IO`. File-like objects are streamed in chunks instead of being buffered in memory. Wrap a large local file in a `MappedFile` to upload it from a memory map instead of reading it.
         :param user: Run the operation as this user
         :param request_timeout: Timeout for the request in **seconds**
         :param gzip: Use gzip compression for the upload. Implies the `application/octet-stream` upload. Requires envd 0.5.7 or later — when not supported, the upload falls back to uncompressed `multipart/form-data`.
         :param use_octet_stream: Upload using `application/octet-stream` instead of `multipart/form-data`. Defaults to `None`, which uses octet-stream when `data` is a file-like object (so streamed uploads aren't buffered) and `multipart/form-data` otherwise. Requires envd 0.5.7 or later — when not supported, the upload falls back to `multipart/form-data`, which reads text-mode file-like data into memory (httpx only streams binary file objects in a multipart body).
         :param metadata: User-defined metadata to persist on the uploaded file as extended attributes. Keys are lowercased by the sandbox; invalid keys or values raise an `InvalidArgumentException`. Requires envd 0.6.2 or later.
 
+        :param resumable: Upload the file in chunks to a temporary path in the sandbox, retrying a chunk that failed on a network error instead of restarting the upload, and rename it into place once complete. The file appears at `path` only when fully written. If the upload fails, the confirmed chunks stay in the sandbox, and writing the same data to the same `path` with the same `chunk_size` again resumes after them; this needs data of a known size, e.g. `bytes` or a binary file. Can't be combined with `metadata`. Requires envd 0.6.7 or later.
+        :param chunk_size: Size of the chunks of a resumable upload in bytes, defaults to 16 MiB. Each chunk is a separate request bounded by `request_timeout`.
+        :param on_progress: Called as `on_progress(bytes_done, total, rate)` as the file content is sent, for each chunk of a streamed upload and once for data sent from memory. `total` is `None` when the size isn't known up front (e.g. for text streams).
+        :param skip_if_identical: Don't upload `data` when the file at `path` already has the same content, then return the information about that file. The sizes are compared first and only a file of the same size is hashed, locally and in the sandbox (SHA-256). Only `str`, `bytes` and seekable file-like data is compared; a file-like object is read twice and rewound in between. Other data is always uploaded. A skipped file keeps its metadata and owner.
+
         :return: Information about the written file
         """
+        if skip_if_identical:
+            existing = self._identical_file(path, data, user, request_timeout)
+            if existing is not None:
+                return existing
+
+        if resumable:
+            return self._write_resumable(
+                path,
+                data,
+                user=user,
+                request_timeout=request_timeout,
+                gzip=gzip,
+                metadata=metadata,
+                chunk_size=chunk_size or RESUMABLE_UPLOAD_CHUNK_SIZE,
+                on_progress=on_progress,
+            )
+
         result = self.write_files(
             [WriteEntry(path=path, data=data)],
             user=user,
@@ -286,6 +631,7 @@ class Filesystem:
             gzip=gzip,
             use_octet_stream=use_octet_stream,
             metadata=metadata,
+            on_progress=on_progress,
         )
 
         if len(result) != 1:
@@ -293,6 +639,142 @@ class Filesystem:
 
         return result[0]
 
+    def _write_resumable(
+        self,
+        path: str,
+        data: Union[str, bytes, Readable],
+        user: Optional[Username],
+        request_timeout: Optional[float],
+        gzip: bool,
+        metadata: Optional[Dict[str, str]],
+        chunk_size: int,
+        on_progress: Optional[ProgressHandler],
+    ) -> EntryInfo:
+        if metadata:
+            raise InvalidArgumentException(
+                "File metadata can't be set on a resumable upload."
+            )
+        if self._envd_version < ENVD_FILE_COMPOSE:
+            raise TemplateException("Resumable uploads require envd 0.6.7 or later.")
+
+        upload = ResumableUpload(path, data, chunk_size)
+
+        username = user
+        if username is None and self._envd_version < ENVD_DEFAULT_USER:
+            username = default_username
+
+        timeout = self._connection_config.get_request_timeout(request_timeout)
+        headers = {"Content-Type": "application/octet-stream"}
+        if gzip:
+            headers["Content-Encoding"] = "gzip"
+
+        def upload_part(part: str, chunk: bytes) -> None:
+            params = {"path": part}
+            if username:
+                params["username"] = username
+            body = compress(chunk) if gzip else chunk
+
+            retries = 0
+            while True:
+                try:
+                    with self._upload_semaphore:
+                        r = self._envd_api.post(
+                            ENVD_API_FILES_ROUTE,
+                            content=body,
+                            headers=headers,
+                            params=params,
+                            timeout=timeout,
+                        )
+                    break
+                except httpx.TransportError as e:
+                    if retries >= UPLOAD_CHUNK_RETRIES:
+                        if isinstance(e, httpx.RemoteProtocolError):
+                            raise handle_envd_api_transport_exception_with_health(
+                                e, self._envd_api
+                            )
+                        raise
+                    time.sleep(UPLOAD_CHUNK_RETRY_DELAY * 2**retries)
+                    retries += 1
+
+            err = _handle_filesystem_envd_api_exception(r)
+            if err:
+                raise err
+
+        progress = self._upload_progress([data], on_progress)
+        composed = False
+        try:
+            if upload.resumable:
+                try:
+                    parts = self.list(
+                        upload.parts_dir, user=user, request_timeout=request_timeout
+                    )
+                except FileNotFoundException:
+                    parts = []
+                upload.resume(parts)
+                if upload.offset:
+                    progress.update(upload.offset)
+
+            while True:
+                chunk = upload.read_chunk()
+                if chunk is None:
+                    break
+                part = upload.next_part()
+                upload_part(part, chunk)
+                upload.confirm(part, len(chunk))
+                progress.update(len(chunk))
+
+            compose_request = {
+                "source_paths": upload.parts,
+                "destination": upload.temp_path,
+            }
+            if username:
+                compose_request["username"] = username
+            try:
+                r = self._envd_api.post(
+                    ENVD_API_FILES_COMPOSE_ROUTE,
+                    json=compose_request,
+                    timeout=timeout,
+                )
+            except httpx.RemoteProtocolError as e:
+                raise handle_envd_api_transport_exception_with_health(e, self._envd_api)
+
+            err = _handle_filesystem_envd_api_exception(r)
+            if err:
+                raise err
+            composed = True
+
+            return self.rename(
+                upload.temp_path, path, user=user, request_timeout=request_timeout
+            )
+        except BaseException:
+            if composed:
+                self._remove_quietly(upload.temp_path, user, request_timeout)
+            raise
+        finally:
+            progress.finish()
+            # Composing deletes the parts but not their directory. The parts
+            # of a failed upload are kept for the next upload of the same data
+            # to resume from.
+            if composed or not upload.resumable:
+                self._remove_quietly(upload.parts_dir, user, request_timeout)
+
+    def _upload_progress(
+        self,
+        data: List[Union[str, bytes, Readable]],
+        on_progress: Optional[ProgressHandler],
+    ) -> TransferProgress:
+        sizes = [upload_size(d) for d in data]
+        total = None if None in sizes else sum(cast(List[int], sizes))
+        return TransferProgress(True, total, on_progress, self._transfer_stats)
+
+    def _remove_quietly(
+        self, path: str, user: Optional[Username], request_timeout: Optional[float]
+    ) -> None:
+        try:
+            self.remove(path, user=user, request_timeout=request_timeout)
+        except Exception:
+            pass
+
     def write_files(
         self,
         files: List[WriteEntry],
@@ -301,6 +783,8 @@ class Filesystem:
         gzip: bool = False,
         use_octet_stream: Optional[bool] = None,
         metadata: Optional[Dict[str, str]] = None,
+        max_concurrency: int = WRITE_FILES_MAX_CONCURRENCY,
+        on_progress: Optional[ProgressHandler] = None,
     ) -> List[WriteInfo]:
         """
         Writes multiple files.
@@ -316,14 +800,92 @@ class Filesystem:
         :param gzip: Use gzip compression for the upload. Implies the `application/octet-stream` upload. Requires envd 0.5.7 or later — when not supported, the upload falls back to uncompressed `multipart/form-data`.
         :param use_octet_stream: Upload using `application/octet-stream` instead of `multipart/form-data`. Defaults to `None`, which uses octet-stream when any entry is a file-like object (so streamed uploads aren't buffered) and `multipart/form-data` otherwise. Requires envd 0.5.7 or later — when not supported, the upload falls back to `multipart/form-data`, which reads text-mode file-like data into memory (httpx only streams binary file objects in a multipart body).
         :param metadata: User-defined metadata to persist on each uploaded file as extended attributes; the same map is applied to every file. Keys are lowercased by the sandbox; invalid keys or values raise an `InvalidArgumentException`. Requires envd 0.6.2 or later.
-        :return: Information about the written files
+        :param max_concurrency: Maximum number of files uploaded at the same time by an `application/octet-stream` upload. Uploads of all calls on the sandbox are additionally capped at `SANDBOX_MAX_CONCURRENT_UPLOADS`.
+        :param on_progress: Called as `on_progress(bytes_done, total, rate)` as the content of the files is sent, summed over all of them
+        :return: Information about the written files, in the order of `files`
         """
+        results: List[List[WriteInfo]] = [[] for _ in files]
+        progress = self._upload_progress([f["data"] for f in files], on_progress)
+        try:
+            with closing(
+                self._write_files(
+                    files,
+                    user=user,
+                    request_timeout=request_timeout,
+                    gzip=gzip,
+                    use_octet_stream=use_octet_stream,
+                    metadata=metadata,
+                    max_concurrency=max_concurrency,
+                    progress=progress,
+                )
+            ) as written:
+                for index, infos in written:
+                    results[index] = infos
+        finally:
+            progress.finish()
+
+        return [info for infos in results for info in infos]
+
+    def iter_write_files(
+        self,
+        files: List[WriteEntry],
+        user: Optional[Username] = None,
+        request_timeout: Optional[float] = None,
+        gzip: bool = False,
+        use_octet_stream: Optional[bool] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        max_concurrency: int = WRITE_FILES_MAX_CONCURRENCY,
+        on_progress: Optional[ProgressHandler] = None,
+    ) -> Generator[WriteInfo, None, None]:
+        """
+        Writes multiple files, yielding information about each written file as soon as its upload completes.
+
+        Takes the same arguments as `write_files`. Files are yielded in completion order, not in the order of `files`. Uploads not yet started are cancelled when the iteration is stopped early; uploads already in flight finish first.
+
+        :return: Iterator of information about the written files
+        """
+        progress = self._upload_progress([f["data"] for f in files], on_progress)
+        try:
+            with closing(
+                self._write_files(
+                    files,
+                    user=user,
+                    request_timeout=request_timeout,
+                    gzip=gzip,
+                    use_octet_stream=use_octet_stream,
+                    metadata=metadata,
+                    max_concurrency=max_concurrency,
+                    progress=progress,
+                )
+            ) as written:
+                for _, infos in written:
+                    for info in infos:
+                        yield info
+        finally:
+            progress.finish()
+
+    def _write_files(
+        self,
+        files: List[WriteEntry],
+        user: Optional[Username],
+        request_timeout: Optional[float],
+        gzip: bool,
+        use_octet_stream: Optional[bool],
+        metadata: Optional[Dict[str, str]],
+        max_concurrency: int,
+        progress: TransferProgress,
+    ) -> Generator[Tuple[int, List[WriteInfo]], None, None]:
+        # Yields the index of each upload in `files` with its results, as the
+        # uploads complete.
+        if max_concurrency < 1:
+            raise InvalidArgumentException("max_concurrency must be at least 1")
+
         username = user
         if username is None and self._envd_version < ENVD_DEFAULT_USER:
             username = default_username
 
         if len(files) == 0:
-            return []
+            return
 
         validate_metadata(metadata)
 
@@ -360,10 +922,9 @@ class Filesystem:
         # metadata is applied to every file in a multi-file upload.
         extra_headers = metadata_to_headers(metadata)
 
-        results: List[WriteInfo] = []
-
         if use_octet_stream:
-            for file in files:
+
+            def _upload_file(file) -> List[WriteInfo]:
                 file_path, file_data = file["path"], file["data"]
 
                 params = {"path": file_path}
@@ -378,7 +939,7 @@ class Filesystem:
                 try:
                     r = self._envd_api.post(
                         ENVD_API_FILES_ROUTE,
-                        content=to_upload_body(file_data, gzip),
+                        content=to_upload_body(file_data, gzip, progress),
                         headers=headers,
                         params=params,
                         timeout=None if is_streamed else upload_timeout,
@@ -399,7 +960,42 @@ class Filesystem:
                         "Expected to receive information about written file"
                     )
 
-                results.extend([WriteInfo.from_dict(f) for f in write_result])
+                if not is_streamed:
+                    progress.update(cast(int, upload_size(file_data)))
+
+                return [WriteInfo.from_dict(f) for f in write_result]
+
+            def _upload_indexed(index: int, file) -> Tuple[int, List[WriteInfo]]:
+                with self._upload_semaphore:
+                    return index, _upload_file(file)
+
+            if max_concurrency == 1 or len(files) == 1:
+                for index, file in enumerate(files):
+                    yield _upload_indexed(index, file)
+                return
+
+            # Submit uploads only as workers free up, so a large batch isn't
+            # queued on the executor up front.
+            entries = iter(enumerate(files))
+            pending: Set["Future[Tuple[int, List[WriteInfo]]]"] = set()
+            with ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(files))
+            ) as executor:
+                try:
+                    while True:
+                        for index, file in islice(
+                            entries, max_concurrency - len(pending)
+                        ):
+                            pending.add(executor.submit(_upload_indexed, index, file))
+                        if not pending:
+                            break
+
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+                finally:
+                    for future in pending:
+                        future.cancel()
         else:
             params = {}
             if username:
@@ -408,9 +1004,13 @@ class Filesystem:
                 params["path"] = files[0]["path"]
 
             httpx_files = [_to_httpx_file(file["path"], file["data"]) for file in files]
+            # Sized before httpx reads the streamed entries.
+            body_size = sum(
+                upload_size(content) or 0 for _, (_, content) in httpx_files
+            )
 
             if len(httpx_files) == 0:
-                return []
+                return
 
             try:
                 r = self._envd_api.post(
@@ -440,9 +1040,308 @@ class Filesystem:
                     "Expected to receive information about written file"
                 )
 
-            results.extend([WriteInfo.from_dict(f) for f in write_result])
+            # httpx reads the multipart body itself, so its progress is only
+            # known once it's sent.
+            progress.update(body_size)
+
+            yield 0, [WriteInfo.from_dict(f) for f in write_result]
+
+    def sync_dir(
+        self,
+        local_dir: str,
+        remote_dir: str,
+        delete: bool = False,
+        checksum: bool = False,
+        depth: Optional[int] = None,
+        user: Optional[Username] = None,
+        request_timeout: Optional[float] = None,
+        max_concurrency: int = WRITE_FILES_MAX_CONCURRENCY,
+    ) -> SyncDirResult:
+        """
+        Make a directory in the sandbox match a local directory, uploading only the files that changed.
+
+        The remote directory is listed once and compared with the local tree: a file is uploaded when it's new, its size differs, or it isn't the local file an earlier `sync_dir` on this sandbox uploaded there, going by the local size and modification time recorded at upload. New and changed files are uploaded in parallel.
+
+        :param local_dir: Local directory to sync from
+        :param remote_dir: Directory in the sandbox to sync to, created if it doesn't exist
+        :param delete: Remove files and directories in the sandbox that don't exist locally
+        :param checksum: Compare the content of such files of the same size instead of uploading them, at the cost of hashing them, and the sandbox copy too (with `sha256sum`) unless the content matches what an earlier `sync_dir` uploaded
+        :param depth: Depth to list the remote directory to, defaults to one level deeper than the local tree
+        :param user: Run the operation as this user
+        :param request_timeout: Timeout for each request in **seconds**
+        :param max_concurrency: Maximum number of files uploaded or removed at the same time
+
+        :return: Paths of the uploaded, deleted and unchanged entries in the sandbox
+        """
+        local = scan_local_dir(local_dir)
+
+        try:
+            root_info = self.get_info(
+                remote_dir, user=user, request_timeout=request_timeout
+            )
+        except FileNotFoundException:
+            remote_root, entries = None, []
+        else:
+            if root_info.type != FileType.DIR:
+                raise InvalidArgumentException(
+                    f"Path '{remote_dir}' in the sandbox is not a directory"
+                )
+            remote_root = root_info.path
+            entries = self.list(
+                remote_dir,
+                depth=depth or local.depth + 1,
+                user=user,
+                request_timeout=request_timeout,
+            )
+
+        plan = plan_dir_sync(
+            local_dir,
+            local,
+            remote_root,
+            entries,
+            self._sync_manifest,
+            checksum,
+            delete,
+        )
+
+        def remote_path(rel: str) -> str:
+            return posixpath.join(remote_root or remote_dir, rel)
+
+        if plan.verify:
+
+            def same_content(rel: str) -> bool:
+                digest = self._remote_hash(
+                    remote_path(rel), "sha256", user, request_timeout
+                )
+                return digest == plan.digests[rel]
+
+            with ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(plan.verify))
+            ) as executor:
+                plan.settle(list(executor.map(same_content, plan.verify)))
+
+        # Files found unchanged by their content are recorded with their new
+        # modification time, so the next sync doesn't hash them again.
+        for rel in plan.unchanged:
+            if rel in plan.digests:
+                self._sync_manifest.record(
+                    remote_path(rel), local.files[rel], plan.digests[rel]
+                )
+
+        def remove(path: str) -> None:
+            self.remove(path, user=user, request_timeout=request_timeout)
+            self._sync_manifest.forget(path)
+
+        if plan.delete:
+            with ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(plan.delete))
+            ) as executor:
+                list(executor.map(remove, plan.delete))
+
+        # Open the files in batches, so a large tree doesn't exhaust file
+        # descriptors.
+        batch_size = max_concurrency * 8
+        for start in range(0, len(plan.upload), batch_size):
+            batch = plan.upload[start : start + batch_size]
+            with ExitStack() as stack:
+                self.write_files(
+                    [
+                        WriteEntry(
+                            path=remote_path(rel),
+                            data=stack.enter_context(
+                                open(os.path.join(local_dir, *rel.split("/")), "rb")
+                            ),
+                        )
+                        for rel in batch
+                    ],
+                    user=user,
+                    request_timeout=request_timeout,
+                    max_concurrency=max_concurrency,
+                )
+
+            for rel in batch:
+                digest = plan.digests.get(rel)
+                if checksum and digest is None:
+                    digest = hash_local_file(os.path.join(local_dir, *rel.split("/")))
+                self._sync_manifest.record(remote_path(rel), local.files[rel], digest)
+
+        make_dirs = [remote_path(rel) for rel in plan.make_dirs]
+        if remote_root is None and not plan.upload and not make_dirs:
+            make_dirs.append(remote_dir)
+        for path in make_dirs:
+            self.make_dir(path, user=user, request_timeout=request_timeout)
+
+        return SyncDirResult(
+            uploaded=[remote_path(rel) for rel in plan.upload],
+            deleted=plan.delete,
+            created_dirs=make_dirs,
+            unchanged=[remote_path(rel) for rel in plan.unchanged],
+        )
+
+    def write_archive(
+        self,
+        local_paths: List[str],
+        remote_dir: str,
+        user: Optional[Username] = None,
+        request_timeout: Optional[float] = None,
+        gzip: bool = False,
+        timeout: Optional[float] = 60,
+    ) -> None:
+        """
+        Upload local files and directories to the sandbox as a single tar archive.
+
+        The archive is produced while it is uploaded and extracted in the sandbox with `tar`, so a tree of many small files costs one upload instead of one request per file. Each path is extracted under its base name in `remote_dir`, directories recursively.
+
+        :param local_paths: Local files and directories to upload
+        :param remote_dir: Directory in the sandbox to extract the archive to, created if it doesn't exist
+        :param user: Run the operation as this user
+        :param request_timeout: Timeout for the request in **seconds**
+        :param gzip: Compress the archive for the transfer
+        :param timeout: Timeout for extracting the archive in **seconds**, `0` disables it
+        """
+        commands = self._require_commands("archive transfers")
+        archive = staged_archive_path()
+
+        try:
+            with TarArchiveStream(local_paths) as stream:
+                self.write(
+                    archive,
+                    stream,
+                    user=user,
+                    request_timeout=request_timeout,
+                    gzip=gzip,
+                    use_octet_stream=True,
+                )
+        except BaseException:
+            self._remove_quietly(archive, user, request_timeout)
+            raise
+
+        commands.run(
+            extract_archive_command(archive, remote_dir),
+            user=user,
+            timeout=timeout,
+            request_timeout=request_timeout,
+        )
+
+    def read_archive(
+        self,
+        remote_dir: str,
+        local_dir: str,
+        user: Optional[Username] = None,
+        request_timeout: Optional[float] = None,
+        gzip: bool = False,
+        timeout: Optional[float] = 60,
+    ) -> List[str]:
+        """
+        Download the contents of a directory in the sandbox as a single tar archive and extract it locally.
+
+        The directory is archived in the sandbox with `tar`, so a tree of many small files costs one download instead of one request per file. Members that would be extracted outside of `local_dir` are rejected.
+
+        :param remote_dir: Directory in the sandbox to download
+        :param local_dir: Local directory to extract the contents to, created if it doesn't exist
+        :param user: Run the operation as this user
+        :param request_timeout: Timeout for the request in **seconds**
+        :param gzip: Compress the archive for the transfer
+        :param timeout: Timeout for creating the archive in **seconds**, `0` disables it
+
+        :return: Local paths of the extracted files and directories
+        """
+        commands = self._require_commands("archive transfers")
+        archive = staged_archive_path()
+
+        try:
+            commands.run(
+                create_archive_command(archive, remote_dir),
+                user=user,
+                timeout=timeout,
+                request_timeout=request_timeout,
+            )
+            stream = self.read(
+                archive,
+                format="stream",
+                user=user,
+                request_timeout=request_timeout,
+                gzip=gzip,
+            )
+            with stream:
+                return extract_archive(IterStream(stream), local_dir)
+        finally:
+            self._remove_quietly(archive, user, request_timeout)
+
+    def hash(
+        self,
+        path: str,
+        algo: HashAlgorithm = "sha256",
+        user: Optional[Username] = None,
+        request_timeout: Optional[float] = None,
+        timeout: Optional[float] = 60,
+    ) -> str:
+        """
+        Compute the digest of a file in the sandbox, without downloading it.
+
+        The file is hashed in the sandbox with the matching coreutils command (e.g. `sha256sum`).
 
-        return results
+        :param path: Path to the file
+        :param algo: Hash algorithm, one of `md5`, `sha1`, `sha256` or `sha512`
+        :param user: Run the operation as this user
+        :param request_timeout: Timeout for the request in **seconds**
+        :param timeout: Timeout for hashing the file in **seconds**, `0` disables it
+
+        :return: Hex digest of the file content
+        """
+        validate_hash_algorithm(algo)
+        info = self.get_info(path, user=user, request_timeout=request_timeout)
+        if info.type == FileType.DIR:
+            raise InvalidArgumentException(f"Path '{path}' is a directory")
+        return self._remote_hash(path, algo, user, request_timeout, timeout)
+
+    def _remote_hash(
+        self,
+        path: str,
+        algo: HashAlgorithm,
+        user: Optional[Username],
+        request_timeout: Optional[float],
+        timeout: Optional[float] = 60,
+    ) -> str:
+        commands = self._require_commands("hashing files")
+        result = commands.run(
+            remote_hash_command(path, algo),
+            user=user,
+            timeout=timeout,
+            request_timeout=request_timeout,
+        )
+        return parse_hash_output(result.stdout, path)
+
+    def _identical_file(
+        self,
+        path: str,
+        data: Union[str, bytes, Readable],
+        user: Optional[Username],
+        request_timeout: Optional[float],
+    ) -> Optional[EntryInfo]:
+        # Sizes are compared first, so only a file that may match is hashed.
+        size = upload_size(data)
+        if size is None:
+            return None
+        try:
+            info = self.get_info(path, user=user, request_timeout=request_timeout)
+        except FileNotFoundException:
+            return None
+        if info.type != FileType.FILE or info.size != size:
+            return None
+
+        local = hash_upload_data(data)
+        if local is None:
+            return None
+        remote = self._remote_hash(path, "sha256", user, request_timeout)
+        return info if remote == local else None
+
+    def _require_commands(self, purpose: str) -> Commands:
+        if self._commands is None:
+            raise SandboxException(
+                f"The sandbox's commands module is required for {purpose}."
+            )
+        return self._commands
 
     def list(
         self,
@@ -2,8 +2,10 @@ import datetime
 import json
 import logging
 import shlex
+import threading
 import uuid
-from typing import Dict, List, Optional, Union, overload
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
+from typing import Dict, Generator, List, Optional, Set, Union, overload
 
 import httpx
 from packaging.version import Version
@@ -15,6 +17,8 @@ from e2b.connection_config import ApiParams, ConnectionConfig
 from e2b.envd.api import ENVD_API_HEALTH_ROUTE, handle_envd_api_exception
 from e2b.envd.versions import ENVD_DEBUG_FALLBACK
 from e2b.exceptions import (
+    InvalidArgumentException,
+    RateLimitException,
     SandboxException,
     TemplateException,
     format_request_timeout_error,
@@ -30,7 +34,11 @@ from e2b.sandbox.sandbox_api import (
     SandboxNetworkUpdate,
     SnapshotInfo,
 )
-from e2b.sandbox.utils import class_method_variant
+from e2b.sandbox.utils import (
+    RATE_LIMIT_MAX_RETRIES,
+    RateLimitBackoff,
+    class_method_variant,
+)
 from e2b.sandbox_sync.commands.command import Commands
 from e2b.sandbox_sync.commands.pty import Pty
 from e2b.sandbox_sync.filesystem.filesystem import Filesystem
@@ -105,17 +113,18 @@ class Sandbox(SandboxApi):
         super().__init__(**opts)
 
         self._envd_api = get_envd_api(self.connection_config, self.envd_api_url)
-        self._filesystem = Filesystem(
+        self._commands = Commands(
             self.envd_api_url,
-            self._envd_version,
             self.connection_config,
+            self._envd_version,
             self._envd_api,
         )
-        self._commands = Commands(
+        self._filesystem = Filesystem(
             self.envd_api_url,
-            self.connection_config,
             self._envd_version,
+            self.connection_config,
             self._envd_api,
+            commands=self._commands,
         )
         self._pty = Pty(
             self.envd_api_url,
@@ -254,6 +263,116 @@ class Sandbox(SandboxApi):
 
         return sandbox
 
+    @classmethod
+    def create_many(
+        cls,
+        count: int,
+        template: Optional[str] = None,
+        timeout: Optional[int] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        envs: Optional[Dict[str, str]] = None,
+        secure: bool = True,
+        allow_internet_access: bool = True,
+        mcp: Optional[McpServer] = None,
+        network: Optional[SandboxNetworkOpts] = None,
+        iam: Optional[SandboxIamOpts] = None,
+        lifecycle: Optional[SandboxLifecycle] = None,
+        volume_mounts: Optional[SandboxVolumeMount] = None,
+        logger: Optional[logging.Logger] = None,
+        max_concurrency: int = 10,
+        **opts: Unpack[ApiParams],
+    ) -> Generator[Self, None, None]:
+        """
+        Create many sandboxes with the same configuration.
+
+        At most `max_concurrency` sandboxes are being created at a time, each on its own worker thread. When the API rate limit is hit,
+        all pending creates back off together and the rate-limited ones are retried.
+        Sandboxes are returned in the order they finish being created, so one slow create doesn't hold back the rest.
+
+        If a create fails, the error is raised when it is reached and the remaining creates are stopped.
+        Sandboxes that were created but not returned are killed.
+
+        :param count: Number of sandboxes to create
+        :param max_concurrency: Maximum number of sandboxes being created at the same time
+
+        The other parameters are the same as in `create` and apply to every sandbox.
+
+        :return: Iterator of the created sandboxes
+
+        Example
+        ```python
+        from e2b import Sandbox
+
+        for sandbox in Sandbox.create_many(100, max_concurrency=20):
+            print(sandbox.sandbox_id)
+        ```
+        """
+        if count < 0:
+            raise InvalidArgumentException("count must not be negative")
+        if max_concurrency < 1:
+            raise InvalidArgumentException("max_concurrency must be at least 1")
+
+        backoff = RateLimitBackoff()
+        closing = threading.Event()
+
+        def create_one() -> Self:
+            retries = 0
+            while True:
+                delay = backoff.wait_time()
+                while delay > 0 and not closing.wait(delay):
+                    delay = backoff.wait_time()
+                if closing.is_set():
+                    raise CancelledError()
+
+                try:
+                    sandbox = cls.create(
+                        template=template,
+                        timeout=timeout,
+                        metadata=metadata,
+                        envs=envs,
+                        secure=secure,
+                        allow_internet_access=allow_internet_access,
+                        mcp=mcp,
+                        network=network,
+                        iam=iam,
+                        lifecycle=lifecycle,
+                        volume_mounts=volume_mounts,
+                        logger=logger,
+                        **opts,
+                    )
+                except RateLimitException:
+                    if closing.is_set() or retries >= RATE_LIMIT_MAX_RETRIES:
+                        raise
+                    retries += 1
+                    backoff.on_rate_limit()
+                    continue
+
+                backoff.on_success()
+                return sandbox
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        futures = [executor.submit(create_one) for _ in range(count)]
+        returned: Set[int] = set()
+        try:
+            for future in as_completed(futures):
+                sandbox = future.result()
+                returned.add(id(sandbox))
+                yield sandbox
+        finally:
+            closing.set()
+            # Creates that already reached the API are let finish, so the
+            # sandboxes they create can be killed instead of leaking
+            executor.shutdown(wait=True, cancel_futures=True)
+            for future in futures:
+                if future.cancelled() or future.exception() is not None:
+                    continue
+                sandbox = future.result()
+                if id(sandbox) not in returned:
+                    try:
+                        sandbox.kill()
+                    except Exception:
+                        pass
+
     @overload
     def connect(
         self,
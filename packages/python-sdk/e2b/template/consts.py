@@ -23,6 +23,12 @@ template. When True, the upload archive is gzipped before being uploaded.
 """
 GZIP = True
 
+"""
+zlib compression level of gzipped upload archives, the same as the default
+of tarfile's "w:gz" mode.
+"""
+GZIP_COMPRESS_LEVEL = 9
+
 """
 Default timeout (in seconds) for uploading the build-context archive to the
 S3 presigned URL. Uploads of large archives can take far longer than the 60s
@@ -31,3 +37,44 @@ caller passes an explicit ``request_timeout``. This matches the JS SDK's
 ``FILE_UPLOAD_TIMEOUT_MS``.
 """
 FILE_UPLOAD_TIMEOUT_SECONDS = 3600
+
+"""
+Size (in bytes) of the chunks read from each file when hashing COPY sources.
+Files are streamed through the hash in chunks of this size, so memory use
+stays flat no matter how large the individual files are.
+"""
+HASH_CHUNK_SIZE = 1024 * 1024
+
+"""
+Maximum number of COPY source files read ahead on a thread pool while
+hashing. The file contents go through the step hash in path order, so reading
+the next files on other threads overlaps their IO with hashing the current one.
+Up to this many first chunks of `HASH_CHUNK_SIZE` bytes are held in memory.
+"""
+HASH_READ_AHEAD = 16
+
+"""
+Format version of the on-disk file hash cache. Bump it whenever the cached
+hashes or the cache layout change, so stale caches are discarded.
+"""
+HASH_CACHE_VERSION = 2
+
+"""
+Default number of COPY steps whose build-context archives are looked up and
+uploaded at the same time during a template build.
+"""
+MAX_CONCURRENT_UPLOADS = 4
+
+"""
+Maximum number of build log entries fetched per request. It is the limit of
+the build logs endpoint; a full page means more entries are likely pending,
+so the next page is requested right away.
+"""
+BUILD_LOGS_PAGE_SIZE = 100
+
+"""
+Longest interval (in seconds) between build log requests. While a build
+produces no new logs, the interval doubles from the refresh frequency up to
+this value.
+"""
+BUILD_LOGS_MAX_INTERVAL = 2.0
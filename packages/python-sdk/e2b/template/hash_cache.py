@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from e2b.template.consts import HASH_CACHE_VERSION
+
+"""
+Steps with files modified this recently (in nanoseconds) are not cached. A
+file that is still being written can change again without moving its mtime
+past the filesystem's timestamp granularity, so its hash can't be trusted yet.
+"""
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def get_hash_cache_dir() -> str:
+    """
+    Get the directory holding the template file hash caches.
+
+    Honors ``XDG_CACHE_HOME`` and falls back to ``~/.cache``.
+
+    :return: Path to the cache directory
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "e2b", "template-hashes")
+
+
+class FileHashCache:
+    """
+    Persistent cache of the file hashes of template COPY steps.
+
+    Entries are keyed by the COPY step and are valid only while the relative
+    path, size, mtime (in nanoseconds), inode and mode of every file of the
+    step are unchanged, so the files of unchanged steps aren't read again.
+    Each file context directory gets its own cache file.
+
+    The cache is best-effort: a missing, corrupt or unwritable cache file
+    behaves like an empty cache and never fails a build.
+    """
+
+    def __init__(self, cache_path: str, entries: Optional[Dict[str, List]] = None):
+        self._cache_path = cache_path
+        self._entries: Dict[str, List] = entries or {}
+        self._dirty = False
+
+    @classmethod
+    def load(
+        cls, context_path: str, cache_dir: Optional[str] = None
+    ) -> "FileHashCache":
+        """
+        Load the cache for a file context directory.
+
+        :param context_path: The template's file context directory
+        :param cache_dir: Directory holding the cache files, defaults to `get_hash_cache_dir()`
+
+        :return: The loaded cache, empty if none exists yet or it can't be read
+        """
+        context_key = hashlib.sha256(
+            os.path.abspath(context_path).encode()
+        ).hexdigest()[:32]
+        cache_path = os.path.join(
+            cache_dir or get_hash_cache_dir(), f"{context_key}.json"
+        )
+
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(cache_path)
+
+        if not isinstance(data, dict) or data.get("version") != HASH_CACHE_VERSION:
+            return cls(cache_path)
+
+        entries = data.get("entries")
+        return cls(cache_path, entries if isinstance(entries, dict) else None)
+
+    @staticmethod
+    def signature(
+        entries: Iterable[Tuple[str, os.stat_result, Optional[str]]],
+    ) -> str:
+        """
+        Get the signature of the files of a COPY step.
+
+        :param entries: Relative path, stat result and symlink target (if hashed as a link) of each file
+
+        :return: Hex digest of the stat data of the files
+        """
+        hash_obj = hashlib.sha256()
+        for relative_path, stats, link_target in entries:
+            key = [
+                relative_path,
+                stats.st_size,
+                stats.st_mtime_ns,
+                stats.st_ino,
+                stats.st_mode,
+                link_target,
+            ]
+            hash_obj.update(json.dumps(key).encode())
+        return hash_obj.hexdigest()
+
+    def get(self, key: str, signature: str) -> Optional[str]:
+        """
+        Get the cached hash of a COPY step.
+
+        :param key: Key of the COPY step
+        :param signature: Current `signature()` of the step's files
+
+        :return: The cached hash, or None if missing or a file changed
+        """
+        entry = self._entries.get(key)
+        if not isinstance(entry, list) or len(entry) != 2:
+            return None
+
+        if entry[0] != signature or not isinstance(entry[1], str):
+            return None
+        return entry[1]
+
+    def set(self, key: str, signature: str, files_hash: str, modified_ns: int) -> None:
+        """
+        Store the hash of a COPY step.
+
+        :param key: Key of the COPY step
+        :param signature: `signature()` of the step's files taken before they were hashed
+        :param files_hash: Hash of the step's files
+        :param modified_ns: Latest mtime of the step's files in nanoseconds
+        """
+        if time.time_ns() - modified_ns < _RACY_WINDOW_NS:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+            return
+
+        if self._entries.get(key) == [signature, files_hash]:
+            return
+        self._entries[key] = [signature, files_hash]
+        self._dirty = True
+
+    def save(self) -> None:
+        """
+        Write the cache back to disk if it changed.
+
+        The file is replaced atomically, so concurrent builds never read a
+        partially written cache.
+        """
+        if not self._dirty:
+            return
+
+        cache_dir = os.path.dirname(self._cache_path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {"version": HASH_CACHE_VERSION, "entries": self._entries}, f
+                    )
+                os.replace(tmp_path, self._cache_path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            # The cache only speeds builds up; failing to persist it is not an error
+            return
+
+        self._dirty = False
@@ -1,9 +1,10 @@
 import sys
 import threading
 import time
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, TypedDict, Callable, Dict, Literal
+from typing import Optional, TypedDict, Callable, Dict, List, Literal, Tuple
 
 from rich.console import Console
 from rich.style import Style
@@ -50,6 +51,57 @@ class LogEntryEnd(LogEntry):
     level: LogEntryLevel = field(default="debug", init=False)
 
 
+class BuildLogsCursor:
+    """
+    Position in the log stream of a template build.
+
+    The build logs endpoint pages by timestamp in milliseconds and a page may
+    start at the millisecond the previous one ended at. Entries already seen
+    at that millisecond are remembered, so they are not returned twice.
+    """
+
+    def __init__(self):
+        self.cursor = 0
+        self._seen: Counter[Tuple[datetime, str, str]] = Counter()
+
+    def advance(self, entries: List[LogEntry]) -> List[LogEntry]:
+        """
+        Move the cursor past a page of log entries.
+
+        :param entries: Log entries fetched from the cursor, oldest first
+
+        :return: The entries that were not seen before
+        """
+        # Entries at the cursor's millisecond that were already returned
+        duplicates = Counter(self._seen)
+        new_entries = []
+        for entry in entries:
+            timestamp = int(entry.timestamp.timestamp() * 1000)
+            key = (entry.timestamp, entry.level, entry.message)
+            if timestamp < self.cursor:
+                continue
+            if timestamp == self.cursor and duplicates[key] > 0:
+                duplicates[key] -= 1
+                continue
+            if timestamp > self.cursor:
+                self.cursor = timestamp
+                self._seen.clear()
+            self._seen[key] += 1
+            new_entries.append(entry)
+
+        return new_entries
+
+    def skip_millisecond(self) -> None:
+        """
+        Move the cursor to the next millisecond.
+
+        Used when a full page holds only entries that were already seen, which
+        happens if more entries than fit a page share one millisecond.
+        """
+        self.cursor += 1
+        self._seen.clear()
+
+
 """
 Interval in milliseconds for updating the build timer display.
 """
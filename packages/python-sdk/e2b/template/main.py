@@ -8,6 +8,7 @@ from e2b.connection_config import ClientFactory
 from e2b.exceptions import BuildException, InvalidArgumentException
 from e2b.template.consts import RESOLVE_SYMLINKS
 from e2b.template.dockerfile_parser import parse_dockerfile
+from e2b.template.hash_cache import FileHashCache
 from e2b.template.readycmd import ReadyCmd, wait_for_file
 from e2b.template.types import (
     CopyItem,
@@ -17,11 +18,11 @@ from e2b.template.types import (
     InstructionType,
 )
 from e2b.template.utils import (
+    ContextSnapshot,
     calculate_files_hash,
     get_caller_directory,
     make_traceback,
     pad_octal,
-    read_dockerignore,
     read_gcp_service_account_json,
     get_caller_frame,
     validate_relative_path,
@@ -1212,15 +1213,33 @@ class TemplateBase(ClientFactory):
 
         return dockerfile
 
+    def _context_snapshot(self) -> ContextSnapshot:
+        """
+        Snapshot the file context for a single build.
+
+        :return: Context snapshot with the template's ignore patterns and `.dockerignore` applied
+        """
+        return ContextSnapshot.from_context(
+            self._file_context_path, self._file_ignore_patterns
+        )
+
     def _instructions_with_hashes(
         self,
+        snapshot: Optional[ContextSnapshot] = None,
     ) -> List[Instruction]:
         """
         Add file hashes to COPY instructions for cache invalidation.
 
+        Step hashes are reused from the on-disk `FileHashCache` of the file
+        context directory, so the files of unchanged steps aren't read again.
+
+        :param snapshot: Context snapshot to share with the upload stage, a fresh one is taken if not provided
         :return: Copy of instructions list with filesHash added to COPY instructions
         """
         steps: List[Instruction] = []
+        if snapshot is None:
+            snapshot = self._context_snapshot()
+        hash_cache: Optional[FileHashCache] = None
 
         for index, instruction in enumerate(self._instructions):
             step: Instruction = {
@@ -1243,23 +1262,28 @@ class TemplateBase(ClientFactory):
                 if src is None or dest is None:
                     raise ValueError("Source path and destination path are required")
 
+                if hash_cache is None:
+                    hash_cache = FileHashCache.load(self._file_context_path)
+
                 resolve_symlinks = instruction.get("resolveSymlinks")
                 step["filesHash"] = calculate_files_hash(
                     src,
                     dest,
-                    self._file_context_path,
-                    [
-                        *self._file_ignore_patterns,
-                        *read_dockerignore(self._file_context_path),
-                    ],
+                    snapshot.context_path,
+                    snapshot.ignore_patterns,
                     resolve_symlinks
                     if resolve_symlinks is not None
                     else RESOLVE_SYMLINKS,
                     stack_trace,
+                    hash_cache,
+                    snapshot,
                 )
 
             steps.append(step)
 
+        if hash_cache is not None:
+            hash_cache.save()
+
         return steps
 
     def _serialize(self, steps: List[Instruction]) -> TemplateType:
@@ -1,4 +1,5 @@
 import hashlib
+import io
 import os
 import tarfile
 import tempfile
@@ -7,11 +8,21 @@ import stat
 from wcmatch import glob
 import re
 import inspect
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from types import TracebackType, FrameType
-from typing import IO, List, Optional, Union
+from typing import IO, Deque, Dict, Generator, List, Optional, Tuple, Union
 
 from e2b.exceptions import TemplateException
-from e2b.template.consts import BASE_STEP_NAME, FINALIZE_STEP_NAME
+from e2b.io_utils import IO_CHUNK_SIZE, iter_io_chunks, parallel_gzip_iter
+from e2b.template.consts import (
+    BASE_STEP_NAME,
+    FINALIZE_STEP_NAME,
+    GZIP_COMPRESS_LEVEL,
+    HASH_CHUNK_SIZE,
+    HASH_READ_AHEAD,
+)
+from e2b.template.hash_cache import FileHashCache
 
 
 def make_traceback(caller_frame: Optional[FrameType]) -> Optional[TracebackType]:
@@ -183,6 +194,129 @@ def get_all_files_in_path(
     return sorted(list(files))
 
 
+class ContextSnapshot:
+    """
+    Snapshot of a template's file context shared by the hash and upload stages.
+
+    Ignore patterns (including `.dockerignore`) are resolved once, every COPY
+    source is walked at most once, and stat results are recorded, so hashing
+    a COPY step and archiving it for upload don't walk or stat the tree again.
+    """
+
+    def __init__(self, context_path: str, ignore_patterns: List[str]):
+        """
+        :param context_path: Base directory for resolving relative paths
+        :param ignore_patterns: Ignore patterns, including the `.dockerignore` ones
+        """
+        self.context_path = context_path
+        self.ignore_patterns = ignore_patterns
+        self._files: Dict[str, List[str]] = {}
+        self._lstats: Dict[str, os.stat_result] = {}
+        self._stats: Dict[str, Optional[os.stat_result]] = {}
+
+    @classmethod
+    def from_context(
+        cls, context_path: str, ignore_patterns: List[str]
+    ) -> "ContextSnapshot":
+        """
+        Create a snapshot, adding the `.dockerignore` patterns of the context.
+
+        :param context_path: Base directory for resolving relative paths
+        :param ignore_patterns: Ignore patterns configured on the template
+
+        :return: The context snapshot
+        """
+        return cls(context_path, [*ignore_patterns, *read_dockerignore(context_path)])
+
+    def files(self, src: str) -> List[str]:
+        """
+        Get all files and directories matching a COPY source.
+
+        :param src: Source path pattern
+        :return: Sorted array of absolute paths, see `get_all_files_in_path`
+        """
+        files = self._files.get(src)
+        if files is None:
+            files = get_all_files_in_path(
+                src, self.context_path, self.ignore_patterns, True
+            )
+            self._files[src] = files
+        return files
+
+    def lstat(self, path: str) -> os.stat_result:
+        """
+        Get the stat result of a path without following symlinks.
+
+        :param path: Absolute path
+        :return: The recorded stat result
+        """
+        stats = self._lstats.get(path)
+        if stats is None:
+            stats = os.lstat(path)
+            self._lstats[path] = stats
+        return stats
+
+    def stat(self, path: str) -> Optional[os.stat_result]:
+        """
+        Get the stat result of a path, following symlinks.
+
+        :param path: Absolute path
+        :return: The recorded stat result, or None for a broken symlink
+        """
+        if path in self._stats:
+            return self._stats[path]
+
+        lstats = self.lstat(path)
+        if not stat.S_ISLNK(lstats.st_mode):
+            stats: Optional[os.stat_result] = lstats
+        else:
+            try:
+                stats = os.stat(path)
+            except OSError:
+                stats = None
+        self._stats[path] = stats
+        return stats
+
+
+def read_file_head(path: str, chunk_size: int = HASH_CHUNK_SIZE) -> bytes:
+    """
+    Read the first chunk of a file.
+
+    :param path: Path to the file to read
+    :param chunk_size: Maximum number of bytes to read
+
+    :return: Up to `chunk_size` bytes from the start of the file
+    """
+    with open(path, "rb") as f:
+        return f.read(chunk_size)
+
+
+def hash_file_content(
+    hash_obj: "hashlib._Hash",
+    path: str,
+    head: bytes,
+    chunk_size: int = HASH_CHUNK_SIZE,
+) -> None:
+    """
+    Feed a file's content into a hash, in fixed-size chunks.
+
+    Memory use stays flat regardless of the file size.
+
+    :param hash_obj: Hash to update
+    :param path: Path to the file to hash
+    :param head: The first chunk of the file, as read by `read_file_head`
+    :param chunk_size: Number of bytes read per chunk, the size `head` was read with
+    """
+    hash_obj.update(head)
+    if len(head) < chunk_size:
+        return
+
+    with open(path, "rb") as f:
+        f.seek(len(head))
+        while chunk := f.read(chunk_size):
+            hash_obj.update(chunk)
+
+
 def calculate_files_hash(
     src: str,
     dest: str,
@@ -190,12 +324,20 @@ def calculate_files_hash(
     ignore_patterns: List[str],
     resolve_symlinks: bool,
     stack_trace: Optional[TracebackType],
+    hash_cache: Optional[FileHashCache] = None,
+    snapshot: Optional[ContextSnapshot] = None,
 ) -> str:
     """
     Calculate a hash of files being copied to detect changes for cache invalidation.
 
     The hash includes file content, metadata (mode, size), and relative paths.
     Note: uid, gid, and mtime are excluded to ensure stable hashes across environments.
+    It is the same hash as the JS SDK's `calculateFilesHash`.
+
+    File contents are streamed through the hash in chunks, in sorted path
+    order, while the next files are read ahead on a thread pool. With a
+    `hash_cache`, the files aren't read at all if none of them changed since
+    the step was last hashed.
 
     :param src: Source path pattern for files to copy
     :param dest: Destination path where files will be copied
@@ -203,6 +345,8 @@ def calculate_files_hash(
     :param ignore_patterns: Glob patterns to ignore
     :param resolve_symlinks: Whether to resolve symbolic links when hashing
     :param stack_trace: Optional stack trace for error reporting
+    :param hash_cache: Optional cache of step hashes to reuse and update
+    :param snapshot: Optional context snapshot to take the files and stats from instead of walking the context
 
     :return: Hex string hash of all files
 
@@ -214,44 +358,93 @@ def calculate_files_hash(
 
     hash_obj.update(content.encode())
 
-    files = get_all_files_in_path(src, context_path, ignore_patterns, True)
+    if snapshot is None:
+        snapshot = ContextSnapshot(context_path, ignore_patterns)
+    files = snapshot.files(src)
 
     if len(files) == 0:
         raise ValueError(f"No files found in {src_path}").with_traceback(stack_trace)
 
-    def hash_stats(stat_info: os.stat_result) -> None:
-        # Only include stable metadata (mode, size)
-        # Exclude uid, gid, and mtime to ensure consistent hashes across environments
-        hash_obj.update(str(stat_info.st_mode).encode())
-        hash_obj.update(str(stat_info.st_size).encode())
+    # (path, relative path, stats, symlink target) per entry, in sorted path
+    # order. The symlink target is only set for links that are hashed as links.
+    entries: List[Tuple[str, str, os.stat_result, Optional[str]]] = []
+    # Regular files, whose content is hashed
+    contents: List[str] = []
 
     for file in files:
-        # Hash the relative path
         relative_path = os.path.relpath(file, context_path)
-        hash_obj.update(relative_path.encode())
 
-        # Add stat information to hash calculation
-        if os.path.islink(file):
-            stats = os.lstat(file)
-            should_follow = resolve_symlinks and (
-                os.path.isfile(file) or os.path.isdir(file)
+        lstats = snapshot.lstat(file)
+        # Follows symlinks; None for a broken one
+        stats = snapshot.stat(file)
+
+        # Symlinks are hashed as links unless they're resolved and point to
+        # a file or directory
+        if stats is None or (
+            stat.S_ISLNK(lstats.st_mode)
+            and not (
+                resolve_symlinks
+                and (stat.S_ISREG(stats.st_mode) or stat.S_ISDIR(stats.st_mode))
             )
+        ):
+            entries.append((file, relative_path, lstats, os.readlink(file)))
+            continue
 
-            if not should_follow:
-                hash_stats(stats)
-
-                content = os.readlink(file)
-                hash_obj.update(content.encode())
-                continue
-
-        stats = os.stat(file)
-        hash_stats(stats)
-
+        entries.append((file, relative_path, stats, None))
         if stat.S_ISREG(stats.st_mode):
-            with open(file, "rb") as f:
-                hash_obj.update(f.read())
+            contents.append(file)
 
-    return hash_obj.hexdigest()
+    cache_key = f"{content}\0{resolve_symlinks}"
+    signature = FileHashCache.signature(
+        (relative_path, stats, link_target)
+        for _, relative_path, stats, link_target in entries
+    )
+    if hash_cache is not None:
+        cached = hash_cache.get(cache_key, signature)
+        if cached is not None:
+            return cached
+
+    chunk_size = HASH_CHUNK_SIZE
+    with ThreadPoolExecutor() as executor:
+        # First chunks of the upcoming files, read on the pool in the order
+        # they're hashed in
+        heads: Deque[Future[bytes]] = deque()
+        pending = iter(contents)
+
+        def read_ahead() -> None:
+            while len(heads) < HASH_READ_AHEAD:
+                file = next(pending, None)
+                if file is None:
+                    return
+                heads.append(executor.submit(read_file_head, file, chunk_size))
+
+        read_ahead()
+        for file, relative_path, stats, link_target in entries:
+            hash_obj.update(relative_path.encode())
+
+            # Only include stable metadata (mode, size)
+            # Exclude uid, gid, and mtime to ensure consistent hashes across environments
+            hash_obj.update(str(stats.st_mode).encode())
+            hash_obj.update(str(stats.st_size).encode())
+
+            if link_target is not None:
+                hash_obj.update(link_target.encode())
+            elif stat.S_ISREG(stats.st_mode):
+                head = heads.popleft().result()
+                read_ahead()
+                hash_file_content(hash_obj, file, head, chunk_size)
+
+    files_hash = hash_obj.hexdigest()
+    if hash_cache is not None:
+        # Keyed by the stats taken before hashing: if a file changed while it
+        # was read, its new stats won't match next time
+        hash_cache.set(
+            cache_key,
+            signature,
+            files_hash,
+            max((stats.st_mtime_ns for _, _, stats, _ in entries), default=0),
+        )
+    return files_hash
 
 
 def tar_file_stream(
@@ -260,6 +453,7 @@ def tar_file_stream(
     ignore_patterns: List[str],
     resolve_symlinks: bool,
     gzip: bool,
+    snapshot: Optional[ContextSnapshot] = None,
 ) -> IO[bytes]:
     """
     Create a tar archive of files matching a pattern in a temporary file.
@@ -272,25 +466,41 @@ def tar_file_stream(
     :param ignore_patterns: Ignore patterns
     :param resolve_symlinks: Whether to resolve symbolic links
     :param gzip: Whether to gzip the archive
+    :param snapshot: Optional context snapshot to take the files from instead of walking the context
 
     :return: Binary file object positioned at the start of the archive
     """
     tar_file = tempfile.TemporaryFile()
     try:
-        with tarfile.open(
-            fileobj=tar_file,
-            mode="w:gz" if gzip else "w",
-            dereference=resolve_symlinks,
-        ) as tar:
-            files = get_all_files_in_path(
-                file_name, file_context_path, ignore_patterns, True
-            )
-            for file in files:
-                tar.add(
-                    file,
-                    arcname=os.path.relpath(file, file_context_path),
-                    recursive=False,
-                )
+        if gzip:
+            # Compress the tar stream in blocks on all cores instead of
+            # through tarfile's single-threaded "w:gz"; the blocks are written
+            # as consecutive gzip members, which read back as one archive
+            with TarStream(
+                file_name,
+                file_context_path,
+                ignore_patterns,
+                resolve_symlinks,
+                snapshot=snapshot,
+            ) as tar_stream:
+                for member in parallel_gzip_iter(
+                    iter_io_chunks(tar_stream), level=GZIP_COMPRESS_LEVEL
+                ):
+                    tar_file.write(member)
+        else:
+            with tarfile.open(
+                fileobj=tar_file,
+                mode="w",
+                dereference=resolve_symlinks,
+            ) as tar:
+                if snapshot is None:
+                    snapshot = ContextSnapshot(file_context_path, ignore_patterns)
+                for file in snapshot.files(file_name):
+                    tar.add(
+                        file,
+                        arcname=os.path.relpath(file, file_context_path),
+                        recursive=False,
+                    )
 
         tar_file.seek(0)
         return tar_file
@@ -304,6 +514,124 @@ def tar_file_stream(
         raise
 
 
+class TarStream(io.RawIOBase):
+    """
+    Uncompressed tar archive of a COPY source, produced while it is read.
+
+    The archive members are planned up front from stat data, so the exact
+    archive `size` is known before any file content is read (as needed for
+    the `Content-Length` of a presigned upload). Reading then produces the
+    archive on the fly, so tarring overlaps with the upload and nothing is
+    spooled to disk.
+
+    The bytes are identical to what `tarfile` writes for the same members.
+    """
+
+    def __init__(
+        self,
+        file_name: str,
+        file_context_path: str,
+        ignore_patterns: List[str],
+        resolve_symlinks: bool,
+        snapshot: Optional[ContextSnapshot] = None,
+        chunk_size: int = IO_CHUNK_SIZE,
+    ):
+        """
+        :param file_name: Glob pattern for files to include
+        :param file_context_path: Base directory for resolving file paths
+        :param ignore_patterns: Ignore patterns
+        :param resolve_symlinks: Whether to resolve symbolic links
+        :param snapshot: Optional context snapshot to take the files from instead of walking the context
+        :param chunk_size: Number of bytes read from a file at a time
+        """
+        super().__init__()
+        if snapshot is None:
+            snapshot = ContextSnapshot(file_context_path, ignore_patterns)
+
+        # Used only to build the member headers: it tracks hard links and
+        # carries the format and encoding settings, nothing is written to it
+        self._tar = tarfile.open(
+            fileobj=io.BytesIO(), mode="w", dereference=resolve_symlinks
+        )
+        self._members: List[Tuple[str, tarfile.TarInfo]] = []
+        self._chunk_size = chunk_size
+
+        size = 0
+        for file in snapshot.files(file_name):
+            tarinfo = self._tar.gettarinfo(
+                file, arcname=os.path.relpath(file, file_context_path)
+            )
+            if tarinfo is None:
+                # Unsupported file type (e.g. a socket), skipped like `tar.add`
+                continue
+            self._members.append((file, tarinfo))
+            size += len(self._header(tarinfo))
+            if tarinfo.isreg():
+                size += _round_up(tarinfo.size, tarfile.BLOCKSIZE)
+
+        size += 2 * tarfile.BLOCKSIZE
+        self.size = _round_up(size, tarfile.RECORDSIZE)
+
+        self._chunks = self._iter_chunks()
+        self._pending = memoryview(b"")
+
+    def _header(self, tarinfo: tarfile.TarInfo) -> bytes:
+        return tarinfo.tobuf(self._tar.format, self._tar.encoding, self._tar.errors)
+
+    def _iter_chunks(self) -> Generator[bytes, None, None]:
+        offset = 0
+        for file, tarinfo in self._members:
+            header = self._header(tarinfo)
+            offset += len(header)
+            yield header
+
+            if not tarinfo.isreg():
+                continue
+
+            with open(file, "rb") as f:
+                remaining = tarinfo.size
+                while remaining > 0:
+                    chunk = f.read(min(self._chunk_size, remaining))
+                    if not chunk:
+                        raise TemplateException(
+                            f"File '{file}' changed while it was being archived"
+                        )
+                    remaining -= len(chunk)
+                    yield chunk
+
+            padded = _round_up(tarinfo.size, tarfile.BLOCKSIZE)
+            offset += padded
+            if padded > tarinfo.size:
+                yield tarfile.NUL * (padded - tarinfo.size)
+
+        # End-of-archive marker, padded to a whole record like `TarFile.close`
+        yield tarfile.NUL * (self.size - offset)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
+
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._chunks.close()
+        super().close()
+
+
+def _round_up(size: int, block: int) -> int:
+    return -(-size // block) * block
+
+
 def strip_ansi_escape_codes(text: str) -> str:
     """
     Strip ANSI escape codes from a string.
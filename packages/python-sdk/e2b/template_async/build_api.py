@@ -1,19 +1,20 @@
 import asyncio
 import os
 from types import TracebackType
-from typing import Callable, Optional, List, Union
+from typing import IO, AsyncGenerator, Callable, Optional, List, Union, cast
 
 import httpx
 from pyqwest import HTTPTransport
 from pyqwest.httpx import AsyncPyqwestTransport
 
 from e2b.api import encode_path_param, handle_api_exception, proxy_to_config
-from e2b.io_utils import aiter_io_chunks
+from e2b.io_utils import MappedFile, aiter_io_chunks
 from e2b.api.client.api.templates import (
     post_v3_templates,
     get_templates_template_id_files_hash,
     post_v_2_templates_template_id_builds_build_id,
     get_templates_template_id_builds_build_id_status,
+    get_templates_template_id_builds_build_id_logs,
     get_templates_aliases_alias,
 )
 from e2b.api.client.api.tags import (
@@ -29,10 +30,11 @@ from e2b.api.client.models import (
     Error,
     AssignTemplateTagsRequest,
     DeleteTemplateTagsRequest,
+    LogsDirection,
 )
 from e2b.api.client.types import UNSET, Unset
 from e2b.exceptions import BuildException, FileUploadException, TemplateException
-from e2b.template.logger import LogEntry
+from e2b.template.logger import BuildLogsCursor, LogEntry
 from e2b.template.types import (
     TemplateType,
     BuildStatusReason,
@@ -41,8 +43,17 @@ from e2b.template.types import (
     TemplateTag,
     TemplateTagInfo,
 )
-from e2b.template.consts import FILE_UPLOAD_TIMEOUT_SECONDS
-from e2b.template.utils import get_build_step_index, tar_file_stream
+from e2b.template.consts import (
+    BUILD_LOGS_MAX_INTERVAL,
+    BUILD_LOGS_PAGE_SIZE,
+    FILE_UPLOAD_TIMEOUT_SECONDS,
+)
+from e2b.template.utils import (
+    ContextSnapshot,
+    TarStream,
+    get_build_step_index,
+    tar_file_stream,
+)
 
 
 async def request_build(
@@ -112,6 +123,7 @@ async def upload_file(
     gzip: bool,
     stack_trace: Optional[TracebackType],
     request_timeout: Optional[float] = None,
+    snapshot: Optional[ContextSnapshot] = None,
 ):
     # Uploading a large build-context archive can take far longer than the 60s
     # general API timeout, so default to a 1-hour upload timeout unless the
@@ -122,12 +134,38 @@ async def upload_file(
     )
     upload_proxy = proxy_to_config(getattr(api_client, "_proxy", None))
     try:
-        tar_file = tar_file_stream(
-            file_name, context_path, ignore_patterns, resolve_symlinks, gzip
-        )
-        try:
+        # Archiving is blocking disk and CPU work; run it off the event loop
+        # so concurrent uploads of other steps keep making progress
+        tar_file: IO[bytes]
+        if gzip:
+            tar_file = await asyncio.to_thread(
+                tar_file_stream,
+                file_name,
+                context_path,
+                ignore_patterns,
+                resolve_symlinks,
+                gzip,
+                snapshot=snapshot,
+            )
             size = os.fstat(tar_file.fileno()).st_size
-
+        else:
+            # An uncompressed archive's size is known from stat data, so it is
+            # produced while it uploads instead of being spooled to disk
+            tar_stream = await asyncio.to_thread(
+                TarStream,
+                file_name,
+                context_path,
+                ignore_patterns,
+                resolve_symlinks,
+                snapshot=snapshot,
+            )
+            tar_file, size = cast(IO[bytes], tar_stream), tar_stream.size
+        source = tar_file
+        try:
+            if gzip:
+                # The spooled archive is uploaded as slices of a memory map
+                # instead of chunk by chunk `read` calls
+                source = cast(IO[bytes], MappedFile(tar_file))
             # Through the pyqwest adapter the upload timeout is a
             # whole-request deadline for the entire transfer, not a per-write
             # bound as with the httpx transport this replaced.
@@ -148,24 +186,25 @@ async def upload_file(
                     )
                 ),
             ) as client:
-                # Stream the archive from disk via an async iterator. The
+                # Stream the archive via an async iterator. The
                 # explicit Content-Length suppresses chunked transfer
                 # encoding, which S3 presigned URLs reject; reqwest keeps the
                 # Content-Length framing for the streamed body.
                 response = await client.put(
                     url,
-                    content=aiter_io_chunks(tar_file),
+                    content=aiter_io_chunks(source),
                     headers={"Content-Length": str(size)},
                 )
             response.raise_for_status()
         finally:
-            # Closing the spooled temp file is best-effort: a failure here
+            # Closing the archive is best-effort: a failure here
             # must not mask a successful upload as a FileUploadException,
             # nor overwrite a real upload error.
-            try:
-                tar_file.close()
-            except Exception:
-                pass
+            for file in (source, tar_file):
+                try:
+                    file.close()
+                except Exception:
+                    pass
     except httpx.HTTPStatusError as e:
         raise FileUploadException(f"Failed to upload file: {e}").with_traceback(
             stack_trace
@@ -224,13 +263,18 @@ def _map_build_status_reason(reason) -> Optional[BuildStatusReason]:
 
 
 async def get_build_status(
-    client: AuthenticatedClient, template_id: str, build_id: str, logs_offset: int
+    client: AuthenticatedClient,
+    template_id: str,
+    build_id: str,
+    logs_offset: int,
+    limit: Union[Unset, int] = UNSET,
 ) -> TemplateBuildStatusResponse:
     res = await get_templates_template_id_builds_build_id_status.asyncio_detailed(
         template_id=encode_path_param(template_id),
         build_id=build_id,
         client=client,
         logs_offset=logs_offset,
+        limit=limit,
     )
 
     if res.status_code >= 300:
@@ -252,64 +296,145 @@ async def get_build_status(
     )
 
 
-async def wait_for_build_finish(
+async def get_build_logs(
     client: AuthenticatedClient,
     template_id: str,
     build_id: str,
-    on_build_logs: Optional[Callable[[LogEntry], None]] = None,
-    logs_refresh_frequency: float = 0.2,
-    stack_traces: List[Union[TracebackType, None]] = [],
-):
-    logs_offset = 0
-    status = TemplateBuildStatus.BUILDING
+    cursor: int = 0,
+    limit: int = BUILD_LOGS_PAGE_SIZE,
+) -> List[LogEntry]:
+    res = await get_templates_template_id_builds_build_id_logs.asyncio_detailed(
+        template_id=encode_path_param(template_id),
+        build_id=build_id,
+        client=client,
+        cursor=cursor,
+        limit=limit,
+        direction=LogsDirection.FORWARD,
+    )
 
-    async def poll_status() -> TemplateBuildStatusResponse:
-        nonlocal logs_offset
-        build_status = await get_build_status(
-            client, template_id, build_id, logs_offset
-        )
+    if res.status_code >= 300:
+        raise handle_api_exception(res, BuildException)
+
+    if isinstance(res.parsed, Error):
+        raise BuildException(f"API error: {res.parsed.message}")
 
-        logs_offset += len(build_status.log_entries)
+    if res.parsed is None:
+        raise BuildException("Failed to get build logs")
 
-        for log_entry in build_status.log_entries:
-            if on_build_logs:
-                on_build_logs(log_entry)
+    return [_map_log_entry(e) for e in res.parsed.logs]
 
-        return build_status
 
-    while status in [TemplateBuildStatus.BUILDING, TemplateBuildStatus.WAITING]:
-        build_status = await poll_status()
+class AsyncBuildLogsFollower:
+    """
+    Async iterator over the log entries of a template build.
+
+    Full pages of logs are fetched back to back until the backlog is drained.
+    While the build produces no new logs, the interval between requests
+    doubles from `min_interval` up to `max_interval`, and each of them also
+    requests the build status. Iteration stops once the build finished and
+    all of its logs were returned; the final build status is then available
+    in `status`.
+    """
 
-        status = build_status.status
+    def __init__(
+        self,
+        client: AuthenticatedClient,
+        template_id: str,
+        build_id: str,
+        min_interval: float = 0.2,
+        max_interval: float = BUILD_LOGS_MAX_INTERVAL,
+    ):
+        self._client = client
+        self._template_id = template_id
+        self._build_id = build_id
+        self._min_interval = min_interval
+        self._max_interval = max(min_interval, max_interval)
+        self.status: Optional[TemplateBuildStatusResponse] = None
+        self._entries: Optional[AsyncGenerator[LogEntry, None]] = None
+
+    def __aiter__(self) -> "AsyncBuildLogsFollower":
+        return self
+
+    async def __anext__(self) -> LogEntry:
+        if self._entries is None:
+            self._entries = self._follow()
+        return await self._entries.__anext__()
+
+    async def _follow(self) -> AsyncGenerator[LogEntry, None]:
+        cursor = BuildLogsCursor()
+        interval = self._min_interval
+        finished = False
+
+        while True:
+            entries = await get_build_logs(
+                self._client, self._template_id, self._build_id, cursor.cursor
+            )
+            new_entries = cursor.advance(entries)
+            for entry in new_entries:
+                yield entry
 
-        if status in [TemplateBuildStatus.READY, TemplateBuildStatus.ERROR]:
-            # The status endpoint returns at most 100 log entries per call, so
-            # the terminal response may not include the last logs - keep
-            # fetching until they are drained.
-            tail_status = build_status
-            while len(tail_status.log_entries) > 0:
-                tail_status = await poll_status()
+            if len(entries) >= BUILD_LOGS_PAGE_SIZE:
+                # A full page means more entries are likely waiting
+                if not new_entries:
+                    cursor.skip_millisecond()
+                continue
 
-            if status == TemplateBuildStatus.READY:
+            if finished:
                 return
 
-            traceback = None
-            if build_status.reason and build_status.reason.step:
-                # Find the corresponding stack trace for the failed step
-                step_index = get_build_step_index(
-                    build_status.reason.step, len(stack_traces)
+            if new_entries:
+                # The build is still running while it logs, so its status is
+                # only requested once it's idle
+                interval = self._min_interval
+            else:
+                # The status is fetched without logs, those come from the logs endpoint
+                self.status = await get_build_status(
+                    self._client, self._template_id, self._build_id, 0, limit=0
                 )
-                if step_index < len(stack_traces):
-                    traceback = stack_traces[step_index]
+                if self.status.status in [
+                    TemplateBuildStatus.READY,
+                    TemplateBuildStatus.ERROR,
+                ]:
+                    # Logs written right before the build finished may not have
+                    # been fetched yet, so drain them once more before stopping
+                    finished = True
+                    continue
+                interval = min(interval * 2, self._max_interval)
+            await asyncio.sleep(interval)
 
-            raise BuildException(
-                build_status.reason.message if build_status.reason else "Build failed"
-            ).with_traceback(traceback)
 
-        # Wait for a short period before checking the status again
-        await asyncio.sleep(logs_refresh_frequency)
-
-    raise BuildException("Unknown build error occurred.")
+async def wait_for_build_finish(
+    client: AuthenticatedClient,
+    template_id: str,
+    build_id: str,
+    on_build_logs: Optional[Callable[[LogEntry], None]] = None,
+    logs_refresh_frequency: float = 0.2,
+    stack_traces: List[Union[TracebackType, None]] = [],
+):
+    follower = AsyncBuildLogsFollower(
+        client, template_id, build_id, min_interval=logs_refresh_frequency
+    )
+    async for log_entry in follower:
+        if on_build_logs:
+            on_build_logs(log_entry)
+
+    build_status = follower.status
+    if build_status is None:
+        raise BuildException("Unknown build error occurred.")
+
+    if build_status.status == TemplateBuildStatus.READY:
+        return
+
+    traceback = None
+    if build_status.reason and build_status.reason.step:
+        # Find the corresponding stack trace for the failed step
+        step_index = get_build_step_index(build_status.reason.step, len(stack_traces))
+        if step_index < len(stack_traces):
+            traceback = stack_traces[step_index]
+
+    raise BuildException(
+        build_status.reason.message if build_status.reason else "Build failed"
+    ).with_traceback(traceback)
 
 
 async def check_alias_exists(client: AuthenticatedClient, alias: str) -> bool:
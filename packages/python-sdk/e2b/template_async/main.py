@@ -1,17 +1,26 @@
+import asyncio
 from datetime import datetime
-from typing import Callable, List, Optional, Union
+from typing import AsyncIterator, Callable, List, Optional, Union
 
 from typing_extensions import Unpack
 
 from e2b.api.client.client import AuthenticatedClient
 from e2b.connection_config import ApiParams, ConnectionConfig
-from e2b.template.consts import GZIP, RESOLVE_SYMLINKS
+from e2b.exceptions import InvalidArgumentException
+from e2b.template.consts import GZIP, MAX_CONCURRENT_UPLOADS, RESOLVE_SYMLINKS
 from e2b.template.logger import LogEntry, LogEntryEnd, LogEntryStart
 from e2b.template.main import TemplateBase, TemplateClass
-from e2b.template.types import BuildInfo, InstructionType, TemplateTag, TemplateTagInfo
-from e2b.template.utils import normalize_build_arguments, read_dockerignore
+from e2b.template.types import (
+    BuildInfo,
+    Instruction,
+    InstructionType,
+    TemplateTag,
+    TemplateTagInfo,
+)
+from e2b.template.utils import normalize_build_arguments
 
 from .build_api import (
+    AsyncBuildLogsFollower,
     assign_tags,
     check_alias_exists,
     get_template_tags,
@@ -42,6 +51,7 @@ class AsyncTemplate(TemplateBase):
         skip_cache: bool = False,
         on_build_logs: Optional[Callable[[LogEntry], None]] = None,
         request_timeout: Optional[float] = None,
+        max_concurrent_uploads: int = MAX_CONCURRENT_UPLOADS,
     ) -> BuildInfo:
         """
         Internal implementation of the template build process
@@ -54,7 +64,11 @@ class AsyncTemplate(TemplateBase):
         :param memory_mb: Amount of memory in MB allocated to the sandbox
         :param skip_cache: If True, forces a complete rebuild ignoring cache
         :param on_build_logs: Callback function to receive build logs during the build process
+        :param max_concurrent_uploads: Maximum number of COPY steps uploaded at the same time
         """
+        if max_concurrent_uploads < 1:
+            raise InvalidArgumentException("max_concurrent_uploads must be at least 1")
+
         if skip_cache:
             template._template._force = True
 
@@ -90,13 +104,16 @@ class AsyncTemplate(TemplateBase):
                 )
             )
 
-        instructions_with_hashes = template._template._instructions_with_hashes()
+        # One snapshot per build: the hash and upload stages share its walk
+        snapshot = template._template._context_snapshot()
+        instructions_with_hashes = template._template._instructions_with_hashes(
+            snapshot
+        )
 
-        # Upload files
-        for index, file_upload in enumerate(instructions_with_hashes):
-            if file_upload["type"] != InstructionType.COPY:
-                continue
+        # Upload files, up to `max_concurrent_uploads` steps at a time
+        upload_slots = asyncio.Semaphore(max_concurrent_uploads)
 
+        async def upload_step(index: int, file_upload: Instruction) -> str:
             args = file_upload.get("args", [])
             src = args[0] if len(args) > 0 else None
             force_upload = file_upload.get("forceUpload")
@@ -115,44 +132,51 @@ class AsyncTemplate(TemplateBase):
             if index + 1 < len(template._template._stack_traces):
                 stack_trace = template._template._stack_traces[index + 1]
 
-            file_info = await get_file_upload_link(
-                api_client, template_id, files_hash, stack_trace
-            )
-
-            if (force_upload and file_info.url) or (
-                file_info.present is False and file_info.url
-            ):
-                await upload_file(
-                    api_client,
-                    src,
-                    template._template._file_context_path,
-                    file_info.url,
-                    [
-                        *template._template._file_ignore_patterns,
-                        *read_dockerignore(template._template._file_context_path),
-                    ],
-                    resolve_symlinks,
-                    gzip,
-                    stack_trace,
-                    request_timeout=request_timeout,
+            async with upload_slots:
+                file_info = await get_file_upload_link(
+                    api_client, template_id, files_hash, stack_trace
                 )
-                if on_build_logs:
-                    on_build_logs(
-                        LogEntry(
-                            timestamp=datetime.now(),
-                            level="info",
-                            message=f"Uploaded '{src}'",
-                        )
+
+                if (force_upload and file_info.url) or (
+                    file_info.present is False and file_info.url
+                ):
+                    await upload_file(
+                        api_client,
+                        src,
+                        snapshot.context_path,
+                        file_info.url,
+                        snapshot.ignore_patterns,
+                        resolve_symlinks,
+                        gzip,
+                        stack_trace,
+                        request_timeout=request_timeout,
+                        snapshot=snapshot,
                     )
-            else:
+                    return f"Uploaded '{src}'"
+
+            return f"Skipping upload of '{src}', already cached"
+
+        uploads = [
+            asyncio.ensure_future(upload_step(index, file_upload))
+            for index, file_upload in enumerate(instructions_with_hashes)
+            if file_upload["type"] == InstructionType.COPY
+        ]
+        try:
+            for next_upload in asyncio.as_completed(uploads):
+                message = await next_upload
                 if on_build_logs:
                     on_build_logs(
                         LogEntry(
                             timestamp=datetime.now(),
                             level="info",
-                            message=f"Skipping upload of '{src}', already cached",
+                            message=message,
                         )
                     )
+        finally:
+            # Fail fast: the first error cancels the uploads still in flight
+            for upload in uploads:
+                upload.cancel()
+            await asyncio.gather(*uploads, return_exceptions=True)
 
         if on_build_logs:
             on_build_logs(
@@ -200,6 +224,7 @@ class AsyncTemplate(TemplateBase):
         memory_mb: int = 1024,
         skip_cache: bool = False,
         on_build_logs: Optional[Callable[[LogEntry], None]] = None,
+        max_concurrent_uploads: int = MAX_CONCURRENT_UPLOADS,
         **opts: Unpack[ApiParams],
     ) -> BuildInfo:
         """
@@ -213,6 +238,7 @@ class AsyncTemplate(TemplateBase):
         :param memory_mb: Amount of memory in MB allocated to the sandbox
         :param skip_cache: If True, forces a complete rebuild ignoring cache
         :param on_build_logs: Callback function to receive build logs during the build process
+        :param max_concurrent_uploads: Maximum number of COPY steps uploaded at the same time
 
         Example
         ```python
@@ -258,6 +284,7 @@ class AsyncTemplate(TemplateBase):
                 memory_mb=memory_mb,
                 skip_cache=skip_cache,
                 on_build_logs=on_build_logs,
+                max_concurrent_uploads=max_concurrent_uploads,
                 # Only honor an explicitly set request_timeout for uploads;
                 # otherwise upload_file applies its 1-hour default.
                 request_timeout=api_params.get("request_timeout"),
@@ -303,6 +330,7 @@ class AsyncTemplate(TemplateBase):
         memory_mb: int = 1024,
         skip_cache: bool = False,
         on_build_logs: Optional[Callable[[LogEntry], None]] = None,
+        max_concurrent_uploads: int = MAX_CONCURRENT_UPLOADS,
         **opts: Unpack[ApiParams],
     ) -> BuildInfo:
         """
@@ -315,6 +343,8 @@ class AsyncTemplate(TemplateBase):
         :param cpu_count: Number of CPUs allocated to the sandbox
         :param memory_mb: Amount of memory in MB allocated to the sandbox
         :param skip_cache: If True, forces a complete rebuild ignoring cache
+        :param on_build_logs: Callback function to receive build logs during the build process
+        :param max_concurrent_uploads: Maximum number of COPY steps uploaded at the same time
         :return: BuildInfo containing the template ID and build ID
 
         Example
@@ -352,6 +382,7 @@ class AsyncTemplate(TemplateBase):
             memory_mb=memory_mb,
             skip_cache=skip_cache,
             on_build_logs=on_build_logs,
+            max_concurrent_uploads=max_concurrent_uploads,
             # Only honor an explicitly set request_timeout for uploads;
             # otherwise upload_file applies its 1-hour default.
             request_timeout=api_params.get("request_timeout"),
@@ -390,6 +421,42 @@ class AsyncTemplate(TemplateBase):
             logs_offset,
         )
 
+    @classmethod
+    def stream_build_logs(
+        cls,
+        build_info: BuildInfo,
+        **opts: Unpack[ApiParams],
+    ) -> AsyncIterator[LogEntry]:
+        """
+        Stream the logs of a build until it finishes.
+
+        Logs are requested back to back while the build produces many of them,
+        and less often while it is idle.
+
+        :param build_info: Build identifiers returned from build_in_background
+        :return: Async iterator of the build's log entries
+
+        Example
+        ```python
+        from e2b import AsyncTemplate
+
+        build_info = await AsyncTemplate.build_in_background(template, alias='my-template')
+        async for log_entry in AsyncTemplate.stream_build_logs(build_info):
+            print(log_entry)
+        ```
+        """
+        config = ConnectionConfig(**cls._resolve_api_params(**opts))
+        api_client = get_api_client(
+            config,
+        )
+
+        return AsyncBuildLogsFollower(
+            api_client,
+            build_info.template_id,
+            build_info.build_id,
+            min_interval=cls._logs_refresh_frequency,
+        )
+
     @classmethod
     async def exists(
         cls,
@@ -1,17 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Callable, List, Optional, Union
+from typing import Callable, Iterator, List, Optional, Union
 
 from typing_extensions import Unpack
 
 from e2b.api.client.client import AuthenticatedClient
 from e2b.connection_config import ApiParams, ConnectionConfig
+from e2b.exceptions import InvalidArgumentException
 
 from e2b.api.client_sync import get_api_client
-from e2b.template.consts import GZIP, RESOLVE_SYMLINKS
+from e2b.template.consts import GZIP, MAX_CONCURRENT_UPLOADS, RESOLVE_SYMLINKS
 from e2b.template.logger import LogEntry, LogEntryEnd, LogEntryStart
 from e2b.template.main import TemplateBase, TemplateClass
-from e2b.template.types import BuildInfo, InstructionType, TemplateTag, TemplateTagInfo
+from e2b.template.types import (
+    BuildInfo,
+    Instruction,
+    InstructionType,
+    TemplateTag,
+    TemplateTagInfo,
+)
 from e2b.template_sync.build_api import (
+    BuildLogsFollower,
     assign_tags,
     check_alias_exists,
     get_template_tags,
@@ -23,7 +32,7 @@ from e2b.template_sync.build_api import (
     upload_file,
     wait_for_build_finish,
 )
-from e2b.template.utils import normalize_build_arguments, read_dockerignore
+from e2b.template.utils import normalize_build_arguments
 
 
 class Template(TemplateBase):
@@ -42,6 +51,7 @@ class Template(TemplateBase):
         skip_cache: bool = False,
         on_build_logs: Optional[Callable[[LogEntry], None]] = None,
         request_timeout: Optional[float] = None,
+        max_concurrent_uploads: int = MAX_CONCURRENT_UPLOADS,
     ) -> BuildInfo:
         """
         Internal implementation of the template build process
@@ -54,7 +64,11 @@ class Template(TemplateBase):
         :param memory_mb: Amount of memory in MB allocated to the sandbox
         :param skip_cache: If True, forces a complete rebuild ignoring cache
         :param on_build_logs: Callback function to receive build logs during the build process
+        :param max_concurrent_uploads: Maximum number of COPY steps uploaded at the same time
         """
+        if max_concurrent_uploads < 1:
+            raise InvalidArgumentException("max_concurrent_uploads must be at least 1")
+
         if skip_cache:
             template._template._force = True
 
@@ -90,13 +104,14 @@ class Template(TemplateBase):
                 )
             )
 
-        instructions_with_hashes = template._template._instructions_with_hashes()
-
-        # Upload files
-        for index, file_upload in enumerate(instructions_with_hashes):
-            if file_upload["type"] != InstructionType.COPY:
-                continue
+        # One snapshot per build: the hash and upload stages share its walk
+        snapshot = template._template._context_snapshot()
+        instructions_with_hashes = template._template._instructions_with_hashes(
+            snapshot
+        )
 
+        # Upload files, up to `max_concurrent_uploads` steps at a time
+        def upload_step(index: int, file_upload: Instruction) -> str:
             args = file_upload.get("args", [])
             src = args[0] if len(args) > 0 else None
             force_upload = file_upload.get("forceUpload")
@@ -125,34 +140,40 @@ class Template(TemplateBase):
                 upload_file(
                     api_client,
                     src,
-                    template._template._file_context_path,
+                    snapshot.context_path,
                     file_info.url,
-                    [
-                        *template._template._file_ignore_patterns,
-                        *read_dockerignore(template._template._file_context_path),
-                    ],
+                    snapshot.ignore_patterns,
                     resolve_symlinks,
                     gzip,
                     stack_trace,
                     request_timeout=request_timeout,
+                    snapshot=snapshot,
                 )
+                return f"Uploaded '{src}'"
+
+            return f"Skipping upload of '{src}', already cached"
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrent_uploads)
+        try:
+            uploads = [
+                executor.submit(upload_step, index, file_upload)
+                for index, file_upload in enumerate(instructions_with_hashes)
+                if file_upload["type"] == InstructionType.COPY
+            ]
+            for upload in as_completed(uploads):
+                message = upload.result()
                 if on_build_logs:
                     on_build_logs(
                         LogEntry(
                             timestamp=datetime.now(),
                             level="info",
-                            message=f"Uploaded '{src}'",
-                        )
-                    )
-            else:
-                if on_build_logs:
-                    on_build_logs(
-                        LogEntry(
-                            timestamp=datetime.now(),
-                            level="info",
-                            message=f"Skipping upload of '{src}', already cached",
+                            message=message,
                         )
                     )
+        finally:
+            # Fail fast: the first error drops the uploads that haven't
+            # started yet instead of waiting for them
+            executor.shutdown(wait=False, cancel_futures=True)
 
         if on_build_logs:
             on_build_logs(
@@ -200,6 +221,7 @@ class Template(TemplateBase):
         memory_mb: int = 1024,
         skip_cache: bool = False,
         on_build_logs: Optional[Callable[[LogEntry], None]] = None,
+        max_concurrent_uploads: int = MAX_CONCURRENT_UPLOADS,
         **opts: Unpack[ApiParams],
     ) -> BuildInfo:
         """
@@ -213,6 +235,7 @@ class Template(TemplateBase):
         :param memory_mb: Amount of memory in MB allocated to the sandbox
         :param skip_cache: If True, forces a complete rebuild ignoring cache
         :param on_build_logs: Callback function to receive build logs during the build process
+        :param max_concurrent_uploads: Maximum number of COPY steps uploaded at the same time
 
         Example
         ```python
@@ -259,6 +282,7 @@ class Template(TemplateBase):
                 memory_mb=memory_mb,
                 skip_cache=skip_cache,
                 on_build_logs=on_build_logs,
+                max_concurrent_uploads=max_concurrent_uploads,
                 # Only honor an explicitly set request_timeout for uploads;
                 # otherwise upload_file applies its 1-hour default.
                 request_timeout=api_params.get("request_timeout"),
@@ -304,6 +328,7 @@ class Template(TemplateBase):
         memory_mb: int = 1024,
         skip_cache: bool = False,
         on_build_logs: Optional[Callable[[LogEntry], None]] = None,
+        max_concurrent_uploads: int = MAX_CONCURRENT_UPLOADS,
         **opts: Unpack[ApiParams],
     ) -> BuildInfo:
         """
@@ -316,6 +341,8 @@ class Template(TemplateBase):
         :param cpu_count: Number of CPUs allocated to the sandbox
         :param memory_mb: Amount of memory in MB allocated to the sandbox
         :param skip_cache: If True, forces a complete rebuild ignoring cache
+        :param on_build_logs: Callback function to receive build logs during the build process
+        :param max_concurrent_uploads: Maximum number of COPY steps uploaded at the same time
         :return: BuildInfo containing the template ID and build ID
 
         Example
@@ -353,6 +380,7 @@ class Template(TemplateBase):
             memory_mb=memory_mb,
             skip_cache=skip_cache,
             on_build_logs=on_build_logs,
+            max_concurrent_uploads=max_concurrent_uploads,
             # Only honor an explicitly set request_timeout for uploads;
             # otherwise upload_file applies its 1-hour default.
             request_timeout=api_params.get("request_timeout"),
@@ -392,6 +420,42 @@ class Template(TemplateBase):
             logs_offset,
         )
 
+    @classmethod
+    def stream_build_logs(
+        cls,
+        build_info: BuildInfo,
+        **opts: Unpack[ApiParams],
+    ) -> Iterator[LogEntry]:
+        """
+        Stream the logs of a build until it finishes.
+
+        Logs are requested back to back while the build produces many of them,
+        and less often while it is idle.
+
+        :param build_info: Build identifiers returned from build_in_background
+        :return: Iterator of the build's log entries
+
+        Example
+        ```python
+        from e2b import Template
+
+        build_info = Template.build_in_background(template, alias='my-template')
+        for log_entry in Template.stream_build_logs(build_info):
+            print(log_entry)
+        ```
+        """
+        config = ConnectionConfig(**cls._resolve_api_params(**opts))
+        api_client = get_api_client(
+            config,
+        )
+
+        return BuildLogsFollower(
+            api_client,
+            build_info.template_id,
+            build_info.build_id,
+            min_interval=cls._logs_refresh_frequency,
+        )
+
     @classmethod
     def exists(
         cls,
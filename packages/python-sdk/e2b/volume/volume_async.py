@@ -60,7 +60,16 @@ from e2b.volume.types import (
     VolumeInfo,
     VolumeEntryStat,
 )
-from e2b.io_utils import aiter_io_chunks
+from e2b.io_utils import (
+    AdaptiveChunkSize,
+    ProgressHandler,
+    TransferProgress,
+    TransferStats,
+    aiter_io_chunks,
+    aiter_progress,
+    content_length,
+    upload_size,
+)
 from e2b.volume.utils import (
     DualMethod,
     convert_volume_entry_stat,
@@ -85,6 +94,7 @@ class AsyncVolume(ClientFactory):
         self._domain = domain
         self._debug = debug
         self._proxy = proxy
+        self._transfer_stats = TransferStats()
 
     @property
     def volume_id(self) -> str:
@@ -98,6 +108,13 @@ class AsyncVolume(ClientFactory):
     def token(self) -> Optional[str]:
         return self._token
 
+    @property
+    def transfer_stats(self) -> TransferStats:
+        """
+        Running totals of the file transfers to and from the volume made through this object.
+        """
+        return self._transfer_stats
+
     def _get_volume_config(
         self, **opts: Unpack[VolumeApiParams]
     ) -> VolumeConnectionConfig:
@@ -475,6 +492,7 @@ class AsyncVolume(ClientFactory):
         path: str,
         format: Literal["stream"],
         stream_idle_timeout: Optional[float] = None,
+        on_progress: Optional[ProgressHandler] = None,
         **opts: Unpack[VolumeApiParams],
     ) -> AsyncIterator[bytes]: ...
 
@@ -483,6 +501,7 @@ class AsyncVolume(ClientFactory):
         path: str,
         format: Literal["text", "bytes", "stream"] = "text",
         stream_idle_timeout: Optional[float] = None,
+        on_progress: Optional[ProgressHandler] = None,
         **opts: Unpack[VolumeApiParams],
     ) -> Union[str, bytes, AsyncIterator[bytes]]:
         """
@@ -499,6 +518,7 @@ class AsyncVolume(ClientFactory):
             without limiting total transfer time. Defaults to the
             transport-wide idle read timeout (60 seconds); pass `0` to
             disable.
+        :param on_progress: Called as `on_progress(bytes_done, total, rate)` for each chunk of a streamed read (`format="stream"`)
         :param opts: Connection options
 
         :return: File content as string, bytes, or async iterator of bytes
@@ -563,13 +583,23 @@ class AsyncVolume(ClientFactory):
                             )
                             raise handle_api_exception(api_response, VolumeException)
 
+                        progress = TransferProgress(
+                            False,
+                            content_length(response.headers),
+                            on_progress,
+                            self._transfer_stats,
+                        )
                         chunks = response.aiter_bytes()
-                        while True:
-                            try:
-                                chunk = await read_bounded(chunks.__anext__())
-                            except StopAsyncIteration:
-                                break
-                            yield chunk
+                        try:
+                            while True:
+                                try:
+                                    chunk = await read_bounded(chunks.__anext__())
+                                except StopAsyncIteration:
+                                    break
+                                progress.update(len(chunk))
+                                yield chunk
+                        finally:
+                            progress.finish()
                     finally:
                         await stream_cm.__aexit__(None, None, None)
                 except asyncio.TimeoutError as e:
@@ -609,6 +639,7 @@ class AsyncVolume(ClientFactory):
         gid: Optional[int] = None,
         mode: Optional[int] = None,
         force: Optional[bool] = None,
+        on_progress: Optional[ProgressHandler] = None,
         **opts: Unpack[VolumeApiParams],
     ) -> VolumeEntryStat:
         """
@@ -623,6 +654,7 @@ class AsyncVolume(ClientFactory):
         :param gid: Group ID of the created file
         :param mode: Mode of the created file
         :param force: Force overwrite of an existing file
+        :param on_progress: Called as `on_progress(bytes_done, total, rate)` as the content is sent, for each chunk of a streamed file-like object and once for `str` or `bytes` data
         :param opts: Connection options
 
         :return: Information about the written file
@@ -643,20 +675,31 @@ class AsyncVolume(ClientFactory):
         elif hasattr(data, "read"):
             # Stream file-like objects in chunks without buffering them in
             # memory. Async httpx requires an async iterable request body.
-            content = aiter_io_chunks(data)
+            content = aiter_io_chunks(data, AdaptiveChunkSize())
         else:
             raise ValueError(f"Unsupported data type: {type(data)}")
 
-        res = await put_file.asyncio_detailed(
-            self._volume_id,
-            body=FilePayload(payload=content),  # type: ignore[arg-type]  # httpx accepts bytes and streamable content directly
-            path=path,
-            uid=uid if uid is not None else UNSET,
-            gid=gid if gid is not None else UNSET,
-            mode=mode if mode is not None else UNSET,
-            force=force if force is not None else UNSET,
-            client=api_client,
+        progress = TransferProgress(
+            True, upload_size(data), on_progress, self._transfer_stats
         )
+        if not isinstance(content, bytes):
+            content = aiter_progress(content, progress)
+
+        try:
+            res = await put_file.asyncio_detailed(
+                self._volume_id,
+                body=FilePayload(payload=content),  # type: ignore[arg-type]  # httpx accepts bytes and streamable content directly
+                path=path,
+                uid=uid if uid is not None else UNSET,
+                gid=gid if gid is not None else UNSET,
+                mode=mode if mode is not None else UNSET,
+                force=force if force is not None else UNSET,
+                client=api_client,
+            )
+            if isinstance(content, bytes) and res.status_code < 300:
+                progress.update(len(content))
+        finally:
+            progress.finish()
 
         if res.status_code == 404:
             raise VolumePathNotFoundException(f"Path {path} not found")
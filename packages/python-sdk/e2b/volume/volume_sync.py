@@ -1,4 +1,3 @@
-import io
 from typing import IO, Iterator, List, Literal, Optional, Union, cast, overload
 from http import HTTPStatus
 
@@ -59,7 +58,17 @@ from e2b.volume.types import (
     VolumeInfo,
     VolumeEntryStat,
 )
-from e2b.io_utils import iter_io_chunks
+from e2b.io_utils import (
+    AdaptiveChunkSize,
+    MappedFile,
+    ProgressHandler,
+    TransferProgress,
+    TransferStats,
+    content_length,
+    iter_io_chunks,
+    iter_progress,
+    upload_size,
+)
 from e2b.volume.utils import (
     DualMethod,
     convert_volume_entry_stat,
@@ -84,6 +93,7 @@ class Volume(ClientFactory):
         self._domain = domain
         self._debug = debug
         self._proxy = proxy
+        self._transfer_stats = TransferStats()
 
     @property
     def volume_id(self) -> str:
@@ -97,6 +107,13 @@ class Volume(ClientFactory):
     def token(self) -> Optional[str]:
         return self._token
 
+    @property
+    def transfer_stats(self) -> TransferStats:
+        """
+        Running totals of the file transfers to and from the volume made through this object.
+        """
+        return self._transfer_stats
+
     def _get_volume_config(
         self, **opts: Unpack[VolumeApiParams]
     ) -> VolumeConnectionConfig:
@@ -474,6 +491,7 @@ class Volume(ClientFactory):
         path: str,
         format: Literal["stream"],
         stream_idle_timeout: Optional[float] = None,
+        on_progress: Optional[ProgressHandler] = None,
         **opts: Unpack[VolumeApiParams],
     ) -> Iterator[bytes]: ...
 
@@ -482,6 +500,7 @@ class Volume(ClientFactory):
         path: str,
         format: Literal["text", "bytes", "stream"] = "text",
         stream_idle_timeout: Optional[float] = None,
+        on_progress: Optional[ProgressHandler] = None,
         **opts: Unpack[VolumeApiParams],
     ) -> Union[str, bytes, Iterator[bytes]]:
         """
@@ -496,6 +515,7 @@ class Volume(ClientFactory):
             a transport-wide idle read timeout instead (60 seconds), which
             resets on every chunk. (`AsyncVolume.read_file` honors this
             parameter.)
+        :param on_progress: Called as `on_progress(bytes_done, total, rate)` for each chunk of a streamed read (`format="stream"`)
         :param opts: Connection options
 
         :return: File content as string, bytes, or iterator of bytes
@@ -543,7 +563,16 @@ class Volume(ClientFactory):
                         )
                         raise handle_api_exception(api_response, VolumeException)
 
-                    yield from response.iter_bytes()
+                    progress = TransferProgress(
+                        False,
+                        content_length(response.headers),
+                        on_progress,
+                        self._transfer_stats,
+                    )
+                    try:
+                        yield from iter_progress(response.iter_bytes(), progress)
+                    finally:
+                        progress.finish()
 
             return stream_file()
 
@@ -579,6 +608,7 @@ class Volume(ClientFactory):
         gid: Optional[int] = None,
         mode: Optional[int] = None,
         force: Optional[bool] = None,
+        on_progress: Optional[ProgressHandler] = None,
         **opts: Unpack[VolumeApiParams],
     ) -> VolumeEntryStat:
         """
@@ -593,6 +623,7 @@ class Volume(ClientFactory):
         :param gid: Group ID of the created file
         :param mode: Mode of the created file
         :param force: Force overwrite of an existing file
+        :param on_progress: Called as `on_progress(bytes_done, total, rate)` as the content is sent, for each chunk of a streamed file-like object and once for `str` or `bytes` data
         :param opts: Connection options
 
         :return: Information about the written file
@@ -605,30 +636,43 @@ class Volume(ClientFactory):
         if upload_timeout is not None:
             api_client = api_client.with_timeout(httpx.Timeout(upload_timeout))
 
-        content: Union[bytes, IO[bytes], Iterator[bytes]]
+        content: Union[bytes, Iterator[bytes]]
         if isinstance(data, str):
             content = data.encode("utf-8")
         elif isinstance(data, bytes):
             content = data
-        elif isinstance(data, io.TextIOBase):
-            # Text-mode IO yields str chunks—encode them while streaming.
+        elif isinstance(data, MappedFile):
+            # Sliced from the map rather than read.
             content = iter_io_chunks(data)
         elif hasattr(data, "read"):
-            # httpx streams file-like objects in chunks without buffering.
-            content = data
+            # Stream file-like objects in chunks without buffering them in
+            # memory, encoding text-mode chunks. Read here rather than by
+            # httpx so the chunks can be counted.
+            content = iter_io_chunks(data, AdaptiveChunkSize())
         else:
             raise ValueError(f"Unsupported data type: {type(data)}")
 
-        res = put_file.sync_detailed(
-            self._volume_id,
-            body=FilePayload(payload=content),  # type: ignore[arg-type]  # httpx accepts bytes and streamable content directly
-            path=path,
-            uid=uid if uid is not None else UNSET,
-            gid=gid if gid is not None else UNSET,
-            mode=mode if mode is not None else UNSET,
-            force=force if force is not None else UNSET,
-            client=api_client,
+        progress = TransferProgress(
+            True, upload_size(data), on_progress, self._transfer_stats
         )
+        if not isinstance(content, bytes):
+            content = iter_progress(content, progress)
+
+        try:
+            res = put_file.sync_detailed(
+                self._volume_id,
+                body=FilePayload(payload=content),  # type: ignore[arg-type]  # httpx accepts bytes and streamable content directly
+                path=path,
+                uid=uid if uid is not None else UNSET,
+                gid=gid if gid is not None else UNSET,
+                mode=mode if mode is not None else UNSET,
+                force=force if force is not None else UNSET,
+                client=api_client,
+            )
+            if isinstance(content, bytes) and res.status_code < 300:
+                progress.update(len(content))
+        finally:
+            progress.finish()
 
         if res.status_code == 404:
             raise VolumePathNotFoundException(f"Path {path} not found")
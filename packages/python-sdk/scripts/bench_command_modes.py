@@ -0,0 +1,250 @@
+"""Benchmark of the per-command latency of the `commands.run` shell modes.
+
+Runs a trivial command through the SDK's `Commands` against a local envd
+stand-in that serves the process RPCs by running the processes on this
+machine, once per shell mode (`login`, `non-login`, `none`) and once in a
+`commands.session()`, and prints the latency of each. The login shell sources
+the profile scripts of this machine, so the gap grows with how much they do —
+in a sandbox, with the template's. Then it times a batch of `--batch` commands
+run one by one, with `commands.run_many()`, and with its supervisor.
+
+`--latency-ms` delays every request to the stand-in, to include a network
+round trip.
+
+    python scripts/bench_command_modes.py [--runs 50] [--cmd true] [--batch 20]
+        [--latency-ms 0]
+"""
+
+import argparse
+import io
+import os
+import queue
+import socketserver
+import statistics
+import subprocess
+import threading
+import time
+from typing import IO, Callable, Dict, Iterator, Optional
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import httpx
+from connectrpc.code import Code
+from connectrpc.errors import ConnectError
+from connectrpc.request import RequestContext
+from packaging.version import Version
+from protobuf import Oneof
+
+from e2b.connection_config import ConnectionConfig
+from e2b.envd.process import process_connect, process_pb
+from e2b.sandbox_sync.commands.command import Commands
+
+MODES = ["login", "non-login", "none"]
+
+DataEvent = process_pb.ProcessEvent.DataEvent
+
+
+def _response(event: process_pb.ProcessEvent) -> process_pb.StartResponse:
+    return process_pb.StartResponse(event=event)
+
+
+def _pid(process: Optional[process_pb.ProcessSelector]) -> int:
+    pid = process.selector.value if process and process.selector else None
+    if not isinstance(pid, int):
+        raise ConnectError(Code.INVALID_ARGUMENT, "Select the process by its pid")
+    return pid
+
+
+class ProcessService(process_connect.ProcessSync):
+    """envd's process service, running the processes locally.
+
+    The other RPCs aren't needed by the benchmark and stay unimplemented.
+    """
+
+    def __init__(self):
+        self._processes: Dict[int, subprocess.Popen] = {}
+
+    def start(
+        self,
+        request: process_pb.StartRequest,
+        ctx: RequestContext[process_pb.StartRequest, process_pb.StartResponse],
+    ) -> Iterator[process_pb.StartResponse]:
+        config = request.process
+        if config is None:
+            raise ConnectError(Code.INVALID_ARGUMENT, "The process config is missing")
+
+        proc = subprocess.Popen(
+            [config.cmd, *config.args],
+            env={**os.environ, **dict(config.envs)},
+            cwd=config.cwd or None,
+            stdin=subprocess.PIPE if request.stdin else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._processes[proc.pid] = proc
+        output: "queue.Queue[Optional[DataEvent]]" = queue.Queue()
+
+        def forward(
+            stream: Optional[IO[bytes]], event: Callable[[bytes], DataEvent]
+        ) -> None:
+            while stream and (chunk := os.read(stream.fileno(), 64 * 1024)):
+                output.put(event(chunk))
+            output.put(None)
+
+        for stream, event in (
+            (proc.stdout, lambda chunk: DataEvent(output=Oneof("stdout", chunk))),
+            (proc.stderr, lambda chunk: DataEvent(output=Oneof("stderr", chunk))),
+        ):
+            threading.Thread(target=forward, args=(stream, event), daemon=True).start()
+
+        yield _response(
+            process_pb.ProcessEvent(
+                event=Oneof("start", process_pb.ProcessEvent.StartEvent(pid=proc.pid))
+            )
+        )
+        open_streams = 2
+        while open_streams:
+            data = output.get()
+            if data is None:
+                open_streams -= 1
+                continue
+            yield _response(process_pb.ProcessEvent(event=Oneof("data", data)))
+
+        exit_code = proc.wait()
+        del self._processes[proc.pid]
+        yield _response(
+            process_pb.ProcessEvent(
+                event=Oneof(
+                    "end",
+                    process_pb.ProcessEvent.EndEvent(
+                        exit_code=exit_code,
+                        exited=True,
+                        status=f"exit status {exit_code}",
+                    ),
+                )
+            )
+        )
+
+    def send_input(
+        self,
+        request: process_pb.SendInputRequest,
+        ctx: RequestContext[process_pb.SendInputRequest, process_pb.SendInputResponse],
+    ) -> process_pb.SendInputResponse:
+        stdin = self._processes[_pid(request.process)].stdin
+        if stdin is not None and request.input and request.input.input:
+            stdin.write(request.input.input.value)
+            stdin.flush()
+        return process_pb.SendInputResponse()
+
+    def send_signal(
+        self,
+        request: process_pb.SendSignalRequest,
+        ctx: RequestContext[
+            process_pb.SendSignalRequest, process_pb.SendSignalResponse
+        ],
+    ) -> process_pb.SendSignalResponse:
+        proc = self._processes.get(_pid(request.process))
+        if proc is not None:
+            proc.kill()
+        return process_pb.SendSignalResponse()
+
+
+def dechunked(app, latency: float = 0):
+    """wsgiref hands the app the raw request body, and connectrpc sends it chunked.
+
+    Each request is also delayed by `latency` seconds, standing in for the round
+    trip to a remote sandbox.
+    """
+
+    def wrapped(environ, start_response):
+        time.sleep(latency)
+        if environ.get("HTTP_TRANSFER_ENCODING") == "chunked":
+            stream, body = environ["wsgi.input"], bytearray()
+            while size := int(stream.readline().split(b";")[0], 16):
+                body += stream.read(size)
+                stream.readline()
+            stream.readline()
+            environ["wsgi.input"] = io.BytesIO(body)
+            environ["CONTENT_LENGTH"] = str(len(body))
+        return app(environ, start_response)
+
+    return wrapped
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *_args) -> None:
+        pass
+
+
+class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").partition("\n")[0])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--cmd", default="true")
+    parser.add_argument("--batch", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    app = process_connect.ProcessWSGIApplication(ProcessService())
+    server = make_server(
+        "127.0.0.1",
+        0,
+        dechunked(app, args.latency_ms / 1000),
+        server_class=ThreadingWSGIServer,
+        handler_class=QuietHandler,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    commands = Commands(
+        url,
+        ConnectionConfig(api_key="e2b_bench"),
+        Version("0.5.0"),
+        httpx.Client(base_url=url),
+    )
+    # Warm up the connection.
+    commands.run(args.cmd, shell="none")
+
+    print(f"{'mode':>10} {'median (ms)':>12} {'p90 (ms)':>10}")
+    for mode in MODES:
+        latencies = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            commands.run(args.cmd, shell=mode)  # type: ignore[arg-type]
+            latencies.append((time.perf_counter() - started) * 1000)
+        p90 = statistics.quantiles(latencies, n=10)[-1]
+        print(f"{mode:>10} {statistics.median(latencies):>12.2f} {p90:>10.2f}")
+
+    with commands.session() as session:
+        latencies = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            session.run(args.cmd)
+            latencies.append((time.perf_counter() - started) * 1000)
+        p90 = statistics.quantiles(latencies, n=10)[-1]
+        print(f"{'session':>10} {statistics.median(latencies):>12.2f} {p90:>10.2f}")
+
+    batch = [args.cmd] * args.batch
+    runs = {
+        "one by one": lambda: [commands.run(cmd, shell="non-login") for cmd in batch],
+        "run_many": lambda: commands.run_many(batch, shell="non-login"),
+        "supervisor": lambda: commands.run_many(
+            batch, shell="non-login", supervisor=True
+        ),
+    }
+    print(f"\n{'batch of ' + str(args.batch):>12} {'best (ms)':>10}")
+    for name, run in runs.items():
+        best = float("inf")
+        for _ in range(5):
+            started = time.perf_counter()
+            run()
+            best = min(best, (time.perf_counter() - started) * 1000)
+        print(f"{name:>12} {best:>10.2f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
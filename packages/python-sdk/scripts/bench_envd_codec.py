@@ -0,0 +1,43 @@
+"""Micro-benchmark of the per-event decode cost of the envd RPC codecs.
+
+Decodes process output events (the bulk of envd stream traffic) of a few
+typical sizes with the JSON and binary protobuf codecs.
+
+    python scripts/bench_envd_codec.py
+"""
+
+import os
+import timeit
+
+from protobuf import Oneof
+
+from e2b.envd.client_shared import ENVD_BINARY_CODEC, ENVD_JSON_CODEC
+from e2b.envd.process.process_pb import ConnectResponse, ProcessEvent
+
+SIZES = [64, 4 * 1024, 64 * 1024]
+
+
+def output_event(size: int) -> ConnectResponse:
+    return ConnectResponse(
+        event=ProcessEvent(
+            event=Oneof(
+                "data", ProcessEvent.DataEvent(output=Oneof("stdout", os.urandom(size)))
+            )
+        )
+    )
+
+
+def main() -> None:
+    print(f"{'size':>8} {'codec':>6} {'bytes':>8} {'decode (us/event)':>18}")
+    for size in SIZES:
+        event = output_event(size)
+        for codec in (ENVD_JSON_CODEC, ENVD_BINARY_CODEC):
+            data = codec.encode(event)
+            timer = timeit.Timer(lambda: codec.decode(data, ConnectResponse))
+            number, _ = timer.autorange()
+            best = min(timer.repeat(repeat=5, number=number)) / number
+            print(f"{size:>8} {codec.name():>6} {len(data):>8} {best * 1e6:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
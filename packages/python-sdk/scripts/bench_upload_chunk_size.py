@@ -0,0 +1,91 @@
+"""Benchmark of streamed upload throughput across chunk sizes.
+
+Uploads an in-memory payload to a local HTTP server through the pyqwest
+transport the SDK uses, once per fixed chunk size of `iter_io_chunks` and
+once with an `AdaptiveChunkSize`, and prints the throughput of each.
+
+    python scripts/bench_upload_chunk_size.py [--size-mb 256] [--repeat 3]
+"""
+
+import argparse
+import http.server
+import io
+import threading
+import time
+
+import httpx
+from pyqwest import SyncHTTPTransport
+from pyqwest.httpx import PyqwestTransport
+
+from e2b.io_utils import AdaptiveChunkSize, ChunkSize, iter_io_chunks
+
+FIXED_SIZES = [16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024]
+
+
+class DiscardHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        buffer = bytearray(1024 * 1024)
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                self._discard(size, buffer)
+                self.rfile.readline()
+                if size == 0:
+                    break
+        else:
+            self._discard(int(self.headers.get("Content-Length", 0)), buffer)
+
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _discard(self, size: int, buffer: bytearray) -> None:
+        view = memoryview(buffer)
+        while size > 0:
+            size -= self.rfile.readinto(view[: min(size, len(view))])
+
+    def log_message(self, *_args) -> None:
+        pass
+
+
+def upload(client: httpx.Client, url: str, data: bytes, chunk_size: ChunkSize) -> float:
+    started = time.perf_counter()
+    response = client.post(url, content=iter_io_chunks(io.BytesIO(data), chunk_size))
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").partition("\n")[0])
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), DiscardHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/upload"
+    data = bytes(args.size_mb * 1024 * 1024)
+
+    print(f"{'chunk size':>12} {'MiB/s':>10} {'final size':>12}")
+    with httpx.Client(transport=PyqwestTransport(SyncHTTPTransport())) as client:
+        # Warm up the connection pool.
+        upload(client, url, b"x", 1)
+
+        for size in FIXED_SIZES:
+            best = min(upload(client, url, data, size) for _ in range(args.repeat))
+            print(f"{size // 1024:>10} K {args.size_mb / best:>10.1f} {'':>12}")
+
+        best, final = float("inf"), 0
+        for _ in range(args.repeat):
+            adaptive = AdaptiveChunkSize()
+            best = min(best, upload(client, url, data, adaptive))
+            final = adaptive.size
+        print(f"{'adaptive':>12} {args.size_mb / best:>10.1f} {final // 1024:>10} K")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -51,3 +51,31 @@ async def test_run_with_timeout(async_sandbox: AsyncSandbox):
 async def test_run_with_too_short_timeout(async_sandbox: AsyncSandbox):
     with pytest.raises(TimeoutException):
         await async_sandbox.commands.run("sleep 10", timeout=2)
+
+
+async def test_run_argv_without_shell(async_sandbox: AsyncSandbox):
+    cmd = await async_sandbox.commands.run(["echo", "$HOME; exit 1"])
+
+    assert cmd.exit_code == 0
+    assert cmd.stdout == "$HOME; exit 1\n"
+
+
+async def test_run_with_non_login_shell(async_sandbox: AsyncSandbox):
+    login = await async_sandbox.commands.run("shopt login_shell")
+    non_login = await async_sandbox.commands.run("shopt login_shell", shell="non-login")
+
+    assert login.stdout.split() == ["login_shell", "on"]
+    assert non_login.stdout.split() == ["login_shell", "off"]
+
+
+async def test_run_with_bytes_output(async_sandbox: AsyncSandbox):
+    data = bytes(range(256)) * 4096
+    await async_sandbox.files.write("/tmp/data.bin", data)
+
+    chunks = []
+    cmd = await async_sandbox.commands.run(
+        "cat /tmp/data.bin", output_format="bytes", on_stdout=chunks.append
+    )
+
+    assert cmd.stdout == data
+    assert b"".join(chunks) == data
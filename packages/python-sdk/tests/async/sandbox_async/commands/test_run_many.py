@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+from packaging.version import Version
+
+from e2b import AsyncSandbox, SandboxException
+from e2b.connection_config import ConnectionConfig
+from e2b.sandbox_async.commands.command import Commands
+
+CMDS = ["echo one", ["printf", "%s", "two words"], "echo err >&2; exit 3"]
+
+
+@pytest.mark.parametrize("supervisor", [False, True])
+async def test_run_many(async_sandbox: AsyncSandbox, supervisor):
+    results = await async_sandbox.commands.run_many(
+        CMDS, max_concurrency=2, supervisor=supervisor
+    )
+
+    assert [(r.stdout, r.stderr, r.exit_code) for r in results] == [
+        ("one\n", "", 0),
+        ("two words", "", 0),
+        ("", "err\n", 3),
+    ]
+    assert all(r.duration > 0 for r in results)
+
+
+async def test_run_many_empty(async_sandbox: AsyncSandbox):
+    assert await async_sandbox.commands.run_many([]) == []
+
+
+class FakeHandle:
+    """
+    Command that runs until it's killed, or fails right away for `fail`.
+    """
+
+    def __init__(self, cmd: str):
+        self.cmd = cmd
+        self.killed = asyncio.Event()
+        self.disconnected = False
+
+    async def wait(self):
+        if self.cmd == "fail":
+            raise SandboxException("The command failed")
+        await asyncio.sleep(10)
+
+    async def kill(self) -> bool:
+        self.killed.set()
+        return True
+
+    async def disconnect(self) -> None:
+        self.disconnected = True
+
+
+async def test_run_many_kills_started_commands_on_failure(monkeypatch, test_api_key):
+    commands = Commands(
+        "http://sandbox.test",
+        ConnectionConfig(api_key=test_api_key),
+        Version("0.5.0"),
+        httpx.AsyncClient(),
+    )
+    handles = []
+
+    async def run(cmd, **_):
+        handles.append(FakeHandle(cmd))
+        return handles[-1]
+
+    monkeypatch.setattr(commands, "run", run)
+
+    with pytest.raises(SandboxException):
+        await commands.run_many(["sleep", "fail", "sleep"], max_concurrency=3)
+
+    # The failed one too, its command may still run
+    assert all(h.killed.is_set() and h.disconnected for h in handles)
+    # No task of the batch is left behind
+    current = asyncio.current_task()
+    assert [t for t in asyncio.all_tasks() if t is not current] == []
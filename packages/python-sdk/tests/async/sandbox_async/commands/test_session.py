@@ -0,0 +1,122 @@
+import asyncio
+from typing import AsyncGenerator, Optional
+
+import pytest
+from protobuf import Oneof
+
+from e2b import AsyncSandbox, CommandExitException, SandboxException, TimeoutException
+from e2b.envd.process import process_pb
+from e2b.sandbox.commands.command_handle import TextOutputBuffer
+from e2b.sandbox_async.commands.command_handle import AsyncCommandHandle
+from e2b.sandbox_async.commands.session import AsyncCommandSession, SessionOutput
+
+
+class FakeShell:
+    """
+    Session shell whose output the test pushes, ending its output when killed.
+    """
+
+    def __init__(self):
+        self.output: "asyncio.Queue[Optional[process_pb.StartResponse]]" = (
+            asyncio.Queue()
+        )
+        self.killed = False
+        self.closed = False
+
+    async def events(self) -> AsyncGenerator[process_pb.StartResponse, None]:
+        try:
+            while (event := await self.output.get()) is not None:
+                yield event
+        finally:
+            self.closed = True
+
+    async def kill(self) -> bool:
+        self.killed = True
+        self.output.put_nowait(None)
+        return True
+
+    def session(self) -> AsyncCommandSession:
+        output: SessionOutput = asyncio.Queue()
+
+        async def send_stdin(*_) -> None:
+            pass
+
+        handle = AsyncCommandHandle(
+            pid=1,
+            handle_kill=self.kill,
+            events=self.events(),
+            output_buffer=TextOutputBuffer,
+            on_stdout=lambda data: output.put_nowait((data, None)),
+            on_stderr=lambda data: output.put_nowait((None, data)),
+            handle_send_stdin=send_stdin,
+        )
+        return AsyncCommandSession(handle, output)
+
+
+def _stdout_event(data: bytes) -> process_pb.StartResponse:
+    return process_pb.StartResponse(
+        event=process_pb.ProcessEvent(
+            event=Oneof(
+                "data", process_pb.ProcessEvent.DataEvent(output=Oneof("stdout", data))
+            )
+        )
+    )
+
+
+async def test_session_keeps_shell_state(async_sandbox: AsyncSandbox):
+    async with await async_sandbox.commands.session() as session:
+        await session.run("cd /tmp && export GREETING=hello")
+        result = await session.run('echo "$GREETING from $PWD"; echo warn >&2')
+
+    assert result.exit_code == 0
+    assert result.stdout == "hello from /tmp\n"
+    assert result.stderr == "warn\n"
+
+
+async def test_session_reports_exit_codes(async_sandbox: AsyncSandbox):
+    async with await async_sandbox.commands.session() as session:
+        with pytest.raises(CommandExitException) as exc:
+            await session.run("printf partial; exit_with() { return $1; }; exit_with 3")
+
+        assert exc.value.exit_code == 3
+        assert exc.value.stdout == "partial"
+        assert (await session.run("echo ok")).stdout == "ok\n"
+
+
+async def test_session_ends_when_the_shell_exits(async_sandbox: AsyncSandbox):
+    async with await async_sandbox.commands.session() as session:
+        with pytest.raises(SandboxException):
+            await session.run("exit 0")
+        with pytest.raises(SandboxException):
+            await session.run("echo unreachable")
+
+
+async def test_session_command_timeout_kills_the_shell():
+    shell = FakeShell()
+    session = shell.session()
+
+    with pytest.raises(TimeoutException):
+        await session.run("sleep 10", timeout=0.05)
+
+    assert shell.killed
+    assert session._watch.done()
+    with pytest.raises(SandboxException):
+        await session.run("echo unreachable")
+
+
+async def test_session_failed_command_kills_the_shell():
+    shell = FakeShell()
+    session = shell.session()
+    shell.output.put_nowait(_stdout_event(b"out"))
+
+    def fail(_: str) -> None:
+        raise ValueError("callback failed")
+
+    with pytest.raises(ValueError):
+        await session.run("echo out", on_stdout=fail)
+
+    assert shell.killed
+    # Disconnected from the shell's output
+    assert shell.closed
+    with pytest.raises(SandboxException):
+        await session.run("echo unreachable")
@@ -0,0 +1,39 @@
+import hashlib
+import io
+
+from e2b import AsyncSandbox
+
+
+async def test_stream_stdin_chunks(async_sandbox: AsyncSandbox):
+    cmd = await async_sandbox.commands.run("wc -c", background=True, stdin=True)
+
+    async def chunks():
+        for _ in range(64):
+            yield b"x" * 65536
+
+    await cmd.stream_stdin(chunks())
+    await cmd.close_stdin()
+
+    result = await cmd.wait()
+    assert result.stdout.strip() == str(64 * 65536)
+
+
+async def test_stream_stdin_from_file(async_sandbox: AsyncSandbox):
+    data = bytes(range(256)) * 16384
+    cmd = await async_sandbox.commands.run("sha256sum", background=True, stdin=True)
+
+    await async_sandbox.commands.stream_stdin(cmd.pid, io.BytesIO(data))
+    await cmd.close_stdin()
+
+    result = await cmd.wait()
+    assert result.stdout.split()[0] == hashlib.sha256(data).hexdigest()
+
+
+async def test_stream_stdin_text_chunks(async_sandbox: AsyncSandbox):
+    cmd = await async_sandbox.commands.run("cat", background=True, stdin=True)
+
+    await cmd.stream_stdin(["Hello, ", "World!"])
+    await cmd.close_stdin()
+
+    result = await cmd.wait()
+    assert result.stdout == "Hello, World!"
@@ -0,0 +1,150 @@
+import os
+from types import SimpleNamespace
+from unittest.mock import sentinel
+
+import httpx
+import pytest
+from packaging.version import Version
+
+from e2b.connection_config import ConnectionConfig
+from e2b.exceptions import FileNotFoundException
+from e2b.sandbox.filesystem import filesystem as filesystem_shared
+from e2b.sandbox.filesystem.filesystem import FileType
+from e2b.sandbox_async.filesystem import filesystem as filesystem_async
+from e2b.sandbox_async.filesystem.filesystem import Filesystem
+
+CONTENT = os.urandom(100_000)
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    def __init__(self, data: bytes, fail_after: int = -1):
+        self.data = data
+        self.fail_after = fail_after
+
+    async def __aiter__(self):
+        for offset in range(0, len(self.data), 1000):
+            if offset == self.fail_after:
+                raise httpx.ReadError("connection reset")
+            yield self.data[offset : offset + 1000]
+
+
+class FileServer:
+    """Stand-in for envd's `GET /files`, answering `Range` requests."""
+
+    def __init__(self, honor_range: bool = True, failures: int = 0):
+        self.honor_range = honor_range
+        self.failures = failures
+        self.ranges = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        header = request.headers.get("range")
+        self.ranges.append(header)
+        if not header or not self.honor_range:
+            return httpx.Response(200, stream=ChunkedStream(CONTENT))
+
+        first, last = header.removeprefix("bytes=").split("-")
+        start, end = int(first), int(last) + 1
+        fail_after = -1
+        if self.failures and start < 25_000:
+            self.failures -= 1
+            fail_after = 5000
+        return httpx.Response(
+            206,
+            headers={"Content-Range": f"bytes {start}-{end - 1}/{len(CONTENT)}"},
+            stream=ChunkedStream(CONTENT[start:end], fail_after),
+        )
+
+
+@pytest.fixture
+def make_filesystem(monkeypatch, test_api_key):
+    monkeypatch.setattr(filesystem_shared, "DOWNLOAD_MIN_RANGE_SIZE", 10_000)
+    monkeypatch.setattr(filesystem_async, "create_rpc_client", lambda *_: sentinel)
+
+    def make(server, size: int = len(CONTENT)):
+        client = httpx.AsyncClient(
+            base_url="http://sandbox.test", transport=httpx.MockTransport(server)
+        )
+        monkeypatch.setattr(filesystem_async, "get_envd_api", lambda *_, **__: client)
+        fs = Filesystem(
+            "http://sandbox.test",
+            Version("0.6.2"),
+            ConnectionConfig(api_key=test_api_key),
+            client,
+        )
+
+        async def get_info(*_, **__):
+            return SimpleNamespace(type=FileType.FILE, size=size)
+
+        monkeypatch.setattr(fs, "get_info", get_info)
+        return fs
+
+    return make
+
+
+async def test_download_fetches_ranges_concurrently(make_filesystem, tmp_path):
+    server = FileServer()
+    dest = tmp_path / "file.bin"
+
+    size = await make_filesystem(server).download("/file.bin", str(dest), 4)
+
+    assert size == len(CONTENT)
+    assert dest.read_bytes() == CONTENT
+    assert sorted(server.ranges) == [
+        "bytes=0-24999",
+        "bytes=25000-49999",
+        "bytes=50000-74999",
+        "bytes=75000-99999",
+    ]
+
+
+async def test_download_resumes_only_the_failed_range(make_filesystem, tmp_path):
+    server = FileServer(failures=1)
+    dest = tmp_path / "file.bin"
+
+    await make_filesystem(server).download("/file.bin", str(dest), 4)
+
+    assert dest.read_bytes() == CONTENT
+    assert server.ranges.count("bytes=5000-24999") == 1
+    assert len(server.ranges) == 5
+
+
+async def test_download_fails_after_retries(make_filesystem, tmp_path):
+    server = FileServer(failures=10)
+    dest = tmp_path / "file.bin"
+
+    with pytest.raises(httpx.ReadError):
+        await make_filesystem(server).download("/file.bin", str(dest), 4)
+
+    assert not dest.exists()
+
+
+async def test_download_falls_back_to_single_stream(make_filesystem, tmp_path):
+    server = FileServer(honor_range=False)
+    dest = tmp_path / "file.bin"
+
+    await make_filesystem(server).download("/file.bin", str(dest), 4)
+
+    assert dest.read_bytes() == CONTENT
+    assert server.ranges == ["bytes=0-24999"]
+
+
+async def test_download_small_file_in_one_request(make_filesystem, tmp_path):
+    server = FileServer()
+    dest = tmp_path / "file.bin"
+
+    await make_filesystem(server, size=5_000).download("/file.bin", str(dest), 4)
+
+    assert dest.read_bytes() == CONTENT
+    assert server.ranges == [None]
+
+
+async def test_download_missing_file(make_filesystem, tmp_path):
+    dest = tmp_path / "file.bin"
+
+    async def not_found(request):
+        return httpx.Response(404, json={"message": "file not found"})
+
+    with pytest.raises(FileNotFoundException):
+        await make_filesystem(not_found).download("/file.bin", str(dest), 4)
+
+    assert not dest.exists()
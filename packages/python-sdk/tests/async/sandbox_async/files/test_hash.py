@@ -0,0 +1,121 @@
+import hashlib
+import io
+from types import SimpleNamespace
+from unittest.mock import sentinel
+
+import httpx
+import pytest
+from envd_files_server import EnvdFilesServer
+from packaging.version import Version
+
+from e2b.connection_config import ConnectionConfig
+from e2b.exceptions import InvalidArgumentException
+from e2b.sandbox_async.filesystem import filesystem as filesystem_async
+from e2b.sandbox_async.filesystem.filesystem import Filesystem
+
+CONTENT = b"hello world\n" * 1000
+
+
+class HashCommands:
+    def __init__(self, server: EnvdFilesServer):
+        self.server = server
+        self.cmds = []
+
+    async def run(self, cmd, **_):
+        self.cmds.append(cmd)
+        return SimpleNamespace(stdout=self.server.hash(cmd))
+
+
+@pytest.fixture
+def server():
+    server = EnvdFilesServer()
+    server._put("/data.txt", CONTENT)
+    server._put_dir("/dir")
+    return server
+
+
+@pytest.fixture
+def commands(server):
+    return HashCommands(server)
+
+
+@pytest.fixture
+def fs(monkeypatch, test_api_key, server, commands):
+    monkeypatch.setattr(filesystem_async, "create_rpc_client", lambda *_: sentinel)
+    monkeypatch.setattr(filesystem_async, "get_envd_api", lambda *_, **__: None)
+    client = httpx.AsyncClient(
+        base_url="http://sandbox.test", transport=server.transport()
+    )
+    fs = Filesystem(
+        "http://sandbox.test",
+        Version("0.6.2"),
+        ConnectionConfig(api_key=test_api_key),
+        client,
+        commands=commands,
+    )
+
+    async def get_info(path, **kwargs):
+        return server.get_info(path, **kwargs)
+
+    monkeypatch.setattr(fs, "get_info", get_info)
+    return fs
+
+
+@pytest.mark.parametrize("algo", ["md5", "sha1", "sha256", "sha512"])
+async def test_hash_computes_the_digest_in_the_sandbox(fs, algo):
+    assert await fs.hash("/data.txt", algo) == hashlib.new(algo, CONTENT).hexdigest()
+
+
+async def test_hash_quotes_the_path(fs, server, commands):
+    server._put("/my file; rm -rf", b"x")
+
+    await fs.hash("/my file; rm -rf")
+
+    assert commands.cmds == ["sha256sum < '/my file; rm -rf'"]
+
+
+async def test_hash_rejects_unknown_algorithms_and_directories(fs):
+    with pytest.raises(InvalidArgumentException):
+        await fs.hash("/data.txt", "crc32")
+    with pytest.raises(InvalidArgumentException):
+        await fs.hash("/dir")
+
+
+@pytest.mark.parametrize(
+    "data",
+    [CONTENT, CONTENT.decode(), io.BytesIO(CONTENT)],
+    ids=["bytes", "str", "io"],
+)
+async def test_write_skips_identical_content(fs, server, data):
+    info = await fs.write(
+        "/data.txt", data, use_octet_stream=True, skip_if_identical=True
+    )
+
+    assert info.path == "/data.txt"
+    assert server.uploads == []
+
+
+async def test_write_skip_rewinds_a_stream_it_uploads(fs, server, commands):
+    changed = CONTENT[:-1] + b"!"
+
+    await fs.write("/data.txt", io.BytesIO(changed), skip_if_identical=True)
+
+    assert server.files["/data.txt"] == changed
+    assert len(commands.cmds) == 1
+
+
+async def test_write_skip_compares_sizes_first(fs, server, commands):
+    await fs.write(
+        "/data.txt", CONTENT + b"more", skip_if_identical=True, use_octet_stream=True
+    )
+    await fs.write("/new.txt", CONTENT, skip_if_identical=True, use_octet_stream=True)
+
+    assert server.uploads == ["/data.txt", "/new.txt"]
+    assert commands.cmds == []
+
+
+async def test_write_uploads_text_streams(fs, server, commands):
+    await fs.write("/data.txt", io.StringIO(CONTENT.decode()), skip_if_identical=True)
+
+    assert server.uploads == ["/data.txt"]
+    assert commands.cmds == []
@@ -0,0 +1,141 @@
+import io
+from unittest.mock import sentinel
+
+import httpx
+import pytest
+from envd_files_server import EnvdFilesServer
+from packaging.version import Version
+
+from e2b.connection_config import ConnectionConfig
+from e2b.sandbox.filesystem.filesystem import WriteEntry
+from e2b.sandbox_async.filesystem import filesystem as filesystem_async
+from e2b.sandbox_async.filesystem.filesystem import Filesystem
+
+CONTENT = bytes(range(256)) * 1024
+
+
+@pytest.fixture
+def server():
+    server = EnvdFilesServer()
+    server._put("/data.bin", CONTENT)
+    return server
+
+
+@pytest.fixture
+def fs(monkeypatch, test_api_key, server):
+    monkeypatch.setattr(filesystem_async, "create_rpc_client", lambda *_: sentinel)
+    monkeypatch.setattr(filesystem_async, "get_envd_api", lambda *_, **__: None)
+    client = httpx.AsyncClient(
+        base_url="http://sandbox.test", transport=server.transport()
+    )
+    fs = Filesystem(
+        "http://sandbox.test",
+        Version("0.6.2"),
+        ConnectionConfig(api_key=test_api_key),
+        client,
+    )
+    fs._envd_api_streaming = client
+
+    async def get_info(path, **kwargs):
+        return server.get_info(path, **kwargs)
+
+    monkeypatch.setattr(fs, "get_info", get_info)
+    return fs
+
+
+def assert_progress(calls, total):
+    done = [c[0] for c in calls]
+    assert done == sorted(done)
+    assert calls[-1][:2] == (len(CONTENT), total)
+    assert all(rate >= 0 for _, _, rate in calls)
+
+
+async def test_write_reports_progress_of_a_stream(fs, server):
+    calls = []
+
+    await fs.write(
+        "/out.bin",
+        io.BytesIO(CONTENT),
+        on_progress=lambda *args: calls.append(args),
+    )
+
+    assert server.files["/out.bin"] == CONTENT
+    assert len(calls) > 1
+    assert_progress(calls, len(CONTENT))
+    assert fs.transfer_stats.bytes_uploaded == len(CONTENT)
+    assert fs.transfer_stats.uploads == 1
+
+
+async def test_write_total_is_unknown_for_text_streams(fs):
+    calls = []
+
+    await fs.write(
+        "/out.txt",
+        io.StringIO("x" * 1000),
+        on_progress=lambda *args: calls.append(args),
+    )
+
+    assert calls[-1][:2] == (1000, None)
+
+
+async def test_write_reports_data_sent_from_memory(fs):
+    calls = []
+
+    await fs.write(
+        "/out.bin",
+        CONTENT,
+        use_octet_stream=True,
+        on_progress=lambda *args: calls.append(args),
+    )
+
+    assert len(calls) == 1
+    assert_progress(calls, len(CONTENT))
+
+
+async def test_write_files_progress_spans_all_files(fs):
+    calls = []
+    half = len(CONTENT) // 2
+
+    await fs.write_files(
+        [
+            WriteEntry(path="/a.bin", data=CONTENT[:half]),
+            WriteEntry(path="/b.bin", data=CONTENT[half:]),
+        ],
+        use_octet_stream=True,
+        max_concurrency=1,
+        on_progress=lambda *args: calls.append(args),
+    )
+
+    assert [c[:2] for c in calls] == [
+        (half, len(CONTENT)),
+        (len(CONTENT), len(CONTENT)),
+    ]
+    assert fs.transfer_stats.uploads == 1
+
+
+async def test_read_stream_reports_progress(fs):
+    calls = []
+
+    stream = await fs.read(
+        "/data.bin", format="stream", on_progress=lambda *args: calls.append(args)
+    )
+    async with stream:
+        assert b"".join([chunk async for chunk in stream]) == CONTENT
+
+    assert_progress(calls, len(CONTENT))
+    assert fs.transfer_stats.bytes_downloaded == len(CONTENT)
+    assert fs.transfer_stats.downloads == 1
+
+
+async def test_download_reports_progress(fs, tmp_path):
+    calls = []
+
+    await fs.download(
+        "/data.bin",
+        str(tmp_path / "data.bin"),
+        on_progress=lambda *args: calls.append(args),
+    )
+
+    assert (tmp_path / "data.bin").read_bytes() == CONTENT
+    assert_progress(calls, len(CONTENT))
+    assert fs.transfer_stats.downloads == 1
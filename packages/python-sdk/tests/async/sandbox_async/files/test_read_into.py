@@ -0,0 +1,75 @@
+import array
+import mmap
+from unittest.mock import sentinel
+
+import httpx
+import pytest
+from envd_files_server import EnvdFilesServer
+from packaging.version import Version
+
+from e2b.connection_config import ConnectionConfig
+from e2b.exceptions import InvalidArgumentException
+from e2b.sandbox_async.filesystem import filesystem as filesystem_async
+from e2b.sandbox_async.filesystem.filesystem import Filesystem
+
+CONTENT = bytes(range(256)) * 1024
+
+
+@pytest.fixture
+def fs(monkeypatch, test_api_key):
+    server = EnvdFilesServer()
+    server._put("/data.bin", CONTENT)
+    monkeypatch.setattr(filesystem_async, "create_rpc_client", lambda *_: sentinel)
+    monkeypatch.setattr(filesystem_async, "get_envd_api", lambda *_, **__: None)
+    client = httpx.AsyncClient(
+        base_url="http://sandbox.test", transport=server.transport()
+    )
+    fs = Filesystem(
+        "http://sandbox.test",
+        Version("0.6.2"),
+        ConnectionConfig(api_key=test_api_key),
+        client,
+    )
+    fs._envd_api_streaming = client
+    return fs
+
+
+async def test_read_into_fills_a_bytearray(fs):
+    buffer = bytearray(len(CONTENT) + 10)
+
+    read = await fs.read_into("/data.bin", buffer)
+
+    assert read == len(CONTENT)
+    assert buffer[:read] == CONTENT
+    # The view of the buffer is released, so it can be resized again.
+    buffer.extend(b"more")
+
+
+async def test_read_into_fills_an_mmap(fs):
+    with mmap.mmap(-1, len(CONTENT)) as buffer:
+        assert await fs.read_into("/data.bin", buffer) == len(CONTENT)
+        assert buffer[:] == CONTENT
+
+
+async def test_read_into_fills_a_typed_array(fs):
+    buffer = array.array("I", bytes(len(CONTENT)))
+
+    await fs.read_into("/data.bin", buffer)
+
+    assert buffer.tobytes() == CONTENT
+
+
+async def test_read_into_rejects_small_and_readonly_buffers(fs):
+    with pytest.raises(InvalidArgumentException):
+        await fs.read_into("/data.bin", bytearray(len(CONTENT) - 1))
+
+    with pytest.raises(InvalidArgumentException):
+        await fs.read_into("/data.bin", bytes(len(CONTENT)))
+
+
+async def test_read_memoryview(fs):
+    view = await fs.read("/data.bin", format="memoryview")
+
+    assert isinstance(view, memoryview)
+    assert view.readonly
+    assert view == CONTENT
@@ -0,0 +1,146 @@
+import io
+import os
+from unittest.mock import sentinel
+
+import httpx
+import pytest
+from envd_files_server import EnvdFilesServer
+from packaging.version import Version
+
+from e2b.connection_config import ConnectionConfig
+from e2b.exceptions import InvalidArgumentException, TemplateException
+from e2b.sandbox_async.filesystem import filesystem as filesystem_async
+from e2b.sandbox_async.filesystem.filesystem import Filesystem
+
+CONTENT = os.urandom(10_000)
+
+
+@pytest.fixture
+def make_filesystem(monkeypatch, test_api_key):
+    monkeypatch.setattr(filesystem_async, "UPLOAD_CHUNK_RETRY_DELAY", 0)
+    monkeypatch.setattr(filesystem_async, "create_rpc_client", lambda *_: sentinel)
+    monkeypatch.setattr(filesystem_async, "get_envd_api", lambda *_, **__: None)
+
+    def make(server: EnvdFilesServer, envd_version: str = "0.6.7"):
+        client = httpx.AsyncClient(
+            base_url="http://sandbox.test", transport=server.transport()
+        )
+        fs = Filesystem(
+            "http://sandbox.test",
+            Version(envd_version),
+            ConnectionConfig(api_key=test_api_key),
+            client,
+        )
+
+        async def rename(old_path, new_path, **kwargs):
+            return server.rename(old_path, new_path, **kwargs)
+
+        async def remove(path, **kwargs):
+            server.remove(path, **kwargs)
+
+        async def list_(path, **kwargs):
+            return server.list(path, **kwargs)
+
+        monkeypatch.setattr(fs, "rename", rename)
+        monkeypatch.setattr(fs, "remove", remove)
+        monkeypatch.setattr(fs, "list", list_)
+        return fs
+
+    return make
+
+
+async def test_resumable_write_uploads_chunks_and_renames(make_filesystem):
+    server = EnvdFilesServer()
+    fs = make_filesystem(server)
+
+    info = await fs.write(
+        "/data/file.bin", io.BytesIO(CONTENT), resumable=True, chunk_size=3_000
+    )
+
+    assert info.path == "/data/file.bin"
+    assert server.files == {"/data/file.bin": CONTENT}
+    assert len(server.uploads) == 4
+    assert all(u.startswith("/data/.file.bin.") for u in server.uploads)
+
+
+async def test_resumable_write_retries_only_the_failed_chunk(make_filesystem):
+    server = EnvdFilesServer(upload_failures=2, fail_after=2)
+    fs = make_filesystem(server)
+
+    await fs.write("file.txt", CONTENT.hex(), resumable=True, chunk_size=5_000)
+
+    assert server.files == {"file.txt": CONTENT.hex().encode()}
+    assert len(server.uploads) == 4
+    assert len(set(server.uploads)) == 4
+
+
+async def test_resumable_write_with_gzip(make_filesystem):
+    server = EnvdFilesServer()
+
+    await make_filesystem(server).write(
+        "/file.bin", CONTENT, resumable=True, chunk_size=4_096, gzip=True
+    )
+
+    assert server.files == {"/file.bin": CONTENT}
+
+
+async def test_resumable_write_of_empty_data(make_filesystem):
+    server = EnvdFilesServer()
+
+    await make_filesystem(server).write("/empty", b"", resumable=True)
+
+    assert server.files == {"/empty": b""}
+
+
+async def test_resumable_write_cleans_up_after_failure(make_filesystem):
+    # A text stream has no size known up front, so it can't be resumed
+    server = EnvdFilesServer(upload_failures=100, fail_after=2)
+
+    with pytest.raises(httpx.WriteError):
+        await make_filesystem(server).write(
+            "/file.txt", io.StringIO(CONTENT.hex()), resumable=True, chunk_size=3_000
+        )
+
+    assert len(server.uploads) == 2
+    assert server.files == {}
+
+
+async def test_resumable_write_resumes_after_a_failed_write(make_filesystem):
+    server = EnvdFilesServer(upload_failures=100, fail_after=2)
+    fs = make_filesystem(server)
+
+    with pytest.raises(httpx.WriteError):
+        await fs.write("/file.bin", CONTENT, resumable=True, chunk_size=3_000)
+    assert len(server.files) == 2
+
+    server.upload_failures = 0
+    progress = []
+    await fs.write(
+        "/file.bin",
+        io.BytesIO(CONTENT),
+        resumable=True,
+        chunk_size=3_000,
+        on_progress=lambda done, total, rate: progress.append((done, total)),
+    )
+
+    assert server.files == {"/file.bin": CONTENT}
+    # Only the two parts after the confirmed ones were uploaded again
+    assert len(server.uploads) == 4
+    assert len(set(server.uploads)) == 4
+    assert progress[0] == (6_000, len(CONTENT))
+    assert progress[-1] == (len(CONTENT), len(CONTENT))
+    assert not any(d.endswith(".parts") for d in server.dirs)
+
+
+async def test_resumable_write_requires_compose_support(make_filesystem):
+    fs = make_filesystem(EnvdFilesServer(), envd_version="0.6.4")
+
+    with pytest.raises(TemplateException):
+        await fs.write("/file.bin", CONTENT, resumable=True)
+
+
+async def test_resumable_write_rejects_metadata(make_filesystem):
+    fs = make_filesystem(EnvdFilesServer())
+
+    with pytest.raises(InvalidArgumentException):
+        await fs.write("/file.bin", CONTENT, resumable=True, metadata={"a": "b"})
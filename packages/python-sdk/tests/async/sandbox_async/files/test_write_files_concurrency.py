@@ -0,0 +1,106 @@
+import asyncio
+from unittest.mock import sentinel
+
+import httpx
+import pytest
+from envd_files_server import EnvdFilesServer
+from packaging.version import Version
+
+from e2b.connection_config import ConnectionConfig
+from e2b.exceptions import InvalidArgumentException
+from e2b.sandbox.filesystem.filesystem import WriteEntry
+from e2b.sandbox_async.filesystem import filesystem as filesystem_async
+from e2b.sandbox_async.filesystem.filesystem import Filesystem
+
+FILES = [WriteEntry(path=f"/data/{i}.txt", data=f"file {i}") for i in range(20)]
+
+
+class SlowServer(EnvdFilesServer):
+    """Answers later uploads faster, so uploads complete out of order.
+
+    With `last_first`, every upload but the last file's waits for `release`,
+    so the last file's upload deterministically completes first.
+    """
+
+    def __init__(self, last_first: bool = False):
+        super().__init__()
+        self.last_first = last_first
+        self.release = asyncio.Event()
+        self.in_flight = 0
+        self.peak = 0
+
+    async def handle_slowly(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        index = int(request.url.params["path"].split("/")[-1].split(".")[0])
+        if not self.last_first:
+            await asyncio.sleep(0.001 * (len(FILES) - index))
+        elif index != len(FILES) - 1:
+            await self.release.wait()
+        self.in_flight -= 1
+        return self.handle(request)
+
+
+@pytest.fixture
+def make_filesystem(monkeypatch, test_api_key):
+    monkeypatch.setattr(filesystem_async, "create_rpc_client", lambda *_: sentinel)
+    monkeypatch.setattr(filesystem_async, "get_envd_api", lambda *_, **__: None)
+
+    def make(server: SlowServer):
+        client = httpx.AsyncClient(
+            base_url="http://sandbox.test",
+            transport=httpx.MockTransport(server.handle_slowly),
+        )
+        return Filesystem(
+            "http://sandbox.test",
+            Version("0.6.2"),
+            ConnectionConfig(api_key=test_api_key),
+            client,
+        )
+
+    return make
+
+
+async def test_write_files_returns_results_in_input_order(make_filesystem):
+    server = SlowServer()
+
+    infos = await make_filesystem(server).write_files(
+        FILES, use_octet_stream=True, max_concurrency=5
+    )
+
+    assert [info.path for info in infos] == [f["path"] for f in FILES]
+    assert server.peak == 5
+    assert len(server.files) == len(FILES)
+
+
+async def test_write_files_shares_the_sandbox_limit(make_filesystem):
+    server = SlowServer()
+    fs = make_filesystem(server)
+    fs._upload_semaphore = asyncio.Semaphore(3)
+
+    await asyncio.gather(
+        fs.write_files(FILES[:10], use_octet_stream=True),
+        fs.write_files(FILES[10:], use_octet_stream=True),
+    )
+
+    assert server.peak == 3
+    assert len(server.files) == len(FILES)
+
+
+async def test_iter_write_files_yields_as_completed(make_filesystem):
+    server = SlowServer(last_first=True)
+    written = make_filesystem(server).iter_write_files(
+        FILES, use_octet_stream=True, max_concurrency=len(FILES)
+    )
+
+    first = await anext(written)
+    server.release.set()
+    rest = [info.path async for info in written]
+
+    assert first.path == FILES[-1]["path"]
+    assert sorted(rest) == sorted(f["path"] for f in FILES[:-1])
+
+
+async def test_write_files_rejects_invalid_concurrency(make_filesystem):
+    with pytest.raises(InvalidArgumentException):
+        await make_filesystem(SlowServer()).write_files(FILES, max_concurrency=0)
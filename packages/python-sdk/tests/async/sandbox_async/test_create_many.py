@@ -0,0 +1,130 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+import e2b.sandbox_async.main as sandbox_async_main
+from e2b import (
+    AsyncSandbox,
+    InvalidArgumentException,
+    RateLimitException,
+    SandboxException,
+)
+from e2b.sandbox.utils import RateLimitBackoff
+
+
+class FakeSandbox:
+    def __init__(self, index: int):
+        self.index = index
+        self.kill = AsyncMock(return_value=True)
+
+
+@pytest.fixture
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(
+        sandbox_async_main,
+        "RateLimitBackoff",
+        lambda: RateLimitBackoff(initial_delay=0.01, max_delay=0.02),
+    )
+
+
+def patch_create(monkeypatch, create):
+    monkeypatch.setattr(AsyncSandbox, "create", classmethod(create))
+
+
+async def test_returns_sandboxes_as_they_are_created(monkeypatch):
+    in_flight = 0
+    max_in_flight = 0
+    calls = 0
+    others_done = asyncio.Event()
+
+    async def create(cls, **kwargs):
+        nonlocal in_flight, max_in_flight, calls
+        index = calls
+        calls += 1
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # The first create finishes only after all the others
+        if index == 0:
+            await others_done.wait()
+        else:
+            await asyncio.sleep(0.01)
+            if calls == 6 and in_flight == 2:
+                others_done.set()
+        in_flight -= 1
+        assert kwargs["template"] == "my-template"
+        return FakeSandbox(index)
+
+    patch_create(monkeypatch, create)
+
+    sandboxes = [
+        sandbox
+        async for sandbox in AsyncSandbox.create_many(
+            6, template="my-template", max_concurrency=3
+        )
+    ]
+
+    assert max_in_flight == 3
+    assert sorted(s.index for s in sandboxes) == list(range(6))
+    assert sandboxes[-1].index == 0
+
+
+async def test_retries_rate_limited_creates(monkeypatch, fast_backoff):
+    attempts = 0
+
+    async def create(cls, **kwargs):
+        nonlocal attempts
+        attempts += 1
+        if attempts <= 3:
+            raise RateLimitException("rate limited")
+        return FakeSandbox(attempts)
+
+    patch_create(monkeypatch, create)
+
+    sandboxes = [s async for s in AsyncSandbox.create_many(2, max_concurrency=1)]
+
+    assert len(sandboxes) == 2
+    assert attempts == 5
+
+
+async def test_gives_up_after_repeated_rate_limits(monkeypatch, fast_backoff):
+    async def create(cls, **kwargs):
+        raise RateLimitException("rate limited")
+
+    patch_create(monkeypatch, create)
+
+    with pytest.raises(RateLimitException):
+        async for _ in AsyncSandbox.create_many(1):
+            pass
+
+
+async def test_failure_kills_sandboxes_that_were_not_returned(monkeypatch):
+    created = []
+
+    async def create(cls, **kwargs):
+        index = len(created)
+        created.append(None)
+        if index == 0:
+            raise SandboxException("boom")
+        await asyncio.sleep(0.02)
+        sandbox = FakeSandbox(index)
+        created[index] = sandbox
+        return sandbox
+
+    patch_create(monkeypatch, create)
+
+    with pytest.raises(SandboxException, match="boom"):
+        async for _ in AsyncSandbox.create_many(5, max_concurrency=2):
+            pass
+
+    # Creates already running are let finish and their sandboxes killed, the
+    # rest never start
+    assert 2 <= len(created) < 5
+    for sandbox in created[1:]:
+        sandbox.kill.assert_awaited_once()
+
+
+async def test_rejects_invalid_arguments():
+    with pytest.raises(InvalidArgumentException):
+        async for _ in AsyncSandbox.create_many(1, max_concurrency=0):
+            pass
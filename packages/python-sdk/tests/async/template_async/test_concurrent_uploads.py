@@ -0,0 +1,107 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+import e2b.template_async.main as template_async_main
+from e2b import AsyncTemplate, FileUploadException, InvalidArgumentException
+
+
+@pytest.fixture
+def template(tmp_path):
+    for i in range(6):
+        (tmp_path / f"file{i}.txt").write_text(f"content{i}")
+
+    builder = AsyncTemplate(file_context_path=str(tmp_path)).from_base_image()
+    for i in range(6):
+        builder = builder.copy(f"file{i}.txt", "/app/")
+    return builder
+
+
+@pytest.fixture
+def build_api(monkeypatch):
+    monkeypatch.setattr(
+        template_async_main,
+        "request_build",
+        AsyncMock(
+            return_value=SimpleNamespace(
+                template_id="template-id", build_id="build-id", tags=[]
+            )
+        ),
+    )
+    monkeypatch.setattr(
+        template_async_main,
+        "get_file_upload_link",
+        AsyncMock(return_value=SimpleNamespace(present=False, url="http://upload")),
+    )
+    trigger_build = AsyncMock()
+    monkeypatch.setattr(template_async_main, "trigger_build", trigger_build)
+    return trigger_build
+
+
+async def test_uploads_run_concurrently_up_to_the_limit(
+    template, build_api, monkeypatch
+):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_upload_file(api_client, src, *args, **kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    monkeypatch.setattr(template_async_main, "upload_file", fake_upload_file)
+    logs = []
+
+    await AsyncTemplate._build(
+        None,  # type: ignore[arg-type]
+        template,
+        "my-template",
+        on_build_logs=lambda log: logs.append(log.message),
+        max_concurrent_uploads=3,
+    )
+
+    assert max_in_flight == 3
+    assert sorted(m for m in logs if m.startswith("Uploaded")) == [
+        f"Uploaded 'file{i}.txt'" for i in range(6)
+    ]
+    build_api.assert_awaited_once()
+
+
+async def test_first_upload_error_cancels_the_rest(template, build_api, monkeypatch):
+    cancelled = []
+
+    async def fake_upload_file(api_client, src, *args, **kwargs):
+        if src == "file0.txt":
+            raise FileUploadException("boom")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(src)
+            raise
+
+    monkeypatch.setattr(template_async_main, "upload_file", fake_upload_file)
+
+    with pytest.raises(FileUploadException, match="boom"):
+        await AsyncTemplate._build(
+            None,  # type: ignore[arg-type]
+            template,
+            "my-template",
+            max_concurrent_uploads=6,
+        )
+
+    assert sorted(cancelled) == [f"file{i}.txt" for i in range(1, 6)]
+    build_api.assert_not_awaited()
+
+
+async def test_rejects_non_positive_upload_limit(template):
+    with pytest.raises(InvalidArgumentException):
+        await AsyncTemplate._build(
+            None,  # type: ignore[arg-type]
+            template,
+            "my-template",
+            max_concurrent_uploads=0,
+        )
@@ -1,3 +1,6 @@
+import io
+import os
+import tarfile
 import threading
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from typing import Any, Dict
@@ -25,7 +28,12 @@ from e2b.template_async.build_api import upload_file
 
 
 def _make_server():
-    state: Dict[str, Any] = {"headers": None, "body_length": 0, "paths": []}
+    state: Dict[str, Any] = {
+        "headers": None,
+        "body_length": 0,
+        "body": b"",
+        "paths": [],
+    }
 
     class Handler(BaseHTTPRequestHandler):
         def do_PUT(self):
@@ -36,6 +44,7 @@ def _make_server():
             length = int(self.headers.get("Content-Length", 0))
             body = self.rfile.read(length) if length else b""
             state["body_length"] = len(body)
+            state["body"] = body
             if self.path.startswith("/redirect"):
                 self.send_response(307)
                 self.send_header("Location", "/upload")
@@ -95,6 +104,43 @@ async def test_upload_file_sets_content_length_and_no_chunked_encoding(tmp_path)
     assert "authorization" not in state["headers"]
 
 
+async def test_upload_file_streams_uncompressed_archive_with_exact_length(tmp_path):
+    # Without gzip the archive isn't spooled to disk: its size is planned
+    # from stat data and the tar is produced while it uploads.
+    (tmp_path / "hello.txt").write_text("hello world")
+    (tmp_path / "big.bin").write_bytes(os.urandom(200_000))
+
+    server, thread, state = _make_server()
+    host, port = server.server_address
+
+    try:
+        client = AuthenticatedClient(base_url="http://test", token="test")
+        with mock.patch(
+            "e2b.template_async.build_api.tar_file_stream",
+            side_effect=AssertionError("uncompressed uploads must not spool"),
+        ):
+            await upload_file(
+                api_client=client,
+                file_name="*",
+                context_path=str(tmp_path),
+                url=f"http://{host}:{port}/upload",
+                ignore_patterns=[],
+                resolve_symlinks=False,
+                gzip=False,
+                stack_trace=None,
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+
+    assert int(state["headers"]["content-length"]) == len(state["body"])
+    with tarfile.open(fileobj=io.BytesIO(state["body"]), mode="r:") as tar:
+        assert sorted(tar.getnames()) == ["big.bin", "hello.txt"]
+        hello = tar.extractfile("hello.txt")
+        assert hello is not None and hello.read() == b"hello world"
+
+
 async def test_upload_file_leaves_redirects_to_httpx(tmp_path):
     # reqwest would otherwise follow redirects inside the transport, replaying
     # the archive body against the new location without httpx knowing. The
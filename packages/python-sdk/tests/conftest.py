@@ -223,6 +223,17 @@ def skip_by_debug(request, debug):
             pytest.skip("skipped because E2B_DEBUG is set")
 
 
+@pytest.fixture(scope="session")
+def cache_home(tmp_path_factory):
+    return tmp_path_factory.mktemp("cache")
+
+
+@pytest.fixture(autouse=True)
+def isolate_hash_cache(monkeypatch, cache_home):
+    """Keep the template file hash cache out of the user's home directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+
+
 class Helpers:
     @staticmethod
     def catch_cmd_exit_error_in_background(cmd: AsyncCommandHandle):
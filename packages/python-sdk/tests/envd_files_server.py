@@ -0,0 +1,184 @@
+"""In-memory stand-in for envd's file HTTP endpoints.
+
+Serves ``GET /files``, ``POST /files`` (octet-stream uploads) and
+``POST /files/compose`` through an ``httpx.MockTransport`` and offers
+replacements for the filesystem RPCs (``get_info``, ``list``, ``make_dir``,
+``rename``, ``remove``) and for the ``tar`` commands of the archive transfers
+and the ``sha256sum``-style commands of the file hashing over the same
+in-memory tree, so upload flows can be exercised end to end
+without a sandbox. Paths are absolute. Uploads can be made to fail with a network error to
+test retries. Not a test module itself — imported by the upload tests
+(``pythonpath = tests`` in pytest.ini makes it importable).
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import posixpath
+import shlex
+import tarfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
+
+import httpx
+
+from e2b.exceptions import FileNotFoundException
+from e2b.sandbox.filesystem.filesystem import EntryInfo, FileType
+
+
+class EnvdFilesServer:
+    def __init__(self, upload_failures: int = 0, fail_after: int = 0):
+        self.files: Dict[str, bytes] = {}
+        self.mtimes: Dict[str, float] = {}
+        self.dirs: Set[str] = set()
+        self.uploads: List[str] = []
+        # The next `upload_failures` uploads after the first `fail_after`
+        # successful ones fail with a network error.
+        self.upload_failures = upload_failures
+        self.fail_after = fail_after
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/files" and request.method == "GET":
+            path = request.url.params["path"]
+            if path not in self.files:
+                return httpx.Response(
+                    404, json={"message": f"{path} not found", "code": 404}
+                )
+            return httpx.Response(200, content=self.files[path])
+
+        if request.url.path == "/files" and request.method == "POST":
+            path = request.url.params["path"]
+            if self.upload_failures and len(self.uploads) >= self.fail_after:
+                self.upload_failures -= 1
+                raise httpx.WriteError("connection reset", request=request)
+
+            content = request.content
+            if request.headers.get("content-encoding") == "gzip":
+                content = gzip.decompress(content)
+            self._put(path, content)
+            self.uploads.append(path)
+            return httpx.Response(200, json=[self._entry(path)])
+
+        if request.url.path == "/files/compose":
+            body = json.loads(request.content)
+            missing = [p for p in body["source_paths"] if p not in self.files]
+            if missing:
+                return httpx.Response(
+                    404, json={"message": f"{missing[0]} not found", "code": 404}
+                )
+            self._put(
+                body["destination"],
+                b"".join(self.files.pop(p) for p in body["source_paths"]),
+            )
+            return httpx.Response(200, json=self._entry(body["destination"]))
+
+        return httpx.Response(404, json={"message": "not found", "code": 404})
+
+    def _put(self, path: str, content: bytes) -> None:
+        self.files[path] = content
+        self.mtimes[path] = time.time()
+        self._put_dir(posixpath.dirname(path))
+
+    def entry_info(self, path: str) -> EntryInfo:
+        is_dir = path in self.dirs
+        if not is_dir and path not in self.files:
+            raise FileNotFoundException(f"path '{path}' does not exist")
+        return EntryInfo(
+            name=posixpath.basename(path),
+            type=FileType.DIR if is_dir else FileType.FILE,
+            path=path,
+            size=0 if is_dir else len(self.files[path]),
+            mode=0o755 if is_dir else 0o644,
+            permissions="drwxr-xr-x" if is_dir else "-rw-r--r--",
+            owner="user",
+            group="user",
+            modified_time=datetime.fromtimestamp(
+                self.mtimes.get(path, 0), timezone.utc
+            ),
+        )
+
+    def get_info(self, path: str, **_) -> EntryInfo:
+        return self.entry_info(path)
+
+    def list(self, path: str, depth: Optional[int] = 1, **_) -> List[EntryInfo]:
+        prefix = path.rstrip("/") + "/"
+        return [
+            self.entry_info(p)
+            for p in sorted({*self.files, *self.dirs})
+            if p.startswith(prefix)
+            and (depth is None or p[len(prefix) :].count("/") < depth)
+        ]
+
+    def make_dir(self, path: str, **_) -> bool:
+        created = path not in self.dirs
+        self._put_dir(path)
+        return created
+
+    def _put_dir(self, path: str) -> None:
+        while path not in ("/", ""):
+            self.dirs.add(path)
+            path = posixpath.dirname(path)
+
+    def rename(self, old_path: str, new_path: str, **_) -> EntryInfo:
+        self._put(new_path, self.files.pop(old_path))
+        return self.entry_info(new_path)
+
+    def remove(self, path: str, **_) -> None:
+        prefix = path + "/"
+        for name in [n for n in self.files if n == path or n.startswith(prefix)]:
+            del self.files[name]
+        self.dirs = {d for d in self.dirs if d != path and not d.startswith(prefix)}
+
+    def tar(self, cmd: str) -> None:
+        """
+        Run the ``tar`` part of an archive transfer command: ``-xf`` extracts
+        a stored archive into the tree and removes it, ``-cf`` archives a
+        directory of the tree.
+        """
+        args = shlex.split(cmd.split(";")[0].split("&&")[-1])
+        archive, directory = args[2], args[args.index("-C") + 1]
+        if args[1] == "-xf":
+            data = self.files.pop(archive)
+            with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+                for member in tar:
+                    path = posixpath.join(directory, member.name)
+                    if member.isdir():
+                        self._put_dir(path)
+                    elif (extracted := tar.extractfile(member)) is not None:
+                        self._put(path, extracted.read())
+            return
+
+        buffer = io.BytesIO()
+        prefix = directory.rstrip("/") + "/"
+        with tarfile.open(fileobj=buffer, mode="w") as tar:
+            for path in sorted({*self.files, *self.dirs}):
+                if not path.startswith(prefix):
+                    continue
+                info = tarfile.TarInfo("./" + path[len(prefix) :])
+                if path in self.dirs:
+                    info.type = tarfile.DIRTYPE
+                    tar.addfile(info)
+                else:
+                    info.size = len(self.files[path])
+                    tar.addfile(info, io.BytesIO(self.files[path]))
+        self._put(archive, buffer.getvalue())
+
+    def hash(self, cmd: str) -> str:
+        """
+        Run a ``<algo>sum < path`` command of the file hashing, returning its
+        output.
+        """
+        program, _, path = shlex.split(cmd)
+        algo = program[: -len("sum")]
+        if path not in self.files:
+            raise FileNotFoundException(f"path '{path}' does not exist")
+        return f"{hashlib.new(algo, self.files[path]).hexdigest()}  -\n"
+
+    @staticmethod
+    def _entry(path: str) -> dict:
+        return {"path": path, "name": posixpath.basename(path), "type": "file"}
@@ -0,0 +1,84 @@
+import io
+import tarfile
+
+import pytest
+
+from e2b.exceptions import SandboxException
+from e2b.sandbox.filesystem.archive import (
+    TarArchiveStream,
+    create_archive_command,
+    extract_archive,
+    extract_archive_command,
+)
+
+
+def _archive(*members: tarfile.TarInfo) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for member in members:
+            tar.addfile(member, io.BytesIO(b"x" * member.size))
+    buffer.seek(0)
+    return buffer
+
+
+def test_tar_archive_stream_matches_tarfile(tmp_path):
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "mod.py").write_bytes(b"m" * 100_000)
+    (tmp_path / "top.txt").write_text("top")
+
+    with TarArchiveStream(
+        [str(tmp_path / "src"), str(tmp_path / "top.txt")], chunk_size=4096
+    ) as stream:
+        data = stream.read()
+
+    assert len(data) % tarfile.RECORDSIZE == 0
+    with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+        assert tar.getnames() == ["src", "src/pkg", "src/pkg/mod.py", "top.txt"]
+        member = tar.extractfile("src/pkg/mod.py")
+        assert member is not None
+        assert member.read() == b"m" * 100_000
+
+
+def test_extract_archive_round_trips(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("app")
+
+    with TarArchiveStream([str(tmp_path / "src")]) as stream:
+        extracted = extract_archive(stream, str(tmp_path / "out"))
+
+    assert extracted == [
+        str(tmp_path / "out" / "src"),
+        str(tmp_path / "out" / "src" / "app.py"),
+    ]
+    assert (tmp_path / "out" / "src" / "app.py").read_text() == "app"
+
+
+@pytest.mark.parametrize("name", ["../escape.txt", "/etc/escape.txt"])
+def test_extract_archive_rejects_paths_outside(tmp_path, name):
+    member = tarfile.TarInfo(name)
+    member.size = 1
+
+    with pytest.raises(SandboxException):
+        extract_archive(_archive(member), str(tmp_path / "out"))
+
+    assert not (tmp_path / "escape.txt").exists()
+
+
+def test_extract_archive_rejects_links_outside(tmp_path):
+    link = tarfile.TarInfo("link")
+    link.type = tarfile.SYMTYPE
+    link.linkname = "../../etc"
+
+    with pytest.raises(SandboxException):
+        extract_archive(_archive(link), str(tmp_path / "out"))
+
+
+def test_archive_commands_quote_paths():
+    assert extract_archive_command("/tmp/a.tar", "/home/user/my dir") == (
+        "mkdir -p '/home/user/my dir' && "
+        "tar -xf /tmp/a.tar --no-same-owner -C '/home/user/my dir'; "
+        "status=$?; rm -f /tmp/a.tar; exit $status"
+    )
+    assert create_archive_command("/tmp/a.tar", "/app; rm -rf /") == (
+        "tar -cf /tmp/a.tar -C '/app; rm -rf /' ."
+    )
@@ -0,0 +1,88 @@
+import subprocess
+
+import pytest
+
+from e2b.exceptions import InvalidArgumentException, SandboxException
+from e2b.sandbox.commands.batch import (
+    SUPERVISOR_MARKER,
+    parse_supervisor_output,
+    supervisor_script,
+    validate_batch,
+)
+
+
+def test_supervisor_script_runs_the_batch():
+    cmds = ["echo out; echo err >&2", ["printf", "%s", "it's é"], "exit 3"]
+
+    shell = subprocess.run(
+        ["bash", "-c", supervisor_script(cmds, 2)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    results = parse_supervisor_output("profile output\n" + shell.stdout, len(cmds))
+
+    assert [(r.stdout, r.stderr, r.exit_code) for r in results] == [
+        ("out\n", "err\n", 0),
+        ("it's é", "", 0),
+        ("", "", 3),
+    ]
+    assert all(r.duration >= 0 for r in results)
+
+
+def test_supervisor_script_limits_concurrency():
+    cmds = ["sleep 0.2"] * 4
+
+    shell = subprocess.run(
+        ["bash", "-c", supervisor_script(cmds, 4)], capture_output=True, text=True
+    )
+    results = parse_supervisor_output(shell.stdout, len(cmds))
+
+    assert all(r.duration < 1 for r in results)
+
+
+def test_parse_supervisor_output_needs_every_result():
+    with pytest.raises(SandboxException):
+        parse_supervisor_output(f"{SUPERVISOR_MARKER} status 0 0 1.5 1.6\n", 2)
+
+
+@pytest.mark.parametrize(
+    "cmds, max_concurrency, shell, supervisor",
+    [("echo", 1, None, False), (["echo"], 0, None, False), (["echo"], 1, "none", True)],
+)
+def test_validate_batch(cmds, max_concurrency, shell, supervisor):
+    with pytest.raises(InvalidArgumentException):
+        validate_batch(cmds, max_concurrency, shell, supervisor)
+
+
+def test_supervisor_script_reports_commands_exiting_the_shell():
+    cmds = ["printf bye; exit 7", "echo after"]
+
+    shell = subprocess.run(
+        ["bash", "-c", supervisor_script(cmds, 1)], capture_output=True, text=True
+    )
+    results = parse_supervisor_output(shell.stdout, len(cmds))
+
+    assert [(r.stdout, r.exit_code) for r in results] == [("bye", 7), ("after\n", 0)]
+
+
+@pytest.mark.parametrize(
+    "cmds, expected",
+    [
+        (
+            ["for i in 1 2 3; do :; done; dir=/; started=x; exit 4", "echo hello"],
+            [("", 4), ("hello\n", 0)],
+        ),
+        (["sleep 0.3; echo x", "i=0; exit 9"], [("x\n", 0), ("", 9)]),
+        (["exec echo hi", "echo ok"], [("hi\n", 0), ("ok\n", 0)]),
+    ],
+)
+def test_supervisor_script_keeps_the_results_of_commands_changing_its_state(
+    cmds, expected
+):
+    shell = subprocess.run(
+        ["bash", "-c", supervisor_script(cmds, 2)], capture_output=True, text=True
+    )
+    results = parse_supervisor_output(shell.stdout, len(cmds))
+
+    assert [(r.stdout, r.exit_code) for r in results] == expected
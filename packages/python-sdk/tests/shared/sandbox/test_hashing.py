@@ -0,0 +1,40 @@
+import hashlib
+import io
+
+from e2b.io_utils import MappedFile
+from e2b.sandbox.filesystem.hashing import hash_upload_data, parse_hash_output
+
+
+def test_hash_upload_data_rewinds_streams(tmp_path):
+    expected = hashlib.sha256(b"world").hexdigest()
+    buffer = io.BytesIO(b"hello world")
+    buffer.seek(6)
+
+    assert hash_upload_data(buffer) == expected
+    assert buffer.tell() == 6
+
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"hello world")
+    with MappedFile(str(path)) as mapped:
+        mapped.seek(6)
+        assert hash_upload_data(mapped) == expected
+        assert mapped.read() == b"world"
+
+
+def test_hash_upload_data_encodes_text():
+    expected = hashlib.md5("é".encode()).hexdigest()
+
+    assert hash_upload_data("é", "md5") == expected
+    assert hash_upload_data(io.StringIO("é"), "md5") == expected
+
+
+def test_hash_upload_data_skips_unseekable_streams():
+    class Pipe(io.RawIOBase):
+        def readable(self):
+            return True
+
+    assert hash_upload_data(Pipe()) is None
+
+
+def test_parse_hash_output():
+    assert parse_hash_output("ABC123  -\n", "/f") == "abc123"
@@ -0,0 +1,33 @@
+import pytest
+
+from e2b.exceptions import InvalidArgumentException
+from e2b.sandbox.commands.main import process_argv
+
+
+def test_process_argv_defaults():
+    assert process_argv("echo hi") == ("/bin/bash", ["-l", "-c", "echo hi"])
+    assert process_argv(["echo", "hi there"]) == ("echo", ["hi there"])
+
+
+def test_process_argv_shell_modes():
+    assert process_argv("echo $HOME", "non-login") == (
+        "/bin/bash",
+        ["-c", "echo $HOME"],
+    )
+    assert process_argv(["echo", "a b; rm -rf /"], "login") == (
+        "/bin/bash",
+        ["-l", "-c", "echo 'a b; rm -rf /'"],
+    )
+
+
+def test_process_argv_splits_strings_without_shell():
+    assert process_argv("ls -la '/home/user/my dir'", "none") == (
+        "ls",
+        ["-la", "/home/user/my dir"],
+    )
+
+
+@pytest.mark.parametrize("cmd, shell", [([], None), ("", "none"), ("echo", "zsh")])
+def test_process_argv_rejects_invalid(cmd, shell):
+    with pytest.raises(InvalidArgumentException):
+        process_argv(cmd, shell)
@@ -0,0 +1,55 @@
+import subprocess
+
+import pytest
+
+from e2b.sandbox.commands.command_handle import CommandExitException
+from e2b.sandbox.commands.session import SentinelStream, SessionState
+
+
+def test_sentinel_stream_holds_back_a_partial_marker():
+    stream = SentinelStream("__end__")
+
+    assert stream.feed("out\n__e") == ("out", None)
+    assert stream.feed("nd") == ("", None)
+    assert stream.feed("__ 0") == ("", None)
+    assert stream.feed("\nnext") == ("", " 0")
+    assert stream.feed("\n__en") == ("next", None)
+
+
+def test_sentinel_stream_passes_on_lookalikes():
+    stream = SentinelStream("__end__")
+
+    assert stream.feed("a\n__en") == ("a", None)
+    assert stream.feed("x\n") == ("\n__enx", None)
+    assert stream.feed("\n__end__\n") == ("\n", "")
+
+
+def test_session_script_runs_in_bash():
+    state = SessionState()
+    cmd = 'cd /tmp && echo "it\'s $PWD"; echo err >&2; printf no-newline'
+
+    shell = subprocess.run(
+        ["bash"],
+        input=state.script(cmd),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert state.feed_stderr(shell.stderr) == "err\n"
+    assert not state.done
+    assert state.feed_stdout(shell.stdout) == "it's /tmp\nno-newline"
+    assert state.done
+    assert state.result().stdout == "it's /tmp\nno-newline"
+
+
+def test_session_result_raises_on_failure():
+    state = SessionState()
+    state.feed_stdout(f"\n{state.sentinel} 2\n")
+    state.feed_stderr(f"boom\n{state.sentinel}\n")
+
+    with pytest.raises(CommandExitException) as exc:
+        state.result()
+
+    assert exc.value.exit_code == 2
+    assert exc.value.stderr == "boom"
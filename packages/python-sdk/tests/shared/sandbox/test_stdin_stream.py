@@ -0,0 +1,64 @@
+import io
+
+from e2b.sandbox.commands.stdin import (
+    STDIN_STREAM_MESSAGE_SIZE,
+    astdin_stream_requests,
+    stdin_stream_requests,
+)
+
+
+def _payloads(requests):
+    assert requests[0].event.field == "start"
+    assert requests[0].event.value.process.selector.value == 7
+    return [r.event.value.input.input.value for r in requests[1:]]
+
+
+def test_stdin_stream_requests_split_large_chunks():
+    big = b"x" * (STDIN_STREAM_MESSAGE_SIZE + 10)
+
+    payloads = _payloads(list(stdin_stream_requests(7, [big, "é", b""])))
+
+    assert payloads == [b"x" * STDIN_STREAM_MESSAGE_SIZE, b"x" * 10, "é".encode()]
+
+
+def test_stdin_stream_requests_read_files():
+    data = bytes(range(256)) * 1024
+
+    assert b"".join(_payloads(list(stdin_stream_requests(7, io.BytesIO(data))))) == data
+
+
+def test_stdin_stream_requests_read_text_files_in_chunks():
+    data = "line\n" * 10
+
+    payloads = _payloads(list(stdin_stream_requests(7, io.StringIO(data))))
+
+    # Read in chunks, not iterated line by line
+    assert payloads == [data.encode()]
+
+
+def test_stdin_stream_requests_pull_chunks_lazily():
+    pulled = []
+
+    def chunks():
+        for i in range(3):
+            pulled.append(i)
+            yield b"x"
+
+    requests = stdin_stream_requests(7, chunks())
+    next(requests)
+    assert pulled == []
+    next(requests)
+    assert pulled == [0]
+
+
+async def test_astdin_stream_requests_accept_sync_and_async_chunks():
+    async def chunks():
+        yield b"a"
+        yield "b"
+
+    async def collect(data):
+        return [r async for r in astdin_stream_requests(7, data)]
+
+    assert _payloads((await collect(chunks()))) == [b"a", b"b"]
+    assert _payloads((await collect([b"a", "b"]))) == [b"a", b"b"]
+    assert _payloads((await collect(io.StringIO("ab")))) == [b"ab"]
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+
+from e2b.template.logger import BuildLogsCursor, LogEntry
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _entry(ms: int, message: str) -> LogEntry:
+    return LogEntry(
+        timestamp=START + timedelta(milliseconds=ms), level="info", message=message
+    )
+
+
+def test_cursor_moves_to_the_last_millisecond():
+    cursor = BuildLogsCursor()
+
+    entries = [_entry(0, "a"), _entry(5, "b")]
+
+    assert cursor.advance(entries) == entries
+    assert cursor.cursor == int(START.timestamp() * 1000) + 5
+
+
+def test_entries_at_the_cursor_are_not_returned_twice():
+    cursor = BuildLogsCursor()
+    cursor.advance([_entry(0, "a"), _entry(5, "b"), _entry(5, "b")])
+
+    new_entries = cursor.advance(
+        [_entry(5, "b"), _entry(5, "b"), _entry(5, "b"), _entry(6, "c")]
+    )
+
+    assert [e.message for e in new_entries] == ["b", "c"]
+
+
+def test_skip_millisecond_forgets_seen_entries():
+    cursor = BuildLogsCursor()
+    cursor.advance([_entry(5, "a")])
+    position = cursor.cursor
+
+    cursor.skip_millisecond()
+
+    assert cursor.cursor == position + 1
+    assert cursor.advance([_entry(6, "a")]) == [_entry(6, "a")]
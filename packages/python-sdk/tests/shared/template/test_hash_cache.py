@@ -0,0 +1,109 @@
+import os
+import time
+from unittest import mock
+
+from e2b.template import hash_cache as hash_cache_mod
+from e2b.template import utils as template_utils
+from e2b.template.hash_cache import FileHashCache
+from e2b.template.utils import calculate_files_hash, read_file_head
+
+
+def _age(path, seconds: int = 60) -> None:
+    """Move a file's mtime out of the window in which digests aren't cached."""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def _signature(path) -> str:
+    return FileHashCache.signature([(os.path.basename(path), os.stat(path), None)])
+
+
+def test_cache_round_trips_through_disk(tmp_path):
+    context = tmp_path / "context"
+    context.mkdir()
+    file_path = context / "file.txt"
+    file_path.write_text("content")
+    _age(file_path)
+    stats = os.stat(file_path)
+
+    cache = FileHashCache.load(str(context), cache_dir=str(tmp_path / "cache"))
+    cache.set("COPY", _signature(file_path), "abc", stats.st_mtime_ns)
+    cache.save()
+
+    reloaded = FileHashCache.load(str(context), cache_dir=str(tmp_path / "cache"))
+    assert reloaded.get("COPY", _signature(file_path)) == "abc"
+
+
+def test_cache_misses_when_stats_change(tmp_path):
+    file_path = tmp_path / "file.txt"
+    file_path.write_text("content")
+    _age(file_path)
+
+    cache = FileHashCache(str(tmp_path / "cache.json"))
+    cache.set("COPY", _signature(file_path), "abc", os.stat(file_path).st_mtime_ns)
+
+    file_path.write_text("changed")
+    _age(file_path, seconds=30)
+
+    assert cache.get("COPY", _signature(file_path)) is None
+
+
+def test_cache_skips_recently_modified_files(tmp_path):
+    file_path = tmp_path / "file.txt"
+    file_path.write_text("content")
+
+    cache = FileHashCache(str(tmp_path / "cache.json"))
+    cache.set("COPY", _signature(file_path), "abc", os.stat(file_path).st_mtime_ns)
+
+    assert cache.get("COPY", _signature(file_path)) is None
+
+
+def test_corrupt_cache_is_treated_as_empty(tmp_path):
+    context = tmp_path / "context"
+    context.mkdir()
+    cache = FileHashCache.load(str(context), cache_dir=str(tmp_path / "cache"))
+    os.makedirs(os.path.dirname(cache._cache_path))
+    with open(cache._cache_path, "w") as f:
+        f.write("{not json")
+
+    reloaded = FileHashCache.load(str(context), cache_dir=str(tmp_path / "cache"))
+    assert reloaded._entries == {}
+
+
+def test_calculate_files_hash_skips_reading_unchanged_steps(tmp_path):
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (tmp_path / name).write_text(name)
+        _age(tmp_path / name)
+
+    cache = FileHashCache(str(tmp_path / "cache.json"))
+    expected = calculate_files_hash("*.txt", "/app", str(tmp_path), [], False, None)
+    first = calculate_files_hash("*.txt", "/app", str(tmp_path), [], False, None, cache)
+    assert first == expected
+
+    with mock.patch.object(
+        template_utils, "read_file_head", side_effect=read_file_head
+    ) as read_spy:
+        again = calculate_files_hash(
+            "*.txt", "/app", str(tmp_path), [], False, None, cache
+        )
+    assert again == first
+    assert read_spy.call_count == 0
+
+    (tmp_path / "b.txt").write_text("changed")
+    _age(tmp_path / "b.txt", seconds=30)
+
+    second = calculate_files_hash(
+        "*.txt", "/app", str(tmp_path), [], False, None, cache
+    )
+    assert second == calculate_files_hash(
+        "*.txt", "/app", str(tmp_path), [], False, None
+    )
+    assert second != first
+
+
+def test_cache_dir_honors_xdg_cache_home(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert hash_cache_mod.get_hash_cache_dir() == os.path.join(
+        str(tmp_path), "e2b", "template-hashes"
+    )
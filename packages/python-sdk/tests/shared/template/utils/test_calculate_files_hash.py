@@ -0,0 +1,127 @@
+import hashlib
+import os
+import tempfile
+
+import pytest
+
+from e2b.template import utils as template_utils
+from e2b.template.utils import (
+    calculate_files_hash,
+    hash_file_content,
+    read_file_head,
+)
+
+
+class TestCalculateFilesHash:
+    @pytest.fixture
+    def test_dir(self):
+        """Create a temporary directory for testing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield tmpdir
+
+    def _write(self, path: str, content: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+
+    def test_should_be_stable_across_runs(self, test_dir):
+        """Test that the hash doesn't depend on the order workers finish in."""
+        for i in range(50):
+            self._write(os.path.join(test_dir, "src", f"file{i}.txt"), b"x" * i)
+
+        hashes = {
+            calculate_files_hash("src", "/app", test_dir, [], False, None)
+            for _ in range(5)
+        }
+
+        assert len(hashes) == 1
+
+    def test_should_change_when_content_changes(self, test_dir):
+        """Test that a content change of the same size changes the hash."""
+        file_path = os.path.join(test_dir, "src", "file.txt")
+        self._write(file_path, b"content1")
+        self._write(os.path.join(test_dir, "src", "other.txt"), b"other")
+        before = calculate_files_hash("src", "/app", test_dir, [], False, None)
+
+        self._write(file_path, b"content2")
+        after = calculate_files_hash("src", "/app", test_dir, [], False, None)
+
+        assert before != after
+
+    def test_should_change_when_destination_changes(self, test_dir):
+        """Test that the destination is part of the hash."""
+        self._write(os.path.join(test_dir, "file.txt"), b"content")
+
+        assert calculate_files_hash(
+            "file.txt", "/app", test_dir, [], False, None
+        ) != calculate_files_hash("file.txt", "/srv", test_dir, [], False, None)
+
+    def test_should_hash_symlink_target_when_not_resolving(self, test_dir):
+        """Test that unresolved symlinks are hashed by their target path."""
+        if not hasattr(os, "symlink"):
+            pytest.skip("Symlinks not supported on this platform")
+
+        self._write(os.path.join(test_dir, "a.txt"), b"same")
+        self._write(os.path.join(test_dir, "b.txt"), b"same")
+        os.symlink("a.txt", os.path.join(test_dir, "link.txt"))
+        before = calculate_files_hash("link.txt", "/app", test_dir, [], False, None)
+
+        os.remove(os.path.join(test_dir, "link.txt"))
+        os.symlink("b.txt", os.path.join(test_dir, "link.txt"))
+        after = calculate_files_hash("link.txt", "/app", test_dir, [], False, None)
+        resolved = calculate_files_hash("link.txt", "/app", test_dir, [], True, None)
+
+        assert before != after
+        assert resolved not in (before, after)
+
+    def test_should_raise_when_no_files_match(self, test_dir):
+        """Test that a pattern without matches raises."""
+        with pytest.raises(ValueError, match="No files found"):
+            calculate_files_hash("missing", "/app", test_dir, [], False, None)
+
+    def test_should_not_depend_on_chunk_size(self, test_dir, monkeypatch):
+        """Test that streaming in small chunks gives the same hash."""
+        self._write(os.path.join(test_dir, "src", "big.bin"), os.urandom(100_000))
+        self._write(os.path.join(test_dir, "src", "small.bin"), b"small")
+        expected = calculate_files_hash("src", "/app", test_dir, [], False, None)
+
+        monkeypatch.setattr(template_utils, "HASH_CHUNK_SIZE", 7)
+
+        assert calculate_files_hash("src", "/app", test_dir, [], False, None) == (
+            expected
+        )
+
+    def test_should_hash_raw_file_content(self, test_dir):
+        """Test that the hash is the one of the JS SDK's `calculateFilesHash`."""
+        self._write(os.path.join(test_dir, "src", "a.txt"), b"alpha")
+        self._write(os.path.join(test_dir, "src", "nested", "b.bin"), os.urandom(5000))
+        os.symlink("a.txt", os.path.join(test_dir, "src", "link.txt"))
+
+        expected = hashlib.sha256(b"COPY src /app")
+        for path in template_utils.get_all_files_in_path("src", test_dir, [], True):
+            stats = os.lstat(path)
+            expected.update(os.path.relpath(path, test_dir).encode())
+            expected.update(str(stats.st_mode).encode())
+            expected.update(str(stats.st_size).encode())
+            if os.path.islink(path):
+                expected.update(os.readlink(path).encode())
+            elif os.path.isfile(path):
+                with open(path, "rb") as f:
+                    expected.update(f.read())
+
+        assert calculate_files_hash("src", "/app", test_dir, [], False, None) == (
+            expected.hexdigest()
+        )
+
+
+def test_hash_file_content_reads_in_chunks(tmp_path):
+    content = os.urandom(10_000)
+    file_path = tmp_path / "file.bin"
+    file_path.write_bytes(content)
+
+    hash_obj = hashlib.sha256()
+    head = read_file_head(str(file_path), chunk_size=3)
+    hash_file_content(hash_obj, str(file_path), head, chunk_size=3)
+
+    assert head == content[:3]
+    assert hash_obj.digest() == hashlib.sha256(content).digest()
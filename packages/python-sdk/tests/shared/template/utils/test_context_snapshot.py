@@ -0,0 +1,101 @@
+import os
+import tarfile
+import tempfile
+from unittest import mock
+
+import pytest
+
+from e2b.template import utils as template_utils
+from e2b.template.utils import (
+    ContextSnapshot,
+    calculate_files_hash,
+    get_all_files_in_path,
+    tar_file_stream,
+)
+
+
+class TestContextSnapshot:
+    @pytest.fixture
+    def test_dir(self):
+        """Create a temporary directory for testing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.makedirs(os.path.join(tmpdir, "src"))
+            with open(os.path.join(tmpdir, "src", "app.py"), "w") as f:
+                f.write("app")
+            with open(os.path.join(tmpdir, "src", "debug.log"), "w") as f:
+                f.write("log")
+            with open(os.path.join(tmpdir, ".dockerignore"), "w") as f:
+                f.write("# comment\n**/*.log\n")
+            yield tmpdir
+
+    def test_should_apply_dockerignore_patterns(self, test_dir):
+        """Test that the `.dockerignore` patterns are read once and applied."""
+        snapshot = ContextSnapshot.from_context(test_dir, ["*.tmp"])
+
+        assert snapshot.ignore_patterns == ["*.tmp", "**/*.log"]
+        assert [os.path.relpath(f, test_dir) for f in snapshot.files("src")] == [
+            "src",
+            os.path.join("src", "app.py"),
+        ]
+
+    def test_should_walk_each_source_once(self, test_dir):
+        """Test that hashing and tarring a source share a single walk."""
+        snapshot = ContextSnapshot.from_context(test_dir, [])
+
+        with mock.patch.object(
+            template_utils,
+            "get_all_files_in_path",
+            side_effect=get_all_files_in_path,
+        ) as walk_spy:
+            calculate_files_hash(
+                "src",
+                "/app",
+                test_dir,
+                snapshot.ignore_patterns,
+                False,
+                None,
+                snapshot=snapshot,
+            )
+            tar_file = tar_file_stream(
+                "src",
+                test_dir,
+                snapshot.ignore_patterns,
+                False,
+                True,
+                snapshot=snapshot,
+            )
+
+        with tarfile.open(fileobj=tar_file, mode="r:*") as tar:
+            names = tar.getnames()
+        tar_file.close()
+
+        assert walk_spy.call_count == 1
+        assert names == ["src", "src/app.py"]
+
+    def test_should_hash_like_a_fresh_walk(self, test_dir):
+        """Test that hashing through a snapshot matches hashing without one."""
+        snapshot = ContextSnapshot.from_context(test_dir, [])
+
+        assert calculate_files_hash(
+            "src", "/app", test_dir, snapshot.ignore_patterns, False, None
+        ) == calculate_files_hash(
+            "src",
+            "/app",
+            test_dir,
+            snapshot.ignore_patterns,
+            False,
+            None,
+            snapshot=snapshot,
+        )
+
+    def test_should_record_broken_symlinks(self, test_dir):
+        """Test that a broken symlink has no followed stats."""
+        if not hasattr(os, "symlink"):
+            pytest.skip("Symlinks not supported on this platform")
+
+        link_path = os.path.join(test_dir, "broken")
+        os.symlink("missing", link_path)
+        snapshot = ContextSnapshot(test_dir, [])
+
+        assert snapshot.stat(link_path) is None
+        assert snapshot.lstat(link_path) is snapshot.lstat(link_path)
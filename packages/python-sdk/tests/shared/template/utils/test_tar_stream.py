@@ -0,0 +1,74 @@
+import os
+import tarfile
+import tempfile
+
+import pytest
+
+from e2b.exceptions import TemplateException
+from e2b.template.utils import TarStream, tar_file_stream
+
+
+class TestTarStream:
+    @pytest.fixture
+    def test_dir(self):
+        """Create a temporary directory with a small nested tree."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.makedirs(os.path.join(tmpdir, "src", "nested"))
+            with open(os.path.join(tmpdir, "src", "empty.txt"), "w"):
+                pass
+            with open(os.path.join(tmpdir, "src", "block.bin"), "wb") as f:
+                f.write(b"\x01" * tarfile.BLOCKSIZE)
+            with open(os.path.join(tmpdir, "src", "nested", "big.bin"), "wb") as f:
+                f.write(os.urandom(100_003))
+            long_name = "a" * 150 + ".txt"
+            with open(os.path.join(tmpdir, "src", "nested", long_name), "w") as f:
+                f.write("long name forces a pax header")
+            yield tmpdir
+
+    def _read_all(self, stream: TarStream) -> bytes:
+        data = b""
+        while True:
+            chunk = stream.read(4096)
+            if not chunk:
+                return data
+            data += chunk
+
+    def test_should_match_size_and_bytes_of_tarfile(self, test_dir):
+        """Test that the planned size is exact and the bytes match tarfile."""
+        stream = TarStream("src", test_dir, [], False, chunk_size=1000)
+        data = self._read_all(stream)
+        stream.close()
+
+        expected_file = tar_file_stream("src", test_dir, [], False, False)
+        expected = expected_file.read()
+        expected_file.close()
+
+        assert stream.size == len(data)
+        assert data == expected
+
+    def test_should_archive_symlinks(self, test_dir):
+        """Test that symlinks are archived as links or resolved."""
+        if not hasattr(os, "symlink"):
+            pytest.skip("Symlinks not supported on this platform")
+
+        os.symlink("empty.txt", os.path.join(test_dir, "src", "link.txt"))
+
+        for resolve_symlinks in (False, True):
+            stream = TarStream("src", test_dir, [], resolve_symlinks)
+            data = self._read_all(stream)
+            expected_file = tar_file_stream(
+                "src", test_dir, [], resolve_symlinks, False
+            )
+
+            assert stream.size == len(data)
+            assert data == expected_file.read()
+            expected_file.close()
+
+    def test_should_fail_when_a_file_shrinks(self, test_dir):
+        """Test that a file truncated after planning can't corrupt the archive."""
+        stream = TarStream("src", test_dir, [], False)
+        with open(os.path.join(test_dir, "src", "nested", "big.bin"), "wb") as f:
+            f.write(b"short")
+
+        with pytest.raises(TemplateException, match="changed while"):
+            self._read_all(stream)
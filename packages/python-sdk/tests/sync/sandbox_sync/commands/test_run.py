@@ -56,3 +56,31 @@ def test_run_with_too_short_timeout_iterating(sandbox):
     with pytest.raises(TimeoutException):
         for _ in cmd:
             pass
+
+
+def test_run_argv_without_shell(sandbox: Sandbox):
+    cmd = sandbox.commands.run(["echo", "$HOME; exit 1"])
+
+    assert cmd.exit_code == 0
+    assert cmd.stdout == "$HOME; exit 1\n"
+
+
+def test_run_with_non_login_shell(sandbox: Sandbox):
+    login = sandbox.commands.run("shopt login_shell")
+    non_login = sandbox.commands.run("shopt login_shell", shell="non-login")
+
+    assert login.stdout.split() == ["login_shell", "on"]
+    assert non_login.stdout.split() == ["login_shell", "off"]
+
+
+def test_run_with_bytes_output(sandbox: Sandbox):
+    data = bytes(range(256)) * 4096
+    sandbox.files.write("/tmp/data.bin", data)
+
+    chunks = []
+    cmd = sandbox.commands.run(
+        "cat /tmp/data.bin", output_format="bytes", on_stdout=chunks.append
+    )
+
+    assert cmd.stdout == data
+    assert b"".join(chunks) == data
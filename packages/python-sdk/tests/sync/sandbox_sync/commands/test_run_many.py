@@ -0,0 +1,69 @@
+import threading
+
+import httpx
+import pytest
+from packaging.version import Version
+
+from e2b import CommandExitException, Sandbox, SandboxException
+from e2b.connection_config import ConnectionConfig
+from e2b.sandbox_sync.commands.command import Commands
+
+CMDS = ["echo one", ["printf", "%s", "two words"], "echo err >&2; exit 3"]
+
+
+@pytest.mark.parametrize("supervisor", [False, True])
+def test_run_many(sandbox: Sandbox, supervisor):
+    results = sandbox.commands.run_many(CMDS, max_concurrency=2, supervisor=supervisor)
+
+    assert [(r.stdout, r.stderr, r.exit_code) for r in results] == [
+        ("one\n", "", 0),
+        ("two words", "", 0),
+        ("", "err\n", 3),
+    ]
+    assert all(r.duration > 0 for r in results)
+
+
+def test_run_many_empty(sandbox: Sandbox):
+    assert sandbox.commands.run_many([]) == []
+
+
+class FakeHandle:
+    """
+    Command that runs until it's killed, or fails right away for `fail`.
+    """
+
+    def __init__(self, cmd: str):
+        self.cmd = cmd
+        self.killed = threading.Event()
+
+    def wait(self):
+        if self.cmd == "fail":
+            raise SandboxException("The command failed")
+        self.killed.wait(10)
+        raise CommandExitException(stdout="", stderr="", exit_code=137, error=None)
+
+    def kill(self) -> bool:
+        self.killed.set()
+        return True
+
+
+def test_run_many_kills_started_commands_on_failure(monkeypatch, test_api_key):
+    commands = Commands(
+        "http://sandbox.test",
+        ConnectionConfig(api_key=test_api_key),
+        Version("0.5.0"),
+        httpx.Client(),
+    )
+    handles = []
+
+    def run(cmd, **_):
+        handles.append(FakeHandle(cmd))
+        return handles[-1]
+
+    monkeypatch.setattr(commands, "run", run)
+
+    with pytest.raises(SandboxException):
+        commands.run_many(["sleep", "fail", "sleep"], max_concurrency=3)
+
+    # The failed one too, its command may still run
+    assert all(h.killed.is_set() for h in handles)
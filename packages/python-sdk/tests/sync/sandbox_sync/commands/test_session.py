@@ -0,0 +1,112 @@
+import queue
+from typing import Generator, Optional
+
+import pytest
+from protobuf import Oneof
+
+from e2b import CommandExitException, Sandbox, SandboxException, TimeoutException
+from e2b.envd.process import process_pb
+from e2b.sandbox.commands.command_handle import TextOutputBuffer
+from e2b.sandbox_sync.commands.command_handle import CommandHandle
+from e2b.sandbox_sync.commands.session import CommandSession
+
+
+class FakeShell:
+    """
+    Session shell whose output the test pushes, ending its output when killed.
+    """
+
+    def __init__(self):
+        self.output: "queue.Queue[Optional[process_pb.StartResponse]]" = queue.Queue()
+        self.killed = False
+        self.closed = False
+
+    def events(self) -> Generator[process_pb.StartResponse, None, None]:
+        try:
+            while (event := self.output.get()) is not None:
+                yield event
+        finally:
+            self.closed = True
+
+    def kill(self) -> bool:
+        self.killed = True
+        self.output.put(None)
+        return True
+
+    def session(self) -> CommandSession:
+        handle = CommandHandle(
+            pid=1,
+            handle_kill=self.kill,
+            events=self.events(),
+            output_buffer=TextOutputBuffer,
+            handle_send_stdin=lambda *_: None,
+        )
+        return CommandSession(handle)
+
+
+def _stdout_event(data: bytes) -> process_pb.StartResponse:
+    return process_pb.StartResponse(
+        event=process_pb.ProcessEvent(
+            event=Oneof(
+                "data", process_pb.ProcessEvent.DataEvent(output=Oneof("stdout", data))
+            )
+        )
+    )
+
+
+def test_session_keeps_shell_state(sandbox: Sandbox):
+    with sandbox.commands.session() as session:
+        session.run("cd /tmp && export GREETING=hello")
+        result = session.run('echo "$GREETING from $PWD"; echo warn >&2')
+
+    assert result.exit_code == 0
+    assert result.stdout == "hello from /tmp\n"
+    assert result.stderr == "warn\n"
+
+
+def test_session_reports_exit_codes(sandbox: Sandbox):
+    with sandbox.commands.session() as session:
+        with pytest.raises(CommandExitException) as exc:
+            session.run("printf partial; exit_with() { return $1; }; exit_with 3")
+
+        assert exc.value.exit_code == 3
+        assert exc.value.stdout == "partial"
+        assert session.run("echo ok").stdout == "ok\n"
+
+
+def test_session_ends_when_the_shell_exits(sandbox: Sandbox):
+    with sandbox.commands.session() as session:
+        with pytest.raises(SandboxException):
+            session.run("exit 0")
+        with pytest.raises(SandboxException):
+            session.run("echo unreachable")
+
+
+def test_session_command_timeout_kills_the_shell():
+    shell = FakeShell()
+    session = shell.session()
+
+    with pytest.raises(TimeoutException):
+        session.run("sleep 10", timeout=0.05)
+
+    assert shell.killed
+    with pytest.raises(SandboxException):
+        session.run("echo unreachable")
+
+
+def test_session_failed_command_kills_the_shell():
+    shell = FakeShell()
+    session = shell.session()
+    shell.output.put(_stdout_event(b"out"))
+
+    def fail(_: str) -> None:
+        raise ValueError("callback failed")
+
+    with pytest.raises(ValueError):
+        session.run("echo out", on_stdout=fail)
+
+    assert shell.killed
+    # Disconnected from the shell's output
+    assert shell.closed
+    with pytest.raises(SandboxException):
+        session.run("echo unreachable")
@@ -0,0 +1,35 @@
+import hashlib
+import io
+
+from e2b import Sandbox
+
+
+def test_stream_stdin_chunks(sandbox: Sandbox):
+    cmd = sandbox.commands.run("wc -c", background=True, stdin=True)
+
+    cmd.stream_stdin(b"x" * 65536 for _ in range(64))
+    cmd.close_stdin()
+
+    result = cmd.wait()
+    assert result.stdout.strip() == str(64 * 65536)
+
+
+def test_stream_stdin_from_file(sandbox: Sandbox):
+    data = bytes(range(256)) * 16384
+    cmd = sandbox.commands.run("sha256sum", background=True, stdin=True)
+
+    sandbox.commands.stream_stdin(cmd.pid, io.BytesIO(data))
+    cmd.close_stdin()
+
+    result = cmd.wait()
+    assert result.stdout.split()[0] == hashlib.sha256(data).hexdigest()
+
+
+def test_stream_stdin_text_chunks(sandbox: Sandbox):
+    cmd = sandbox.commands.run("cat", background=True, stdin=True)
+
+    cmd.stream_stdin(["Hello, ", "World!"])
+    cmd.close_stdin()
+
+    result = cmd.wait()
+    assert result.stdout == "Hello, World!"
@@ -0,0 +1,97 @@
+from unittest.mock import sentinel
+
+import httpx
+import pytest
+from envd_files_server import EnvdFilesServer
+from packaging.version import Version
+
+from e2b.connection_config import ConnectionConfig
+from e2b.exceptions import SandboxException
+from e2b.sandbox_sync.filesystem import filesystem as filesystem_sync
+from e2b.sandbox_sync.filesystem.filesystem import Filesystem
+
+
+class TarCommands:
+    def __init__(self, server: EnvdFilesServer):
+        self.server = server
+        self.cmds = []
+
+    def run(self, cmd, **_):
+        self.cmds.append(cmd)
+        self.server.tar(cmd)
+
+
+@pytest.fixture
+def local_dir(tmp_path):
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "mod.py").write_text("mod")
+    (tmp_path / "src" / "app.py").write_text("app")
+    (tmp_path / "README.md").write_text("readme")
+    return tmp_path
+
+
+@pytest.fixture
+def server():
+    return EnvdFilesServer()
+
+
+@pytest.fixture
+def commands(server):
+    return TarCommands(server)
+
+
+@pytest.fixture
+def fs(monkeypatch, test_api_key, server, commands):
+    monkeypatch.setattr(filesystem_sync, "create_rpc_client", lambda *_: sentinel)
+    monkeypatch.setattr(filesystem_sync, "get_envd_api", lambda *_, **__: None)
+    client = httpx.Client(base_url="http://sandbox.test", transport=server.transport())
+    fs = Filesystem(
+        "http://sandbox.test",
+        Version("0.6.2"),
+        ConnectionConfig(api_key=test_api_key),
+        client,
+        commands=commands,
+    )
+    fs._envd_api_streaming = client
+    monkeypatch.setattr(fs, "remove", server.remove)
+    return fs
+
+
+def test_write_archive_uploads_a_single_archive(fs, server, local_dir):
+    fs.write_archive([str(local_dir / "src"), str(local_dir / "README.md")], "/app")
+
+    assert len(server.uploads) == 1
+    assert server.uploads[0].startswith("/tmp/.e2b-archive-")
+    assert server.files == {
+        "/app/README.md": b"readme",
+        "/app/src/app.py": b"app",
+        "/app/src/pkg/mod.py": b"mod",
+    }
+
+
+def test_write_archive_compresses_the_upload(fs, server, local_dir):
+    fs.write_archive([str(local_dir / "src")], "/app", gzip=True)
+
+    assert server.files["/app/src/pkg/mod.py"] == b"mod"
+
+
+def test_read_archive_extracts_locally(fs, server, tmp_path):
+    server._put("/app/data/a.txt", b"a")
+    server._put("/app/b.txt", b"b")
+
+    extracted = fs.read_archive("/app", str(tmp_path / "out"))
+
+    assert sorted(extracted) == [
+        str(tmp_path / "out" / "b.txt"),
+        str(tmp_path / "out" / "data"),
+        str(tmp_path / "out" / "data" / "a.txt"),
+    ]
+    assert (tmp_path / "out" / "data" / "a.txt").read_text() == "a"
+    assert not [p for p in server.files if p.startswith("/tmp/")]
+
+
+def test_archive_transfers_need_commands(fs, local_dir):
+    fs._commands = None
+
+    with pytest.raises(SandboxException):
+        fs.write_archive([str(local_dir / "README.md")], "/app")
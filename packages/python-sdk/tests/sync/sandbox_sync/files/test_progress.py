@@ -0,0 +1,136 @@
+import io
+from unittest.mock import sentinel
+
+import httpx
+import pytest
+from envd_files_server import EnvdFilesServer
+from packaging.version import Version
+
+from e2b.connection_config import ConnectionConfig
+from e2b.sandbox.filesystem.filesystem import WriteEntry
+from e2b.sandbox_sync.filesystem import filesystem as filesystem_sync
+from e2b.sandbox_sync.filesystem.filesystem import Filesystem
+
+CONTENT = bytes(range(256)) * 1024
+
+
+@pytest.fixture
+def server():
+    server = EnvdFilesServer()
+    server._put("/data.bin", CONTENT)
+    return server
+
+
+@pytest.fixture
+def fs(monkeypatch, test_api_key, server):
+    monkeypatch.setattr(filesystem_sync, "create_rpc_client", lambda *_: sentinel)
+    monkeypatch.setattr(filesystem_sync, "get_envd_api", lambda *_, **__: None)
+    client = httpx.Client(base_url="http://sandbox.test", transport=server.transport())
+    fs = Filesystem(
+        "http://sandbox.test",
+        Version("0.6.2"),
+        ConnectionConfig(api_key=test_api_key),
+        client,
+    )
+    fs._envd_api_streaming = client
+
+    monkeypatch.setattr(fs, "get_info", server.get_info)
+    return fs
+
+
+def assert_progress(calls, total):
+    done = [c[0] for c in calls]
+    assert done == sorted(done)
+    assert calls[-1][:2] == (len(CONTENT), total)
+    assert all(rate >= 0 for _, _, rate in calls)
+
+
+def test_write_reports_progress_of_a_stream(fs, server):
+    calls = []
+
+    fs.write(
+        "/out.bin",
+        io.BytesIO(CONTENT),
+        on_progress=lambda *args: calls.append(args),
+    )
+
+    assert server.files["/out.bin"] == CONTENT
+    assert len(calls) > 1
+    assert_progress(calls, len(CONTENT))
+    assert fs.transfer_stats.bytes_uploaded == len(CONTENT)
+    assert fs.transfer_stats.uploads == 1
+
+
+def test_write_total_is_unknown_for_text_streams(fs):
+    calls = []
+
+    fs.write(
+        "/out.txt",
+        io.StringIO("x" * 1000),
+        on_progress=lambda *args: calls.append(args),
+    )
+
+    assert calls[-1][:2] == (1000, None)
+
+
+def test_write_reports_data_sent_from_memory(fs):
+    calls = []
+
+    fs.write(
+        "/out.bin",
+        CONTENT,
+        use_octet_stream=True,
+        on_progress=lambda *args: calls.append(args),
+    )
+
+    assert len(calls) == 1
+    assert_progress(calls, len(CONTENT))
+
+
+def test_write_files_progress_spans_all_files(fs):
+    calls = []
+    half = len(CONTENT) // 2
+
+    fs.write_files(
+        [
+            WriteEntry(path="/a.bin", data=CONTENT[:half]),
+            WriteEntry(path="/b.bin", data=CONTENT[half:]),
+        ],
+        use_octet_stream=True,
+        max_concurrency=1,
+        on_progress=lambda *args: calls.append(args),
+    )
+
+    assert [c[:2] for c in calls] == [
+        (half, len(CONTENT)),
+        (len(CONTENT), len(CONTENT)),
+    ]
+    assert fs.transfer_stats.uploads == 1
+
+
+def test_read_stream_reports_progress(fs):
+    calls = []
+
+    stream = fs.read(
+        "/data.bin", format="stream", on_progress=lambda *args: calls.append(args)
+    )
+    with stream:
+        assert b"".join(stream) == CONTENT
+
+    assert_progress(calls, len(CONTENT))
+    assert fs.transfer_stats.bytes_downloaded == len(CONTENT)
+    assert fs.transfer_stats.downloads == 1
+
+
+def test_download_reports_progress(fs, tmp_path):
+    calls = []
+
+    fs.download(
+        "/data.bin",
+        str(tmp_path / "data.bin"),
+        on_progress=lambda *args: calls.append(args),
+    )
+
+    assert (tmp_path / "data.bin").read_bytes() == CONTENT
+    assert_progress(calls, len(CONTENT))
+    assert fs.transfer_stats.downloads == 1
@@ -0,0 +1,174 @@
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import sentinel
+
+import httpx
+import pytest
+from envd_files_server import EnvdFilesServer
+from packaging.version import Version
+
+from e2b.connection_config import ConnectionConfig
+from e2b.sandbox_sync.filesystem import filesystem as filesystem_sync
+from e2b.sandbox_sync.filesystem.filesystem import Filesystem
+
+
+def _touch(path, content=None):
+    if content is not None:
+        path.write_text(content)
+    future = time.time() + 60
+    os.utime(path, (future, future))
+
+
+class HashCommands:
+    def __init__(self, server: EnvdFilesServer):
+        self.server = server
+        self.cmds = []
+
+    def run(self, cmd, **_):
+        self.cmds.append(cmd)
+        return SimpleNamespace(stdout=self.server.hash(cmd))
+
+
+@pytest.fixture
+def local_dir(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("print('app')")
+    (tmp_path / "README.md").write_text("readme")
+    (tmp_path / "empty").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def server():
+    return EnvdFilesServer()
+
+
+@pytest.fixture
+def commands(server):
+    return HashCommands(server)
+
+
+@pytest.fixture
+def fs(monkeypatch, test_api_key, server, commands):
+    monkeypatch.setattr(filesystem_sync, "create_rpc_client", lambda *_: sentinel)
+    monkeypatch.setattr(filesystem_sync, "get_envd_api", lambda *_, **__: None)
+    client = httpx.Client(base_url="http://sandbox.test", transport=server.transport())
+    fs = Filesystem(
+        "http://sandbox.test",
+        Version("0.6.2"),
+        ConnectionConfig(api_key=test_api_key),
+        client,
+        commands=commands,
+    )
+    for name in ("get_info", "list", "make_dir", "remove"):
+        monkeypatch.setattr(fs, name, getattr(server, name))
+    return fs
+
+
+def test_sync_dir_uploads_only_changes(fs, server, local_dir):
+    first = fs.sync_dir(str(local_dir), "/app")
+
+    assert first.uploaded == ["/app/README.md", "/app/src/app.py"]
+    assert first.created_dirs == ["/app/empty"]
+    assert server.files == {
+        "/app/README.md": b"readme",
+        "/app/src/app.py": b"print('app')",
+    }
+    assert "/app/empty" in server.dirs
+
+    second = fs.sync_dir(str(local_dir), "/app")
+
+    assert second.uploaded == []
+    assert second.created_dirs == []
+    assert second.unchanged == ["/app/README.md", "/app/src/app.py"]
+
+    _touch(local_dir / "src" / "app.py", "print('changed')")
+    third = fs.sync_dir(str(local_dir), "/app")
+
+    assert third.uploaded == ["/app/src/app.py"]
+    assert server.files["/app/src/app.py"] == b"print('changed')"
+
+
+def test_sync_dir_deletes_extras_only_when_asked(fs, server, local_dir):
+    server.make_dir("/app/stale/nested")
+    fs.write_files([{"path": "/app/old.txt", "data": "old"}])
+
+    kept = fs.sync_dir(str(local_dir), "/app")
+    assert kept.deleted == []
+    assert "/app/old.txt" in server.files
+
+    result = fs.sync_dir(str(local_dir), "/app", delete=True)
+
+    assert result.deleted == ["/app/old.txt", "/app/stale"]
+    assert "/app/old.txt" not in server.files
+    assert not any(d.startswith("/app/stale") for d in server.dirs)
+
+
+def test_sync_dir_replaces_conflicting_entries(fs, server, local_dir):
+    server.make_dir("/app/README.md")
+
+    result = fs.sync_dir(str(local_dir), "/app")
+
+    assert result.deleted == ["/app/README.md"]
+    assert server.files["/app/README.md"] == b"readme"
+
+
+def test_sync_dir_checksum_skips_touched_files(fs, server, commands, local_dir):
+    fs.sync_dir(str(local_dir), "/app", checksum=True)
+    _touch(local_dir / "README.md")
+
+    result = fs.sync_dir(str(local_dir), "/app", checksum=True)
+
+    assert result.uploaded == []
+    assert result.unchanged == ["/app/README.md", "/app/src/app.py"]
+    # The content matched the manifest, the sandbox copy wasn't hashed
+    assert commands.cmds == []
+
+    # The new mtime was recorded
+    again = fs.sync_dir(str(local_dir), "/app")
+    assert again.uploaded == []
+
+    os.utime(local_dir / "README.md", (0, 0))
+    without = fs.sync_dir(str(local_dir), "/app")
+
+    assert without.uploaded == ["/app/README.md"]
+
+
+def test_sync_dir_ignores_the_sandbox_clock(fs, server, local_dir):
+    fs.sync_dir(str(local_dir), "/app")
+    # Same size, but older than the sandbox copy by the sandbox's clock
+    readme = local_dir / "README.md"
+    readme.write_text("README")
+    os.utime(readme, (0, 0))
+
+    result = fs.sync_dir(str(local_dir), "/app")
+
+    assert result.uploaded == ["/app/README.md"]
+    assert server.files["/app/README.md"] == b"README"
+
+
+def test_sync_dir_checksum_hashes_unrecorded_files_in_the_sandbox(
+    fs, server, commands, local_dir
+):
+    server._put("/app/README.md", b"readme")
+    server._put("/app/src/app.py", b"print('APP')")
+
+    result = fs.sync_dir(str(local_dir), "/app", checksum=True)
+
+    assert result.unchanged == ["/app/README.md"]
+    assert result.uploaded == ["/app/src/app.py"]
+    assert server.files["/app/src/app.py"] == b"print('app')"
+    assert len(commands.cmds) == 2
+
+    # Both are recorded now
+    second = fs.sync_dir(str(local_dir), "/app")
+    assert second.unchanged == ["/app/README.md", "/app/src/app.py"]
+    assert len(commands.cmds) == 2
+
+
+def test_sync_dir_creates_empty_remote_dir(fs, server, tmp_path):
+    result = fs.sync_dir(str(tmp_path), "/app")
+
+    assert result.created_dirs == ["/app"]
+    assert "/app" in server.dirs
@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import sentinel
+
+import httpx
+import pytest
+from envd_files_server import EnvdFilesServer
+from packaging.version import Version
+
+from e2b.connection_config import ConnectionConfig
+from e2b.exceptions import InvalidArgumentException
+from e2b.sandbox.filesystem.filesystem import WriteEntry
+from e2b.sandbox_sync.filesystem import filesystem as filesystem_sync
+from e2b.sandbox_sync.filesystem.filesystem import Filesystem
+
+FILES = [WriteEntry(path=f"/data/{i}.txt", data=f"file {i}") for i in range(20)]
+
+
+class SlowServer(EnvdFilesServer):
+    """Answers later uploads faster, so uploads complete out of order.
+
+    With `last_first`, every upload but the last file's waits for `release`,
+    so the last file's upload deterministically completes first.
+    """
+
+    def __init__(self, last_first: bool = False):
+        super().__init__()
+        self.last_first = last_first
+        self.release = threading.Event()
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def handle_slowly(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        index = int(request.url.params["path"].split("/")[-1].split(".")[0])
+        if not self.last_first:
+            time.sleep(0.005 * (len(FILES) - index))
+        elif index != len(FILES) - 1:
+            self.release.wait(5)
+        with self.lock:
+            self.in_flight -= 1
+            return self.handle(request)
+
+
+@pytest.fixture
+def make_filesystem(monkeypatch, test_api_key):
+    monkeypatch.setattr(filesystem_sync, "create_rpc_client", lambda *_: sentinel)
+    monkeypatch.setattr(filesystem_sync, "get_envd_api", lambda *_, **__: None)
+
+    def make(server: SlowServer):
+        client = httpx.Client(
+            base_url="http://sandbox.test",
+            transport=httpx.MockTransport(server.handle_slowly),
+        )
+        return Filesystem(
+            "http://sandbox.test",
+            Version("0.6.2"),
+            ConnectionConfig(api_key=test_api_key),
+            client,
+        )
+
+    return make
+
+
+def test_write_files_returns_results_in_input_order(make_filesystem):
+    server = SlowServer()
+
+    infos = make_filesystem(server).write_files(
+        FILES, use_octet_stream=True, max_concurrency=5
+    )
+
+    assert [info.path for info in infos] == [f["path"] for f in FILES]
+    assert 1 < server.peak <= 5
+    assert len(server.files) == len(FILES)
+
+
+def test_write_files_shares_the_sandbox_limit(make_filesystem):
+    server = SlowServer()
+    fs = make_filesystem(server)
+    fs._upload_semaphore = threading.BoundedSemaphore(3)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        calls = [
+            executor.submit(fs.write_files, FILES[:10], use_octet_stream=True),
+            executor.submit(fs.write_files, FILES[10:], use_octet_stream=True),
+        ]
+        for call in calls:
+            call.result()
+
+    assert server.peak <= 3
+    assert len(server.files) == len(FILES)
+
+
+def test_iter_write_files_yields_as_completed(make_filesystem):
+    server = SlowServer(last_first=True)
+    written = make_filesystem(server).iter_write_files(
+        FILES, use_octet_stream=True, max_concurrency=len(FILES)
+    )
+
+    first = next(written)
+    server.release.set()
+    rest = [info.path for info in written]
+
+    assert first.path == FILES[-1]["path"]
+    assert sorted(rest) == sorted(f["path"] for f in FILES[:-1])
+
+
+def test_write_files_uploads_one_at_a_time(make_filesystem):
+    server = SlowServer()
+
+    make_filesystem(server).write_files(
+        FILES[:3], use_octet_stream=True, max_concurrency=1
+    )
+
+    assert server.peak == 1
+
+
+def test_write_files_rejects_invalid_concurrency(make_filesystem):
+    with pytest.raises(InvalidArgumentException):
+        make_filesystem(SlowServer()).write_files(FILES, max_concurrency=0)
@@ -0,0 +1,128 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import e2b.sandbox_sync.main as sandbox_sync_main
+from e2b import (
+    InvalidArgumentException,
+    RateLimitException,
+    Sandbox,
+    SandboxException,
+)
+from e2b.sandbox.utils import RateLimitBackoff
+
+
+class FakeSandbox:
+    def __init__(self, index: int):
+        self.index = index
+        self.kill = MagicMock(return_value=True)
+
+
+@pytest.fixture
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(
+        sandbox_sync_main,
+        "RateLimitBackoff",
+        lambda: RateLimitBackoff(initial_delay=0.01, max_delay=0.02),
+    )
+
+
+def patch_create(monkeypatch, create):
+    monkeypatch.setattr(Sandbox, "create", classmethod(create))
+
+
+def test_returns_sandboxes_as_they_are_created(monkeypatch):
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    calls = 0
+    others_done = threading.Event()
+
+    def create(cls, **kwargs):
+        nonlocal in_flight, max_in_flight, calls
+        with lock:
+            index = calls
+            calls += 1
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        # The first create finishes only after all the others
+        if index == 0:
+            others_done.wait(timeout=5)
+        else:
+            time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+            if calls == 6 and in_flight == 1:
+                others_done.set()
+        assert kwargs["template"] == "my-template"
+        return FakeSandbox(index)
+
+    patch_create(monkeypatch, create)
+
+    sandboxes = list(Sandbox.create_many(6, template="my-template", max_concurrency=3))
+
+    assert max_in_flight == 3
+    assert sorted(s.index for s in sandboxes) == list(range(6))
+    assert sandboxes[-1].index == 0
+
+
+def test_retries_rate_limited_creates(monkeypatch, fast_backoff):
+    attempts = 0
+
+    def create(cls, **kwargs):
+        nonlocal attempts
+        attempts += 1
+        if attempts <= 3:
+            raise RateLimitException("rate limited")
+        return FakeSandbox(attempts)
+
+    patch_create(monkeypatch, create)
+
+    sandboxes = list(Sandbox.create_many(2, max_concurrency=1))
+
+    assert len(sandboxes) == 2
+    assert attempts == 5
+
+
+def test_gives_up_after_repeated_rate_limits(monkeypatch, fast_backoff):
+    def create(cls, **kwargs):
+        raise RateLimitException("rate limited")
+
+    patch_create(monkeypatch, create)
+
+    with pytest.raises(RateLimitException):
+        list(Sandbox.create_many(1))
+
+
+def test_failure_kills_sandboxes_that_were_not_returned(monkeypatch):
+    lock = threading.Lock()
+    created = []
+
+    def create(cls, **kwargs):
+        with lock:
+            index = len(created)
+            created.append(None)
+        if index == 0:
+            raise SandboxException("boom")
+        time.sleep(0.05)
+        sandbox = FakeSandbox(index)
+        created[index] = sandbox
+        return sandbox
+
+    patch_create(monkeypatch, create)
+
+    with pytest.raises(SandboxException, match="boom"):
+        list(Sandbox.create_many(5, max_concurrency=2))
+
+    # Creates already running are let finish and their sandboxes killed, the
+    # rest never start
+    assert 2 <= len(created) < 5
+    for sandbox in created[1:]:
+        sandbox.kill.assert_called_once()
+
+
+def test_rejects_invalid_arguments():
+    with pytest.raises(InvalidArgumentException):
+        list(Sandbox.create_many(1, max_concurrency=0))
@@ -0,0 +1,145 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+
+import pytest
+
+import e2b.template_sync.build_api as build_api
+from e2b import BuildException
+from e2b.template.logger import LogEntry
+from e2b.template.types import BuildStatusReason, TemplateBuildStatus
+
+FakeStatus = Tuple[TemplateBuildStatus, Optional[BuildStatusReason]]
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _entries(start: int, count: int):
+    return [
+        LogEntry(
+            timestamp=START + timedelta(milliseconds=i),
+            level="info",
+            message=f"log {i}",
+        )
+        for i in range(start, start + count)
+    ]
+
+
+@dataclass
+class FakeApi:
+    pages: List[List[LogEntry]] = field(default_factory=list)
+    statuses: List[FakeStatus] = field(default_factory=list)
+    log_calls: int = 0
+    status_calls: int = 0
+    sleeps: List[float] = field(default_factory=list)
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    state = FakeApi()
+
+    def get_build_logs(client, template_id, build_id, cursor=0, limit=100):
+        state.log_calls += 1
+        return state.pages.pop(0) if state.pages else []
+
+    def get_build_status(client, template_id, build_id, logs_offset, limit=0):
+        state.status_calls += 1
+        status, reason = state.statuses.pop(0)
+        return SimpleNamespace(status=status, reason=reason)
+
+    def sleep(seconds):
+        state.sleeps.append(seconds)
+
+    monkeypatch.setattr(build_api, "get_build_logs", get_build_logs)
+    monkeypatch.setattr(build_api, "get_build_status", get_build_status)
+    monkeypatch.setattr(build_api.time, "sleep", sleep)
+    return state
+
+
+def test_drains_full_pages_without_waiting(fake_api):
+    fake_api.pages = [_entries(0, 100), _entries(100, 100), _entries(200, 3)]
+    fake_api.statuses = [(TemplateBuildStatus.READY, None)]
+
+    follower = build_api.BuildLogsFollower(None, "template-id", "build-id")  # type: ignore[arg-type]
+    messages = [entry.message for entry in follower]
+
+    assert messages == [f"log {i}" for i in range(203)]
+    # Only the partial page waits, before the status is requested
+    assert fake_api.sleeps == [0.2]
+    assert follower.status is not None
+    assert follower.status.status == TemplateBuildStatus.READY
+
+
+def test_backs_off_while_idle(fake_api):
+    fake_api.pages = [[], [], [], [], _entries(0, 1)]
+    fake_api.statuses = [(TemplateBuildStatus.BUILDING, None)] * 4 + [
+        (TemplateBuildStatus.READY, None)
+    ]
+
+    follower = build_api.BuildLogsFollower(
+        None,  # type: ignore[arg-type]
+        "template-id",
+        "build-id",
+        min_interval=0.2,
+        max_interval=1.0,
+    )
+    messages = [entry.message for entry in follower]
+
+    assert messages == ["log 0"]
+    assert fake_api.sleeps == [0.4, 0.8, 1.0, 1.0, 0.2]
+
+
+def test_fetches_logs_written_before_the_build_finished(fake_api):
+    fake_api.pages = [[], _entries(0, 1)]
+    fake_api.statuses = [(TemplateBuildStatus.ERROR, None)]
+
+    follower = build_api.BuildLogsFollower(None, "template-id", "build-id")  # type: ignore[arg-type]
+    messages = [entry.message for entry in follower]
+
+    assert messages == ["log 0"]
+
+
+def test_requests_the_status_only_while_idle(fake_api):
+    fake_api.pages = [_entries(0, 1), _entries(1, 1), _entries(2, 1)]
+    fake_api.statuses = [(TemplateBuildStatus.READY, None)]
+
+    follower = build_api.BuildLogsFollower(None, "template-id", "build-id")  # type: ignore[arg-type]
+    messages = [entry.message for entry in follower]
+
+    assert messages == ["log 0", "log 1", "log 2"]
+    assert fake_api.log_calls == 5
+    assert fake_api.status_calls == 1
+
+
+def test_follower_is_an_iterator(fake_api):
+    fake_api.pages = [_entries(0, 2)]
+    fake_api.statuses = [(TemplateBuildStatus.READY, None)]
+
+    follower = build_api.BuildLogsFollower(None, "template-id", "build-id")  # type: ignore[arg-type]
+
+    assert next(follower).message == "log 0"
+    assert next(follower).message == "log 1"
+    with pytest.raises(StopIteration):
+        next(follower)
+
+
+def test_wait_for_build_finish_raises_the_failure_reason(fake_api):
+    fake_api.pages = [_entries(0, 2)]
+    fake_api.statuses = [
+        (
+            TemplateBuildStatus.ERROR,
+            BuildStatusReason(message="step failed", step="1", log_entries=[]),
+        )
+    ]
+    logs = []
+
+    with pytest.raises(BuildException, match="step failed"):
+        build_api.wait_for_build_finish(
+            None,  # type: ignore[arg-type]
+            "template-id",
+            "build-id",
+            on_build_logs=logs.append,
+        )
+
+    assert [log.message for log in logs] == ["log 0", "log 1"]
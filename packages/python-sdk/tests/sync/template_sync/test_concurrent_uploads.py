@@ -0,0 +1,109 @@
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+import e2b.template_sync.main as template_sync_main
+from e2b import FileUploadException, InvalidArgumentException, Template
+
+
+@pytest.fixture
+def template(tmp_path):
+    for i in range(6):
+        (tmp_path / f"file{i}.txt").write_text(f"content{i}")
+
+    builder = Template(file_context_path=str(tmp_path)).from_base_image()
+    for i in range(6):
+        builder = builder.copy(f"file{i}.txt", "/app/")
+    return builder
+
+
+@pytest.fixture
+def build_api(monkeypatch):
+    monkeypatch.setattr(
+        template_sync_main,
+        "request_build",
+        MagicMock(
+            return_value=SimpleNamespace(
+                template_id="template-id", build_id="build-id", tags=[]
+            )
+        ),
+    )
+    monkeypatch.setattr(
+        template_sync_main,
+        "get_file_upload_link",
+        MagicMock(return_value=SimpleNamespace(present=False, url="http://upload")),
+    )
+    trigger_build = MagicMock()
+    monkeypatch.setattr(template_sync_main, "trigger_build", trigger_build)
+    return trigger_build
+
+
+def test_uploads_run_concurrently_up_to_the_limit(template, build_api, monkeypatch):
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def fake_upload_file(api_client, src, *args, **kwargs):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+
+    monkeypatch.setattr(template_sync_main, "upload_file", fake_upload_file)
+    logs = []
+
+    Template._build(
+        None,  # type: ignore[arg-type]
+        template,
+        "my-template",
+        on_build_logs=lambda log: logs.append(log.message),
+        max_concurrent_uploads=3,
+    )
+
+    assert max_in_flight == 3
+    assert sorted(m for m in logs if m.startswith("Uploaded")) == [
+        f"Uploaded 'file{i}.txt'" for i in range(6)
+    ]
+    build_api.assert_called_once()
+
+
+def test_first_upload_error_skips_pending_uploads(template, build_api, monkeypatch):
+    uploaded = []
+
+    def fake_upload_file(api_client, src, *args, **kwargs):
+        if src == "file0.txt":
+            raise FileUploadException("boom")
+        time.sleep(0.05)
+        uploaded.append(src)
+
+    monkeypatch.setattr(template_sync_main, "upload_file", fake_upload_file)
+
+    with pytest.raises(FileUploadException, match="boom"):
+        Template._build(
+            None,  # type: ignore[arg-type]
+            template,
+            "my-template",
+            max_concurrent_uploads=2,
+        )
+
+    # Uploads already running may finish, but the queued ones never start
+    time.sleep(0.2)
+    assert "file1.txt" in uploaded
+    assert len(uploaded) < 5
+    build_api.assert_not_called()
+
+
+def test_rejects_non_positive_upload_limit(template):
+    with pytest.raises(InvalidArgumentException):
+        Template._build(
+            None,  # type: ignore[arg-type]
+            template,
+            "my-template",
+            max_concurrent_uploads=0,
+        )
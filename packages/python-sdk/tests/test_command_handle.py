@@ -5,7 +5,13 @@ import pytest
 
 from protobuf import Oneof
 
+from e2b import CommandExitException, InvalidArgumentException, OutputRetention
 from e2b.envd.process import process_pb
+from e2b.sandbox.commands.command_handle import (
+    BytesOutputBuffer,
+    TextOutputBuffer,
+    validate_output_format,
+)
 from e2b.sandbox_async.commands.command_handle import AsyncCommandHandle
 from e2b.sandbox_sync.commands.command_handle import CommandHandle
 
@@ -94,6 +100,7 @@ async def test_async_disconnect_stops_callbacks():
         # The handle only async-iterates and aclose()s the stream; this stand-in
         # satisfies both without being a real async generator.
         events=cast(Any, events),
+        output_buffer=TextOutputBuffer,
         on_stdout=chunks.append,
     )
 
@@ -127,7 +134,9 @@ def test_sync_has_no_background_subscription():
         yield _stdout_event(b"a")
         yield _end_event()
 
-    handle = CommandHandle(pid=1, handle_kill=lambda: True, events=events())
+    handle = CommandHandle(
+        pid=1, handle_kill=lambda: True, events=events(), output_buffer=TextOutputBuffer
+    )
 
     # Nothing is consumed until the caller iterates.
     assert consumed == []
@@ -139,13 +148,15 @@ def test_sync_has_no_background_subscription():
 
 def test_sync_records_result_before_yielding_flushed_chunk():
     # A consumer that stops iterating right after the end event's flushed chunk
-    # must still observe the exit code: the result is recorded before the
-    # flushed chunk is yielded.
+    # must still observe the exit code: it is recorded before the flushed chunk
+    # is yielded.
     def events():
         yield _stdout_event(b"a" + EMOJI_BYTES[:2])
         yield _end_event(0)
 
-    handle = CommandHandle(pid=1, handle_kill=lambda: True, events=events())
+    handle = CommandHandle(
+        pid=1, handle_kill=lambda: True, events=events(), output_buffer=TextOutputBuffer
+    )
     iterator = iter(handle)
     assert next(iterator) == ("a", None, None)
     # The end event flushes a trailing replacement character; pull just that
@@ -153,9 +164,10 @@ def test_sync_records_result_before_yielding_flushed_chunk():
     next(iterator)
     iterator.close()
 
-    assert handle._result is not None
-    assert handle._result.exit_code == 0
-    assert handle._result.stdout == "a�"
+    assert handle._exit_code == 0
+    result = handle.wait()
+    assert result.exit_code == 0
+    assert result.stdout == "a�"
 
 
 def test_sync_decodes_multibyte_chars_split_across_chunks():
@@ -167,7 +179,9 @@ def test_sync_decodes_multibyte_chars_split_across_chunks():
         yield _end_event()
 
     chunks = []
-    handle = CommandHandle(pid=1, handle_kill=lambda: True, events=events())
+    handle = CommandHandle(
+        pid=1, handle_kill=lambda: True, events=events(), output_buffer=TextOutputBuffer
+    )
     result = handle.wait(on_stdout=chunks.append)
 
     assert result.stdout == f"a{EMOJI}b"
@@ -182,7 +196,9 @@ def test_sync_replaces_incomplete_trailing_utf8():
         yield _stdout_event(b"a" + EMOJI_BYTES[:2])
         yield _end_event()
 
-    handle = CommandHandle(pid=1, handle_kill=lambda: True, events=events())
+    handle = CommandHandle(
+        pid=1, handle_kill=lambda: True, events=events(), output_buffer=TextOutputBuffer
+    )
     result = handle.wait()
 
     assert result.stdout == "a�"
@@ -201,6 +217,7 @@ async def test_async_decodes_multibyte_chars_split_across_chunks():
         pid=1,
         handle_kill=_kill,
         events=events(),
+        output_buffer=TextOutputBuffer,
         on_stdout=chunks.append,
     )
     result = await handle.wait()
@@ -217,7 +234,9 @@ async def test_async_replaces_incomplete_trailing_utf8():
         yield _stdout_event(b"a" + EMOJI_BYTES[:2])
         yield _end_event()
 
-    handle = AsyncCommandHandle(pid=1, handle_kill=_kill, events=events())
+    handle = AsyncCommandHandle(
+        pid=1, handle_kill=_kill, events=events(), output_buffer=TextOutputBuffer
+    )
     result = await handle.wait()
 
     assert result.stdout == "a�"
@@ -228,7 +247,9 @@ def test_sync_flushes_incomplete_trailing_utf8_without_end_event():
         yield _stdout_event(b"a" + EMOJI_BYTES[:2])
 
     chunks = []
-    handle = CommandHandle(pid=1, handle_kill=lambda: True, events=events())
+    handle = CommandHandle(
+        pid=1, handle_kill=lambda: True, events=events(), output_buffer=TextOutputBuffer
+    )
     for stdout, _, _ in handle:
         if stdout is not None:
             chunks.append(stdout)
@@ -245,6 +266,7 @@ async def test_async_flushes_incomplete_trailing_utf8_without_end_event():
         pid=1,
         handle_kill=_kill,
         events=events(),
+        output_buffer=TextOutputBuffer,
         on_stdout=chunks.append,
     )
     await handle._wait
@@ -258,7 +280,9 @@ def test_sync_flushes_incomplete_trailing_utf8_on_stream_error():
         raise RuntimeError("stream died")
 
     chunks = []
-    handle = CommandHandle(pid=1, handle_kill=lambda: True, events=events())
+    handle = CommandHandle(
+        pid=1, handle_kill=lambda: True, events=events(), output_buffer=TextOutputBuffer
+    )
 
     # The stream raises before an end event, but the buffered bytes must still
     # be flushed as a replacement character before the error is surfaced.
@@ -280,6 +304,7 @@ async def test_async_flushes_incomplete_trailing_utf8_on_stream_error():
         pid=1,
         handle_kill=_kill,
         events=events(),
+        output_buffer=TextOutputBuffer,
         on_stdout=chunks.append,
     )
     await handle._wait
@@ -288,3 +313,214 @@ async def test_async_flushes_incomplete_trailing_utf8_on_stream_error():
     # be flushed to the stdout callback as a replacement character.
     assert "".join(chunks) == "a�"
     assert isinstance(handle._iteration_exception, RuntimeError)
+
+
+def test_tail_retention_keeps_last_chars():
+    buffer = TextOutputBuffer(OutputRetention(mode="tail", max_chars=5))
+    written = ""
+    for chunk in ("abc", "defg", "h", "ijklmnopq"):
+        buffer.append(chunk)
+        written += chunk
+        assert buffer.getvalue() == written[-5:]
+
+
+def test_spill_retention_moves_output_to_a_file():
+    buffer = TextOutputBuffer(OutputRetention(mode="spill", max_chars=4))
+    buffer.append("ab")
+    assert buffer._file is None
+
+    buffer.append(f"c{EMOJI}d")
+    buffer.append("e")
+
+    assert buffer._file is not None
+    assert buffer._chunks == type(buffer._chunks)()
+    assert buffer.getvalue() == f"abc{EMOJI}de"
+    buffer.append("f")
+    assert buffer.getvalue() == f"abc{EMOJI}def"
+
+    spilled = buffer._file
+    buffer.close()
+    assert spilled.closed
+    assert buffer._file is None
+
+
+def test_sync_spilled_output_is_read_once_and_closed():
+    def events():
+        yield _stdout_event(b"abcdef")
+        yield _end_event(1)
+
+    handle = CommandHandle(
+        pid=1,
+        handle_kill=lambda: True,
+        events=events(),
+        output_buffer=TextOutputBuffer,
+        output_retention=OutputRetention(mode="spill", max_chars=2),
+    )
+    reads = []
+    getvalue = handle._stdout_buffer.getvalue
+
+    def counted_getvalue():
+        reads.append(1)
+        return getvalue()
+
+    handle._stdout_buffer.getvalue = counted_getvalue  # type: ignore[method-assign]
+    with pytest.raises(CommandExitException) as exc:
+        handle.wait()
+
+    assert exc.value.stdout == "abcdef"
+    assert reads == [1]
+    assert handle._stdout_buffer._file is None
+    # The result is kept, a second wait doesn't read the buffers again
+    with pytest.raises(CommandExitException):
+        handle.wait()
+    assert reads == [1]
+
+
+def test_sync_disconnect_keeps_collected_output():
+    def events():
+        yield _stdout_event(b"abcdef")
+        yield _end_event()
+
+    handle = CommandHandle(
+        pid=1,
+        handle_kill=lambda: True,
+        events=events(),
+        output_buffer=TextOutputBuffer,
+        output_retention=OutputRetention(mode="spill", max_chars=2),
+    )
+    iterator = iter(handle)
+    next(iterator)
+    assert handle._stdout_buffer._file is not None
+
+    iterator.close()
+    handle.disconnect()
+    assert handle._stdout_buffer.getvalue() == "abcdef"
+
+
+async def test_async_disconnect_keeps_collected_output():
+    received = asyncio.Event()
+
+    async def events():
+        yield _stdout_event(b"abc")
+        received.set()
+        await asyncio.Event().wait()
+
+    handle = AsyncCommandHandle(
+        pid=1, handle_kill=_kill, events=events(), output_buffer=TextOutputBuffer
+    )
+    await received.wait()
+    await handle.disconnect()
+
+    assert handle.stdout == "abc"
+
+
+def test_invalid_retention_is_rejected():
+    with pytest.raises(InvalidArgumentException):
+        OutputRetention(mode="tail", max_chars=0)
+    with pytest.raises(InvalidArgumentException):
+        OutputRetention(mode="keep")  # type: ignore[arg-type]
+
+
+def test_sync_tail_retention_bounds_result_but_not_callbacks():
+    def events():
+        for i in range(10):
+            yield _stdout_event(f"line {i}\n".encode())
+        yield _stderr_event(b"error")
+        yield _end_event(1)
+
+    chunks = []
+    handle = CommandHandle(
+        pid=1,
+        handle_kill=lambda: True,
+        events=events(),
+        output_buffer=TextOutputBuffer,
+        output_retention=OutputRetention(mode="tail", max_chars=14),
+    )
+    with pytest.raises(CommandExitException) as excinfo:
+        handle.wait(on_stdout=chunks.append)
+
+    assert len(chunks) == 10
+    assert excinfo.value.stdout == "line 8\nline 9\n"
+    assert excinfo.value.stderr == "error"
+
+
+async def test_async_discard_retention_keeps_nothing():
+    async def events():
+        yield _stdout_event(b"out")
+        yield _stderr_event(b"err")
+        yield _end_event()
+
+    chunks = []
+    handle = AsyncCommandHandle(
+        pid=1,
+        handle_kill=_kill,
+        events=events(),
+        output_buffer=TextOutputBuffer,
+        on_stdout=chunks.append,
+        output_retention=OutputRetention(mode="discard"),
+    )
+    result = await handle.wait()
+
+    assert chunks == ["out"]
+    assert result.stdout == ""
+    assert result.stderr == ""
+    assert handle.stdout == ""
+
+
+def test_sync_bytes_output_is_not_decoded():
+    def events():
+        yield _stdout_event(b"a" + EMOJI_BYTES[:2])
+        yield _stdout_event(b"\xff\x00")
+        yield _stderr_event(EMOJI_BYTES[3:])
+        yield _end_event()
+
+    chunks = []
+    handle = CommandHandle(
+        pid=1,
+        handle_kill=lambda: True,
+        events=events(),
+        output_buffer=BytesOutputBuffer,
+    )
+    result = handle.wait(on_stdout=chunks.append)
+
+    assert chunks == [b"a" + EMOJI_BYTES[:2], b"\xff\x00"]
+    assert result.stdout == b"a" + EMOJI_BYTES[:2] + b"\xff\x00"
+    assert result.stderr == EMOJI_BYTES[3:]
+
+
+async def test_async_bytes_output_is_not_decoded():
+    async def events():
+        yield _stdout_event(EMOJI_BYTES[:3])
+        yield _stderr_event(b"\xfe")
+        yield _end_event(2)
+
+    chunks = []
+    handle = AsyncCommandHandle(
+        pid=1,
+        handle_kill=_kill,
+        events=events(),
+        output_buffer=BytesOutputBuffer,
+        on_stderr=chunks.append,
+    )
+    with pytest.raises(CommandExitException) as excinfo:
+        await handle.wait()
+
+    assert chunks == [b"\xfe"]
+    assert handle.stdout == EMOJI_BYTES[:3]
+    assert excinfo.value.stderr == b"\xfe"
+    assert "�" in str(excinfo.value)
+
+
+@pytest.mark.parametrize("mode", ["tail", "spill"])
+def test_bytes_retention_counts_bytes(mode):
+    buffer = BytesOutputBuffer(OutputRetention(mode=mode, max_chars=4))
+    for chunk in (b"ab", EMOJI_BYTES, b"\xff"):
+        buffer.append(chunk)
+
+    written = b"ab" + EMOJI_BYTES + b"\xff"
+    assert buffer.getvalue() == (written[-4:] if mode == "tail" else written)
+
+
+def test_invalid_output_format_is_rejected():
+    with pytest.raises(InvalidArgumentException):
+        validate_output_format("base64")  # type: ignore[arg-type]
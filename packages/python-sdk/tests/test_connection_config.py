@@ -234,3 +234,20 @@ def test_get_api_params_includes_sandbox_url():
     # Per-call override takes priority.
     overridden = config.get_api_params(sandbox_url="https://sandbox.override.com")
     assert overridden["sandbox_url"] == "https://sandbox.override.com"
+
+
+def test_envd_binary_rpc_is_opt_in(monkeypatch):
+    monkeypatch.delenv("E2B_ENVD_BINARY_RPC", raising=False)
+    assert ConnectionConfig().envd_binary_rpc is False
+
+    monkeypatch.setenv("E2B_ENVD_BINARY_RPC", "true")
+    assert ConnectionConfig().envd_binary_rpc is True
+    assert ConnectionConfig(envd_binary_rpc=False).envd_binary_rpc is False
+
+
+def test_envd_binary_rpc_survives_get_api_params(monkeypatch):
+    monkeypatch.delenv("E2B_ENVD_BINARY_RPC", raising=False)
+    config = ConnectionConfig(envd_binary_rpc=True)
+
+    rebuilt_config = ConnectionConfig(**config.get_api_params())
+    assert rebuilt_config.envd_binary_rpc is True
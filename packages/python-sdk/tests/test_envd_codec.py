@@ -1,5 +1,5 @@
-"""The envd JSON codec must tolerate unknown response fields (newer envd,
-older SDK) and raise decode failures as ``ConnectError(INTERNAL)`` itself —
+"""The envd codecs must tolerate unknown response fields (newer envd,
+older SDK) and raise decode failures as ``ConnectError(INTERNAL)`` themselves —
 a raw error would hit connectrpc's catch-all and end up a misleading
 sandbox-timeout message in rpc.py.
 """
@@ -7,9 +7,10 @@ sandbox-timeout message in rpc.py.
 import pytest
 from connectrpc.code import Code
 from connectrpc.errors import ConnectError
+from protobuf import Oneof
 
-from e2b.envd.client_shared import ENVD_JSON_CODEC
-from e2b.envd.process.process_pb import ProcessConfig
+from e2b.envd.client_shared import ENVD_BINARY_CODEC, ENVD_JSON_CODEC, envd_rpc_codec
+from e2b.envd.process.process_pb import ConnectResponse, ProcessConfig, ProcessEvent
 from e2b.envd.rpc import handle_rpc_exception, is_transport_failure
 from e2b.exceptions import SandboxException, TimeoutException
 
@@ -39,3 +40,39 @@ def test_decode_failure_maps_to_sandbox_exception_not_timeout():
     assert isinstance(err, SandboxException)
     assert not isinstance(err, TimeoutException)
     assert "could not be decoded" in str(err)
+
+
+def test_binary_codec_round_trips_process_output():
+    event = ConnectResponse(
+        event=ProcessEvent(
+            event=Oneof(
+                "data", ProcessEvent.DataEvent(output=Oneof("stdout", b"\x00\xffhi"))
+            )
+        )
+    )
+    data = ENVD_BINARY_CODEC.encode(event)
+
+    assert ENVD_BINARY_CODEC.name() == "proto"
+    assert ENVD_BINARY_CODEC.decode(data, ConnectResponse) == event
+    assert ENVD_JSON_CODEC.decode(ENVD_JSON_CODEC.encode(event), ConnectResponse) == (
+        event
+    )
+
+
+def test_binary_codec_keeps_unknown_fields():
+    # Field 111 as a varint: something a newer envd added.
+    data = ProcessConfig(cmd="echo").to_binary() + b"\xf8\x06\x01"
+
+    assert ENVD_BINARY_CODEC.decode(data, ProcessConfig).cmd == "echo"
+
+
+def test_binary_decode_failure_raises_typed_connect_error():
+    with pytest.raises(ConnectError) as excinfo:
+        ENVD_BINARY_CODEC.decode(b"\xff\xff\xff", ProcessConfig)
+    assert excinfo.value.code is Code.INTERNAL
+    assert "ProcessConfig" in excinfo.value.message
+
+
+def test_json_is_the_default_codec():
+    assert envd_rpc_codec(False) is ENVD_JSON_CODEC
+    assert envd_rpc_codec(True) is ENVD_BINARY_CODEC
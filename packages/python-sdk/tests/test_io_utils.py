@@ -5,7 +5,21 @@ import gzip
 import threading
 from typing import IO, cast
 
-from e2b.io_utils import agzip_iter, aiter_io_chunks, gzip_iter, iter_io_chunks
+from e2b.io_utils import (
+    AdaptiveChunkSize,
+    MappedFile,
+    TransferProgress,
+    TransferStats,
+    agzip_iter,
+    aiter_io_chunks,
+    aiter_progress,
+    content_length,
+    gzip_iter,
+    iter_io_chunks,
+    iter_progress,
+    parallel_gzip_iter,
+    upload_size,
+)
 
 
 def test_iter_io_chunks_encodes_text():
@@ -20,6 +34,21 @@ def test_gzip_iter_roundtrip():
     assert gzip.decompress(compressed) == b"hello world"
 
 
+def test_parallel_gzip_iter_roundtrip_keeps_block_order():
+    data = bytes(range(256)) * 1000
+    chunks = [data[i : i + 1000] for i in range(0, len(data), 1000)]
+
+    members = list(parallel_gzip_iter(chunks, block_size=4096, max_workers=4))
+
+    # One gzip member per block, concatenated into a single valid stream
+    assert len(members) == -(-len(data) // 4096)
+    assert gzip.decompress(b"".join(members)) == data
+
+
+def test_parallel_gzip_iter_empty_stream_is_valid_gzip():
+    assert gzip.decompress(b"".join(parallel_gzip_iter([]))) == b""
+
+
 async def test_aiter_io_chunks_roundtrip():
     import io
 
@@ -72,3 +101,198 @@ async def test_aiter_io_chunks_offloads_reads_to_a_thread():
     _, chunks = await asyncio.gather(releaser(), collect())
     assert result["released"] is True
     assert chunks == [b"data"]
+
+
+def test_mapped_file_yields_slices_of_the_map(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 40)
+
+    with MappedFile(str(path), chunk_size=4096) as mapped:
+        chunks = list(mapped.chunks())
+
+    assert all(isinstance(chunk, memoryview) for chunk in chunks)
+    assert [len(chunk) for chunk in chunks] == [4096, 4096, 2048]
+    # Slices outlive the closed file, the map is released with the last one.
+    assert b"".join(chunks) == path.read_bytes()
+
+
+def test_mapped_file_reads_like_a_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"hello world")
+
+    with open(path, "rb") as f:
+        f.seek(6)
+        with MappedFile(f) as mapped:
+            assert mapped.size == 11
+            assert list(iter_io_chunks(mapped)) == [b"world"]
+            assert mapped.seek(0) == 0
+            assert mapped.read(5) == b"hello"
+
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    with MappedFile(str(empty)) as mapped:
+        assert mapped.read() == b""
+
+
+async def test_aiter_io_chunks_slices_a_mapped_file(tmp_path, monkeypatch):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"x" * 10_000)
+
+    async def no_thread(*_args, **_kwargs):
+        raise AssertionError("a mapped file must not be read in a thread")
+
+    monkeypatch.setattr(asyncio, "to_thread", no_thread)
+    with MappedFile(str(path), chunk_size=4096) as mapped:
+        chunks = [chunk async for chunk in aiter_io_chunks(mapped)]
+
+    # The HTTP transport only accepts `bytes` chunks.
+    assert all(type(chunk) is bytes for chunk in chunks)
+    assert b"".join(chunks) == b"x" * 10_000
+
+
+def test_adaptive_chunk_size_follows_the_pace():
+    chunk_size = AdaptiveChunkSize(
+        initial=64 * 1024, minimum=16 * 1024, maximum=1024 * 1024, target_seconds=0.1
+    )
+
+    # A fast link grows the chunks, at most doubling them per chunk.
+    chunk_size.record(64 * 1024, 0.001)
+    assert chunk_size.size == 128 * 1024
+    for _ in range(10):
+        chunk_size.record(chunk_size.size, 0.001)
+    assert chunk_size.size == 1024 * 1024
+
+    # A slow one shrinks them down to the minimum.
+    for _ in range(20):
+        chunk_size.record(chunk_size.size, 10.0)
+    assert chunk_size.size == 16 * 1024
+
+
+def test_adaptive_chunk_size_ignores_short_reads():
+    chunk_size = AdaptiveChunkSize(initial=64 * 1024)
+
+    chunk_size.record(10, 10.0)
+
+    assert chunk_size.size == 64 * 1024
+    assert chunk_size.throughput is None
+
+
+def test_iter_io_chunks_adapts_chunk_size():
+    import io
+
+    data = bytes(range(256)) * 4096
+    chunk_size = AdaptiveChunkSize(initial=16 * 1024, minimum=16 * 1024)
+
+    chunks = list(iter_io_chunks(io.BytesIO(data), chunk_size))
+
+    assert b"".join(chunks) == data
+    # Reading from memory is fast, so the chunks grow from the initial size.
+    assert len(chunks[0]) == 16 * 1024
+    assert max(len(chunk) for chunk in chunks) > 16 * 1024
+
+
+def test_gzip_iter_regroups_adaptive_chunks():
+    data = bytes(range(256)) * 4096
+    chunks = [data[i : i + 1000] for i in range(0, len(data), 1000)]
+
+    compressed = list(gzip_iter(chunks, AdaptiveChunkSize(initial=1024, minimum=1024)))
+
+    assert gzip.decompress(b"".join(compressed)) == data
+    assert all(len(chunk) >= 1024 for chunk in compressed[:-1])
+
+
+async def test_async_iterators_adapt_chunk_size():
+    import io
+
+    data = bytes(range(256)) * 4096
+    chunk_size = AdaptiveChunkSize(initial=16 * 1024, minimum=16 * 1024)
+
+    chunks = [c async for c in aiter_io_chunks(io.BytesIO(data), chunk_size)]
+    assert b"".join(chunks) == data
+    assert max(len(chunk) for chunk in chunks) > 16 * 1024
+
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    compressed = [
+        c
+        async for c in agzip_iter(
+            source(), AdaptiveChunkSize(initial=1024, minimum=1024)
+        )
+    ]
+    assert gzip.decompress(b"".join(compressed)) == data
+
+
+def test_transfer_progress_reports_each_chunk():
+    calls = []
+    stats = TransferStats()
+    progress = TransferProgress(True, 300, lambda *args: calls.append(args), stats)
+
+    assert list(iter_progress([b"a" * 100, b"b" * 200], progress)) == [
+        b"a" * 100,
+        b"b" * 200,
+    ]
+    progress.finish()
+    progress.finish()
+
+    assert [c[:2] for c in calls] == [(100, 300), (300, 300)]
+    assert all(rate > 0 for _, _, rate in calls)
+    assert stats.bytes_uploaded == 300
+    assert stats.bytes_downloaded == 0
+    assert stats.uploads == 1
+    assert stats.upload_rate > 0
+
+
+def test_transfer_progress_is_shared_across_threads():
+    stats = TransferStats()
+    progress = TransferProgress(False, stats=stats)
+
+    threads = [
+        threading.Thread(target=lambda: [progress.update(1) for _ in range(1000)])
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    progress.finish()
+
+    assert progress.bytes_done == stats.bytes_downloaded == 4000
+    assert stats.downloads == 1
+
+
+async def test_aiter_progress_counts_chunks():
+    progress = TransferProgress(False)
+
+    async def source():
+        yield b"abc"
+        yield b"de"
+
+    assert [c async for c in aiter_progress(source(), progress)] == [b"abc", b"de"]
+    assert progress.bytes_done == 5
+
+
+def test_upload_size(tmp_path):
+    import io
+
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"x" * 100)
+
+    assert upload_size(b"abc") == 3
+    assert upload_size("é") == 2
+    assert upload_size(io.StringIO("abc")) is None
+    buffer = io.BytesIO(b"abcdef")
+    buffer.seek(2)
+    assert upload_size(buffer) == 4
+    with open(path, "rb") as f:
+        f.seek(10)
+        assert upload_size(f) == 90
+    with MappedFile(str(path)) as mapped:
+        assert upload_size(mapped) == 100
+
+
+def test_content_length():
+    assert content_length({"Content-Length": "10"}) == 10
+    assert content_length({}) is None
+    assert content_length({"Content-Length": "10", "Content-Encoding": "gzip"}) is None